@@ -0,0 +1,216 @@
+"""
+Stale-while-revalidate caching of responses from other services.
+
+Values are stored in the TieredCache for longer than their timeout, together with the time their timeout
+expires at (the soft expiry). Once the soft expiry has passed, the stale value keeps being served while a
+single refresh of the key runs in the background, so that requests do not all wait on the upstream service
+when a popular key expires. Values are only fetched synchronously when they are not cached at all, or once
+the grace period (the hard expiry) has passed as well. Not found responses are cached for a short time too.
+
+Entries are stored under the given keys prefixed with CACHE_KEY_PREFIX, so that other readers of the same keys,
+e.g. processes running an earlier release during a deployment, never get them in a format they do not expect.
+"""
+
+
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from edx_django_utils import monitoring as monitoring_utils
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, RequestCache, TieredCache
+from slumber.exceptions import HttpNotFoundError
+
+logger = logging.getLogger(__name__)
+
+NOT_FOUND = 'not-found'
+
+# Value cached along with its soft expiry, which is NOT_FOUND for cached not found responses.
+CacheEntry = namedtuple('CacheEntry', ['value', 'soft_expiry'])
+# Version of the format of the entries, to be changed whenever CacheEntry changes.
+CACHE_KEY_PREFIX = 'swr.v1.'
+
+_refresh_executor = None
+_refresh_executor_lock = threading.Lock()
+
+
+def _get_entry_key(key):
+    return CACHE_KEY_PREFIX + key
+
+
+def _get_refresh_lock_key(key):
+    return '{}.refreshing'.format(key)
+
+
+def _increment_metric(namespace, event):
+    monitoring_utils.increment('{namespace}_cache_{event}'.format(namespace=namespace, event=event))
+
+
+def _unpack(cached_value):
+    """
+    Returns the value and soft expiry of a cached value. Values cached with a timeout of 0 have no soft expiry.
+    """
+    if isinstance(cached_value, CacheEntry):
+        return cached_value
+    return CacheEntry(cached_value, None)
+
+
+def _is_stale(soft_expiry):
+    # Values cached without a soft expiry are served until they are evicted.
+    return soft_expiry is not None and soft_expiry != NOT_FOUND and soft_expiry <= time.time()
+
+
+def set_cached_value(key, value, timeout):
+    """
+    Caches the value in all tiers, to be served as fresh for `timeout` seconds and as stale
+    for CACHE_STALE_WHILE_REVALIDATE_PERIOD seconds after that.
+
+    Arguments:
+        key (str): Cache key.
+        value (object): Value to cache.
+        timeout (int): Number of seconds the value is fresh for. As with TieredCache, 0 skips the django cache.
+    """
+    if timeout <= 0:
+        TieredCache.set_all_tiers(_get_entry_key(key), value, timeout)
+        return
+
+    hard_timeout = timeout + settings.CACHE_STALE_WHILE_REVALIDATE_PERIOD
+    TieredCache.set_all_tiers(_get_entry_key(key), CacheEntry(value, time.time() + timeout), hard_timeout)
+
+
+def _set_not_found(key):
+    TieredCache.set_all_tiers(_get_entry_key(key), CacheEntry(None, NOT_FOUND), settings.CACHE_NOT_FOUND_TIMEOUT)
+
+
+def _fetch_and_cache(key, fetch, timeout):
+    try:
+        value = fetch()
+    except HttpNotFoundError:
+        _set_not_found(key)
+        raise
+
+    set_cached_value(key, value, timeout)
+    return value
+
+
+def _get_refresh_executor():
+    global _refresh_executor  # pylint: disable=global-statement
+
+    if _refresh_executor is None:
+        with _refresh_executor_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(
+                    max_workers=settings.CACHE_REFRESH_MAX_WORKERS, thread_name_prefix='cache-refresh'
+                )
+    return _refresh_executor
+
+
+def _refresh(namespace, key, fetch, timeout, in_background):
+    try:
+        _fetch_and_cache(key, fetch, timeout)
+    except HttpNotFoundError:
+        logger.info('Stopped serving stale [%s] cache entry [%s], which is no longer found.', namespace, key)
+    except Exception:  # pylint: disable=broad-except
+        _increment_metric(namespace, 'refresh_failed')
+        logger.exception('Failed to refresh [%s] cache entry [%s]. The stale value is served.', namespace, key)
+    finally:
+        cache.delete(_get_refresh_lock_key(key))
+        if in_background:
+            # The refresh thread has its own database connections and request cache, which no request
+            # would otherwise close or clear.
+            connections.close_all()
+            RequestCache.clear_all_namespaces()
+
+
+def _schedule_refresh(namespace, key, fetch, timeout):
+    if not cache.add(_get_refresh_lock_key(key), True, settings.CACHE_REFRESH_LOCK_TIMEOUT):
+        # Another thread or process is already refreshing the key.
+        return
+
+    _increment_metric(namespace, 'refresh')
+    if settings.CACHE_REFRESH_IN_BACKGROUND:
+        _get_refresh_executor().submit(_refresh, namespace, key, fetch, timeout, True)
+    else:
+        _refresh(namespace, key, fetch, timeout, False)
+
+
+def get_or_fetch(namespace, key, fetch, timeout):
+    """
+    Returns the cached value of the key, fetching and caching it if necessary.
+
+    Stale values are returned as is, while a refresh of the key is scheduled in the background.
+    If the key is not cached, the value is fetched before returning.
+
+    Arguments:
+        namespace (str): Name of the kind of value, used for the hit, stale, miss and refresh metrics.
+        key (str): Cache key.
+        fetch (callable): Takes no arguments and returns the value to cache.
+        timeout (int): Number of seconds the fetched value is fresh for.
+
+    Returns:
+        object: The cached or fetched value.
+
+    Raises:
+        HttpNotFoundError: If fetch raised it, now or within the last CACHE_NOT_FOUND_TIMEOUT seconds.
+        Any other exception raised by fetch when the key is not cached.
+    """
+    cached_response = TieredCache.get_cached_response(_get_entry_key(key))
+
+    if cached_response.is_found:
+        value, soft_expiry = _unpack(cached_response.value)
+        if soft_expiry == NOT_FOUND:
+            _increment_metric(namespace, 'not_found_hit')
+            raise HttpNotFoundError('Not found response cached for [{}].'.format(key))
+
+        if _is_stale(soft_expiry):
+            _increment_metric(namespace, 'stale')
+            _schedule_refresh(namespace, key, fetch, timeout)
+        else:
+            _increment_metric(namespace, 'hit')
+        return value
+
+    _increment_metric(namespace, 'miss')
+    return _fetch_and_cache(key, fetch, timeout)
+
+
+def get_many_cached_values(namespace, keys):
+    """
+    Returns the cached values of several keys, with a single lookup in the django cache.
+
+    Arguments:
+        namespace (str): Name of the kind of value, used for the hit metric.
+        keys (list): Cache keys.
+
+    Returns:
+        dict: For each key that is cached, a (value, is_stale) tuple. Stale values should be
+            refreshed by looking them up with get_or_fetch.
+    """
+    keys_by_entry_key = {_get_entry_key(key): key for key in keys}
+    cached_values = {}
+    uncached_entry_keys = []
+    for entry_key in keys_by_entry_key:
+        cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(entry_key)
+        if cached_response.is_found:
+            cached_values[entry_key] = cached_response.value
+        else:
+            uncached_entry_keys.append(entry_key)
+
+    if uncached_entry_keys:
+        django_cached_values = cache.get_many(uncached_entry_keys)
+        for entry_key, cached_value in django_cached_values.items():
+            DEFAULT_REQUEST_CACHE.set(entry_key, cached_value)
+        cached_values.update(django_cached_values)
+
+    results = {}
+    for entry_key, cached_value in cached_values.items():
+        value, soft_expiry = _unpack(cached_value)
+        if soft_expiry != NOT_FOUND:
+            results[keys_by_entry_key[entry_key]] = (value, _is_stale(soft_expiry))
+
+    for _value, is_stale in results.values():
+        _increment_metric(namespace, 'stale' if is_stale else 'hit')
+    return results
@@ -33,6 +33,9 @@ COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME = 'Course Entitlement'
 # Discovery Service constants
 DEFAULT_CATALOG_PAGE_SIZE = 100
 
+# switch is used to serve course and course run details from the local copy of the Discovery Service catalog
+DISCOVERY_REPLICA_SWITCH = 'use_discovery_replica'
+
 ENTERPRISE_COUPON_ADMIN_ROLE = 'enterprise_coupon_admin'
 ORDER_MANAGER_ROLE = 'order_manager'
 
@@ -0,0 +1,184 @@
+"""
+Routing of read-only requests and management commands to the read replica.
+
+Queries only go to the 'read_replica' database inside use_read_replica blocks, e.g. views decorated with
+read_replica_view. Everything else, and every write, uses the default database. Reads fall back to the
+default database when the replica lags behind by more than READ_REPLICA_MAX_LAG seconds, after a write
+in the same block, and for READ_REPLICA_STICKY_SECONDS after a write request of the same client, so that
+clients read their own writes.
+"""
+
+
+import logging
+import threading
+from contextlib import ContextDecorator
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.template.response import TemplateResponse
+from django.utils.deprecation import MiddlewareMixin
+from edx_django_utils import monitoring as monitoring_utils
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+READ_REPLICA = 'read_replica'
+READ_REPLICA_LAGGING_CACHE_KEY = 'read_replica.lagging'
+READ_REPLICA_STICKY_COOKIE = 'ecommerce_read_primary'
+
+_state = threading.local()
+
+
+def is_read_replica_available():
+    return READ_REPLICA in settings.DATABASES
+
+
+def get_replication_lag():
+    """
+    Returns the number of seconds the read replica is behind the default database, or None if replication
+    is not running. The lag is only measured on MySQL, it is 0 for other databases.
+    """
+    connection = connections[READ_REPLICA]
+    if connection.vendor != 'mysql':
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute('SHOW SLAVE STATUS')
+        row = cursor.fetchone()
+        if not row:
+            # The replica database is not replicated, e.g. it is an alias of the default database.
+            return 0
+        columns = [column[0] for column in cursor.description]
+    return dict(zip(columns, row))['Seconds_Behind_Master']
+
+
+def is_read_replica_lagging():
+    """
+    Returns True if the read replica lags behind by more than READ_REPLICA_MAX_LAG seconds, checking the lag
+    at most once every READ_REPLICA_LAG_CHECK_INTERVAL seconds.
+    """
+    if settings.READ_REPLICA_MAX_LAG is None:
+        return False
+
+    lagging = cache.get(READ_REPLICA_LAGGING_CACHE_KEY)
+    if lagging is None:
+        try:
+            lag = get_replication_lag()
+        except DatabaseError:
+            logger.exception('Failed to check the replication lag of the read replica.')
+            lagging = True
+        else:
+            lagging = lag is None or lag > settings.READ_REPLICA_MAX_LAG
+            if lagging:
+                logger.warning('The read replica is lagging behind by [%s] seconds, reading from the default '
+                               'database.', lag)
+        cache.set(READ_REPLICA_LAGGING_CACHE_KEY, lagging, settings.READ_REPLICA_LAG_CHECK_INTERVAL)
+    return lagging
+
+
+def _set_fallback_metric(reason):
+    monitoring_utils.set_custom_metric('read_replica_fallback_reason', reason)
+
+
+class use_read_replica(ContextDecorator):  # pylint: disable=invalid-name
+    """
+    Context manager and decorator sending the reads of the block to the read replica, if it is available
+    and does not lag behind.
+    """
+
+    def __enter__(self):
+        blocks = getattr(_state, 'blocks', [])
+        if not blocks:
+            _state.wrote = False
+
+        database = DEFAULT_DB_ALIAS
+        if is_read_replica_available():
+            if is_read_replica_lagging():
+                _set_fallback_metric('lag')
+            else:
+                database = READ_REPLICA
+
+        _state.blocks = blocks + [database]
+        monitoring_utils.set_custom_metric('read_replica_database', database)
+        return self
+
+    def __exit__(self, *exc):
+        _state.blocks = _state.blocks[:-1]
+        return False
+
+
+def get_read_database():
+    """ Returns the database reads are currently sent to. """
+    blocks = getattr(_state, 'blocks', None)
+    if not blocks or getattr(_state, 'wrote', False):
+        return DEFAULT_DB_ALIAS
+    return blocks[-1]
+
+
+def read_replica_view(view_func):
+    """
+    Decorator sending the reads of safe requests to the read replica, unless the client has made a write
+    request in the last READ_REPLICA_STICKY_SECONDS. Use method_decorator to decorate view methods.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return view_func(request, *args, **kwargs)
+
+        if READ_REPLICA_STICKY_COOKIE in request.COOKIES:
+            _set_fallback_metric('sticky')
+            return view_func(request, *args, **kwargs)
+
+        with use_read_replica():
+            response = view_func(request, *args, **kwargs)
+            if isinstance(response, TemplateResponse):
+                # Templates are otherwise rendered, and their queries run, after the view has returned.
+                response.render()
+            return response
+
+    return _wrapped_view
+
+
+class ReadReplicaRouter:
+    """
+    Database router sending the reads of use_read_replica blocks to the read replica.
+    """
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        if not getattr(_state, 'blocks', None):
+            return None
+        return get_read_database()
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        if getattr(_state, 'blocks', None) and not _state.wrote:
+            # Later reads of the block must see the write.
+            _state.wrote = True
+            _set_fallback_metric('write')
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        databases = {DEFAULT_DB_ALIAS, READ_REPLICA}
+        if obj1._state.db in databases and obj2._state.db in databases:  # pylint: disable=protected-access
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):  # pylint: disable=unused-argument
+        if db == READ_REPLICA:
+            return False
+        return None
+
+
+class ReadReplicaStickinessMiddleware(MiddlewareMixin):
+    """
+    Middleware marking clients that have made a write request, so that their reads are sent to the default
+    database for READ_REPLICA_STICKY_SECONDS.
+    """
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and is_read_replica_available():
+            response.set_cookie(
+                READ_REPLICA_STICKY_COOKIE, '1', max_age=settings.READ_REPLICA_STICKY_SECONDS, httponly=True
+            )
+        return response
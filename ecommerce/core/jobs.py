@@ -0,0 +1,170 @@
+"""
+Background jobs for long-running admin operations.
+
+Jobs are recorded as BackgroundJob objects, and run by the run_background_job Celery task once the transaction
+of the request that started them has been committed. Jobs run under a fake request for the site of the request
+that started them, made by the user who started them. Clients poll the status, progress and partial results of
+a job with its ID, and download its result file once it has succeeded.
+
+Endpoints run in a background job when the client passes `async=true`, see is_async_requested.
+
+Running jobs whose progress has not been updated for BACKGROUND_JOB_STALE_TIMEOUT seconds, e.g. because their worker
+died, are considered failed. Jobs are kept for BACKGROUND_JOB_RETENTION_DAYS days, see the delete_background_jobs
+management command.
+"""
+
+
+import logging
+from contextlib import nullcontext
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+from threadlocals.threadlocals import get_current_request
+
+from ecommerce.core.models import BackgroundJob
+from ecommerce.core.utils import site_request
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = BackgroundJob.PENDING
+JOB_RUNNING = BackgroundJob.RUNNING
+JOB_SUCCEEDED = BackgroundJob.SUCCEEDED
+JOB_FAILED = BackgroundJob.FAILED
+
+# The errors of jobs are shown to their clients, so unexpected ones are only logged.
+JOB_ERROR_MESSAGE = 'The job failed unexpectedly.'
+JOB_STALE_ERROR_MESSAGE = 'The job stopped before completing.'
+
+
+class JobError(Exception):
+    """
+    Error failing a job, whose message is recorded as the error of the job.
+    """
+
+
+def is_async_requested(request):
+    """
+    Returns whether the client asked for the operation to run in a background job, by passing `async=true`.
+    """
+    return request.GET.get('async', '').lower() == 'true'
+
+
+def get_job(job_id):
+    """
+    Returns the BackgroundJob with the given ID, or None if the job does not exist.
+    """
+    fail_stale_jobs(pk=job_id)
+    try:
+        return BackgroundJob.objects.get(pk=job_id)
+    except (BackgroundJob.DoesNotExist, ValidationError):
+        return None
+
+
+def fail_stale_jobs(**filters):
+    """
+    Fails the running jobs matching the given filters whose progress has not been updated for
+    BACKGROUND_JOB_STALE_TIMEOUT seconds.
+    """
+    stale_before = now() - timedelta(seconds=settings.BACKGROUND_JOB_STALE_TIMEOUT)
+    try:
+        return BackgroundJob.objects.filter(status=JOB_RUNNING, modified__lt=stale_before, **filters).update(
+            status=JOB_FAILED, error=JOB_STALE_ERROR_MESSAGE, modified=now()
+        )
+    except ValidationError:
+        return 0
+
+
+class JobProgress:
+    """
+    Records the status, progress and results of a job.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+    def update(self, **fields):
+        """ Updates the given fields of the job, e.g. its partial results. """
+        BackgroundJob.objects.filter(pk=self.job_id).update(modified=now(), **fields)
+
+    def advance(self, count):
+        """ Records that `count` more items of the job have been completed. """
+        self.update(completed=F('completed') + count)
+
+    def save_result_file(self, name, content):
+        """ Stores the content of the file clients can download once the job has succeeded. """
+        BackgroundJob.objects.get(pk=self.job_id).result_file.save(name, ContentFile(content))
+
+
+@shared_task(ignore_result=True)
+def run_background_job(job_id, func_path, args, kwargs, site_id=None):
+    """
+    Runs the job, recording its status and result.
+    """
+    # The task of a job may be delivered more than once, possibly to several workers at the same time, so the job
+    # is claimed by the worker which updates its status.
+    if not BackgroundJob.objects.filter(pk=job_id, status=JOB_PENDING).update(status=JOB_RUNNING, modified=now()):
+        logger.warning('Background job [%s] is not pending, it will not be run again.', job_id)
+        return
+
+    job = BackgroundJob.objects.select_related('created_by').get(pk=job_id)
+    progress = JobProgress(job_id)
+    try:
+        request_context = nullcontext()
+        if site_id:
+            request_context = site_request(Site.objects.get(id=site_id), user=job.created_by)
+        with request_context:
+            result = import_string(func_path)(progress, *args, **kwargs)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception('Background job [%s] [%s] failed.', job.name, job_id)
+        fields = {'status': JOB_FAILED, 'error': str(exc) if isinstance(exc, JobError) else JOB_ERROR_MESSAGE}
+    else:
+        fields = {'status': JOB_SUCCEEDED, 'result': result}
+        logger.info('Background job [%s] [%s] succeeded.', job.name, job_id)
+
+    # Jobs which have been failed for being stale keep their status.
+    if not BackgroundJob.objects.filter(pk=job_id, status=JOB_RUNNING).update(modified=now(), **fields):
+        logger.warning('Background job [%s] [%s] completed after it was failed for being stale.', job.name, job_id)
+
+
+def start_job(name, func, total, *args, context=None, user=None, site=None, **kwargs):
+    """
+    Starts a job running func in the background.
+
+    Arguments:
+        name (str): Name of the kind of job, used in logs.
+        func (callable): Module-level function called with a JobProgress and the remaining arguments, which
+            must be picklable. Its return value is stored as the result of the job, and should be small. It should
+            record its progress more often than every BACKGROUND_JOB_STALE_TIMEOUT seconds, and raise JobError for
+            errors the clients of the job may see.
+        total (int): Total number of items the job processes.
+        context (dict): Data identifying what the job operates on, e.g. to check who can see its status.
+        user (User): User who started the job.
+        site (Site): Site of the fake request the job runs under. Defaults to the site of the current request.
+
+    Returns:
+        str: ID of the job.
+    """
+    func_path = '{}.{}'.format(func.__module__, func.__qualname__)
+    if '.' in func.__qualname__ or '<' in func.__qualname__:
+        raise ValueError('Background jobs must run module-level functions, not [{}].'.format(func_path))
+
+    site = site or getattr(get_current_request(), 'site', None)
+    site_id = site.id if site else None
+    job = BackgroundJob.objects.create(name=name, total=total, context=context or {}, created_by=user)
+    job_id = job.id.hex
+
+    if settings.CELERY_ALWAYS_EAGER:
+        # Eager tasks run in the current transaction, where the job is already visible.
+        run_background_job.delay(job_id, func_path, args, kwargs, site_id=site_id)
+    else:
+        transaction.on_commit(lambda: run_background_job.delay(job_id, func_path, args, kwargs, site_id=site_id))
+
+    return job_id
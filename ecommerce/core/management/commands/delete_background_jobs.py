@@ -0,0 +1,67 @@
+"""
+Management command that deletes old background jobs, along with their result files.
+
+The results of jobs may contain the emails and usernames of learners, so they are only kept for
+BACKGROUND_JOB_RETENTION_DAYS days. This command should run daily.
+"""
+
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils.timezone import now
+
+from ecommerce.core.models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Delete background jobs older than BACKGROUND_JOB_RETENTION_DAYS, and their result files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-d', '--days',
+                            action='store',
+                            dest='days',
+                            default=None,
+                            type=int,
+                            help='Delete the jobs created more than this many days ago, instead of '
+                                 'BACKGROUND_JOB_RETENTION_DAYS.')
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Size of each batch of jobs to be deleted.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually delete the jobs.')
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.BACKGROUND_JOB_RETENTION_DAYS
+        queryset = BackgroundJob.objects.filter(created__lt=now() - timedelta(days=days))
+        count = queryset.count()
+
+        if not options['commit']:
+            logger.info(
+                'This has been an example operation. If the --commit flag had been included, the command would have '
+                'deleted [%d] background jobs.', count
+            )
+            return
+
+        deleted = 0
+        while True:
+            jobs = list(queryset.order_by('created')[:options['batch_size']])
+            if not jobs:
+                break
+            for job in jobs:
+                if job.result_file:
+                    job.result_file.delete(save=False)
+            BackgroundJob.objects.filter(pk__in=[job.pk for job in jobs]).delete()
+            deleted += len(jobs)
+
+        logger.info('Deleted [%d] background jobs.', deleted)
@@ -0,0 +1,54 @@
+"""
+Tests for the delete_background_jobs management command.
+"""
+
+
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils.timezone import now
+
+from ecommerce.core.models import BackgroundJob
+from ecommerce.tests.testcases import TestCase
+
+
+class DeleteBackgroundJobsTests(TestCase):
+    command = 'delete_background_jobs'
+
+    def setUp(self):
+        super(DeleteBackgroundJobsTests, self).setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_root_override = override_settings(MEDIA_ROOT=media_root)
+        media_root_override.enable()
+        self.addCleanup(media_root_override.disable)
+
+        self.old_job = BackgroundJob.objects.create(name='test')
+        self.old_job.result_file.save('old.txt', ContentFile('learner@example.com'))
+        BackgroundJob.objects.filter(pk=self.old_job.pk).update(created=now() - timedelta(days=31))
+        self.job = BackgroundJob.objects.create(name='test')
+
+    @override_settings(BACKGROUND_JOB_RETENTION_DAYS=30)
+    def test_delete_background_jobs(self):
+        """ Verify the jobs older than the retention period are deleted with their result files. """
+        path = self.old_job.result_file.path
+        self.assertTrue(os.path.exists(path))
+
+        call_command(self.command, '--commit')
+        self.assertEqual(list(BackgroundJob.objects.all()), [self.job])
+        self.assertFalse(os.path.exists(path))
+
+    def test_delete_background_jobs_days(self):
+        """ Verify the retention period can be given to the command. """
+        call_command(self.command, '--commit', '--days', '40')
+        self.assertEqual(BackgroundJob.objects.count(), 2)
+
+    def test_delete_background_jobs_without_commit(self):
+        """ Verify no job is deleted without the commit flag. """
+        call_command(self.command)
+        self.assertEqual(BackgroundJob.objects.count(), 2)
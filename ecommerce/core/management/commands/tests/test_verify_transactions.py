@@ -4,6 +4,9 @@ Tests for Django management command to verify ecommerce transactions.
 
 
 import datetime
+import json
+import os
+import tempfile
 
 import ddt
 import pytz
@@ -252,3 +255,41 @@ class VerifyTransactionsTest(TestCase):
         self.assertIn(str(refund.id), exception)
         self.assertIn('"amount": 90.0', exception)
         self.assertIn('"amount": 100.0', exception)
+
+    def test_chunked_verification(self):
+        """ Verify orders spread over several chunks are all verified """
+        orders = [self.order]
+        for __ in range(3):
+            order = OrderFactory(total_incl_tax=90, date_placed=self.timestamp)
+            OrderLineFactory(order=order, product=self.product, partner_sku='test_sku')
+            order.save()
+            orders.append(order)
+
+        with self.assertRaises(CommandError) as cm:
+            call_command('verify_transactions', '--chunk-size=3')
+        exception = json.loads(str(cm.exception).split(': ', 1)[1])
+        self.assertEqual(
+            sorted(error['order']['order_id'] for error in exception['orders_no_payment']['errors']),
+            sorted(order.id for order in orders)
+        )
+
+    def test_errors_file(self):
+        """ Verify errors are streamed to the errors file as JSON lines """
+        payment = PaymentEventFactory(order=self.order,
+                                      amount=80,
+                                      event_type_id=self.payevent.id,
+                                      date_created=self.timestamp)
+        payment.save()
+        handle, path = tempfile.mkstemp()
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+
+        with self.assertRaises(CommandError):
+            call_command('verify_transactions', '--errors-file={}'.format(path))
+
+        with open(path) as errors_file:
+            errors = [json.loads(line) for line in errors_file]
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['tag'], 'orders_mismatched_totals')
+        self.assertEqual(errors[0]['error']['order']['order_id'], self.order.id)
+        self.assertEqual(errors[0]['error']['payments'][0]['payment_id'], payment.id)
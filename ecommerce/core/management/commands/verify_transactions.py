@@ -12,9 +12,16 @@ PaymentEvent amount is different from the order amount, then the order
 id and relevant payment information is logged in a list associated with
 each of these scenarios.
 
+Orders are read from the read replica (if available) in chunks of
+--chunk-size orders, keyed by order id, with their payment events and lines
+prefetched, so validating a chunk does not issue any further queries.
+Progress and throughput are logged after each chunk.
+
 After considering each order in the time window the errors are input into the
 exit_errors dictionary. If any errors exist at the end of the script a
-CommandError is raised and the dictionary is printed as a string log.
+CommandError is raised and the dictionary is printed as a string log. Errors
+can also be streamed, one JSON object per line, to a file (or to stdout with
+"-") as soon as they are found by using --errors-file.
 
 Example output:
     CommandError:
@@ -29,16 +36,18 @@ Example output:
 import datetime
 import json
 import logging
+import time
 
 import pytz
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Sum
+from django.db.models import Prefetch
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
-from ecommerce.core.utils import use_read_replica_if_available
+from ecommerce.core.db_routers import use_read_replica
 
 logger = logging.getLogger(__name__)
+Line = get_model('order', 'Line')
 Order = get_model('order', 'Order')
 PaymentEvent = get_model('order', 'PaymentEvent')
 PaymentEventType = get_model('order', 'PaymentEventType')
@@ -46,6 +55,7 @@ PaymentEventTypeName = get_class('order.constants', 'PaymentEventTypeName')
 
 DEFAULT_START_DELTA_TIME = 240
 DEFAULT_END_DELTA_TIME = 60
+DEFAULT_CHUNK_SIZE = 1000
 VALID_PRODUCT_CLASS_NAMES = [SEAT_PRODUCT_CLASS_NAME, COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME]
 
 
@@ -53,6 +63,8 @@ class Command(BaseCommand):
     ERRORS_DICT = None
     PAID_EVENT_TYPE = None
     REFUNDED_EVENT_TYPE = None
+    errors_stream = None
+    order_count = 0
 
     help = 'Management command to verify ecommerce transactions and log if there is any imbalance.'
 
@@ -84,52 +96,109 @@ class Command(BaseCommand):
             action='store_true',
             help='Mismatched orders to go to Support'
         )
+        parser.add_argument(
+            '--chunk-size',
+            action='store',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Number of orders to load and verify at a time.'
+        )
+        parser.add_argument(
+            '--errors-file',
+            action='store',
+            default=None,
+            help='Path of a file to which errors are written, one JSON object per line, as soon as they are found. '
+                 'Use "-" to write them to stdout.'
+        )
 
+    @use_read_replica()
     def handle(self, *args, **options):
         logger.info("Verify transactions with options: %r", options)
 
         self.ERRORS_DICT = {}
         self.PAID_EVENT_TYPE = PaymentEventType.objects.get(name=PaymentEventTypeName.PAID)
         self.REFUNDED_EVENT_TYPE = PaymentEventType.objects.get(name=PaymentEventTypeName.REFUNDED)
+        self.order_count = 0
 
         support = options['support']
         start_delta = options['start_delta']
         end_delta = options['end_delta']
         threshold = max(options['threshold'], 0)
+        chunk_size = max(options['chunk_size'], 1)
+        errors_file = options['errors_file']
 
         start = datetime.datetime.now(pytz.utc) - datetime.timedelta(minutes=start_delta)
         end = datetime.datetime.now(pytz.utc) - datetime.timedelta(minutes=end_delta)
         logger.info("Start time: %s  --  End time: %s", start, end)
 
-        orders = use_read_replica_if_available(Order.objects.all()
-                                               .filter(date_placed__gte=start, date_placed__lt=end)
-                                               .prefetch_related('payment_events__event_type'))
-        logger.info("Number of orders to verify: %s", orders.count())
-        if orders.count() == 0:
-            logger.info("No orders, DONE")
-            return
-
-        if support:
-            self.handle_support(orders)
-        else:
-            self.handle_alert(orders, threshold)
+        orders = Order.objects.filter(date_placed__gte=start, date_placed__lt=end)
+
+        if errors_file == '-':
+            self.errors_stream = self.stdout
+        elif errors_file:
+            self.errors_stream = open(errors_file, 'w')
+
+        try:
+            if support:
+                self.handle_support(orders, chunk_size)
+            else:
+                self.handle_alert(orders, threshold, chunk_size)
+        finally:
+            if self.errors_stream and self.errors_stream is not self.stdout:
+                self.errors_stream.close()
+            self.errors_stream = None
+
+    def iter_order_chunks(self, orders, chunk_size):
+        """
+        Yield lists of orders, in chunks of at most chunk_size orders.
+
+        Chunks are paginated by order id rather than by offset, so each query only reads its own chunk. Payment
+        events and lines are prefetched so that orders can be validated without any further queries.
+        """
+        orders = orders.order_by('id').prefetch_related(
+            Prefetch('payment_events', queryset=PaymentEvent.objects.select_related('event_type')),
+            Prefetch('lines', queryset=Line.objects.select_related(
+                'product__product_class', 'product__parent__product_class'
+            )),
+        )
+        started = time.time()
+        last_id = 0
+        while True:
+            chunk = list(orders.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+
+            yield chunk
+
+            last_id = chunk[-1].id
+            self.order_count += len(chunk)
+            elapsed = time.time() - started
+            logger.info(
+                "Verified %d orders (last order id: %d) in %.1f seconds, %.1f orders/second",
+                self.order_count, last_id, elapsed, self.order_count / elapsed if elapsed else 0
+            )
 
-    def process_errors(self, orders):
+    def process_errors(self):
         # FIXME: it is possible for an order to have more than one error, so this really should
         # count "unique orders with errors", not number of errors
         error_count = sum([len(v["errors"]) for v in self.ERRORS_DICT.values()])
         exit_errors = json.dumps(self.ERRORS_DICT)
-        error_rate = float(error_count) / orders.count()
+        error_rate = float(error_count) / self.order_count
 
         logger.info("Summary: %d errors, %.1f %%", error_count, error_rate * 100.0)
 
         return error_count, exit_errors, error_rate
 
-    def handle_alert(self, orders, threshold):
-        for order in orders:
-            self.validate_order(order)
+    def handle_alert(self, orders, threshold, chunk_size=DEFAULT_CHUNK_SIZE):
+        for chunk in self.iter_order_chunks(orders, chunk_size):
+            for order in chunk:
+                self.validate_order(order)
+
+        if self.order_count == 0:
+            logger.info("No orders, DONE")
+            return
 
-        error_count, exit_errors, error_rate = self.process_errors(orders)
+        error_count, exit_errors, error_rate = self.process_errors()
 
         if threshold == 0 or threshold >= 1:
             threshold = int(threshold)
@@ -142,45 +211,57 @@ class Command(BaseCommand):
         if self.ERRORS_DICT:
             logger.warning("Errors in transactions within threshold (%r): %s", threshold, exit_errors)
 
-    def handle_support(self, orders):
-        for order in orders:
-            all_payment_events = order.payment_events
-            payments = all_payment_events.filter(event_type=self.PAID_EVENT_TYPE)
-
-            # If the payment total and the order total do not match, flag for review.
-            if payments.count() == 1 and payments[0].amount != order.total_incl_tax:
-                mismatch_total = float(payments[0].amount - order.total_incl_tax)
-                # FIXME: validate_order should be changed to log _all_ errors related to an order
-                # If payment amount > order amount, a refund is required from Support
-                if mismatch_total > 0:
-                    error_dict = {
-                        "order_number": order.number,
-                        "order_id": order.id,
-                        "order_amount": float(order.total_incl_tax),
-                        # Assuming just one payment since we do not support multi-payment
-                        "payment_id": payments[0].id,
-                        "payment_amount": float(payments[0].amount),
-                        "user_email": order.guest_email,
-                        "refund_amount": mismatch_total
-                    }
-                    self.add_error(
-                        "orders_mismatched_totals_support",
-                        "There was a mismatch in the totals in the following order that require a refund",
-                        error_dict=error_dict,
-                    )
-
-        error_count, exit_errors, error_rate = self.process_errors(orders)
+    def handle_support(self, orders, chunk_size=DEFAULT_CHUNK_SIZE):
+        for chunk in self.iter_order_chunks(orders, chunk_size):
+            for order in chunk:
+                __, payments = self.get_order_payment_events(order)
+
+                # If the payment total and the order total do not match, flag for review.
+                if len(payments) == 1 and payments[0].amount != order.total_incl_tax:
+                    mismatch_total = float(payments[0].amount - order.total_incl_tax)
+                    # FIXME: validate_order should be changed to log _all_ errors related to an order
+                    # If payment amount > order amount, a refund is required from Support
+                    if mismatch_total > 0:
+                        error_dict = {
+                            "order_number": order.number,
+                            "order_id": order.id,
+                            "order_amount": float(order.total_incl_tax),
+                            # Assuming just one payment since we do not support multi-payment
+                            "payment_id": payments[0].id,
+                            "payment_amount": float(payments[0].amount),
+                            "user_email": order.guest_email,
+                            "refund_amount": mismatch_total
+                        }
+                        self.add_error(
+                            "orders_mismatched_totals_support",
+                            "There was a mismatch in the totals in the following order that require a refund",
+                            error_dict=error_dict,
+                        )
+
+        if self.order_count == 0:
+            logger.info("No orders, DONE")
+            return
+
+        error_count, exit_errors, error_rate = self.process_errors()
         if error_count and error_rate > 0:
             raise CommandError("Errors in transactions: {errors}".format(errors=exit_errors))
 
+    def get_order_payment_events(self, order):
+        """
+        Return the refund and payment events of an order, from its prefetched payment events.
+        """
+        all_payment_events = order.payment_events.all()
+        refunds = [event for event in all_payment_events if event.event_type_id == self.REFUNDED_EVENT_TYPE.id]
+        payments = [event for event in all_payment_events if event.event_type_id == self.PAID_EVENT_TYPE.id]
+        return refunds, payments
+
     def validate_order(self, order):
-        all_payment_events = order.payment_events
-        refunds = all_payment_events.filter(event_type=self.REFUNDED_EVENT_TYPE)
-        payments = all_payment_events.filter(event_type=self.PAID_EVENT_TYPE)
+        refunds, payments = self.get_order_payment_events(order)
+        payment_total = sum(payment.amount for payment in payments)
 
         # If a coupon is used to purchase a product for the full price, there will be no PaymentEvent
         # so we must also verify that order had a price > 0.
-        if payments.count() == 0:
+        if not payments:
             if self.order_requires_payment(order) and order.total_incl_tax > 0:
                 self.add_error(
                     "orders_no_payment",
@@ -189,7 +270,7 @@ class Command(BaseCommand):
                 )
 
         # We do not support multi-payment today, so flag this for review.
-        elif payments.count() > 1:
+        elif len(payments) > 1:
             self.add_error(
                 "orders_multi_payment",
                 "The following orders had multiple payments",
@@ -198,7 +279,7 @@ class Command(BaseCommand):
             )
 
         # If the payment total and the order total do not match, flag for review.
-        elif payments.aggregate(total=Sum('amount')).get('total') != order.total_incl_tax:
+        elif payment_total != order.total_incl_tax:
             # FIXME: validate_order should be changed to log _all_ errors related to an order
             self.add_error(
                 "orders_mismatched_totals",
@@ -207,9 +288,7 @@ class Command(BaseCommand):
                 payments
             )
 
-        refund_total = refunds.aggregate(total=Sum('amount')).get('total')
-        payment_total = payments.aggregate(total=Sum('amount')).get('total')
-        if refund_total is not None and refund_total > payment_total:
+        if refunds and sum(refund.amount for refund in refunds) > payment_total:
             self.add_error(
                 "orders_refund_exceeded",
                 "The following orders had excessive refunds",
@@ -220,10 +299,13 @@ class Command(BaseCommand):
     def add_error(self, tag, msg, order=None, payments=None, error_dict=None):
         if tag not in self.ERRORS_DICT:
             self.ERRORS_DICT[tag] = {"message": msg, "errors": []}
-        if error_dict:
-            self.ERRORS_DICT[tag]["errors"].append(error_dict)
-        else:
-            self.ERRORS_DICT[tag]["errors"].append(self.create_error_dict(order, payments))
+        if not error_dict:
+            error_dict = self.create_error_dict(order, payments)
+        self.ERRORS_DICT[tag]["errors"].append(error_dict)
+
+        if self.errors_stream:
+            self.errors_stream.write(json.dumps({"tag": tag, "message": msg, "error": error_dict}) + "\n")
+            self.errors_stream.flush()
 
     def create_error_dict(self, order, payments=None):
         d = {}
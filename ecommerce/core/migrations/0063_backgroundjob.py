@@ -0,0 +1,41 @@
+# Generated by Django 2.2.17 on 2026-10-19 10:20
+
+import uuid
+
+import django.db.models.deletion
+import django_extensions.db.fields
+import jsonfield.encoder
+import jsonfield.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0062_siteconfiguration_account_microfrontend_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundJob',
+            fields=[
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text='Kind of operation run by the job.', max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=32)),
+                ('total', models.PositiveIntegerField(default=0, help_text='Number of items processed by the job.')),
+                ('completed', models.PositiveIntegerField(default=0, help_text='Number of items already processed.')),
+                ('context', jsonfield.fields.JSONField(default={}, dump_kwargs={'cls': jsonfield.encoder.JSONEncoder, 'separators': (',', ':')}, help_text='Data identifying what the job operates on.', load_kwargs={})),
+                ('result', jsonfield.fields.JSONField(blank=True, dump_kwargs={'cls': jsonfield.encoder.JSONEncoder, 'separators': (',', ':')}, help_text='Result of the job, or its partial results while it is running.', load_kwargs={}, null=True)),
+                ('result_file', models.FileField(blank=True, null=True, upload_to='background_jobs')),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'get_latest_by': 'modified',
+                'abstract': False,
+            },
+        ),
+    ]
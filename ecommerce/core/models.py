@@ -2,9 +2,9 @@ import datetime
 import hashlib
 import logging
 from urllib.parse import quote, urljoin, urlsplit
+from uuid import uuid4
 
 import waffle
-from analytics import Client as SegmentClient
 from dateutil.parser import parse
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
@@ -14,6 +14,7 @@ from django.db import models
 from django.utils.functional import cached_property
 from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
 from edx_django_utils import monitoring as monitoring_utils
 from edx_django_utils.cache import TieredCache
 from edx_rbac.models import UserRole, UserRoleAssignment
@@ -27,8 +28,13 @@ from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 from ecommerce.core.constants import ALL_ACCESS_CONTEXT, ALLOW_MISSING_LMS_USER_ID
 from ecommerce.core.exceptions import MissingLmsUserIdException
 from ecommerce.core.utils import log_message_and_raise_validation_error
+from ecommerce.extensions.analytics.utils import get_segment_client
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
-from ecommerce.extensions.payment.helpers import get_processor_class, get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import (
+    get_processor_class,
+    get_processor_class_by_name,
+    get_site_processor_value
+)
 
 log = logging.getLogger(__name__)
 
@@ -274,9 +280,16 @@ class SiteConfiguration(models.Model):
         """
         Returns payment processor classes enabled for the corresponding Site
 
+        The classes are cached for the configured processors, until a payment processor switch is toggled.
+
         Returns:
             list[BasePaymentProcessor]: Returns payment processor classes enabled for the corresponding Site
         """
+        return list(get_site_processor_value(
+            self.site, ('enabled_processors', self.payment_processors), self._get_payment_processors
+        ))
+
+    def _get_payment_processors(self):
         all_processors = self._all_payment_processors()
         all_processor_names = {processor.NAME for processor in all_processors}
 
@@ -300,12 +313,17 @@ class SiteConfiguration(models.Model):
          Returns:
              BasePaymentProcessor
         """
-        if self.client_side_payment_processor:
-            for processor in self._all_payment_processors():
-                if processor.NAME == self.client_side_payment_processor:
-                    return processor
+        def find_processor_class():
+            if self.client_side_payment_processor:
+                for processor in self._all_payment_processors():
+                    if processor.NAME == self.client_side_payment_processor:
+                        return processor
 
-        return None
+            return None
+
+        return get_site_processor_value(
+            self.site, ('client_side_processor', self.client_side_payment_processor), find_processor_class
+        )
 
     def get_from_email(self):
         """
@@ -319,7 +337,7 @@ class SiteConfiguration(models.Model):
 
     @cached_property
     def segment_client(self):
-        return SegmentClient(self.segment_key, debug=settings.DEBUG, send=settings.SEND_SEGMENT_EVENTS)
+        return get_segment_client(self.segment_key)
 
     def save(self, *args, **kwargs):  # pylint: disable=arguments-differ
         # Clear Site cache upon SiteConfiguration changed
@@ -847,3 +865,41 @@ class EcommerceFeatureRoleAssignment(UserRoleAssignment):
         Return uniquely identifying string representation.
         """
         return self.__str__()
+
+
+class BackgroundJob(TimeStampedModel):
+    """
+    Long-running admin operation run in the background by a Celery task, see ecommerce.core.jobs.
+
+    .. pii: The results, result files and errors of jobs may contain the emails and usernames of learners, e.g. those
+       of manual enrollment orders or code assignments. Jobs are deleted with their result files once they are older
+       than BACKGROUND_JOB_RETENTION_DAYS by the delete_background_jobs management command, which should run daily.
+    .. pii_types: email_address, username
+    .. pii_retirement: retained
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (SUCCEEDED, _('Succeeded')),
+        (FAILED, _('Failed')),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    name = models.CharField(max_length=255, help_text=_('Kind of operation run by the job.'))
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=PENDING)
+    total = models.PositiveIntegerField(default=0, help_text=_('Number of items processed by the job.'))
+    completed = models.PositiveIntegerField(default=0, help_text=_('Number of items already processed.'))
+    context = JSONField(default={}, help_text=_('Data identifying what the job operates on.'))
+    result = JSONField(
+        null=True, blank=True, help_text=_('Result of the job, or its partial results while it is running.')
+    )
+    result_file = models.FileField(upload_to='background_jobs', null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+
+    def __str__(self):
+        return '{name} [{id}]'.format(name=self.name, id=self.id.hex)
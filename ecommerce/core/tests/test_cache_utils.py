@@ -0,0 +1,180 @@
+
+
+import time
+
+import mock
+from django.core.cache import cache
+from django.test import override_settings
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, RequestCache, TieredCache
+from slumber.exceptions import HttpNotFoundError
+from testfixtures import LogCapture
+
+from ecommerce.core import cache_utils
+from ecommerce.core.cache_utils import get_many_cached_values, get_or_fetch, set_cached_value
+from ecommerce.tests.testcases import TestCase
+
+CACHE_KEY = 'test-key'
+LOGGER_NAME = 'ecommerce.core.cache_utils'
+NAMESPACE = 'test'
+
+
+class CacheUtilsTests(TestCase):
+    """ Tests for the stale-while-revalidate cache utilities. """
+
+    def setUp(self):
+        super(CacheUtilsTests, self).setUp()
+        patcher = mock.patch('ecommerce.core.cache_utils.monitoring_utils.increment')
+        self.mock_increment = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def expire(self, timeout):
+        """ Returns a patch moving the current time past the given timeout, with the request cache cleared. """
+        RequestCache.clear_all_namespaces()
+        return mock.patch('ecommerce.core.cache_utils.time', time=mock.Mock(return_value=time.time() + timeout + 1))
+
+    def assert_metrics(self, *events):
+        self.assertEqual(
+            [call[0][0] for call in self.mock_increment.call_args_list],
+            ['{}_cache_{}'.format(NAMESPACE, event) for event in events]
+        )
+
+    def test_get_or_fetch(self):
+        """ Verify values are fetched once and then served from the cache. """
+        fetch = mock.Mock(return_value='value')
+
+        self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60), 'value')
+        self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60), 'value')
+        RequestCache.clear_all_namespaces()
+        with mock.patch.object(cache, 'get', wraps=cache.get) as mock_get:
+            self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60), 'value')
+            # The soft expiry is read along with the value.
+            self.assertEqual(mock_get.call_count, 1)
+
+        fetch.assert_called_once_with()
+        self.assert_metrics('miss', 'hit', 'hit')
+
+    def test_get_or_fetch_stale(self):
+        """ Verify stale values are served while they are refreshed, until the grace period passes. """
+        get_or_fetch(NAMESPACE, CACHE_KEY, mock.Mock(return_value='value'), 60)
+
+        fetch = mock.Mock(return_value='new value')
+        with self.expire(60):
+            self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60), 'value')
+        fetch.assert_called_once_with()
+
+        RequestCache.clear_all_namespaces()
+        self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60), 'new value')
+        self.assert_metrics('miss', 'stale', 'refresh', 'hit')
+
+    def test_get_or_fetch_refresh_in_progress(self):
+        """ Verify only one refresh of a stale key runs at a time. """
+        get_or_fetch(NAMESPACE, CACHE_KEY, mock.Mock(return_value='value'), 60)
+        cache.add('{}.refreshing'.format(CACHE_KEY), True)
+
+        fetch = mock.Mock(return_value='new value')
+        with self.expire(60):
+            self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60), 'value')
+        fetch.assert_not_called()
+
+    def test_get_or_fetch_refresh_failure(self):
+        """ Verify the stale value is served if its refresh fails. """
+        get_or_fetch(NAMESPACE, CACHE_KEY, mock.Mock(return_value='value'), 60)
+
+        fetch = mock.Mock(side_effect=Exception)
+        with self.expire(60), LogCapture(LOGGER_NAME) as logger:
+            self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60), 'value')
+            logger.check((
+                LOGGER_NAME,
+                'ERROR',
+                'Failed to refresh [{}] cache entry [{}]. The stale value is served.'.format(NAMESPACE, CACHE_KEY)
+            ))
+
+        # The key can be refreshed again.
+        self.assertIsNone(cache.get('{}.refreshing'.format(CACHE_KEY)))
+        self.assert_metrics('miss', 'stale', 'refresh', 'refresh_failed')
+
+    @override_settings(CACHE_REFRESH_IN_BACKGROUND=True)
+    def test_get_or_fetch_refresh_in_background(self):
+        """ Verify stale values are refreshed by the background executor. """
+        get_or_fetch(NAMESPACE, CACHE_KEY, mock.Mock(return_value='value'), 60)
+
+        fetch = mock.Mock(return_value='new value')
+        with mock.patch('ecommerce.core.cache_utils._get_refresh_executor') as mock_executor:
+            with self.expire(60):
+                self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60), 'value')
+            self.assertEqual(mock_executor.return_value.submit.call_count, 1)
+        fetch.assert_not_called()
+
+    @override_settings(CACHE_REFRESH_IN_BACKGROUND=True, CACHE_REFRESH_MAX_WORKERS=1)
+    def test_refresh_in_background_clears_request_cache(self):
+        """ Verify refresh threads do not serve the values they cached in their request cache to later refreshes. """
+        def fetch():
+            nested_response = DEFAULT_REQUEST_CACHE.get_cached_response('nested')
+            DEFAULT_REQUEST_CACHE.set('nested', 'nested value')
+            return nested_response.is_found
+
+        with mock.patch.object(cache_utils, '_refresh_executor', None):
+            for __ in range(2):
+                set_cached_value(CACHE_KEY, 'value', 60)
+                with self.expire(60):
+                    get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60)
+                # Wait for the refresh, which runs on the only worker thread.
+                cache_utils._get_refresh_executor().submit(lambda: None).result()  # pylint: disable=protected-access
+
+                RequestCache.clear_all_namespaces()
+                self.assertFalse(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60))
+            cache_utils._get_refresh_executor().shutdown()  # pylint: disable=protected-access
+
+    def test_get_or_fetch_not_found(self):
+        """ Verify not found responses are cached. """
+        fetch = mock.Mock(side_effect=HttpNotFoundError)
+
+        for __ in range(2):
+            with self.assertRaises(HttpNotFoundError):
+                get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60)
+
+        fetch.assert_called_once_with()
+        self.assert_metrics('miss', 'not_found_hit')
+
+    def test_get_or_fetch_stale_not_found(self):
+        """ Verify stale values are no longer served once they are not found. """
+        get_or_fetch(NAMESPACE, CACHE_KEY, mock.Mock(return_value='value'), 60)
+
+        with self.expire(60):
+            self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, mock.Mock(side_effect=HttpNotFoundError), 60), 'value')
+
+        RequestCache.clear_all_namespaces()
+        with self.assertRaises(HttpNotFoundError):
+            get_or_fetch(NAMESPACE, CACHE_KEY, mock.Mock(), 60)
+
+    def test_get_or_fetch_versioned_key(self):
+        """
+        Verify entries are stored under a versioned key, and values cached directly in the TieredCache under the
+        given key, e.g. by an earlier release, are neither served nor overwritten.
+        """
+        TieredCache.set_all_tiers(CACHE_KEY, 'unversioned value', 60)
+
+        self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, mock.Mock(return_value='value'), 60), 'value')
+        self.assertEqual(TieredCache.get_cached_response(CACHE_KEY).value, 'unversioned value')
+        self.assertEqual(cache.get(cache_utils.CACHE_KEY_PREFIX + CACHE_KEY).value, 'value')
+
+    def test_get_or_fetch_without_soft_expiry(self):
+        """ Verify values cached with a timeout of 0 are served until they are evicted. """
+        set_cached_value(CACHE_KEY, 'value', 0)
+        fetch = mock.Mock()
+
+        with mock.patch('ecommerce.core.cache_utils.time', time=mock.Mock(return_value=time.time() + 61)):
+            self.assertEqual(get_or_fetch(NAMESPACE, CACHE_KEY, fetch, 60), 'value')
+        fetch.assert_not_called()
+
+    def test_get_many_cached_values(self):
+        """ Verify the cached values of several keys are returned, along with whether they are stale. """
+        set_cached_value('fresh', 'fresh value', 120)
+        set_cached_value('stale', 'stale value', 30)
+        RequestCache.clear_all_namespaces()
+
+        with self.expire(60):
+            self.assertEqual(
+                get_many_cached_values(NAMESPACE, ['fresh', 'stale', 'uncached']),
+                {'fresh': ('fresh value', False), 'stale': ('stale value', True)}
+            )
@@ -0,0 +1,134 @@
+
+
+import ddt
+import mock
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from oscar.core.loading import get_model
+from testfixtures import LogCapture
+
+from ecommerce.core.db_routers import (
+    READ_REPLICA,
+    READ_REPLICA_STICKY_COOKIE,
+    ReadReplicaRouter,
+    ReadReplicaStickinessMiddleware,
+    get_read_database,
+    read_replica_view,
+    use_read_replica
+)
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.core.db_routers'
+Order = get_model('order', 'Order')
+
+
+@ddt.ddt
+@override_settings(READ_REPLICA_MAX_LAG=30)
+class ReadReplicaRouterTests(TestCase):
+    """ Tests for the routing of reads to the read replica. """
+
+    def setUp(self):
+        super(ReadReplicaRouterTests, self).setUp()
+        self.router = ReadReplicaRouter()
+        for target, return_value in (('is_read_replica_available', True), ('get_replication_lag', 0)):
+            patcher = mock.patch('ecommerce.core.db_routers.{}'.format(target), return_value=return_value)
+            setattr(self, 'mock_{}'.format(target), patcher.start())
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch('ecommerce.core.db_routers.monitoring_utils.set_custom_metric')
+        self.mock_set_custom_metric = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_metrics(self, **metrics):
+        self.assertEqual(
+            {call[0][0]: call[0][1] for call in self.mock_set_custom_metric.call_args_list},
+            {'read_replica_{}'.format(name): value for name, value in metrics.items()}
+        )
+
+    def test_reads_outside_blocks(self):
+        """ Verify reads outside of use_read_replica blocks are left alone, and writes go to the default database. """
+        self.assertIsNone(self.router.db_for_read(Order))
+        self.assertEqual(self.router.db_for_write(Order), DEFAULT_DB_ALIAS)
+        self.assertEqual(get_read_database(), DEFAULT_DB_ALIAS)
+        self.assertFalse(self.router.allow_migrate(READ_REPLICA, 'order'))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'order'))
+
+    def test_use_read_replica(self):
+        """ Verify the reads of use_read_replica blocks are sent to the read replica. """
+        with use_read_replica():
+            self.assertEqual(self.router.db_for_read(Order), READ_REPLICA)
+            with use_read_replica():
+                self.assertEqual(self.router.db_for_read(Order), READ_REPLICA)
+            self.assertEqual(self.router.db_for_read(Order), READ_REPLICA)
+            self.assertEqual(self.router.db_for_write(Order), DEFAULT_DB_ALIAS)
+
+        self.assertIsNone(self.router.db_for_read(Order))
+        self.assert_metrics(database=READ_REPLICA, fallback_reason='write')
+
+    def test_read_your_writes(self):
+        """ Verify the reads of a block are sent to the default database once the block has written. """
+        with use_read_replica():
+            self.router.db_for_write(Order)
+            self.assertEqual(self.router.db_for_read(Order), DEFAULT_DB_ALIAS)
+
+        with use_read_replica():
+            self.assertEqual(self.router.db_for_read(Order), READ_REPLICA)
+
+    def test_read_replica_not_available(self):
+        self.mock_is_read_replica_available.return_value = False
+        with use_read_replica():
+            self.assertEqual(self.router.db_for_read(Order), DEFAULT_DB_ALIAS)
+
+    @ddt.data(
+        (0, READ_REPLICA),
+        (30, READ_REPLICA),
+        (31, DEFAULT_DB_ALIAS),
+        (None, DEFAULT_DB_ALIAS),
+    )
+    @ddt.unpack
+    def test_replication_lag(self, lag, expected_database):
+        """ Verify reads fall back to the default database when the replica lags behind, checking the lag once. """
+        self.mock_get_replication_lag.return_value = lag
+        for __ in range(2):
+            with use_read_replica():
+                self.assertEqual(self.router.db_for_read(Order), expected_database)
+
+        self.mock_get_replication_lag.assert_called_once_with()
+
+    def test_replication_lag_check_failure(self):
+        self.mock_get_replication_lag.side_effect = DatabaseError
+        with LogCapture(LOGGER_NAME) as logger:
+            with use_read_replica():
+                self.assertEqual(self.router.db_for_read(Order), DEFAULT_DB_ALIAS)
+            logger.check((LOGGER_NAME, 'ERROR', 'Failed to check the replication lag of the read replica.'))
+        self.assert_metrics(database=DEFAULT_DB_ALIAS, fallback_reason='lag')
+
+    @override_settings(READ_REPLICA_MAX_LAG=None)
+    def test_replication_lag_check_disabled(self):
+        with use_read_replica():
+            self.assertEqual(self.router.db_for_read(Order), READ_REPLICA)
+        self.mock_get_replication_lag.assert_not_called()
+
+    @ddt.data(
+        ('get', {}, READ_REPLICA),
+        ('post', {}, DEFAULT_DB_ALIAS),
+        ('get', {READ_REPLICA_STICKY_COOKIE: '1'}, DEFAULT_DB_ALIAS),
+    )
+    @ddt.unpack
+    def test_read_replica_view(self, method, cookies, expected_database):
+        """ Verify the reads of safe requests are sent to the read replica, unless the client has just written. """
+        @read_replica_view
+        def view(request):  # pylint: disable=unused-argument
+            return HttpResponse(get_read_database())
+
+        request = getattr(RequestFactory(), method)('/')
+        request.COOKIES.update(cookies)
+        self.assertEqual(view(request).content.decode('utf-8'), expected_database)
+
+    @ddt.data(('get', False), ('post', True))
+    @ddt.unpack
+    def test_stickiness_middleware(self, method, sticky):
+        """ Verify clients are marked as having written after write requests. """
+        request = getattr(RequestFactory(), method)('/')
+        response = ReadReplicaStickinessMiddleware().process_response(request, HttpResponse())
+        self.assertEqual(READ_REPLICA_STICKY_COOKIE in response.cookies, sticky)
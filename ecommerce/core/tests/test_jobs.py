@@ -0,0 +1,172 @@
+
+
+import shutil
+import tempfile
+from datetime import timedelta
+
+import mock
+from django.test import override_settings
+from django.utils.timezone import now
+from testfixtures import LogCapture
+from threadlocals.threadlocals import get_current_request, set_thread_variable
+
+from ecommerce.core.jobs import (
+    JOB_ERROR_MESSAGE,
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    JOB_STALE_ERROR_MESSAGE,
+    JOB_SUCCEEDED,
+    JobError,
+    get_job,
+    run_background_job,
+    start_job
+)
+from ecommerce.core.models import BackgroundJob
+from ecommerce.tests.factories import SiteConfigurationFactory
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.core.jobs'
+
+
+def sum_items(progress, items, factor=1):
+    for __ in items:
+        progress.advance(1)
+        progress.update(result={'partial': True})
+    progress.save_result_file('items.txt', ','.join(str(item) for item in items))
+    return sum(items) * factor
+
+
+def get_request_site(progress):  # pylint: disable=unused-argument
+    request = get_current_request()
+    return {'site_id': request.site.id, 'username': request.user.username}
+
+
+def fail(progress):  # pylint: disable=unused-argument
+    raise Exception('boom')
+
+
+def fail_with_job_error(progress):  # pylint: disable=unused-argument
+    raise JobError('The coupon does not exist.')
+
+
+class JobsTests(TestCase):
+    """ Tests for the background jobs. """
+
+    def setUp(self):
+        super(JobsTests, self).setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_root_override = override_settings(MEDIA_ROOT=media_root)
+        media_root_override.enable()
+        self.addCleanup(media_root_override.disable)
+
+    def test_start_job(self):
+        """ Verify the job's progress and results are recorded. """
+        user = self.create_user()
+        job_id = start_job('test', sum_items, 3, [1, 2, 3], factor=2, context={'coupon_id': 1}, user=user)
+
+        job = get_job(job_id)
+        self.assertEqual(job.status, JOB_SUCCEEDED)
+        self.assertEqual(job.name, 'test')
+        self.assertEqual(job.total, 3)
+        self.assertEqual(job.completed, 3)
+        self.assertEqual(job.context, {'coupon_id': 1})
+        self.assertEqual(job.result, 12)
+        self.assertEqual(job.created_by, user)
+        self.assertIsNone(job.error)
+        self.assertEqual(job.result_file.read(), b'1,2,3')
+
+    def test_start_job_failure(self):
+        """ Verify the failure of a job is logged and recorded. """
+        with LogCapture(LOGGER_NAME) as logger:
+            job_id = start_job('test', fail, 1)
+            logger.check((LOGGER_NAME, 'ERROR', 'Background job [test] [{}] failed.'.format(job_id)))
+
+        job = get_job(job_id)
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertEqual(job.error, JOB_ERROR_MESSAGE)
+
+    def test_start_job_job_error(self):
+        """ Verify the message of JobErrors is recorded as the error of the job. """
+        job_id = start_job('test', fail_with_job_error, 1)
+
+        job = get_job(job_id)
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertEqual(job.error, 'The coupon does not exist.')
+
+    def test_start_job_local_function(self):
+        """ Verify jobs can only run functions the Celery task can import. """
+        def func(progress):  # pragma: no cover
+            return progress
+
+        with self.assertRaises(ValueError):
+            start_job('test', func, 1)
+
+    @override_settings(CELERY_ALWAYS_EAGER=False)
+    def test_start_job_on_commit(self):
+        """ Verify jobs are queued once the transaction is committed. """
+        with mock.patch('ecommerce.core.jobs.run_background_job.delay') as mock_delay:
+            with mock.patch('ecommerce.core.jobs.transaction.on_commit') as mock_on_commit:
+                job_id = start_job('test', sum_items, 1, [1])
+                mock_delay.assert_not_called()
+                mock_on_commit.call_args[0][0]()
+            mock_delay.assert_called_once_with(
+                job_id, 'ecommerce.core.tests.test_jobs.sum_items', ([1],), {}, site_id=self.site.id
+            )
+
+        self.assertEqual(get_job(job_id).status, JOB_PENDING)
+
+    def test_start_job_site_request(self):
+        """ Verify jobs run under a request for the given site, made by the user who started them. """
+        user = self.create_user()
+        site = SiteConfigurationFactory().site
+        set_thread_variable('request', None)
+
+        job_id = start_job('test', get_request_site, 1, user=user, site=site)
+        self.assertEqual(get_job(job_id).result, {'site_id': site.id, 'username': user.username})
+        self.assertIsNone(get_current_request())
+
+    def test_run_job_once(self):
+        """ Verify jobs whose task is delivered again are not run twice. """
+        job_id = start_job('test', sum_items, 1, [1])
+
+        with LogCapture(LOGGER_NAME) as logger:
+            run_background_job(job_id, 'ecommerce.core.tests.test_jobs.sum_items', ([1],), {})
+            logger.check(
+                (LOGGER_NAME, 'WARNING', 'Background job [{}] is not pending, it will not be run again.'.format(job_id))
+            )
+        self.assertEqual(get_job(job_id).completed, 1)
+
+    def test_get_job_stale(self):
+        """ Verify running jobs whose progress has not been updated for too long are failed. """
+        job = BackgroundJob.objects.create(name='test', status=JOB_RUNNING)
+        self.assertEqual(get_job(job.id.hex).status, JOB_RUNNING)
+
+        with override_settings(BACKGROUND_JOB_STALE_TIMEOUT=60):
+            BackgroundJob.objects.filter(pk=job.pk).update(modified=now() - timedelta(seconds=61))
+            job = get_job(job.id.hex)
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertEqual(job.error, JOB_STALE_ERROR_MESSAGE)
+
+    def test_run_job_stale(self):
+        """ Verify jobs which complete after they were failed for being stale keep their status. """
+        def fail_job(progress, items):  # pylint: disable=unused-argument
+            BackgroundJob.objects.filter(pk=job_id).update(status=JOB_FAILED, error=JOB_STALE_ERROR_MESSAGE)
+
+        job_id = BackgroundJob.objects.create(name='test').id.hex
+        with mock.patch('ecommerce.core.tests.test_jobs.sum_items', fail_job):
+            with LogCapture(LOGGER_NAME) as logger:
+                run_background_job(job_id, 'ecommerce.core.tests.test_jobs.sum_items', ([1],), {})
+                logger.check_present((
+                    LOGGER_NAME, 'WARNING',
+                    'Background job [test] [{}] completed after it was failed for being stale.'.format(job_id)
+                ))
+
+        job = get_job(job_id)
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertIsNone(job.result)
+
+    def test_get_job_not_found(self):
+        self.assertIsNone(get_job('0' * 32))
+        self.assertIsNone(get_job('not-a-job'))
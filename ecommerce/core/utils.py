@@ -1,12 +1,17 @@
 
 
+import json
 import logging
+from contextlib import contextmanager
+from io import BytesIO
 from urllib.parse import parse_qs, urlparse
 
+import crum
 import waffle
-from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.handlers.wsgi import WSGIRequest
 from edx_django_utils.cache import get_cache_key as get_django_cache_key
+from threadlocals.threadlocals import get_current_request, set_thread_variable
 
 logger = logging.getLogger(__name__)
 
@@ -69,8 +74,47 @@ def deprecated_traverse_pagination(response, endpoint):
     return results
 
 
-def use_read_replica_if_available(queryset):
+@contextmanager
+def site_request(site, path='/', user=None, method='GET', data=None):
     """
-    If there is a database called 'read_replica', use that database for the queryset.
+    Installs a fake current request for the site while the block runs, restoring the previous one afterwards.
+
+    Code run outside of requests, e.g. by management commands, background jobs and worker threads, needs it
+    to call code which reads the site or the path of the current request, e.g. to build LMS URLs.
+
+    Args:
+        site (Site): Site of the request.
+        path (str): Path of the request.
+        user (User): User making the request.
+        method (str): HTTP method of the request.
+        data (dict): Data sent as the JSON body of the request.
+
+    Yields:
+        HttpRequest: The fake request.
     """
-    return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
+    body = json.dumps(data).encode('utf-8') if data is not None else b''
+    request = WSGIRequest({
+        'REQUEST_METHOD': method.upper(),
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': site.domain,
+        'SERVER_PORT': '80',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': BytesIO(body),
+        'wsgi.url_scheme': 'http',
+    })
+    request.session = None
+    request.site = site
+    if user:
+        request.user = user
+
+    previous_request, previous_crum_request = get_current_request(), crum.get_current_request()
+    set_thread_variable('request', request)
+    crum.set_current_request(request)
+    try:
+        yield request
+    finally:
+        set_thread_variable('request', previous_request)
+        crum.set_current_request(previous_crum_request)
@@ -1,24 +1,29 @@
 # -*- coding: utf-8 -*-
 
 
+import csv
 import datetime
 import urllib
 from decimal import Decimal
+from io import StringIO
 
 import ddt
 import httpretty
 import mock
 import pytz
 from django.conf import settings
+from django.db import connection
 from django.http import HttpResponseRedirect
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
 from factory.fuzzy import FuzzyText
 from oscar.core.loading import get_class, get_model
 from oscar.test.factories import OrderFactory, OrderLineFactory, ProductFactory, RangeFactory, VoucherFactory
 
-from ecommerce.core.url_utils import get_lms_url
+from ecommerce.core.url_utils import get_ecommerce_url, get_lms_url
 from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
+from ecommerce.coupons.utils import ENROLLMENT_CODE_CSV_FIELD_NAMES
 from ecommerce.coupons.views import voucher_is_valid
 from ecommerce.enterprise.tests.mixins import EnterpriseServiceMockMixin
 from ecommerce.enterprise.utils import (
@@ -773,7 +778,8 @@ class CouponRedeemViewTests(CouponMixin, DiscoveryTestMixin, LmsApiMockMixin, En
         self.mock_account_api(self.request, self.user.username, data={'is_active': True})
         self.mock_access_token_response()
         self.create_coupon_and_get_code(catalog=self.catalog)
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=True):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'get_already_purchased_products',
+                               side_effect=lambda user, products, site: {product.id for product in products}):
             response = self.client.get(self.redeem_url_with_params())
             msg = 'You have already purchased {course} seat.'.format(course=self.course.name)
             self.assertEqual(response.context['error'], msg)
@@ -875,3 +881,34 @@ class EnrollmentCodeCsvViewTests(TestCase):
         response = self.client.get(reverse(self.path, args=[order.number]))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['content-type'], 'text/csv')
+
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertIn(product_title, content)
+        self.assertIn(voucher.code, content)
+
+    def test_multiple_lines(self):
+        """ Verify the codes of every order line are written under their product's title. """
+        order = OrderFactory(user=self.user)
+        redeem_url = get_ecommerce_url(reverse('coupons:offer'))
+        expected_rows = [['Order Number:', order.number], []]
+        for title in ('First product', 'Second product'):
+            product = ProductFactory(title=title, categories=[], stockrecords__partner__short_code=title[:3])
+            line = OrderLineFactory(order=order, product=product, partner_sku=title)
+            order_line_vouchers = OrderLineVouchers.objects.create(line=line)
+            vouchers = [VoucherFactory(code=title[:3].upper() + str(index)) for index in range(3)]
+            order_line_vouchers.vouchers.add(*vouchers)
+
+            expected_rows.append([title])
+            expected_rows.append(list(ENROLLMENT_CODE_CSV_FIELD_NAMES))
+            for voucher in vouchers:
+                expected_rows.append([voucher.code, '{}?code={}'.format(redeem_url, voucher.code), '', '', ''])
+            expected_rows.append([])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(self.path, args=[order.number]))
+            content = b''.join(response.streaming_content).decode('utf-8')
+
+        # The lines, products and codes are all loaded by a single query.
+        self.assertEqual(len([query for query in queries if 'voucher_voucher' in query['sql']]), 1)
+
+        self.assertEqual(list(csv.reader(StringIO(content))), expected_rows)
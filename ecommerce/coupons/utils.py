@@ -4,16 +4,22 @@
 import hashlib
 import logging
 
+import unicodecsv as csv
 from django.conf import settings
 from django.utils import timezone
 from edx_django_utils.cache import TieredCache
 from oscar.core.loading import get_model
 from slumber.exceptions import HttpNotFoundError
 
+from ecommerce.core.cache_utils import get_or_fetch
 from ecommerce.core.utils import get_cache_key
 
 Product = get_model('catalogue', 'Product')
 
+ENROLLMENT_CODE_CSV_FIELD_NAMES = (
+    'Code', 'Redemption URL', 'Name Of Employee', 'Date Of Distribution', 'Employee Email'
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,21 +75,18 @@ def get_catalog_course_runs(site, query, limit=None, offset=None):
     )
     cache_key = hashlib.md5(cache_key.encode('utf-8')).hexdigest()
 
-    cached_response = TieredCache.get_cached_response(cache_key)
-    if cached_response.is_found:
-        return cached_response.value
+    def fetch():
+        api = site.siteconfiguration.discovery_api_client
+        endpoint = getattr(api, api_resource_name)
 
-    api = site.siteconfiguration.discovery_api_client
-    endpoint = getattr(api, api_resource_name)
+        return endpoint().get(
+            partner=partner_code,
+            q=query,
+            limit=limit,
+            offset=offset
+        )
 
-    response = endpoint().get(
-        partner=partner_code,
-        q=query,
-        limit=limit,
-        offset=offset
-    )
-    TieredCache.set_all_tiers(cache_key, response, settings.COURSES_API_CACHE_TIMEOUT)
-    return response
+    return get_or_fetch('catalog_course_runs', cache_key, fetch, settings.COURSES_API_CACHE_TIMEOUT)
 
 
 def prepare_course_seat_types(course_seat_types):
@@ -184,3 +187,53 @@ def is_coupon_available(coupon):
     end_datetime = voucher.end_datetime
     current_datetime = timezone.now()
     return start_datetime < current_datetime < end_datetime
+
+
+class Echo:
+    """
+    File-like object whose write method returns the value instead of buffering it.
+
+    Used with the csv writers so that rows can be handed to a StreamingHttpResponse as they are generated.
+    """
+
+    def write(self, value):
+        return value
+
+
+def generate_enrollment_code_csv(preamble, grouped_codes, redeem_url):
+    """
+    Yield the encoded rows of an enrollment code CSV.
+
+    Each group of codes is written as its title, followed by the code header row, one row
+    per code and an empty separator row.
+
+    Arguments:
+        preamble (list): Rows written at the top of the file, before the first group.
+        grouped_codes (iterable): (group id, group title, code) tuples ordered by group id. A code
+            of None denotes a group without codes.
+        redeem_url (str): URL at which the codes can be redeemed.
+
+    Yields:
+        bytes: A single CSV encoded row.
+    """
+    writer = csv.writer(Echo())
+    for row in preamble:
+        yield writer.writerow(row)
+
+    current_group = None
+    for group, title, code in grouped_codes:
+        if group != current_group:
+            if current_group is not None:
+                yield writer.writerow([])
+            current_group = group
+            yield writer.writerow([title])
+            yield writer.writerow(ENROLLMENT_CODE_CSV_FIELD_NAMES)
+
+        if code:
+            row = [code, '{url}?code={code}'.format(url=redeem_url, code=code)]
+            # The employee columns are left blank for the purchaser to fill in.
+            row.extend([''] * (len(ENROLLMENT_CODE_CSV_FIELD_NAMES) - len(row)))
+            yield writer.writerow(row)
+
+    if current_group is not None:
+        yield writer.writerow([])
@@ -2,11 +2,10 @@
 
 import logging
 
-import unicodecsv as csv
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils import timezone
@@ -21,7 +20,7 @@ from rest_framework.views import APIView
 from ecommerce.core.url_utils import absolute_redirect, get_ecommerce_url
 from ecommerce.core.views import StaffOnlyMixin
 from ecommerce.coupons.decorators import login_required_for_credit
-from ecommerce.coupons.utils import is_voucher_applied
+from ecommerce.coupons.utils import generate_enrollment_code_csv, is_voucher_applied
 from ecommerce.enterprise.decorators import set_enterprise_cookie
 from ecommerce.enterprise.exceptions import EnterpriseDoesNotExist
 from ecommerce.enterprise.utils import (
@@ -322,7 +321,7 @@ class EnrollmentCodeCsvView(View):
             number (str): Number of the order
 
         Returns:
-            HttpResponse
+            StreamingHttpResponse
 
         Raises:
             Http404: When an order number for a non-existing order is passed.
@@ -334,32 +333,21 @@ class EnrollmentCodeCsvView(View):
         except Order.DoesNotExist:
             raise Http404('Order not found.')
 
-        if request.user != order.user and not request.user.is_staff:
+        if request.user.id != order.user_id and not request.user.is_staff:
             raise PermissionDenied
 
         file_name = 'Enrollment code CSV order num {}'.format(order.number)
         file_name = '{filename}.csv'.format(filename=slugify(file_name))
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename={filename}'.format(filename=file_name)
+        # Load the product title and voucher codes for every line in a single query, streamed
+        # from the database so that bulk purchases do not have to be held in memory.
+        grouped_codes = OrderLineVouchers.objects.filter(line__order=order).order_by(
+            'id', 'vouchers__id'
+        ).values_list('id', 'line__product__title', 'vouchers__code').iterator()
 
         redeem_url = get_ecommerce_url(reverse('coupons:offer'))
-        voucher_field_names = ('Code', 'Redemption URL', 'Name Of Employee', 'Date Of Distribution', 'Employee Email')
-        voucher_writer = csv.DictWriter(response, fieldnames=voucher_field_names)
-
-        writer = csv.writer(response)
-        writer.writerow(('Order Number:', order.number))
-        writer.writerow([])
-
-        order_line_vouchers = OrderLineVouchers.objects.filter(line__order=order)
-        for order_line_voucher in order_line_vouchers:
-            writer.writerow([order_line_voucher.line.product.title])
-            voucher_writer.writeheader()
-
-            for voucher in order_line_voucher.vouchers.all():
-                voucher_writer.writerow({
-                    voucher_field_names[0]: voucher.code,
-                    voucher_field_names[1]: '{url}?code={code}'.format(url=redeem_url, code=voucher.code)
-                })
-            writer.writerow([])
+        rows = generate_enrollment_code_csv([('Order Number:', order.number), []], grouped_codes, redeem_url)
+
+        response = StreamingHttpResponse(rows, content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename={filename}'.format(filename=file_name)
         return response
@@ -0,0 +1,203 @@
+"""
+This command keeps the local copy of the Discovery Service catalog up to date.
+"""
+
+
+import logging
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+from slumber.exceptions import HttpNotFoundError
+
+from ecommerce.core.constants import DEFAULT_CATALOG_PAGE_SIZE, ISO_8601_FORMAT
+from ecommerce.courses.models import DiscoveryCatalog, DiscoveryCatalogCourseRun, DiscoveryCourse, DiscoveryCourseRun
+
+logger = logging.getLogger(__name__)
+Range = get_model('offer', 'Range')
+SiteConfiguration = get_model('core', 'SiteConfiguration')
+
+
+class Command(BaseCommand):
+    """
+    Copies the courses and course runs of each partner, and the course runs of the catalogs of ranges,
+    from the Discovery Service.
+
+    Only the courses and course runs modified since the last sync are requested, unless --full is passed.
+    A full sync also deletes the courses and course runs the Discovery Service no longer returns.
+    """
+
+    help = 'Sync the local copy of the Discovery Service catalog.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            dest='full',
+            default=False,
+            help='Copy all of the courses and course runs, instead of only those modified since the last sync.',
+        )
+        parser.add_argument(
+            '--page-size',
+            action='store',
+            dest='page_size',
+            default=DEFAULT_CATALOG_PAGE_SIZE,
+            help='Number of resources requested from the Discovery Service at a time.',
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        synced_partners = set()
+        site_configurations = SiteConfiguration.objects.select_related('partner', 'site').exclude(
+            discovery_api_url=''
+        ).order_by('id')
+
+        for site_configuration in site_configurations:
+            partner = site_configuration.partner
+            if partner is None or partner.id in synced_partners:
+                continue
+            synced_partners.add(partner.id)
+
+            try:
+                for model, resource in ((DiscoveryCourseRun, 'course_runs'), (DiscoveryCourse, 'courses')):
+                    count = self._sync(site_configuration, model, resource, options['full'], options['page_size'])
+                    logger.info('Synced %d %s of partner [%s].', count, resource, partner.short_code)
+                self._sync_catalogs(site_configuration, options['page_size'])
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(
+                    'Failed to sync the Discovery Service catalog of partner [%s] from site [%s].',
+                    partner.short_code, site_configuration.site.domain
+                )
+
+    def _get_pages(self, endpoint, params):
+        """ Yields the results of each page of a list endpoint. """
+        params = dict(params, page=1)
+        while True:
+            response = endpoint.get(**params)
+            yield response.get('results', [])
+
+            if not response.get('next'):
+                return
+            params['page'] += 1
+
+    def _sync(self, site_configuration, model, resource, full, page_size):
+        """
+        Copies the resources modified since the last sync, or all of them, deleting those no longer returned,
+        if full is True.
+
+        Returns:
+            int: Number of resources created or updated.
+        """
+        partner = site_configuration.partner
+        started = now()
+        params = {'page_size': page_size}
+        if resource == 'course_runs':
+            params['partner'] = partner.short_code
+
+        last_modified = None if full else model.objects.filter(partner=partner).aggregate(
+            last_modified=Max('modified')
+        )['last_modified']
+        if last_modified:
+            params['timestamp'] = last_modified.strftime(ISO_8601_FORMAT)
+
+        endpoint = getattr(site_configuration.discovery_api_client, resource)
+        count = 0
+        for results in self._get_pages(endpoint, params):
+            count += self._upsert(partner, model, results, started)
+
+        if full:
+            deleted, __ = model.objects.filter(partner=partner, synced__lt=started).delete()
+            if deleted:
+                logger.info('Deleted %d %s of partner [%s] no longer returned by the Discovery Service.',
+                            deleted, resource, partner.short_code)
+        return count
+
+    def _upsert(self, partner, model, results, synced):
+        """
+        Creates or updates the records of a page of resources.
+
+        Returns:
+            int: Number of resources created or updated.
+        """
+        fields = {}
+        for result in results:
+            if not result.get('modified'):
+                # Storing the resource with another date could move the watermark of incremental syncs
+                # past resources that have not been copied yet.
+                logger.warning('Skipped %s [%s] of partner [%s], which has no modification date.',
+                               model.__name__, result.get('key'), partner.short_code)
+                continue
+
+            record_fields = {
+                'data': result,
+                'key': result['key'],
+                'modified': parse_datetime(result['modified']),
+                'synced': synced,
+            }
+            if model is DiscoveryCourse:
+                record_fields['uuid'] = result['uuid']
+                fields[str(result['uuid'])] = record_fields
+            else:
+                record_fields['course_uuid'] = result.get('course_uuid')
+                fields[result['key']] = record_fields
+
+        if not fields:
+            return 0
+
+        count = len(fields)
+        lookup_field = 'uuid' if model is DiscoveryCourse else 'key'
+        update_fields = ['data', 'key', 'modified', 'synced', 'uuid' if model is DiscoveryCourse else 'course_uuid']
+        with transaction.atomic():
+            existing = model.objects.filter(partner=partner, **{lookup_field + '__in': list(fields)})
+            records = []
+            for record in existing:
+                for name, value in fields.pop(str(getattr(record, lookup_field))).items():
+                    setattr(record, name, value)
+                records.append(record)
+
+            if records:
+                model.objects.bulk_update(records, update_fields)
+            model.objects.bulk_create([model(partner=partner, **values) for values in fields.values()])
+        return count
+
+    def _sync_catalogs(self, site_configuration, page_size):
+        """
+        Copies the course runs of the catalogs of ranges, replacing those copied by the last sync.
+
+        The catalog courses endpoint only returns the active and marketable course runs, so the catalog contains
+        endpoint is still used for the other course runs, see get_replicated_catalog_contains.
+        """
+        partner = site_configuration.partner
+        catalog_ids = Range.objects.filter(course_catalog__isnull=False).values_list(
+            'course_catalog', flat=True
+        ).distinct()
+
+        for catalog_id in catalog_ids:
+            endpoint = site_configuration.discovery_api_client.catalogs(catalog_id).courses
+            course_run_keys = set()
+            try:
+                for results in self._get_pages(endpoint, {'page_size': page_size}):
+                    for course in results:
+                        course_run_keys.update(course_run['key'] for course_run in course.get('course_runs', []))
+            except HttpNotFoundError:
+                logger.info('Deleted catalog [%s] of partner [%s], which no longer exists.',
+                            catalog_id, partner.short_code)
+                DiscoveryCatalog.objects.filter(partner=partner, catalog_id=catalog_id).delete()
+                continue
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to sync catalog [%s] of partner [%s].', catalog_id, partner.short_code)
+                continue
+
+            with transaction.atomic():
+                catalog, __ = DiscoveryCatalog.objects.update_or_create(
+                    partner=partner, catalog_id=catalog_id, defaults={'synced': now()}
+                )
+                catalog.course_runs.all().delete()
+                DiscoveryCatalogCourseRun.objects.bulk_create(
+                    [DiscoveryCatalogCourseRun(catalog=catalog, key=key) for key in course_run_keys]
+                )
+            logger.info('Synced %d course runs of catalog [%s] of partner [%s].',
+                        len(course_run_keys), catalog_id, partner.short_code)
@@ -0,0 +1,47 @@
+# Generated by Django 2.2.17 on 2026-10-19 09:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+import jsonfield.encoder
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partner', '0017_auto_20200305_1448'),
+        ('courses', '0012_auto_20191115_2151'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiscoveryCourseRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', jsonfield.fields.JSONField(dump_kwargs={'cls': jsonfield.encoder.JSONEncoder, 'separators': (',', ':')}, help_text='Resource as returned by the Discovery Service API.', load_kwargs={})),
+                ('modified', models.DateTimeField(help_text='Last time the resource was modified in the Discovery Service.')),
+                ('key', models.CharField(max_length=255)),
+                ('course_uuid', models.UUIDField(blank=True, null=True)),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='partner.Partner')),
+            ],
+            options={
+                'unique_together': {('partner', 'key')},
+                'index_together': {('partner', 'modified')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DiscoveryCourse',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', jsonfield.fields.JSONField(dump_kwargs={'cls': jsonfield.encoder.JSONEncoder, 'separators': (',', ':')}, help_text='Resource as returned by the Discovery Service API.', load_kwargs={})),
+                ('modified', models.DateTimeField(help_text='Last time the resource was modified in the Discovery Service.')),
+                ('uuid', models.UUIDField()),
+                ('key', models.CharField(max_length=255)),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='partner.Partner')),
+            ],
+            options={
+                'unique_together': {('partner', 'uuid')},
+                'index_together': {('partner', 'modified'), ('partner', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+
+
+from django.db import migrations
+
+from ecommerce.core.constants import DISCOVERY_REPLICA_SWITCH
+
+
+def create_switch(apps, schema_editor):
+    """Create a switch for serving course details from the local copy of the Discovery Service catalog."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.get_or_create(name=DISCOVERY_REPLICA_SWITCH, defaults={'active': False})
+
+
+def remove_switch(apps, schema_editor):
+    """Remove the Discovery Service catalog copy switch."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.filter(name=DISCOVERY_REPLICA_SWITCH).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0013_discovery_replica'),
+        ('waffle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_switch, remove_switch),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 2.2.17 on 2026-10-19 11:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partner', '0017_auto_20200305_1448'),
+        ('courses', '0014_discovery_replica_switch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiscoveryCatalog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('catalog_id', models.PositiveIntegerField()),
+                ('synced', models.DateTimeField(default=django.utils.timezone.now, help_text='Last time the course runs of the catalog were copied.')),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='partner.Partner')),
+            ],
+            options={
+                'unique_together': {('partner', 'catalog_id')},
+            },
+        ),
+        migrations.AddField(
+            model_name='discoverycourse',
+            name='synced',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Last time the resource was returned by the Discovery Service API.'),
+        ),
+        migrations.AddField(
+            model_name='discoverycourserun',
+            name='synced',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Last time the resource was returned by the Discovery Service API.'),
+        ),
+        migrations.CreateModel(
+            name='DiscoveryCatalogCourseRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('catalog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='course_runs', to='courses.DiscoveryCatalog')),
+            ],
+            options={
+                'unique_together': {('catalog', 'key')},
+            },
+        ),
+    ]
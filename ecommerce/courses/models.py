@@ -7,6 +7,7 @@ from django.db import models, transaction
 from django.db.models import Count, Q
 from django.utils.timezone import now, timedelta
 from django.utils.translation import ugettext_lazy as _
+from jsonfield import JSONField
 from oscar.core.loading import get_class, get_model
 from simple_history.models import HistoricalRecords
 
@@ -348,3 +349,71 @@ class Course(models.Model):
             else:
                 enrollment_code.expires = now() - timedelta(days=365)
             enrollment_code.save()
+
+
+class AbstractDiscoveryRecord(models.Model):
+    """
+    Local copy of a Discovery Service resource, kept up to date by the sync_discovery_catalog command.
+    """
+    partner = models.ForeignKey('partner.Partner', on_delete=models.CASCADE)
+    data = JSONField(help_text=_('Resource as returned by the Discovery Service API.'))
+    modified = models.DateTimeField(help_text=_('Last time the resource was modified in the Discovery Service.'))
+    synced = models.DateTimeField(
+        default=now, help_text=_('Last time the resource was returned by the Discovery Service API.')
+    )
+
+    class Meta:
+        abstract = True
+
+
+class DiscoveryCourse(AbstractDiscoveryRecord):
+    uuid = models.UUIDField()
+    key = models.CharField(max_length=255)
+
+    class Meta:
+        unique_together = ('partner', 'uuid')
+        index_together = (('partner', 'key'), ('partner', 'modified'))
+
+    def __str__(self):
+        return self.key
+
+
+class DiscoveryCourseRun(AbstractDiscoveryRecord):
+    key = models.CharField(max_length=255)
+    course_uuid = models.UUIDField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('partner', 'key')
+        index_together = (('partner', 'modified'),)
+
+    def __str__(self):
+        return self.key
+
+
+class DiscoveryCatalog(models.Model):
+    """
+    Local copy of the course runs of a Discovery Service catalog, kept up to date by the sync_discovery_catalog
+    command for the catalogs of ranges.
+
+    Only the active and marketable course runs of the catalog are copied, see get_replicated_catalog_contains.
+    """
+    partner = models.ForeignKey('partner.Partner', on_delete=models.CASCADE)
+    catalog_id = models.PositiveIntegerField()
+    synced = models.DateTimeField(default=now, help_text=_('Last time the course runs of the catalog were copied.'))
+
+    class Meta:
+        unique_together = ('partner', 'catalog_id')
+
+    def __str__(self):
+        return str(self.catalog_id)
+
+
+class DiscoveryCatalogCourseRun(models.Model):
+    catalog = models.ForeignKey(DiscoveryCatalog, related_name='course_runs', on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+
+    class Meta:
+        unique_together = ('catalog', 'key')
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,231 @@
+"""Contains the tests for the sync discovery catalog command."""
+
+
+import json
+from urllib.parse import parse_qs, urlparse
+
+import httpretty
+from django.core.management import call_command
+from oscar.test.factories import RangeFactory
+from testfixtures import LogCapture
+
+from ecommerce.courses.models import DiscoveryCatalog, DiscoveryCourse, DiscoveryCourseRun
+from ecommerce.tests.factories import SiteConfigurationFactory
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.courses.management.commands.sync_discovery_catalog'
+COURSE_UUID = 'a9f6cd3a-5b6e-4d1f-9d6e-3f4b1c2d0001'
+OTHER_COURSE_UUID = 'a9f6cd3a-5b6e-4d1f-9d6e-3f4b1c2d0002'
+
+
+@httpretty.activate
+class SyncDiscoveryCatalogCommandTests(TestCase):
+    """ Tests the sync_discovery_catalog command against a stubbed Discovery Service. """
+
+    def setUp(self):
+        super(SyncDiscoveryCatalogCommandTests, self).setUp()
+        self.mock_access_token_response()
+        self.discovery_api_url = self.site_configuration.discovery_api_url
+
+    def mock_resource_pages(self, resource, pages):
+        """ Stub the list endpoint of the resource to return the given pages of results. """
+        url = '{}{}/'.format(self.discovery_api_url, resource)
+        if not pages:
+            httpretty.register_uri(httpretty.GET, url, status=404)
+            return
+
+        responses = [
+            httpretty.Response(
+                body=json.dumps({
+                    'next': '{}?page={}'.format(url, index + 2) if index + 1 < len(pages) else None,
+                    'results': results,
+                }),
+                content_type='application/json'
+            )
+            for index, results in enumerate(pages)
+        ]
+        httpretty.register_uri(httpretty.GET, url, responses=responses)
+
+    def get_requests(self, resource):
+        return [
+            parse_qs(urlparse(request.path).query)
+            for request in httpretty.latest_requests()
+            if urlparse(request.path).path.endswith('/{}/'.format(resource))
+        ]
+
+    def course_run(self, key, modified, title='Course Run'):
+        return {'key': key, 'course_uuid': COURSE_UUID, 'modified': modified, 'title': title}
+
+    def course(self, uuid, key, modified, title='Course'):
+        return {'uuid': uuid, 'key': key, 'modified': modified, 'title': title}
+
+    def test_sync(self):
+        """ Verify all of the pages of course runs and courses are copied. """
+        self.mock_resource_pages('course_runs', [
+            [self.course_run('course-v1:edX+DemoX+1T2020', '2020-01-01T00:00:00Z')],
+            [self.course_run('course-v1:edX+DemoX+2T2020', '2020-02-01T00:00:00Z')],
+        ])
+        self.mock_resource_pages('courses', [[self.course(COURSE_UUID, 'edX+DemoX', '2020-01-15T00:00:00Z')]])
+
+        with LogCapture(LOGGER_NAME) as logger:
+            call_command('sync_discovery_catalog', page_size=1)
+            logger.check(
+                (LOGGER_NAME, 'INFO', 'Synced 2 course_runs of partner [{}].'.format(self.partner.short_code)),
+                (LOGGER_NAME, 'INFO', 'Synced 1 courses of partner [{}].'.format(self.partner.short_code)),
+            )
+
+        self.assertEqual(
+            set(DiscoveryCourseRun.objects.filter(partner=self.partner).values_list('key', flat=True)),
+            {'course-v1:edX+DemoX+1T2020', 'course-v1:edX+DemoX+2T2020'}
+        )
+        course = DiscoveryCourse.objects.get(partner=self.partner)
+        self.assertEqual(str(course.uuid), COURSE_UUID)
+        self.assertEqual(course.data['title'], 'Course')
+
+        course_run_requests = self.get_requests('course_runs')
+        self.assertEqual([request['page'] for request in course_run_requests], [['1'], ['2']])
+        self.assertEqual(course_run_requests[0]['partner'], [self.partner.short_code])
+        self.assertNotIn('timestamp', course_run_requests[0])
+
+    def test_incremental_sync(self):
+        """ Verify only the resources modified since the last sync are requested, and that they are updated. """
+        self.mock_resource_pages(
+            'course_runs', [[self.course_run('course-v1:edX+DemoX+1T2020', '2020-01-01T00:00:00Z')]]
+        )
+        self.mock_resource_pages('courses', [[self.course(COURSE_UUID, 'edX+DemoX', '2020-01-15T00:00:00Z')]])
+        call_command('sync_discovery_catalog')
+
+        self.mock_resource_pages('course_runs', [[
+            self.course_run('course-v1:edX+DemoX+1T2020', '2020-03-01T00:00:00Z', title='Updated Course Run')
+        ]])
+        self.mock_resource_pages('courses', [[self.course(OTHER_COURSE_UUID, 'edX+OtherX', '2020-03-01T00:00:00Z')]])
+        call_command('sync_discovery_catalog')
+
+        self.assertEqual(self.get_requests('course_runs')[-1]['timestamp'], ['2020-01-01T00:00:00Z'])
+        self.assertEqual(self.get_requests('courses')[-1]['timestamp'], ['2020-01-15T00:00:00Z'])
+        course_run = DiscoveryCourseRun.objects.get(partner=self.partner)
+        self.assertEqual(course_run.data['title'], 'Updated Course Run')
+        self.assertEqual(
+            set(DiscoveryCourse.objects.filter(partner=self.partner).values_list('key', flat=True)),
+            {'edX+DemoX', 'edX+OtherX'}
+        )
+
+        call_command('sync_discovery_catalog', full=True)
+        self.assertNotIn('timestamp', self.get_requests('courses')[-1])
+
+    def test_sync_failure(self):
+        """ Verify a failure to sync one partner is logged, and does not stop the other partners from syncing. """
+        other_site_configuration = SiteConfigurationFactory(
+            partner__short_code='other',
+            discovery_api_url=self.discovery_api_url,
+            oauth_settings=self.site_configuration.oauth_settings,
+        )
+
+        def course_runs_callback(request, uri, headers):  # pylint: disable=unused-argument
+            if parse_qs(urlparse(request.path).query)['partner'] == [self.partner.short_code]:
+                return 500, headers, ''
+            return 200, headers, json.dumps({'results': []})
+
+        httpretty.register_uri(
+            httpretty.GET, '{}course_runs/'.format(self.discovery_api_url),
+            body=course_runs_callback, content_type='application/json'
+        )
+        self.mock_resource_pages('courses', [[self.course(COURSE_UUID, 'edX+DemoX', '2020-01-15T00:00:00Z')]])
+
+        with LogCapture(LOGGER_NAME) as logger:
+            call_command('sync_discovery_catalog')
+            logger.check_present((
+                LOGGER_NAME,
+                'ERROR',
+                'Failed to sync the Discovery Service catalog of partner [{}] from site [{}].'.format(
+                    self.partner.short_code, self.site.domain
+                )
+            ))
+
+        self.assertFalse(DiscoveryCourse.objects.filter(partner=self.partner).exists())
+        self.assertTrue(DiscoveryCourse.objects.filter(partner=other_site_configuration.partner).exists())
+
+    def mock_remaining_resources(self):
+        self.mock_resource_pages(
+            'course_runs', [[self.course_run('course-v1:edX+DemoX+2T2020', '2020-01-01T00:00:00Z')]]
+        )
+        self.mock_resource_pages('courses', [[]])
+
+    def test_full_sync_deletes_missing_resources(self):
+        """ Verify a full sync deletes the resources the Discovery Service no longer returns. """
+        self.mock_resource_pages('course_runs', [[
+            self.course_run('course-v1:edX+DemoX+1T2020', '2020-01-01T00:00:00Z'),
+            self.course_run('course-v1:edX+DemoX+2T2020', '2020-01-01T00:00:00Z'),
+        ]])
+        self.mock_resource_pages('courses', [[self.course(COURSE_UUID, 'edX+DemoX', '2020-01-15T00:00:00Z')]])
+        call_command('sync_discovery_catalog')
+
+        self.mock_remaining_resources()
+        call_command('sync_discovery_catalog')
+        self.assertEqual(DiscoveryCourseRun.objects.filter(partner=self.partner).count(), 2)
+
+        # The endpoints are stubbed again, as their incremental stubs do not match requests without a timestamp.
+        self.mock_remaining_resources()
+        with LogCapture(LOGGER_NAME) as logger:
+            call_command('sync_discovery_catalog', full=True)
+            logger.check_present(
+                (
+                    LOGGER_NAME, 'INFO', 'Deleted 1 course_runs of partner [{}] no longer returned by the '
+                    'Discovery Service.'.format(self.partner.short_code)
+                ),
+                (
+                    LOGGER_NAME, 'INFO', 'Deleted 1 courses of partner [{}] no longer returned by the '
+                    'Discovery Service.'.format(self.partner.short_code)
+                ),
+            )
+
+        self.assertEqual(
+            list(DiscoveryCourseRun.objects.filter(partner=self.partner).values_list('key', flat=True)),
+            ['course-v1:edX+DemoX+2T2020']
+        )
+        self.assertFalse(DiscoveryCourse.objects.filter(partner=self.partner).exists())
+
+    def test_sync_skips_resources_without_modified(self):
+        """ Verify resources without a modification date are skipped, so they cannot move the watermark. """
+        course_run = self.course_run('course-v1:edX+DemoX+2T2020', None)
+        self.mock_resource_pages('course_runs', [[
+            self.course_run('course-v1:edX+DemoX+1T2020', '2020-01-01T00:00:00Z'), course_run
+        ]])
+        self.mock_resource_pages('courses', [[]])
+
+        with LogCapture(LOGGER_NAME) as logger:
+            call_command('sync_discovery_catalog')
+            logger.check_present((
+                LOGGER_NAME, 'WARNING', 'Skipped DiscoveryCourseRun [course-v1:edX+DemoX+2T2020] of partner [{}], '
+                'which has no modification date.'.format(self.partner.short_code)
+            ))
+
+        self.assertEqual(
+            list(DiscoveryCourseRun.objects.filter(partner=self.partner).values_list('key', flat=True)),
+            ['course-v1:edX+DemoX+1T2020']
+        )
+
+        call_command('sync_discovery_catalog')
+        self.assertEqual(self.get_requests('course_runs')[-1]['timestamp'], ['2020-01-01T00:00:00Z'])
+
+    def test_sync_catalogs(self):
+        """ Verify the course runs of the catalogs of ranges are copied, and deleted catalogs are removed. """
+        RangeFactory(course_catalog=1, course_seat_types='verified')
+        RangeFactory(course_catalog=2, course_seat_types='verified')
+        DiscoveryCatalog.objects.create(partner=self.partner, catalog_id=2).course_runs.create(key='stale')
+        self.mock_resource_pages('course_runs', [[]])
+        self.mock_resource_pages('courses', [[]])
+        self.mock_resource_pages('catalogs/1/courses', [
+            [{'key': 'edX+DemoX', 'course_runs': [{'key': 'course-v1:edX+DemoX+1T2020'}]}],
+            [{'key': 'edX+OtherX', 'course_runs': [{'key': 'course-v1:edX+OtherX+1T2020'}]}],
+        ])
+        self.mock_resource_pages('catalogs/2/courses', [])
+
+        call_command('sync_discovery_catalog', page_size=1)
+
+        catalog = DiscoveryCatalog.objects.get(partner=self.partner)
+        self.assertEqual(catalog.catalog_id, 1)
+        self.assertEqual(
+            set(catalog.course_runs.values_list('key', flat=True)),
+            {'course-v1:edX+DemoX+1T2020', 'course-v1:edX+OtherX+1T2020'}
+        )
@@ -1,19 +1,28 @@
 
 
+import json
+from urllib.parse import parse_qs, urlparse
+
 import ddt
 import httpretty
-from edx_django_utils.cache import TieredCache
+from django.utils.timezone import now
+from edx_django_utils.cache import RequestCache, TieredCache
 from mock import patch
 from opaque_keys.edx.keys import CourseKey
 from requests.exceptions import ConnectionError as ReqConnectionError
 
+from ecommerce.core.cache_utils import CACHE_KEY_PREFIX
+from ecommerce.core.constants import DISCOVERY_REPLICA_SWITCH
+from ecommerce.core.tests import toggle_switch
 from ecommerce.core.utils import get_cache_key
 from ecommerce.coupons.tests.mixins import DiscoveryMockMixin
+from ecommerce.courses.models import DiscoveryCourse, DiscoveryCourseRun
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.courses.utils import (
     get_certificate_type_display_value,
     get_course_catalogs,
     get_course_info_from_catalog,
+    get_course_info_from_catalog_for_products,
     mode_for_product
 )
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
@@ -72,7 +81,7 @@ class UtilsTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
             site_domain=self.site.domain,
             resource="{}-{}".format(resource, key)
         )
-        course_cached_response = TieredCache.get_cached_response(cache_key)
+        course_cached_response = TieredCache.get_cached_response(CACHE_KEY_PREFIX + cache_key)
         self.assertFalse(course_cached_response.is_found)
 
         response = get_course_info_from_catalog(self.request.site, product)
@@ -82,8 +91,8 @@ class UtilsTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
         else:
             self.assertEqual(response['title'], product.title)
 
-        course_cached_response = TieredCache.get_cached_response(cache_key)
-        self.assertEqual(course_cached_response.value, response)
+        course_cached_response = TieredCache.get_cached_response(CACHE_KEY_PREFIX + cache_key)
+        self.assertEqual(course_cached_response.value.value, response)
 
     def test_get_course_info_from_catalog_cached(self):
         """
@@ -108,6 +117,145 @@ class UtilsTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
             _ = get_course_info_from_catalog(self.request.site, product)
             self.assertEqual(mocked_set_all_tiers.call_count, 2)
 
+    def test_get_course_info_from_catalog_for_products(self):
+        """
+        Verify that the course runs and courses that are not cached are each fetched with a single request.
+        """
+        self.mock_access_token_response()
+        discovery_api_url = self.site_configuration.discovery_api_url
+        seats = [CourseFactory(partner=self.partner).create_or_update_seat('verified', None, 100) for _ in range(3)]
+        entitlements = [
+            create_or_update_course_entitlement('verified', 100, self.partner, uuid, uuid)
+            for uuid in ('d2b3d2b8-5d2a-4f6c-a6b9-5e3c1c1a0001', 'd2b3d2b8-5d2a-4f6c-a6b9-5e3c1c1a0002')
+        ]
+
+        # Cache the first seat's course run.
+        cached_course = seats[0].course
+        self.mock_course_run_detail_endpoint(cached_course, discovery_api_url=discovery_api_url)
+        get_course_info_from_catalog(self.request.site, seats[0])
+
+        httpretty.register_uri(
+            httpretty.GET, '{}course_runs/'.format(discovery_api_url),
+            body=json.dumps({'results': [{'key': seat.attr.course_key, 'title': seat.title} for seat in seats[1:]]}),
+            content_type='application/json'
+        )
+        httpretty.register_uri(
+            httpretty.GET, '{}courses/'.format(discovery_api_url),
+            body=json.dumps({
+                'results': [{'uuid': product.attr.UUID, 'title': product.title} for product in entitlements]
+            }),
+            content_type='application/json'
+        )
+
+        request_count = len(httpretty.latest_requests())
+        courses = get_course_info_from_catalog_for_products(self.request.site, seats + entitlements)
+        self.assertEqual(courses[seats[0].id]['title'], cached_course.name)
+        for product in seats[1:] + entitlements:
+            self.assertEqual(courses[product.id]['title'], product.title)
+
+        requests = httpretty.latest_requests()[request_count:]
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(
+            parse_qs(urlparse(requests[0].path).query)['keys'],
+            [','.join(sorted(seat.attr.course_key for seat in seats[1:]))]
+        )
+        self.assertEqual(
+            parse_qs(urlparse(requests[1].path).query)['uuids'],
+            [','.join(sorted(product.attr.UUID for product in entitlements))]
+        )
+
+        # All of the products are now cached, including in the django cache.
+        RequestCache.clear_all_namespaces()
+        self.assertEqual(get_course_info_from_catalog_for_products(self.request.site, seats + entitlements), courses)
+        self.assertEqual(len(httpretty.latest_requests()), request_count + 2)
+
+    def test_get_course_info_from_catalog_for_products_list_results(self):
+        """
+        Verify that the results of the list requests are not returned when a single course run is looked up.
+        """
+        self.mock_access_token_response()
+        discovery_api_url = self.site_configuration.discovery_api_url
+        seats = [CourseFactory(partner=self.partner).create_or_update_seat('verified', None, 100) for _ in range(2)]
+        httpretty.register_uri(
+            httpretty.GET, '{}course_runs/'.format(discovery_api_url),
+            body=json.dumps({'results': [{'key': seat.attr.course_key, 'title': seat.title} for seat in seats]}),
+            content_type='application/json'
+        )
+        courses = get_course_info_from_catalog_for_products(self.request.site, seats)
+        self.assertEqual(courses[seats[0].id], {'key': seats[0].attr.course_key, 'title': seats[0].title})
+
+        self.mock_course_run_detail_endpoint(seats[0].course, discovery_api_url=discovery_api_url)
+        request_count = len(httpretty.latest_requests())
+        response = get_course_info_from_catalog(self.request.site, seats[0])
+        self.assertEqual(response['title'], seats[0].course.name)
+        self.assertEqual(len(httpretty.latest_requests()), request_count + 1)
+
+        # The list results are still used for the products looked up together.
+        RequestCache.clear_all_namespaces()
+        courses_after_lookup = get_course_info_from_catalog_for_products(self.request.site, seats)
+        self.assertEqual(courses_after_lookup[seats[1].id], courses[seats[1].id])
+        self.assertEqual(len(httpretty.latest_requests()), request_count + 1)
+
+    def create_replicated_products(self):
+        """ Create a seat and an entitlement whose course run and course are replicated locally. """
+        seat = CourseFactory(partner=self.partner).create_or_update_seat('verified', None, 100)
+        entitlement = create_or_update_course_entitlement(
+            'verified', 100, self.partner, 'd2b3d2b8-5d2a-4f6c-a6b9-5e3c1c1a0003', 'Replicated Entitlement'
+        )
+        DiscoveryCourseRun.objects.create(
+            partner=self.partner, key=seat.attr.course_key, modified=now(),
+            data={'key': seat.attr.course_key, 'title': 'Replicated Course Run'}
+        )
+        DiscoveryCourse.objects.create(
+            partner=self.partner, uuid=entitlement.attr.UUID, key='edX+Replicated', modified=now(),
+            data={'uuid': entitlement.attr.UUID, 'title': 'Replicated Course'}
+        )
+        return seat, entitlement
+
+    @ddt.data(True, False)
+    def test_get_course_info_from_replica(self, switch_active):
+        """ Verify replicated course runs and courses are served without calling the Discovery Service. """
+        toggle_switch(DISCOVERY_REPLICA_SWITCH, switch_active)
+        self.mock_access_token_response()
+        seat, entitlement = self.create_replicated_products()
+        discovery_api_url = self.site_configuration.discovery_api_url
+        self.mock_course_run_detail_endpoint(seat.course, discovery_api_url=discovery_api_url)
+        self.mock_course_detail_endpoint(discovery_api_url=discovery_api_url, course=entitlement)
+
+        request_count = len(httpretty.latest_requests())
+        seat_info = get_course_info_from_catalog(self.request.site, seat)
+        entitlement_info = get_course_info_from_catalog(self.request.site, entitlement)
+
+        if switch_active:
+            self.assertEqual(seat_info['title'], 'Replicated Course Run')
+            self.assertEqual(entitlement_info['title'], 'Replicated Course')
+            self.assertEqual(len(httpretty.latest_requests()), request_count)
+        else:
+            self.assertEqual(seat_info['title'], seat.course.name)
+            self.assertEqual(entitlement_info['title'], entitlement.title)
+
+    def test_get_course_info_from_catalog_for_products_from_replica(self):
+        """ Verify products whose course run or course is replicated are not requested from the Discovery Service. """
+        toggle_switch(DISCOVERY_REPLICA_SWITCH, True)
+        self.mock_access_token_response()
+        seat, entitlement = self.create_replicated_products()
+        other_seat = CourseFactory(partner=self.partner).create_or_update_seat('verified', None, 100)
+        self.mock_course_run_detail_endpoint(
+            other_seat.course, discovery_api_url=self.site_configuration.discovery_api_url
+        )
+
+        request_count = len(httpretty.latest_requests())
+        courses = get_course_info_from_catalog_for_products(self.request.site, [seat, entitlement, other_seat])
+
+        self.assertEqual(courses[seat.id]['title'], 'Replicated Course Run')
+        self.assertEqual(courses[entitlement.id]['title'], 'Replicated Course')
+        self.assertEqual(courses[other_seat.id]['title'], other_seat.course.name)
+        requests = [
+            request for request in httpretty.latest_requests()[request_count:] if 'course_runs' in request.path
+        ]
+        self.assertEqual(len(requests), 1)
+        self.assertIn(other_seat.attr.course_key, requests[0].path)
+
     @ddt.data(
         ('honor', 'Honor'),
         ('verified', 'Verified'),
@@ -148,7 +296,7 @@ class GetCourseCatalogUtilTests(DiscoveryMockMixin, TestCase):
             site_domain=self.site.domain,
             resource=resource
         )
-        course_catalogs_cached_response = TieredCache.get_cached_response(cache_key)
+        course_catalogs_cached_response = TieredCache.get_cached_response(CACHE_KEY_PREFIX + cache_key)
         self.assertFalse(course_catalogs_cached_response.is_found)
 
         response = get_course_catalogs(self.request.site)
@@ -157,8 +305,8 @@ class GetCourseCatalogUtilTests(DiscoveryMockMixin, TestCase):
         for catalog_index, catalog in enumerate(response):
             self.assertEqual(catalog['name'], catalog_name_list[catalog_index])
 
-        course_cached_response = TieredCache.get_cached_response(cache_key)
-        self.assertEqual(course_cached_response.value, response)
+        course_cached_response = TieredCache.get_cached_response(CACHE_KEY_PREFIX + cache_key)
+        self.assertEqual(course_cached_response.value.value, response)
 
     def test_get_course_catalogs_for_single_catalog_with_id(self):
         """
@@ -174,14 +322,14 @@ class GetCourseCatalogUtilTests(DiscoveryMockMixin, TestCase):
             site_domain=self.site.domain,
             resource="{}-{}".format(resource, catalog_id)
         )
-        course_catalogs_cached_response = TieredCache.get_cached_response(cache_key)
+        course_catalogs_cached_response = TieredCache.get_cached_response(CACHE_KEY_PREFIX + cache_key)
         self.assertFalse(course_catalogs_cached_response.is_found)
 
         response = get_course_catalogs(self.request.site, catalog_id)
         self.assertEqual(response['name'], 'All Courses')
 
-        course_cached_response = TieredCache.get_cached_response(cache_key)
-        self.assertEqual(course_cached_response.value, response)
+        course_cached_response = TieredCache.get_cached_response(CACHE_KEY_PREFIX + cache_key)
+        self.assertEqual(course_cached_response.value.value, response)
 
         # Verify the API was actually hit (not the cache)
         self._assert_num_requests(2)
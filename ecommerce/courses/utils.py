@@ -1,10 +1,15 @@
 
 
+from uuid import UUID
+
+import waffle
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
-from edx_django_utils.cache import TieredCache
 from opaque_keys.edx.keys import CourseKey
+from oscar.core.loading import get_model
 
+from ecommerce.core.cache_utils import get_many_cached_values, get_or_fetch, set_cached_value
+from ecommerce.core.constants import DISCOVERY_REPLICA_SWITCH
 from ecommerce.core.utils import deprecated_traverse_pagination, get_cache_key
 
 
@@ -23,6 +28,81 @@ def mode_for_product(product):
     return mode
 
 
+def _get_replicated_resources(site, resource, resource_ids):
+    """
+    Return the locally replicated Discovery Service data of the given courses or course runs.
+
+    The local copy of the catalog is kept up to date by the sync_discovery_catalog command, and is only
+    used while the DISCOVERY_REPLICA_SWITCH is active.
+
+    Arguments:
+        site (Site): Site object containing Site Configuration data
+        resource (str): Either 'courses' or 'course_runs'
+        resource_ids (list): Course UUIDs or keys, or course run keys
+
+    Returns:
+        dict: Replicated data keyed by resource id. Resources that are not replicated are left out.
+    """
+    if resource not in ('courses', 'course_runs') or not waffle.switch_is_active(DISCOVERY_REPLICA_SWITCH):
+        return {}
+
+    resource_ids = [str(resource_id) for resource_id in resource_ids]
+    partner = site.siteconfiguration.partner
+    if resource == 'course_runs':
+        records = get_model('courses', 'DiscoveryCourseRun').objects.filter(partner=partner, key__in=resource_ids)
+        return dict(records.values_list('key', 'data'))
+
+    uuids = {}
+    for resource_id in resource_ids:
+        try:
+            uuids[UUID(resource_id)] = resource_id
+        except ValueError:
+            pass
+
+    records = get_model('courses', 'DiscoveryCourse').objects.filter(partner=partner)
+    replicated = {}
+    if uuids:
+        for uuid, data in records.filter(uuid__in=uuids).values_list('uuid', 'data'):
+            replicated[uuids[uuid]] = data
+    keys = [resource_id for resource_id in resource_ids if resource_id not in uuids.values()]
+    if keys:
+        replicated.update(records.filter(key__in=keys).values_list('key', 'data'))
+    return replicated
+
+
+def get_replicated_catalog_contains(site, catalog_id, course_run_ids):
+    """
+    Return whether the locally replicated Discovery Service catalog contains the given course runs, in the
+    format of the catalog contains endpoint.
+
+    The replica only has the course runs the catalog courses endpoint returns, which leaves out the runs that are
+    not active or marketable, unlike the catalog contains endpoint. A course run missing from the replica may thus
+    still be in the catalog, so the replica only answers when it contains all of the course runs.
+
+    Arguments:
+        site (Site): Site object containing Site Configuration data
+        catalog_id (int): Discovery Service catalog ID
+        course_run_ids (list): Course run keys
+
+    Returns:
+        dict: {'courses': {course_run_id: True}}, or None if the catalog is not replicated or the replica does
+            not contain all of the course runs.
+    """
+    if not waffle.switch_is_active(DISCOVERY_REPLICA_SWITCH):
+        return None
+
+    catalog = get_model('courses', 'DiscoveryCatalog').objects.filter(
+        partner=site.siteconfiguration.partner, catalog_id=catalog_id
+    ).first()
+    if not catalog:
+        return None
+
+    contained = set(catalog.course_runs.filter(key__in=course_run_ids).values_list('key', flat=True))
+    if contained != set(course_run_ids):
+        return None
+    return {'courses': {course_run_id: True for course_run_id in course_run_ids}}
+
+
 def _get_discovery_response(site, cache_key, resource, resource_id):
     """
     Return the discovery endpoint result of given resource or cached response if its already been cached.
@@ -35,23 +115,25 @@ def _get_discovery_response(site, cache_key, resource, resource_id):
     Returns:
         dict: resource's information for given resource_id received from Discovery API
     """
-    course_cached_response = TieredCache.get_cached_response(cache_key)
-    if course_cached_response.is_found:
-        return course_cached_response.value
+    def fetch():
+        if resource_id is not None:
+            replicated = _get_replicated_resources(site, resource, [resource_id])
+            if replicated:
+                return replicated[str(resource_id)]
 
-    params = {}
-    api = site.siteconfiguration.discovery_api_client
-    endpoint = getattr(api, resource)
+        params = {}
+        api = site.siteconfiguration.discovery_api_client
+        endpoint = getattr(api, resource)
 
-    if resource == 'course_runs':
-        params['partner'] = site.siteconfiguration.partner.short_code
-    response = endpoint(resource_id).get(**params)
+        if resource == 'course_runs':
+            params['partner'] = site.siteconfiguration.partner.short_code
+        response = endpoint(resource_id).get(**params)
 
-    if resource_id is None:
-        response = deprecated_traverse_pagination(response, endpoint)
+        if resource_id is None:
+            response = deprecated_traverse_pagination(response, endpoint)
+        return response
 
-    TieredCache.set_all_tiers(cache_key, response, settings.COURSES_API_CACHE_TIMEOUT)
-    return response
+    return get_or_fetch('discovery', cache_key, fetch, settings.COURSES_API_CACHE_TIMEOUT)
 
 
 def get_course_detail(site, course_resource_id):
@@ -101,6 +183,96 @@ def get_course_info_from_catalog(site, product):
     return response
 
 
+def get_course_info_from_catalog_for_products(site, products):
+    """
+    Get course or course_run information for several products from Discovery Service and cache.
+
+    All of the products are looked up in the cache at once. The course runs and courses that are
+    not cached are looked up in the local copy of the catalog, and the remaining ones are each
+    fetched with a single list request (filtered by `keys` and `uuids` respectively) instead of
+    one detail request per product. The list results are cached apart from the detail responses,
+    so that `get_course_detail` and `get_course_run_detail` never return them.
+
+    Arguments:
+        site (Site): Site object containing Site Configuration data
+        products (list): Seat, enrollment code or course entitlement products
+
+    Returns:
+        dict: Course or course run information keyed by product id. Products whose information
+            was not returned by Discovery Service are left out.
+
+    Raises:
+        ConnectionError: requests exception "ConnectionError"
+        SlumberBaseException: slumber exception "SlumberBaseException"
+        Timeout: requests exception "Timeout"
+    """
+    lookups = {}
+    for product in products:
+        if product.is_course_entitlement_product:
+            resource, resource_id = 'courses', str(product.attr.UUID)
+        else:
+            resource, resource_id = 'course_runs', str(CourseKey.from_string(product.attr.course_key))
+        cache_key = get_cache_key(site_domain=site.domain, resource='{}-{}'.format(resource, resource_id))
+        # List endpoints return fewer fields than the detail endpoints, so their results are cached
+        # under separate keys which are only read here.
+        list_cache_key = get_cache_key(site_domain=site.domain, resource='{}-list-{}'.format(resource, resource_id))
+        lookups[product.id] = (resource, resource_id, cache_key, list_cache_key)
+
+    cached_values = get_many_cached_values(
+        'discovery', [key for lookup in lookups.values() for key in lookup[2:]]
+    )
+    responses = {}
+    for resource, resource_id, cache_key, list_cache_key in lookups.values():
+        if cache_key in cached_values:
+            value, is_stale = cached_values[cache_key]
+            # Looking stale values up individually schedules their refresh.
+            responses[cache_key] = (
+                _get_discovery_response(site, cache_key, resource, resource_id) if is_stale else value
+            )
+        elif list_cache_key in cached_values:
+            value, is_stale = cached_values[list_cache_key]
+            # Stale list results are fetched again below, along with the other missing ones.
+            if not is_stale:
+                responses[cache_key] = value
+
+    for resource, filter_name, id_field in (('course_runs', 'keys', 'key'), ('courses', 'uuids', 'uuid')):
+        missing = {
+            resource_id: (cache_key, list_cache_key)
+            for lookup_resource, resource_id, cache_key, list_cache_key in lookups.values()
+            if lookup_resource == resource and cache_key not in responses
+        }
+        for resource_id, data in _get_replicated_resources(site, resource, list(missing)).items():
+            cache_key, _list_cache_key = missing.pop(resource_id)
+            set_cached_value(cache_key, data, settings.COURSES_API_CACHE_TIMEOUT)
+            responses[cache_key] = data
+
+        if not missing:
+            continue
+
+        if len(missing) == 1:
+            resource_id, (cache_key, _list_cache_key) = missing.popitem()
+            responses[cache_key] = _get_discovery_response(site, cache_key, resource, resource_id)
+            continue
+
+        params = {filter_name: ','.join(sorted(missing)), 'page_size': len(missing)}
+        if resource == 'course_runs':
+            params['partner'] = site.siteconfiguration.partner.short_code
+        response = getattr(site.siteconfiguration.discovery_api_client, resource).get(**params)
+
+        for result in response.get('results', []):
+            cache_keys = missing.get(str(result.get(id_field)))
+            if cache_keys:
+                cache_key, list_cache_key = cache_keys
+                set_cached_value(list_cache_key, result, settings.COURSES_API_CACHE_TIMEOUT)
+                responses[cache_key] = result
+
+    return {
+        product_id: responses[cache_key]
+        for product_id, (_resource, _resource_id, cache_key, _list_cache_key) in lookups.items()
+        if cache_key in responses
+    }
+
+
 def get_course_catalogs(site, resource_id=None):
     """
     Get details related to course catalogs from Discovery Service.
@@ -211,6 +211,24 @@ class CheckoutPageTest(DiscoveryTestMixin, TestCase, JwtMixin):
 
         self._assert_success_checkout_page(sku=credit_seat.stockrecords.first().partner_sku)
 
+    @httpretty.activate
+    def test_providers_cached(self):
+        """ Verify the providers are requested from the Credit API once, while the eligibility is always requested. """
+        self.course.create_or_update_seat('credit', True, self.price, self.provider, credit_hours=self.credit_hours)
+        self._enable_payment_providers()
+        self.mock_access_token_response()
+        self._mock_eligibility_api(body=self.eligibilities)
+        self._mock_providers_api(body=self.provider_data)
+
+        for __ in range(2):
+            response = self.client.get(self.path)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context['providers'][0]['price'], self.price)
+
+        paths = [request.path.split('?')[0] for request in httpretty.latest_requests()]
+        self.assertEqual(paths.count('/api/credit/v1/providers/'), 1)
+        self.assertEqual(paths.count('/api/credit/v1/eligibility/'), 2)
+
     @httpretty.activate
     def test_get_checkout_page_with_audit_seats(self):
         """ Verify the page loads with the proper context, if all Credit API
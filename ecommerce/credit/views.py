@@ -1,8 +1,10 @@
 
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from dateutil.parser import parse
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
@@ -11,6 +13,8 @@ from django.views.generic import TemplateView
 from oscar.core.loading import get_model
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.cache_utils import get_or_fetch
+from ecommerce.core.utils import get_cache_key
 from ecommerce.courses.models import Course
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
 from ecommerce.extensions.offer.utils import format_benefit_value
@@ -33,7 +37,17 @@ class Checkout(TemplateView):
         course = get_object_or_404(Course, id=kwargs.get('course_id'))
         context['course'] = course
 
-        deadline = self._check_credit_eligibility(self.request.user, kwargs.get('course_id'))
+        # The eligibility of the user is requested while the credit seats are loaded and their providers requested,
+        # so that the page waits on the Credit API only once.
+        credit_api_client = self.request.site.siteconfiguration.credit_api_client
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='credit-eligibility') as executor:
+            deadline_future = executor.submit(
+                self._check_credit_eligibility, self.request.user, kwargs.get('course_id'), credit_api_client
+            )
+            credit_seats, stockrecords = self._get_credit_seats(course)
+            lms_providers = self._get_providers_from_lms(credit_seats) if credit_seats else None
+
+        deadline = deadline_future.result()
         if not deadline:
             context.update({
                 'error': _('An error has occurred. We could not confirm that you are eligible for course credit. '
@@ -41,20 +55,6 @@ class Checkout(TemplateView):
             })
             return context
 
-        partner = get_partner_for_site(self.request)
-        strategy = self.request.strategy
-        # Audit seats do not have a `certificate_type` attribute, so
-        # we use getattr to avoid an exception.
-        credit_seats = []
-
-        for seat in course.seat_products:
-            if getattr(seat.attr, 'certificate_type', None) != self.CREDIT_MODE:
-                continue
-
-            purchase_info = strategy.fetch_for_product(seat)
-            if purchase_info.availability.is_available_to_buy and seat.stockrecords.filter(partner=partner).exists():
-                credit_seats.append(seat)
-
         if not credit_seats:
             msg = _(
                 'Credit is not currently available for "{course_name}". If you are currently enrolled in the '
@@ -68,7 +68,7 @@ class Checkout(TemplateView):
             context.update({'error': msg})
             return context
 
-        providers = self._get_providers_detail(credit_seats)
+        providers = self._get_providers_detail(credit_seats, stockrecords, lms_providers)
         if not providers:
             context.update({
                 'error': _('An error has occurred. We could not confirm that the institution you selected offers this '
@@ -92,18 +92,49 @@ class Checkout(TemplateView):
     def get(self, request, *args, **kwargs):
         return super(Checkout, self).get(request, args, **kwargs)
 
-    def _check_credit_eligibility(self, user, course_key):
+    def _get_credit_seats(self, course):
+        """ Get the credit seats of the course which are available to buy from the site's partner.
+
+        Arguments:
+            course (Course): Course whose credit seats should be returned.
+
+        Returns:
+            A tuple of the list of credit seats, and of a dict of their stock records keyed by product ID.
+        """
+        partner = get_partner_for_site(self.request)
+        strategy = self.request.strategy
+        credit_seats = []
+        stockrecords = {}
+
+        # The stock records of the seats are prefetched along with them.
+        for seat in course.seat_products:
+            # Audit seats do not have a `certificate_type` attribute, so
+            # we use getattr to avoid an exception.
+            if getattr(seat.attr, 'certificate_type', None) != self.CREDIT_MODE:
+                continue
+
+            stockrecord = next(
+                (stockrecord for stockrecord in seat.stockrecords.all() if stockrecord.partner_id == partner.id), None
+            )
+            purchase_info = strategy.fetch_for_product(seat)
+            if purchase_info.availability.is_available_to_buy and stockrecord:
+                credit_seats.append(seat)
+                stockrecords[seat.id] = stockrecord
+
+        return credit_seats, stockrecords
+
+    def _check_credit_eligibility(self, user, course_key, credit_api_client):
         """ Check that the user is eligible for credit.
 
         Arguments:
             user(User): User object for which checking the eligibility.
             course_key(string): The course identifier.
+            credit_api_client (EdxRestApiClient): Client of the Credit API.
 
         Returns:
             Eligibility deadline date or None if user is not eligible.
         """
         try:
-            credit_api_client = self.request.site.siteconfiguration.credit_api_client
             eligibilities = credit_api_client.eligibility.get(username=user.username, course_key=course_key)
             if not eligibilities:
                 return None
@@ -119,11 +150,13 @@ class Checkout(TemplateView):
             )
             return None
 
-    def _get_providers_detail(self, credit_seats):
+    def _get_providers_detail(self, credit_seats, stockrecords, providers):
         """ Get details for the credit providers for the given credit seats.
 
         Arguments:
             credit_seats (Products[]): List of credit_seats objects.
+            stockrecords (dict): Stock records of the credit seats, keyed by product ID.
+            providers (list): Providers of the credit seats, as returned by the LMS.
 
         Returns:
             A list of dictionaries with provider(s) detail.
@@ -134,17 +167,16 @@ class Checkout(TemplateView):
             discount_type = voucher.benefit.type
             discount_value = voucher.benefit.value
 
-        providers = self._get_providers_from_lms(credit_seats)
         if not providers:
             return None
 
         providers_dict = {}
         for provider in providers:
-            providers_dict[provider['id']] = provider
+            # The providers are cached, and should not be updated in place.
+            providers_dict[provider['id']] = dict(provider)
 
-        partner = get_partner_for_site(self.request)
         for seat in credit_seats:
-            stockrecord = seat.stockrecords.filter(partner=partner).first()
+            stockrecord = stockrecords[seat.id]
             new_price = None
             discount = None
             if code:
@@ -167,6 +199,8 @@ class Checkout(TemplateView):
     def _get_providers_from_lms(self, credit_seats):
         """ Helper method for getting provider info from LMS.
 
+        The providers are cached for CREDIT_PROVIDER_CACHE_TIMEOUT seconds.
+
         Arguments:
             credit_seats (Products): List of credit_seats objects.
 
@@ -175,10 +209,18 @@ class Checkout(TemplateView):
         """
 
         provider_ids = ",".join([seat.attr.credit_provider for seat in credit_seats if seat.attr.credit_provider])
+        cache_key = get_cache_key(
+            site_domain=self.request.site.domain,
+            resource='credit_providers',
+            provider_ids=provider_ids,
+        )
 
-        try:
+        def fetch():
             credit_api_client = self.request.site.siteconfiguration.credit_api_client
             return credit_api_client.providers.get(provider_ids=provider_ids)
+
+        try:
+            return get_or_fetch('credit_provider', cache_key, fetch, settings.CREDIT_PROVIDER_CACHE_TIMEOUT)
         except SlumberHttpBaseException:
             logger.exception('An error occurred while retrieving credit provider details.')
             return None
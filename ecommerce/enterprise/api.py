@@ -12,6 +12,7 @@ from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import Timeout
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.cache_utils import get_or_fetch
 from ecommerce.core.utils import get_cache_key
 from ecommerce.enterprise.utils import get_enterprise_id_for_current_request_user_from_jwt
 
@@ -136,15 +137,11 @@ def catalog_contains_course_runs(site, course_run_ids, enterprise_customer_uuid,
         query_params=urlencode(query_params, True)
     )
 
-    contains_content_cached_response = TieredCache.get_cached_response(cache_key)
-    if contains_content_cached_response.is_found:
-        return contains_content_cached_response.value
+    def fetch():
+        endpoint = getattr(api, api_resource_name)(api_resource_id)
+        return endpoint.contains_content_items.get(**query_params)['contains_content_items']
 
-    endpoint = getattr(api, api_resource_name)(api_resource_id)
-    contains_content = endpoint.contains_content_items.get(**query_params)['contains_content_items']
-    TieredCache.set_all_tiers(cache_key, contains_content, settings.ENTERPRISE_API_CACHE_TIMEOUT)
-
-    return contains_content
+    return get_or_fetch('enterprise_contains_content', cache_key, fetch, settings.ENTERPRISE_API_CACHE_TIMEOUT)
 
 
 def get_enterprise_id_for_user(site, user):
@@ -5,6 +5,8 @@ import logging
 from datetime import datetime
 
 from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from ecommerce_worker.sailthru.v1.tasks import send_code_assignment_nudge_email
 
@@ -13,6 +15,7 @@ from ecommerce.programs.custom import get_model
 CodeAssignmentNudgeEmails = get_model('offer', 'CodeAssignmentNudgeEmails')
 CodeAssignmentNudgeEmailTemplates = get_model('offer', 'CodeAssignmentNudgeEmailTemplates')
 OfferAssignment = get_model('offer', 'OfferAssignment')
+Voucher = get_model('voucher', 'Voucher')
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -23,6 +26,16 @@ class Command(BaseCommand):
     Send the code assignment nudge emails.
     """
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            default=500,
+            help='Number of nudge emails marked as sent, and added to the email sending queue, in each batch.',
+            type=int,
+        )
+
     @staticmethod
     def _get_nudge_emails():
         """
@@ -36,6 +49,7 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        batch_size = options['batch_size']
         send_nudge_email_count = 0
         nudge_emails = self._get_nudge_emails()
         total_nudge_emails_count = nudge_emails.count()
@@ -43,28 +57,75 @@ class Command(BaseCommand):
             '[Code Assignment Nudge Email] Total count of Enterprise Nudge Emails that are scheduled for today is %s.',
             total_nudge_emails_count
         )
-        for nudge_email in nudge_emails:
-            # Get the formatted email body and subject on the bases of given code.
-            email_body, email_subject = nudge_email.email_template.get_email_content(
-                nudge_email.user_email,
-                nudge_email.code
+        last_nudge_email_id = 0
+        while True:
+            nudge_emails_batch = list(
+                nudge_emails.filter(pk__gt=last_nudge_email_id).select_related('email_template').order_by('pk')[
+                    :batch_size
+                ]
             )
-            if email_body:
-                nudge_email.already_sent = True
-                nudge_email.save()
-                send_nudge_email_count += 1
-                send_code_assignment_nudge_email.delay(nudge_email.user_email, email_subject, email_body)
-                self.set_last_reminder_date(nudge_email.user_email, nudge_email.code)
+            if not nudge_emails_batch:
+                break
+            last_nudge_email_id = nudge_emails_batch[-1].pk
+            send_nudge_email_count += self.send_nudge_emails(nudge_emails_batch)
         logger.info(
             '[Code Assignment Nudge Email] %s out of %s added to the email sending queue.',
             send_nudge_email_count,
             total_nudge_emails_count
         )
 
+    def send_nudge_emails(self, nudge_emails):
+        """
+        Send the given nudge emails, and return the number of emails added to the email sending queue.
+
+        The nudge emails are marked as sent, and the reminder dates of their offer assignments are set, in a single
+        transaction before the emails are queued. Emails already sent by a previous or concurrent run of the command
+        are skipped, so that running the command again after a failure does not send any email twice.
+        """
+        emails = []
+        with transaction.atomic():
+            unsent_nudge_email_ids = set(
+                CodeAssignmentNudgeEmails.objects.select_for_update().filter(
+                    pk__in=[nudge_email.pk for nudge_email in nudge_emails],
+                    already_sent=False
+                ).values_list('pk', flat=True)
+            )
+            nudge_emails = [nudge_email for nudge_email in nudge_emails if nudge_email.pk in unsent_nudge_email_ids]
+            vouchers = {
+                voucher.code: voucher
+                for voucher in Voucher.objects.filter(
+                    code__in={nudge_email.code for nudge_email in nudge_emails}
+                ).prefetch_related('offers__condition')
+            }
+            for nudge_email in nudge_emails:
+                # Get the formatted email body and subject on the bases of given code.
+                email_body, email_subject = nudge_email.email_template.get_voucher_email_content(
+                    nudge_email.user_email,
+                    nudge_email.code,
+                    vouchers.get(nudge_email.code)
+                )
+                if email_body:
+                    emails.append((nudge_email, email_subject, email_body))
+
+            if emails:
+                CodeAssignmentNudgeEmails.objects.filter(
+                    pk__in=[nudge_email.pk for nudge_email, __, __ in emails]
+                ).update(already_sent=True, modified=timezone.now())
+                self.set_last_reminder_dates(
+                    [(nudge_email.user_email, nudge_email.code) for nudge_email, __, __ in emails]
+                )
+
+        for nudge_email, email_subject, email_body in emails:
+            send_code_assignment_nudge_email.delay(nudge_email.user_email, email_subject, email_body)
+        return len(emails)
+
     @staticmethod
-    def set_last_reminder_date(email, code):
+    def set_last_reminder_dates(email_code_pairs):
         """
-        Set reminder date for offer assignments with `email` and `code`.
+        Set reminder date for offer assignments with each of the (`email`, `code`) pairs.
         """
         current_date_time = timezone.now()
-        OfferAssignment.objects.filter(code=code, user_email=email).update(last_reminder_date=current_date_time)
+        offer_assignments = Q()
+        for email, code in set(email_code_pairs):
+            offer_assignments |= Q(code=code, user_email=email)
+        OfferAssignment.objects.filter(offer_assignments).update(last_reminder_date=current_date_time)
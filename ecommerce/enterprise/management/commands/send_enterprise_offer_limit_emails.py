@@ -5,7 +5,7 @@ import logging
 from datetime import datetime
 
 from django.core.management import BaseCommand
-from django.db.models import Sum
+from django.db.models import OuterRef, Subquery, Sum
 from ecommerce_worker.sailthru.v1.tasks import send_offer_usage_email
 
 from ecommerce.extensions.fulfillment.status import ORDER
@@ -33,17 +33,31 @@ class Command(BaseCommand):
     Send the enterprise offer limits emails.
     """
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            default=500,
+            help='Number of offers whose usage is computed, and whose emails are queued, in each batch.',
+            type=int,
+        )
+
     @staticmethod
     def is_eligible_for_alert(enterprise_offer):
         """
         Return the bool whether given offer is eligible for sending the email.
+
+        The offer must be annotated with the creation date of its last usage email, see `_get_enterprise_offers`.
         """
-        offer_usage = OfferUsageEmail.objects.filter(offer=enterprise_offer).last()
-        diff_of_days = datetime.now().toordinal() - offer_usage.created.toordinal() if offer_usage else 0
+        last_usage_email_created = enterprise_offer.last_usage_email_created
+        diff_of_days = (
+            datetime.now().toordinal() - last_usage_email_created.toordinal() if last_usage_email_created else 0
+        )
 
         if not enterprise_offer.max_global_applications and not enterprise_offer.max_discount:
             is_eligible = False
-        elif not offer_usage:
+        elif not last_usage_email_created:
             is_eligible = True
         elif enterprise_offer.usage_email_frequency == ConditionalOffer.DAILY:
             is_eligible = diff_of_days >= 1
@@ -62,26 +76,34 @@ class Command(BaseCommand):
         return int(offer.max_global_applications), percentage_usage, int(offer.num_orders)
 
     @staticmethod
-    def get_booking_limits(offer):
+    def get_booking_limits(offer, total_used_discount_amount):
         """
         Return the total discount limit, percentage usage and current usage of booking limit.
         """
-        total_used_discount_amount = OrderDiscount.objects.filter(
-            offer_id=offer.id,
-            order__status=ORDER.COMPLETE
-        ).aggregate(Sum('amount'))['amount__sum']
         total_used_discount_amount = total_used_discount_amount if total_used_discount_amount else 0
 
         percentage_usage = int((total_used_discount_amount / offer.max_discount) * 100)
         return int(offer.max_discount), percentage_usage, int(total_used_discount_amount)
 
-    def get_email_content(self, offer):
+    @staticmethod
+    def get_used_discount_amounts(offers):
+        """
+        Return the total discount amount of the complete orders of each offer, by offer ID.
+        """
+        return dict(
+            OrderDiscount.objects.filter(
+                offer_id__in=[offer.id for offer in offers],
+                order__status=ORDER.COMPLETE
+            ).values('offer_id').annotate(amount_sum=Sum('amount')).values_list('offer_id', 'amount_sum')
+        )
+
+    def get_email_content(self, offer, total_used_discount_amount=None):
         """
         Return the appropriate email body and subject of given offer.
         """
         is_enrollment_limit_offer = bool(offer.max_global_applications)
         total_limit, percentage_usage, current_usage = self.get_enrollment_limits(offer) if is_enrollment_limit_offer \
-            else self.get_booking_limits(offer)
+            else self.get_booking_limits(offer, total_used_discount_amount)
 
         email_body = EMAIL_BODY.format(
             percentage_usage=percentage_usage,
@@ -95,33 +117,66 @@ class Command(BaseCommand):
     @staticmethod
     def _get_enterprise_offers():
         """
-        Return the enterprise offers which have opted for email usage alert.
+        Return the enterprise offers which have opted for email usage alert, annotated with the creation date of
+        their last usage email.
         """
+        last_usage_email = OfferUsageEmail.objects.filter(offer=OuterRef('pk')).order_by('-pk')
         return ConditionalOffer.objects.filter(
             emails_for_usage_alert__isnull=False,
             condition__enterprise_customer_uuid__isnull=False
-        ).exclude(emails_for_usage_alert='')
+        ).exclude(emails_for_usage_alert='').annotate(
+            last_usage_email_created=Subquery(last_usage_email.values('created')[:1])
+        ).order_by('pk')
+
+    def send_emails(self, enterprise_offers):
+        """
+        Create the usage email records of the offers at once, then add their emails to the email sending queue.
+        """
+        used_discount_amounts = self.get_used_discount_amounts(
+            [offer for offer in enterprise_offers if not offer.max_global_applications]
+        )
+        emails = []
+        for enterprise_offer in enterprise_offers:
+            logger.info(
+                '[Offer Usage Alert] Sending email for Offer with Name %s, ID %s',
+                enterprise_offer.name,
+                enterprise_offer.id
+            )
+            email_body, email_subject = self.get_email_content(
+                enterprise_offer, used_discount_amounts.get(enterprise_offer.id)
+            )
+            emails.append((enterprise_offer, email_subject, email_body))
+
+        OfferUsageEmail.objects.bulk_create([
+            OfferUsageEmail(offer=enterprise_offer, offer_email_metadata={
+                'email_body': email_body,
+                'email_subject': email_subject,
+                'email_addresses': enterprise_offer.emails_for_usage_alert
+            })
+            for enterprise_offer, email_subject, email_body in emails
+        ])
+        for enterprise_offer, email_subject, email_body in emails:
+            send_offer_usage_email.delay(enterprise_offer.emails_for_usage_alert, email_subject, email_body)
 
     def handle(self, *args, **options):
+        batch_size = options['batch_size']
         send_enterprise_offer_count = 0
         enterprise_offers = self._get_enterprise_offers()
         total_enterprise_offers_count = enterprise_offers.count()
         logger.info('[Offer Usage Alert] Total count of enterprise offers is %s.', total_enterprise_offers_count)
-        for enterprise_offer in enterprise_offers:
+
+        eligible_offers = []
+        for enterprise_offer in enterprise_offers.iterator():
             if self.is_eligible_for_alert(enterprise_offer):
-                logger.info(
-                    '[Offer Usage Alert] Sending email for Offer with Name %s, ID %s',
-                    enterprise_offer.name,
-                    enterprise_offer.id
-                )
-                send_enterprise_offer_count += 1
-                email_body, email_subject = self.get_email_content(enterprise_offer)
-                OfferUsageEmail.create_record(enterprise_offer, meta_data={
-                    'email_body': email_body,
-                    'email_subject': email_subject,
-                    'email_addresses': enterprise_offer.emails_for_usage_alert
-                })
-                send_offer_usage_email.delay(enterprise_offer.emails_for_usage_alert, email_subject, email_body)
+                eligible_offers.append(enterprise_offer)
+            if len(eligible_offers) == batch_size:
+                self.send_emails(eligible_offers)
+                send_enterprise_offer_count += len(eligible_offers)
+                eligible_offers = []
+        if eligible_offers:
+            self.send_emails(eligible_offers)
+            send_enterprise_offer_count += len(eligible_offers)
+
         logger.info(
             '[Offer Usage Alert] %s of %s added to the email sending queue.',
             total_enterprise_offers_count,
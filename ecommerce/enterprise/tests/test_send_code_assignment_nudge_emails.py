@@ -11,6 +11,7 @@ from django.core.management import call_command
 from django.utils import timezone
 from testfixtures import LogCapture
 
+from ecommerce.enterprise.management.commands.send_code_assignment_nudge_emails import Command
 from ecommerce.extensions.test.factories import (
     CodeAssignmentNudgeEmailsFactory,
     EnterpriseOfferFactory,
@@ -132,3 +133,35 @@ class SendCodeAssignmentNudgeEmailsTests(TestCase):
                 )
             )
         )
+
+    def test_nudge_email_command_batches(self):
+        """
+        Test that the nudge emails are sent in batches, with a number of queries which does not grow with the number
+        of nudge emails in a batch.
+        """
+        with mock.patch('ecommerce_worker.sailthru.v1.tasks.send_code_assignment_nudge_email.delay') as mock_send_email:
+            with self.assertNumQueries(29):
+                call_command('send_code_assignment_nudge_emails', batch_size=2)
+            assert mock_send_email.call_count == self.total_nudge_emails_for_today
+
+            CodeAssignmentNudgeEmails.objects.update(already_sent=False)
+            mock_send_email.reset_mock()
+            with self.assertNumQueries(11):
+                call_command('send_code_assignment_nudge_emails', batch_size=self.total_nudge_emails_for_today)
+            assert mock_send_email.call_count == self.total_nudge_emails_for_today
+        self.assert_last_reminder_date()
+
+    def test_nudge_email_command_resumed(self):
+        """
+        Test that nudge emails already sent by a previous run of the command are not sent again.
+        """
+        nudge_emails = list(CodeAssignmentNudgeEmails.objects.filter(pk__in=[email.pk for email in self.nudge_emails]))
+        CodeAssignmentNudgeEmails.objects.filter(pk=nudge_emails[0].pk).update(already_sent=True)
+        with mock.patch('ecommerce_worker.sailthru.v1.tasks.send_code_assignment_nudge_email.delay') as mock_send_email:
+            sent_count = Command().send_nudge_emails(nudge_emails)
+            assert sent_count == self.total_nudge_emails_for_today - 1
+            assert mock_send_email.call_count == self.total_nudge_emails_for_today - 1
+            assert nudge_emails[0].user_email not in [call[0][0] for call in mock_send_email.call_args_list]
+
+            assert Command().send_nudge_emails(nudge_emails) == 0
+            assert mock_send_email.call_count == self.total_nudge_emails_for_today - 1
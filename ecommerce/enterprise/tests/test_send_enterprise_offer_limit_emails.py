@@ -7,8 +7,10 @@ import logging
 
 import mock
 from django.core.management import call_command
+from oscar.test.factories import OrderDiscountFactory, OrderFactory
 from testfixtures import LogCapture
 
+from ecommerce.extensions.fulfillment.status import ORDER
 from ecommerce.extensions.test.factories import EnterpriseOfferFactory
 from ecommerce.programs.custom import get_model
 from ecommerce.tests.testcases import TestCase
@@ -88,3 +90,36 @@ class SendEnterpriseOfferLimitEmailsTests(TestCase):
                 )
             )
         )
+
+    def test_command_booking_usage(self):
+        """
+        Test that the booking usage of the offers is the total discount of their complete orders.
+        """
+        ConditionalOffer.objects.all().delete()
+        offer = EnterpriseOfferFactory(max_discount=100)
+        for amount, order_status in ((10, ORDER.COMPLETE), (15, ORDER.COMPLETE), (50, ORDER.OPEN)):
+            order = OrderFactory(status=order_status)
+            OrderDiscountFactory(order=order, offer_id=offer.id, amount=amount)
+
+        with mock.patch('ecommerce_worker.sailthru.v1.tasks.send_offer_usage_email.delay') as mock_send_email:
+            call_command('send_enterprise_offer_limit_emails')
+
+        email_body = mock_send_email.call_args[0][2]
+        self.assertIn('You have used 25% of the Booking Limit', email_body)
+        self.assertIn('Bookings Redeemed: 25$', email_body)
+        self.assertEqual(OfferUsageEmail.objects.get(offer=offer).offer_email_metadata['email_body'], email_body)
+
+    def test_command_query_count(self):
+        """
+        Test that the number of queries does not grow with the number of offers in a batch.
+        """
+        with mock.patch('ecommerce_worker.sailthru.v1.tasks.send_offer_usage_email.delay'):
+            with self.assertNumQueries(4):
+                call_command('send_enterprise_offer_limit_emails')
+
+            for __ in range(5):
+                EnterpriseOfferFactory(max_global_applications=10)
+                EnterpriseOfferFactory(max_discount=100)
+            OfferUsageEmail.objects.all().delete()
+            with self.assertNumQueries(4):
+                call_command('send_enterprise_offer_limit_emails')
@@ -22,6 +22,7 @@ from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import Timeout
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.cache_utils import get_or_fetch
 from ecommerce.core.constants import SYSTEM_ENTERPRISE_LEARNER_ROLE
 from ecommerce.core.url_utils import absolute_url, get_lms_dashboard_url
 from ecommerce.enterprise.exceptions import EnterpriseDoesNotExist
@@ -66,36 +67,29 @@ def get_enterprise_customer(site, uuid):
         enterprise_uuid=uuid,
     )
     cache_key = hashlib.md5(cache_key.encode('utf-8')).hexdigest()
-    cached_response = TieredCache.get_cached_response(cache_key)
-    if cached_response.is_found:
-        return cached_response.value
 
-    client = get_enterprise_api_client(site)
-    path = [resource, str(uuid)]
-    client = reduce(getattr, path, client)
+    def fetch():
+        client = get_enterprise_api_client(site)
+        path = [resource, str(uuid)]
+        client = reduce(getattr, path, client)
+        response = client.get()
+
+        return {
+            'name': response['name'],
+            'id': response['uuid'],
+            'enable_data_sharing_consent': response['enable_data_sharing_consent'],
+            'enforce_data_sharing_consent': response['enforce_data_sharing_consent'],
+            'contact_email': response.get('contact_email', ''),
+            'slug': response.get('slug')
+        }
 
     try:
-        response = client.get()
+        return get_or_fetch(
+            'enterprise_customer', cache_key, fetch, settings.ENTERPRISE_CUSTOMER_RESULTS_CACHE_TIMEOUT
+        )
     except (ReqConnectionError, SlumberHttpBaseException, Timeout):
         return None
 
-    enterprise_customer_response = {
-        'name': response['name'],
-        'id': response['uuid'],
-        'enable_data_sharing_consent': response['enable_data_sharing_consent'],
-        'enforce_data_sharing_consent': response['enforce_data_sharing_consent'],
-        'contact_email': response.get('contact_email', ''),
-        'slug': response.get('slug')
-    }
-
-    TieredCache.set_all_tiers(
-        cache_key,
-        enterprise_customer_response,
-        settings.ENTERPRISE_CUSTOMER_RESULTS_CACHE_TIMEOUT
-    )
-
-    return enterprise_customer_response
-
 
 def get_enterprise_customers(request):
     client = get_enterprise_api_client(request.site)
@@ -530,25 +524,21 @@ def get_enterprise_catalog(site, enterprise_catalog, limit, page, endpoint_reque
     )
     cache_key = hashlib.md5(cache_key.encode('utf-8')).hexdigest()
 
-    cached_response = TieredCache.get_cached_response(cache_key)
-    if cached_response.is_found:
-        return cached_response.value
+    def fetch():
+        client = get_enterprise_api_client(site)
+        path = [resource, str(enterprise_catalog)]
+        client = reduce(getattr, path, client)
 
-    client = get_enterprise_api_client(site)
-    path = [resource, str(enterprise_catalog)]
-    client = reduce(getattr, path, client)
-
-    response = client.get(
-        limit=limit,
-        page=page,
-    )
-
-    if endpoint_request_url:
-        response = update_paginated_response(endpoint_request_url, response)
+        response = client.get(
+            limit=limit,
+            page=page,
+        )
 
-    TieredCache.set_all_tiers(cache_key, response, settings.CATALOG_RESULTS_CACHE_TIMEOUT)
+        if endpoint_request_url:
+            response = update_paginated_response(endpoint_request_url, response)
+        return response
 
-    return response
+    return get_or_fetch('enterprise_catalog', cache_key, fetch, settings.CATALOG_RESULTS_CACHE_TIMEOUT)
 
 
 def get_enterprise_id_for_current_request_user_from_jwt():
@@ -12,7 +12,10 @@ from ecommerce.core.models import User  # pylint: disable=unused-import
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.analytics.utils import (
     ECOM_TRACKING_ID_FMT,
+    MonitoredSegmentClient,
     get_google_analytics_client_id,
+    get_segment_client,
+    get_tracking_context,
     parse_tracking_context,
     prepare_analytics_data,
     track_segment_event,
@@ -120,6 +123,43 @@ class UtilsTest(DiscoveryTestMixin, BasketMixin, TransactionTestCase):
             track_segment_event(self.site, user, event, properties)
             mock_track.assert_called_once_with(user_tracking_id, event, properties, context=context)
 
+    def test_segment_client_queue_full(self):
+        """ Events dropped because the Segment queue is full should be logged and recorded as a metric. """
+        client = MonitoredSegmentClient('fake-key', max_queue_size=1, send=False)
+        # Enable sending without starting the consumer thread, so that the queue is never drained.
+        client.send = True
+        with mock.patch('ecommerce.extensions.analytics.utils.monitoring_utils.set_custom_metric') as mock_metric:
+            with mock.patch('ecommerce.extensions.analytics.utils.logger.warning') as mock_warning:
+                self.assertTrue(client.track('user-id', 'first', {})[0])
+                mock_metric.assert_called_with('segment_queue_backpressure', True)
+                self.assertFalse(mock_warning.called)
+
+                self.assertFalse(client.track('user-id', 'second', {})[0])
+                mock_metric.assert_called_with('segment_event_dropped', 'second')
+                self.assertTrue(mock_warning.called)
+
+    def test_get_tracking_context_memoized(self):
+        """ The tracking context should only be parsed again if it has been replaced. """
+        user = self.create_user(tracking_context={'ga_client_id': 'test-client-id', 'lms_ip': '18.0.0.1'})
+        with mock.patch('ecommerce.extensions.analytics.utils.parse_tracking_context',
+                        wraps=parse_tracking_context) as mock_parse:
+            first = get_tracking_context(user)
+            second = get_tracking_context(user)
+            self.assertEqual(first, second)
+            self.assertEqual(mock_parse.call_count, 1)
+
+            user.tracking_context = {'ga_client_id': 'other-client-id'}
+            self.assertEqual(get_tracking_context(user)[1], 'other-client-id')
+            user.lms_user_id = None
+            self.assertEqual(get_tracking_context(user)[0], ECOM_TRACKING_ID_FMT.format(user.id))
+            self.assertEqual(mock_parse.call_count, 3)
+
+    def test_get_segment_client_shared(self):
+        """ A single Segment client should be shared by all callers using the same write key. """
+        client = get_segment_client('shared-key')
+        self.assertIs(get_segment_client('shared-key'), client)
+        self.assertIsNot(get_segment_client('other-key'), client)
+
     def test_translate_basket_line_for_segment(self):
         """ The method should return a dict formatted for Segment. """
         basket = create_basket(empty=True)
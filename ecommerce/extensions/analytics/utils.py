@@ -2,10 +2,14 @@
 
 import json
 import logging
+import threading
 from functools import wraps
 from urllib.parse import urlunsplit
 
+from analytics import Client as SegmentClient
+from django.conf import settings
 from django.db import transaction
+from edx_django_utils import monitoring as monitoring_utils
 
 from ecommerce.courses.utils import mode_for_product
 
@@ -13,6 +17,11 @@ logger = logging.getLogger(__name__)
 
 ECOM_TRACKING_ID_FMT = 'ecommerce-{}'
 
+# Segment clients are shared by every SiteConfiguration using the same write key. Each client owns a bounded
+# queue and a consumer thread which uploads events in batches, so there must be exactly one per key per process.
+_segment_clients = {}
+_segment_clients_lock = threading.Lock()
+
 
 def parse_tracking_context(user, usage=None):
     """
@@ -42,6 +51,91 @@ def parse_tracking_context(user, usage=None):
     return user_tracking_id, ga_client_id, lms_ip
 
 
+def get_tracking_context(user, usage=None):
+    """
+    Return the parsed tracking context for a user, memoized on the user instance.
+
+    Several Segment events are usually fired for the same user while handling a single request (e.g. basket
+    add/remove followed by checkout events). This avoids resolving the tracking context again for each of them.
+    The memoized value is discarded if the user's LMS user ID or tracking context is replaced.
+
+    Arguments:
+        user (User): An instance of the User model.
+        usage (string): Optional. A description of how the returned tuple will be used.
+
+    Returns:
+        Tuple of strings: user_tracking_id, ga_client_id, lms_ip
+    """
+    cached = getattr(user, '_parsed_tracking_context', None)
+    if cached and cached[0] == user.lms_user_id and cached[1] is user.tracking_context:
+        return cached[2]
+
+    tracking_context = parse_tracking_context(user, usage=usage)
+    user._parsed_tracking_context = (  # pylint: disable=protected-access
+        user.lms_user_id, user.tracking_context, tracking_context
+    )
+    return tracking_context
+
+
+class MonitoredSegmentClient(SegmentClient):
+    """
+    Segment client which records metrics about its queue.
+
+    Segment's client never blocks when its queue is full; the event is discarded instead. Queue depth is recorded
+    so backpressure from a slow Segment API is visible before events start being dropped.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('on_error', self._on_upload_error)
+        super(MonitoredSegmentClient, self).__init__(*args, **kwargs)
+
+    def _enqueue(self, msg):
+        success, msg = super(MonitoredSegmentClient, self)._enqueue(msg)
+        queue_size = self.queue.qsize()
+        monitoring_utils.set_custom_metric('segment_queue_size', queue_size)
+        if not success:
+            monitoring_utils.set_custom_metric('segment_event_dropped', msg.get('event', msg['type']))
+            logger.warning('Segment event [%s] was dropped because the queue is full (max size [%d]).',
+                           msg.get('event', msg['type']), self.queue.maxsize)
+        elif queue_size >= self.queue.maxsize * settings.SEGMENT_QUEUE_BACKPRESSURE_THRESHOLD:
+            monitoring_utils.set_custom_metric('segment_queue_backpressure', True)
+        return success, msg
+
+    @staticmethod
+    def _on_upload_error(error, batch):
+        monitoring_utils.set_custom_metric('segment_events_upload_failed', len(batch))
+        logger.warning('Failed to upload a batch of [%d] events to Segment: %s', len(batch), error)
+
+
+def get_segment_client(write_key):
+    """
+    Return the process-wide Segment client for the given write key, creating it if necessary.
+
+    Events are enqueued on the client's bounded in-memory queue without blocking, and uploaded in batches by the
+    client's consumer thread, so Segment latency never adds to request latency. The size of the queue is controlled
+    by the SEGMENT_MAX_QUEUE_SIZE setting.
+
+    Arguments:
+        write_key (str): Segment write key.
+
+    Returns:
+        MonitoredSegmentClient
+    """
+    client = _segment_clients.get(write_key)
+    if client is None:
+        with _segment_clients_lock:
+            client = _segment_clients.get(write_key)
+            if client is None:
+                client = MonitoredSegmentClient(
+                    write_key,
+                    debug=settings.DEBUG,
+                    max_queue_size=settings.SEGMENT_MAX_QUEUE_SIZE,
+                    send=settings.SEND_SEGMENT_EVENTS,
+                )
+                _segment_clients[write_key] = client
+    return client
+
+
 def silence_exceptions(msg):
     """Silences exceptions raised by the decorated function.
 
@@ -151,7 +245,7 @@ def track_segment_event(site, user, event, properties):
         logger.debug(msg)
         return False, msg
 
-    user_tracking_id, ga_client_id, lms_ip = parse_tracking_context(user, usage=event)
+    user_tracking_id, ga_client_id, lms_ip = get_tracking_context(user, usage=event)
     # construct a URL, so that hostname can be sent to GA.
     # For now, send a dummy value for path.  Segment parses the URL and sends
     # the host and path separately. When needed, the path can be fetched by adding:
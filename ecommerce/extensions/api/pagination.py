@@ -1,6 +1,7 @@
 
 
 from edx_rest_framework_extensions.paginators import DefaultPagination
+from rest_framework.pagination import BasePagination, CursorPagination
 from rest_framework_datatables.pagination import DatatablesPageNumberPagination
 
 
@@ -14,3 +15,73 @@ class PageNumberPagination(DatatablesPageNumberPagination):
 
 class DatatablesDefaultPagination(DefaultPagination, PageNumberPagination):
     """ Default Pagination for Datatables. """
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination ordered by the `cursor_ordering` of the view, e.g. ('-date_created', '-id').
+
+    Pages are fetched with a WHERE clause on the date of the last object of the previous page, which uses the
+    index on that date, instead of an OFFSET scan. No COUNT(*) query is run.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, 'cursor_ordering', None) or super(KeysetCursorPagination, self).get_ordering(
+            request, queryset, view
+        )
+
+
+class OptionalCursorPagination(BasePagination):
+    """
+    Paginates with page numbers, unless the client requests cursor pagination with `pagination=cursor`.
+
+    The next and previous links of cursor pages carry the `cursor` parameter, which also selects cursor
+    pagination, so clients only need to request it for the first page. Cursor pagination is only available
+    for the `cursor_pagination_actions` of the view, which paginate querysets ordered by its `cursor_ordering`.
+    """
+    page_number_pagination_class = PageNumberPagination
+    cursor_pagination_class = KeysetCursorPagination
+    paginator = None
+
+    def is_cursor_request(self, request, view):
+        if getattr(view, 'action', None) not in getattr(view, 'cursor_pagination_actions', ('list',)):
+            return False
+        return (
+            request.query_params.get('pagination') == 'cursor' or
+            self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_request(request, view):
+            self.paginator = self.cursor_pagination_class()
+        else:
+            self.paginator = self.page_number_pagination_class()
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_fields(self, view):
+        fields = self.page_number_pagination_class().get_schema_fields(view)
+        names = {field.name for field in fields}
+        return fields + [
+            field for field in self.cursor_pagination_class().get_schema_fields(view) if field.name not in names
+        ]
+
+    def get_schema_operation_parameters(self, view):
+        parameters = self.page_number_pagination_class().get_schema_operation_parameters(view)
+        names = {parameter['name'] for parameter in parameters}
+        return parameters + [
+            parameter for parameter in self.cursor_pagination_class().get_schema_operation_parameters(view)
+            if parameter['name'] not in names
+        ]
+
+
+class DatatablesOptionalCursorPagination(OptionalCursorPagination):
+    """ Pagination for Datatables, which integrations can switch to cursor pagination. """
+    page_number_pagination_class = DatatablesDefaultPagination
@@ -2,7 +2,7 @@
 
 
 import logging
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from decimal import Decimal
 from urllib.parse import urljoin
 
@@ -27,6 +27,8 @@ from ecommerce.core.constants import (
     ISO_8601_FORMAT,
     SEAT_PRODUCT_CLASS_NAME
 )
+from ecommerce.core.jobs import start_job
+from ecommerce.core.models import BackgroundJob
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.coupons.utils import is_coupon_available
@@ -912,8 +914,9 @@ class OfferAssignmentSummarySerializer(serializers.BaseSerializer):  # pylint: d
         representation['redemptions_remaining'] = instance['count']
         representation['code'] = offer_assignment.code
         representation['catalog'] = offer_assignment.offer.condition.enterprise_customer_catalog_uuid
-        representation['coupon_start_date'] = offer_assignment.offer.vouchers.first().start_datetime
-        representation['coupon_end_date'] = offer_assignment.offer.vouchers.first().end_datetime
+        # The dates of the first voucher of the offer are annotated by OfferAssignmentSummaryViewSet.
+        representation['coupon_start_date'] = offer_assignment.coupon_start_date
+        representation['coupon_end_date'] = offer_assignment.coupon_end_date
 
         return representation
 
@@ -1385,49 +1388,112 @@ class CouponCodeAssignmentSerializer(serializers.Serializer):  # pylint: disable
     )
     base_enterprise_url = serializers.URLField(required=False, write_only=True)
     enable_nudge_emails = serializers.BooleanField(default=False)
+    job_id = serializers.CharField(read_only=True)
 
     def create(self, validated_data):
-        """Create OfferAssignment objects for each email and the available_assignments determined from validation."""
+        """
+        Create OfferAssignment objects for each email and the available_assignments determined from validation.
+
+        Assignments to more than CODE_ASSIGNMENT_JOB_THRESHOLD emails are made by a background job, whose ID is
+        returned instead of the offer assignments.
+        """
         emails = validated_data.get('emails')
         voucher_usage_type = validated_data.pop('voucher_usage_type')
-        subject = validated_data.pop('subject')
-        greeting = validated_data.pop('greeting')
-        closing = validated_data.pop('closing')
-        enable_nudge_emails = validated_data.pop('enable_nudge_emails')
         available_assignments = validated_data.pop('available_assignments')
         email_iterator = iter(emails)
-        offer_assignments = []
-        emails_already_sent = set()
-        current_date_time = timezone.now()
-        base_enterprise_url = validated_data.pop('base_enterprise_url', '')
+        assignments = []
 
         for code in available_assignments:
             offer = available_assignments[code]['offer']
             email = next(email_iterator) if voucher_usage_type == Voucher.MULTI_USE_PER_CUSTOMER else None
             for _ in range(available_assignments[code]['num_slots']):
-                user_email = email or next(email_iterator)
-                new_offer_assignment = OfferAssignment.objects.create(
-                    offer=offer,
-                    code=code,
-                    user_email=user_email,
-                    assignment_date=current_date_time,
-                )
-                offer_assignments.append(new_offer_assignment)
-                # Start async email task. For MULTI_USE_PER_CUSTOMER, a single email is sent
-                email_code_pair = frozenset((new_offer_assignment.user_email, new_offer_assignment.code))
+                assignments.append((offer, code, email or next(email_iterator)))
+
+        coupon = self.context.get('coupon')
+        request = self.context.get('request')
+        assignment_kwargs = {
+            'subject': validated_data.pop('subject'),
+            'greeting': validated_data.pop('greeting'),
+            'closing': validated_data.pop('closing'),
+            'voucher_usage_type': voucher_usage_type,
+            'base_enterprise_url': validated_data.pop('base_enterprise_url', ''),
+            'enable_nudge_emails': validated_data.pop('enable_nudge_emails'),
+            'history_user': getattr(request, 'user', None),
+        }
+
+        if len(emails) > settings.CODE_ASSIGNMENT_JOB_THRESHOLD:
+            validated_data['job_id'] = start_job(
+                'code_assignment', assign_coupon_codes, len(assignments), coupon, assignments, assignment_kwargs,
+                context={'coupon_id': coupon.id}, user=assignment_kwargs['history_user']
+            )
+            validated_data['offer_assignments'] = []
+        else:
+            validated_data['offer_assignments'] = self._assign_codes(assignments, **assignment_kwargs)
+        return validated_data
+
+    def _assign_codes(self, assignments, progress=None, subject='', greeting='', closing='', voucher_usage_type=None,
+                      base_enterprise_url='', enable_nudge_emails=False, history_user=None):
+        """
+        Creates the offer assignments in batches, and sends each learner a single email per code.
+
+        Arguments:
+            assignments (list): (offer, code, user email) tuple of each offer assignment to create.
+            progress (JobProgress): Progress of the job making the assignments, if any.
+
+        Returns:
+            list: The created OfferAssignment objects.
+        """
+        batch_size = settings.CODE_ASSIGNMENT_BATCH_SIZE
+        code_expiration_date = retrieve_end_date(self.context.get('coupon'))
+        current_date_time = timezone.now()
+        offer_assignments = []
+        emails_already_sent = set()
+        created_ids = set()
+
+        for index in range(0, len(assignments), batch_size):
+            batch = assignments[index:index + batch_size]
+            with transaction.atomic():
+                OfferAssignment.objects.bulk_create([
+                    OfferAssignment(offer=offer, code=code, user_email=user_email, assignment_date=current_date_time)
+                    for offer, code, user_email in batch
+                ])
+                # bulk_create does not return the IDs of the objects on every database, so they are fetched again.
+                # Assignments of a code may be split across batches, so those of the previous batches are skipped.
+                new_offer_assignments = [
+                    offer_assignment for offer_assignment in OfferAssignment.objects.select_related('offer').filter(
+                        code__in={code for __, code, __ in batch}, assignment_date=current_date_time
+                    ).order_by('id')
+                    if offer_assignment.id not in created_ids
+                ]
+                # bulk_create does not send the signals that create historical records.
+                OfferAssignment.history.bulk_history_create(new_offer_assignments, default_user=history_user)
+
+            created_ids.update(offer_assignment.id for offer_assignment in new_offer_assignments)
+            offer_assignments.extend(new_offer_assignments)
+
+            # For MULTI_USE_PER_CUSTOMER, a single email is sent
+            assignments_to_email = []
+            for offer_assignment in new_offer_assignments:
+                email_code_pair = (offer_assignment.user_email, offer_assignment.code)
                 if email_code_pair not in emails_already_sent:
-                    # subscribe the user for nudge email if enable_nudge_emails flag is on.
-                    if enable_nudge_emails:
-                        CodeAssignmentNudgeEmails.subscribe_nudge_emails(
-                            user_email=user_email,
-                            code=code
-                        )
-                    self._trigger_email_sending_task(
-                        subject, greeting, closing, new_offer_assignment, voucher_usage_type, base_enterprise_url,
-                    )
                     emails_already_sent.add(email_code_pair)
-        validated_data['offer_assignments'] = offer_assignments
-        return validated_data
+                    assignments_to_email.append(offer_assignment)
+
+            # subscribe the users for nudge emails if enable_nudge_emails flag is on.
+            if enable_nudge_emails:
+                CodeAssignmentNudgeEmails.bulk_subscribe_nudge_emails(
+                    [(offer_assignment.user_email, offer_assignment.code) for offer_assignment in assignments_to_email]
+                )
+            for offer_assignment in assignments_to_email:
+                self._trigger_email_sending_task(
+                    subject, greeting, closing, offer_assignment, voucher_usage_type, base_enterprise_url,
+                    code_expiration_date=code_expiration_date,
+                )
+
+            if progress:
+                progress.advance(len(batch))
+
+        return offer_assignments
 
     def validate(self, attrs):
         """
@@ -1451,33 +1517,51 @@ class CouponCodeAssignmentSerializer(serializers.Serializer):  # pylint: disable
         # been assigned to or redeemed by the requested emails.
         voucher_usage_type = vouchers.first().usage
         if voucher_usage_type == Voucher.ONCE_PER_CUSTOMER:
-            existing_assignments_for_users = OfferAssignment.objects.filter(user_email__in=emails).exclude(
-                status__in=[OFFER_ASSIGNMENT_REVOKED]
-            )
-            existing_applications_for_users = VoucherApplication.objects.select_related('user').filter(
-                user__email__in=emails
+            existing_assignments_for_users = list(
+                OfferAssignment.objects.filter(user_email__in=emails).exclude(
+                    status__in=[OFFER_ASSIGNMENT_REVOKED]
+                ).values_list('code', 'user_email')
             )
-            codes_to_exclude = (
-                [assignment.code for assignment in existing_assignments_for_users] +
-                [application.voucher.code for application in existing_applications_for_users]
-            )
-            emails_requiring_exclusions = (
-                [assignment.user_email for assignment in existing_assignments_for_users] +
-                [application.user.email for application in existing_applications_for_users]
+            existing_applications_for_users = list(
+                VoucherApplication.objects.filter(user__email__in=emails).values_list('voucher__code', 'user__email')
             )
+            codes_to_exclude = {code for code, __ in existing_assignments_for_users + existing_applications_for_users}
+            emails_requiring_exclusions = {
+                email for __, email in existing_assignments_for_users + existing_applications_for_users
+            }
             logger.info(
                 'Excluding the following codes because they have been assigned to or redeemed by '
                 'at least one user in the given list of emails to assign to this coupon. '
                 'codes: %s, emails: %s, coupon_id: %s',
-                set(codes_to_exclude), set(emails_requiring_exclusions), coupon.id
+                codes_to_exclude, emails_requiring_exclusions, coupon.id
             )
             vouchers = vouchers.exclude(code__in=codes_to_exclude)
 
-        vouchers = vouchers.all()
-        prefetch_related_objects(vouchers, 'offers', 'offers__condition', 'offers__offerassignment_set')
+        vouchers = list(vouchers.all())
+        prefetch_related_objects(vouchers, 'offers', 'offers__condition')
+
+        # Count the assignments of all of the vouchers at once, rather than loading the assignments of each offer.
+        # Redeemed assignments are excluded in favor of using num_orders on the vouchers.
+        num_assignments = {
+            (assignment['offer_id'], assignment['code']): assignment['num_assignments']
+            for assignment in OfferAssignment.objects.filter(
+                code__in=[voucher.code for voucher in vouchers]
+            ).exclude(
+                status__in=[OFFER_REDEEMED, OFFER_ASSIGNMENT_REVOKED]
+            ).values('offer_id', 'code').annotate(num_assignments=Count('id')).order_by()
+        }
+
         total_slots = 0
         for voucher in vouchers:
-            available_slots = voucher.slots_available_for_assignment
+            enterprise_offer = voucher.enterprise_offer
+            # Assignment is only valid for Vouchers linked to an enterprise offer.
+            if not enterprise_offer:
+                continue
+
+            available_slots = voucher.calculate_available_slots(
+                enterprise_offer.max_global_applications,
+                num_assignments.get((enterprise_offer.id, voucher.code), 0)
+            )
             # If there are no available slots for this voucher, skip it.
             if available_slots < 1:
                 continue
@@ -1490,7 +1574,7 @@ class CouponCodeAssignmentSerializer(serializers.Serializer):  # pylint: disable
             if total_slots < len(emails):
                 # Keep track of which codes can be assigned how many times
                 # along with its corresponding ConditionalOffer.
-                available_assignments[voucher.code] = {'offer': voucher.enterprise_offer, 'num_slots': available_slots}
+                available_assignments[voucher.code] = {'offer': enterprise_offer, 'num_slots': available_slots}
 
                 # For Multi use per customer vouchers, all of the slots must go to one user email,
                 # so for accounting purposes we only count one slot here towards the total.
@@ -1513,12 +1597,11 @@ class CouponCodeAssignmentSerializer(serializers.Serializer):  # pylint: disable
         return attrs
 
     def _trigger_email_sending_task(self, subject, greeting, closing, assigned_offer, voucher_usage_type,
-                                    base_enterprise_url=''):
+                                    base_enterprise_url='', code_expiration_date=None):
         """
         Schedule async task to send email to the learner who has been assigned the code.
         """
-        coupon = self.context.get('coupon')
-        code_expiration_date = retrieve_end_date(coupon)
+        code_expiration_date = code_expiration_date or retrieve_end_date(self.context.get('coupon'))
         redemptions_remaining = (
             assigned_offer.offer.max_global_applications if voucher_usage_type == Voucher.MULTI_USE_PER_CUSTOMER else 1
         )
@@ -1546,6 +1629,17 @@ class CouponCodeAssignmentSerializer(serializers.Serializer):  # pylint: disable
             )
 
 
+def assign_coupon_codes(progress, coupon, assignments, assignment_kwargs):
+    """
+    Background job making large code assignments, see CouponCodeAssignmentSerializer.create.
+    """
+    serializer = CouponCodeAssignmentSerializer(context={'coupon': coupon})
+    offer_assignments = serializer._assign_codes(  # pylint: disable=protected-access
+        assignments, progress, **assignment_kwargs
+    )
+    return {'num_offer_assignments': len(offer_assignments)}
+
+
 class RefundedOrderCreateVoucherSerializer(serializers.Serializer):  # pylint: disable=abstract-method
     """
         Creates and assigns new coupon voucher to the user associated with the order.
@@ -1667,6 +1761,8 @@ class CouponCodeRevokeRemindBulkSerializer(serializers.ListSerializer):  # pylin
         """
         This implements the same relevant logic as ListSerializer except that if one or more items fail validation,
         processing for other items that did not fail will continue.
+
+        The offer assignments of all of the items are loaded at once before the items are validated.
         """
 
         if not isinstance(data, list):
@@ -1677,6 +1773,7 @@ class CouponCodeRevokeRemindBulkSerializer(serializers.ListSerializer):  # pylin
                 api_settings.NON_FIELD_ERRORS_KEY: [message]
             })
 
+        self.child.prefetch_offer_assignments(data)
         ret = []
 
         for item in data:
@@ -1700,16 +1797,19 @@ class CouponCodeRevokeRemindBulkSerializer(serializers.ListSerializer):  # pylin
 
     def create(self, validated_data):
         """
-        This selectively calls the child create method based on whether or not validation failed for each payload.
+        This selectively calls the child create_many method, in batches, with the payloads which passed validation.
         """
-        ret = []
-        for attrs in validated_data:
-            if 'non_field_errors' not in attrs and not any(isinstance(attrs[field], list) for field in attrs):
-                ret.append(self.child.create(attrs))
-            else:
-                ret.append(attrs)
+        valid_attrs = [
+            attrs for attrs in validated_data
+            if 'non_field_errors' not in attrs and not any(
+                isinstance(attrs[field], list) for field in attrs if field != 'offer_assignments'
+            )
+        ]
+        batch_size = settings.CODE_ASSIGNMENT_BATCH_SIZE
+        for index in range(0, len(valid_attrs), batch_size):
+            self.child.create_many(valid_attrs[index:index + batch_size])
 
-        return ret
+        return validated_data
 
     def to_representation(self, data):
         """
@@ -1729,6 +1829,43 @@ class CouponCodeRevokeRemindBulkSerializer(serializers.ListSerializer):  # pylin
 
 class CouponCodeMixin:
 
+    UNREDEEMED_STATUSES = [OFFER_ASSIGNED, OFFER_ASSIGNMENT_EMAIL_PENDING, OFFER_ASSIGNMENT_EMAIL_BOUNCED]
+
+    _coupon_codes = None
+    _offer_assignments = None
+
+    def prefetch_offer_assignments(self, data):
+        """
+        Load the codes of the coupon and the offer assignments of all of the given (code, email) items at once,
+        so that validating each item does not query the database.
+        :param data: (list): Items of the request, each with a code and an email
+        """
+        items = [item for item in data if isinstance(item, dict)]
+        codes = {str(item.get('code', '')).strip() for item in items}
+        emails = {str(item.get('email', '')).strip() for item in items}
+        coupon = self.context.get('coupon')
+
+        self._coupon_codes = (
+            codes,
+            set(coupon.attr.coupon_vouchers.vouchers.filter(code__in=codes).values_list('code', flat=True))
+        )
+        self._offer_assignments = defaultdict(list)
+        for offer_assignment in OfferAssignment.objects.filter(
+                code__in=codes,
+                user_email__in=emails,
+                status__in=self.UNREDEEMED_STATUSES + [OFFER_REDEEMED]
+        ).order_by('id'):
+            self._offer_assignments[(offer_assignment.code, offer_assignment.user_email)].append(offer_assignment)
+
+    def _get_prefetched_offer_assignments(self, code, email):
+        """
+        Returns the prefetched offer assignments associated with the code and email, or None if they were not
+        prefetched.
+        """
+        if self._offer_assignments is None or code not in self._coupon_codes[0]:
+            return None
+        return self._offer_assignments.get((code, email), [])
+
     def validate_coupon_has_code(self, coupon, code):
         """
         Validate that the code is associated with the coupon
@@ -1736,7 +1873,12 @@ class CouponCodeMixin:
         :param code: (str): Code associated with the voucher
         :raises rest_framework.exceptions.ValidationError in case code is not associated with the coupon
         """
-        if not coupon.attr.coupon_vouchers.vouchers.filter(code=code).exists():
+        if self._coupon_codes is not None and code in self._coupon_codes[0]:
+            has_code = code in self._coupon_codes[1]
+        else:
+            has_code = coupon.attr.coupon_vouchers.vouchers.filter(code=code).exists()
+
+        if not has_code:
             raise serializers.ValidationError('Code {} is not associated with this Coupon'.format(code))
 
     def get_unredeemed_offer_assignments(self, code, email):
@@ -1744,13 +1886,59 @@ class CouponCodeMixin:
         Returns offer assignments associated with the code and email
         :param code: (str): Code associated with the voucher
         :param email: (str): Learner email
-        :return: QuerySet containing offer assignments associated with the code and email
+        :return: list containing offer assignments associated with the code and email
         """
-        return OfferAssignment.objects.filter(
+        offer_assignments = self._get_prefetched_offer_assignments(code, email)
+        if offer_assignments is not None:
+            return [
+                offer_assignment for offer_assignment in offer_assignments
+                if offer_assignment.status in self.UNREDEEMED_STATUSES
+            ]
+
+        return list(OfferAssignment.objects.filter(
             code=code,
             user_email=email,
-            status__in=[OFFER_ASSIGNED, OFFER_ASSIGNMENT_EMAIL_PENDING, OFFER_ASSIGNMENT_EMAIL_BOUNCED]
-        )
+            status__in=self.UNREDEEMED_STATUSES
+        ))
+
+    def get_redeemed_offer_assignment_count(self, code, email):
+        """
+        Returns the number of redeemed offer assignments associated with the code and email
+        :param code: (str): Code associated with the voucher
+        :param email: (str): Learner email
+        """
+        offer_assignments = self._get_prefetched_offer_assignments(code, email)
+        if offer_assignments is not None:
+            return sum(1 for offer_assignment in offer_assignments if offer_assignment.status == OFFER_REDEEMED)
+
+        return OfferAssignment.objects.filter(code=code, user_email=email, status=OFFER_REDEEMED).count()
+
+    def update_offer_assignments(self, offer_assignments, **fields):
+        """
+        Update the given fields of the offer assignments with a single query, and record their history.
+        :param offer_assignments: (list): OfferAssignment objects
+        """
+        fields['modified'] = timezone.now()
+        OfferAssignment.objects.filter(
+            id__in=[offer_assignment.id for offer_assignment in offer_assignments]
+        ).update(**fields)
+        for offer_assignment in offer_assignments:
+            for name, value in fields.items():
+                setattr(offer_assignment, name, value)
+        # update does not send the signals that create historical records.
+        OfferAssignment.history.bulk_history_create(offer_assignments, update=True)
+
+    def create(self, validated_data):
+        return self.create_many([validated_data])[0]
+
+    def create_many(self, validated_items):
+        """
+        Abstract method processing a batch of validated items, which the bulk serializer calls instead of create.
+        Subclasses must implement it.
+        :param validated_items: (list): Validated data of the items
+        :return: (list): The processed items, each with a `detail` field
+        """
+        raise NotImplementedError
 
 
 class CouponCodeRevokeSerializer(CouponCodeMixin, serializers.Serializer):  # pylint: disable=abstract-method
@@ -1763,45 +1951,56 @@ class CouponCodeRevokeSerializer(CouponCodeMixin, serializers.Serializer):  # py
     detail = serializers.CharField(read_only=True)
     do_not_email = serializers.BooleanField(default=False)
 
-    def create(self, validated_data):
+    def create_many(self, validated_items):
         """
         Update OfferAssignments to have Revoked status.
         """
-        offer_assignments = validated_data.get('offer_assignments')
-        email = validated_data.get('email')
-        code = validated_data.get('code')
-
-        # `not` is used here to avoid double negative in the if condition in the code ahead.
-        # `should_send_revoke_email` shows whether a new email will be sent or not.
-        should_send_revoke_email = not validated_data.get('do_not_email')
-
         subject = self.context.get('subject')
         greeting = self.context.get('greeting')
         closing = self.context.get('closing')
-        detail = 'success'
         current_date_time = timezone.now()
 
         try:
-            for offer_assignment in offer_assignments:
-                offer_assignment.status = OFFER_ASSIGNMENT_REVOKED
-                offer_assignment.revocation_date = current_date_time
-                offer_assignment.save()
-
-            if should_send_revoke_email:
-                send_revoked_offer_email(
-                    subject=subject,
-                    greeting=greeting,
-                    closing=closing,
-                    learner_email=email,
-                    code=code
+            with transaction.atomic():
+                self.update_offer_assignments(
+                    [
+                        offer_assignment
+                        for validated_data in validated_items
+                        for offer_assignment in validated_data.get('offer_assignments') or []
+                    ],
+                    status=OFFER_ASSIGNMENT_REVOKED,
+                    revocation_date=current_date_time,
                 )
         except Exception as exc:  # pylint: disable=broad-except
-            logger.exception('[Offer Revocation] Encountered error when revoking code %s for user %s with '
-                             'subject %r, greeting %r and closing %r', code, email, subject, greeting, closing)
-            detail = str(exc)
+            logger.exception('[Offer Revocation] Encountered error when revoking %d codes', len(validated_items))
+            for validated_data in validated_items:
+                validated_data['detail'] = str(exc)
+            return validated_items
+
+        for validated_data in validated_items:
+            email = validated_data.get('email')
+            code = validated_data.get('code')
+            detail = 'success'
+
+            # `not` is used here to avoid double negative in the if condition in the code ahead.
+            # `should_send_revoke_email` shows whether a new email will be sent or not.
+            should_send_revoke_email = not validated_data.get('do_not_email')
+            try:
+                if should_send_revoke_email:
+                    send_revoked_offer_email(
+                        subject=subject,
+                        greeting=greeting,
+                        closing=closing,
+                        learner_email=email,
+                        code=code
+                    )
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception('[Offer Revocation] Encountered error when revoking code %s for user %s with '
+                                 'subject %r, greeting %r and closing %r', code, email, subject, greeting, closing)
+                detail = str(exc)
 
-        validated_data['detail'] = detail
-        return validated_data
+            validated_data['detail'] = detail
+        return validated_items
 
     def validate(self, attrs):
         """
@@ -1812,7 +2011,7 @@ class CouponCodeRevokeSerializer(CouponCodeMixin, serializers.Serializer):  # py
         coupon = self.context.get('coupon')
         self.validate_coupon_has_code(coupon, code)
         offer_assignments = self.get_unredeemed_offer_assignments(code, email)
-        if not offer_assignments.exists():
+        if not offer_assignments:
             raise serializers.ValidationError('No assignments exist for user {} and code {}'.format(email, code))
         attrs['offer_assignments'] = offer_assignments
         return attrs
@@ -1827,39 +2026,44 @@ class CouponCodeRemindSerializer(CouponCodeMixin, serializers.Serializer):  # py
     email = serializers.EmailField(required=True)
     detail = serializers.CharField(read_only=True)
 
-    def create(self, validated_data):
+    def create_many(self, validated_items):
         """
         Send remind email(s) for pending OfferAssignments.
         """
-        offer_assignments = validated_data.get('offer_assignments')
-        email = validated_data.get('email')
-        code = validated_data.get('code')
-        redeemed_offer_count = validated_data.get('redeemed_offer_count')
-        total_offer_count = validated_data.get('total_offer_count')
         subject = self.context.get('subject')
         greeting = self.context.get('greeting')
         closing = self.context.get('closing')
-        detail = 'success'
-        current_date_time = timezone.now()
+        code_expiration_date = retrieve_end_date(self.context.get('coupon'))
+        reminded_offer_assignments = []
 
-        try:
-            self._trigger_email_sending_task(
-                subject,
-                greeting,
-                closing,
-                offer_assignments.first(),
-                redeemed_offer_count,
-                total_offer_count
-            )
-            for offer_assignment in offer_assignments:
-                offer_assignment.last_reminder_date = current_date_time
-                offer_assignment.save()
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.exception('Encountered error during reminder email for code %s of user %s', code, email)
-            detail = str(exc)
+        for validated_data in validated_items:
+            offer_assignments = validated_data.get('offer_assignments')
+            detail = 'success'
 
-        validated_data['detail'] = detail
-        return validated_data
+            try:
+                self._trigger_email_sending_task(
+                    subject,
+                    greeting,
+                    closing,
+                    offer_assignments[0],
+                    validated_data.get('redeemed_offer_count'),
+                    validated_data.get('total_offer_count'),
+                    code_expiration_date=code_expiration_date,
+                )
+                reminded_offer_assignments.extend(offer_assignments)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception(
+                    'Encountered error during reminder email for code %s of user %s',
+                    validated_data.get('code'),
+                    validated_data.get('email')
+                )
+                detail = str(exc)
+
+            validated_data['detail'] = detail
+
+        if reminded_offer_assignments:
+            self.update_offer_assignments(reminded_offer_assignments, last_reminder_date=timezone.now())
+        return validated_items
 
     def validate(self, attrs):
         """
@@ -1870,26 +2074,21 @@ class CouponCodeRemindSerializer(CouponCodeMixin, serializers.Serializer):  # py
         coupon = self.context.get('coupon')
         self.validate_coupon_has_code(coupon, code)
         offer_assignments = self.get_unredeemed_offer_assignments(code, email)
-        offer_assignments_redeemed = OfferAssignment.objects.filter(
-            code=code,
-            user_email=email,
-            status=OFFER_REDEEMED
-        )
-        if not offer_assignments.exists():
+        if not offer_assignments:
             raise serializers.ValidationError('No assignments exist for user {} and code {}'.format(email, code))
         attrs['offer_assignments'] = offer_assignments
-        attrs['redeemed_offer_count'] = offer_assignments_redeemed.count()
-        attrs['total_offer_count'] = offer_assignments.count()
+        attrs['redeemed_offer_count'] = self.get_redeemed_offer_assignment_count(code, email)
+        attrs['total_offer_count'] = len(offer_assignments)
         return attrs
 
     def _trigger_email_sending_task(
-            self, subject, greeting, closing, assigned_offer, redeemed_offer_count, total_offer_count
+            self, subject, greeting, closing, assigned_offer, redeemed_offer_count, total_offer_count,
+            code_expiration_date=None
     ):
         """
         Schedule async task to send email to the learner who has been assigned the code.
         """
-        coupon = self.context.get('coupon')
-        code_expiration_date = retrieve_end_date(coupon)
+        code_expiration_date = code_expiration_date or retrieve_end_date(self.context.get('coupon'))
         try:
             send_assigned_offer_reminder_email(
                 subject=subject,
@@ -1913,3 +2112,28 @@ class CouponCodeRemindSerializer(CouponCodeMixin, serializers.Serializer):  # py
                 exc
             )
             raise
+
+
+class BackgroundJobSerializer(serializers.ModelSerializer):
+    """ Serializer for the status, progress and results of background jobs. """
+    id = serializers.SerializerMethodField()
+    context = serializers.JSONField(read_only=True)
+    result = serializers.JSONField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    def get_id(self, obj):
+        return obj.id.hex
+
+    def get_download_url(self, obj):
+        if not obj.result_file:
+            return None
+        return reverse(
+            'api:v2:background-jobs-download', kwargs={'pk': obj.id.hex}, request=self.context.get('request')
+        )
+
+    class Meta:
+        model = BackgroundJob
+        fields = (
+            'id', 'name', 'status', 'total', 'completed', 'context', 'result', 'error', 'download_url', 'created',
+            'modified',
+        )
@@ -1,6 +1,8 @@
 import datetime
 from unittest import mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from oscar.core.loading import get_model
 from testfixtures import LogCapture
 
@@ -10,6 +12,7 @@ from ecommerce.extensions.api.serializers import (
     CouponCodeRemindSerializer,
     CouponCodeRevokeSerializer
 )
+from ecommerce.extensions.offer.constants import OFFER_ASSIGNMENT_REVOKED
 from ecommerce.extensions.test import factories
 from ecommerce.tests.testcases import TestCase
 
@@ -211,7 +214,7 @@ class CouponCodeSerializerTests(CouponMixin, TestCase):
         validated_data = {
             'code': self.code,
             'email': self.email,
-            'offer_assignments': self.offer_assignments,
+            'offer_assignments': [self.offer_assignment],
         }
         context = {
             'coupon': self.coupon,
@@ -238,3 +241,61 @@ class CouponCodeSerializerTests(CouponMixin, TestCase):
         with LogCapture(self.LOGGER_NAME) as log:
             serializer.create(validated_data=validated_data)
             log.check_present(*expected)
+
+    def _remind(self, emails):
+        """ Remind each of the given emails, returning the response data and the number of queries run. """
+        serializer = CouponCodeRemindSerializer(
+            data=[{'code': self.code, 'email': email} for email in emails],
+            many=True,
+            context={'coupon': self.coupon, 'subject': self.SUBJECT, 'greeting': self.GREETING, 'closing': self.CLOSING}
+        )
+        with CaptureQueriesContext(connection) as queries:
+            with mock.patch('ecommerce.extensions.api.serializers.send_assigned_offer_reminder_email'):
+                assert serializer.is_valid()
+                serializer.save()
+        return serializer.data, len(queries)
+
+    def test_bulk_remind(self):
+        """ Verify the offer assignments of bulk reminders are loaded and updated with a constant number of queries. """
+        emails = ['learner{}@test.org'.format(index) for index in range(5)]
+        for email in emails:
+            OfferAssignment.objects.create(offer=self.offer_assignments[0], code=self.code, user_email=email)
+
+        __, num_queries = self._remind(emails[:1])
+        data, bulk_num_queries = self._remind(emails + ['unassigned@test.org'])
+
+        self.assertEqual(bulk_num_queries, num_queries)
+        self.assertEqual(data[:len(emails)], [
+            {'code': self.code, 'email': email, 'detail': 'success'} for email in emails
+        ])
+        self.assertEqual(data[-1], {
+            'code': self.code,
+            'email': 'unassigned@test.org',
+            'detail': 'failure',
+            'message': 'No assignments exist for user unassigned@test.org and code {}'.format(self.code),
+        })
+        for offer_assignment in OfferAssignment.objects.filter(user_email__in=emails):
+            self.assertIsNotNone(offer_assignment.last_reminder_date)
+            self.assertIsNotNone(offer_assignment.history.first().last_reminder_date)
+
+    @mock.patch('ecommerce.extensions.api.serializers.send_revoked_offer_email')
+    def test_bulk_revoke(self, mock_email):
+        """ Verify bulk revocations update the offer assignments at once, and report email failures per item. """
+        emails = ['learner{}@test.org'.format(index) for index in range(3)]
+        for email in emails:
+            OfferAssignment.objects.create(offer=self.offer_assignments[0], code=self.code, user_email=email)
+        mock_email.side_effect = [None, Exception('Ignore me - revocation'), None]
+
+        serializer = CouponCodeRevokeSerializer(
+            data=[{'code': self.code, 'email': email} for email in emails],
+            many=True,
+            context={'coupon': self.coupon, 'subject': self.SUBJECT, 'greeting': self.GREETING, 'closing': self.CLOSING}
+        )
+        assert serializer.is_valid()
+        serializer.save()
+
+        self.assertEqual([item['detail'] for item in serializer.data], ['success', 'Ignore me - revocation', 'success'])
+        self.assertEqual(
+            set(OfferAssignment.objects.filter(user_email__in=emails).values_list('status', flat=True)),
+            {OFFER_ASSIGNMENT_REVOKED}
+        )
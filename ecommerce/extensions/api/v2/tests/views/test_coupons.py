@@ -10,7 +10,9 @@ import ddt
 import httpretty
 import mock
 import pytz
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
 from oscar.core.loading import get_model
@@ -18,6 +20,7 @@ from oscar.test import factories
 from rest_framework import status
 from testfixtures import LogCapture
 
+from ecommerce.core.jobs import JOB_FAILED, JOB_SUCCEEDED, get_job
 from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.enterprise.conditions import AssignableEnterpriseCustomerCondition
@@ -452,6 +455,43 @@ class CouponViewSetFunctionalTest(CouponMixin, DiscoveryTestMixin, DiscoveryMock
         self.assertEqual(response_data['title'], 'New title')
         self.assertIsNone(response_data['email_domains'])
 
+    def get_async_job(self, method, path, data):
+        """Helper method sending a request with async=true and returning the background job it started."""
+        response = self.get_response(method, path + '?async=true', data)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = get_job(response.json()['job_id'])
+        self.assertEqual(job.created_by, self.user)
+        return job
+
+    def test_create_async(self):
+        """Test creating a coupon in a background job."""
+        self.data['title'] = 'Async coupon'
+        job = self.get_async_job('POST', COUPONS_LINK, self.data)
+
+        coupon = Product.objects.get(title='Async coupon')
+        self.assertEqual(job.name, 'coupon_creation')
+        self.assertEqual(job.status, JOB_SUCCEEDED)
+        self.assertEqual(job.result['status_code'], status.HTTP_200_OK)
+        self.assertEqual(job.result['data']['coupon_id'], coupon.id)
+
+    def test_create_async_invalid_data(self):
+        """Test the background job fails when the coupon is invalid."""
+        self.data.pop('title')
+        job = self.get_async_job('POST', COUPONS_LINK, self.data)
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertIn('400', job.error)
+
+    def test_update_async(self):
+        """Test updating a coupon in a background job."""
+        job = self.get_async_job(
+            'PUT', reverse('api:v2:coupons-detail', kwargs={'pk': self.coupon.id}), {'title': 'New title'}
+        )
+        self.assertEqual(job.name, 'coupon_update')
+        self.assertEqual(job.context, {'coupon_id': str(self.coupon.id)})
+        self.assertEqual(job.status, JOB_SUCCEEDED)
+        self.assertEqual(job.result['data']['title'], 'New title')
+        self.assertEqual(Product.objects.get(id=self.coupon.id).title, 'New title')
+
     def test_update_multi_offer_coupon(self):
         """Test updating a coupon that has unique offers under each offer."""
         self.data.update({
@@ -792,6 +832,21 @@ class CouponViewSetFunctionalTest(CouponMixin, DiscoveryTestMixin, DiscoveryMock
             self.assertEqual(voucher.offers.first().benefit.value, benefit_value)
             self.assertEqual(voucher.offers.first().max_global_applications, max_uses)
 
+    def test_update_coupon_offers_query_count(self):
+        """ Verify the offers of a coupon are updated with a number of queries independent of its vouchers. """
+        def update_offer_data(quantity, benefit_value):
+            coupon = self.create_coupon(title='Coupon with {} vouchers'.format(quantity), quantity=quantity)
+            vouchers = coupon.attr.coupon_vouchers.vouchers.all()
+            with CaptureQueriesContext(connection) as queries:
+                CouponViewSet().update_offer_data(
+                    request_data={'benefit_value': benefit_value}, vouchers=vouchers, site=self.site
+                )
+            for voucher in vouchers:
+                self.assertEqual([offer.benefit.value for offer in voucher.offers.all()], [benefit_value])
+            return len(queries)
+
+        self.assertEqual(update_offer_data(2, Decimal(54)), update_offer_data(50, Decimal(55)))
+
     def test_update_coupon_client(self):
         baskets = Basket.objects.filter(lines__product_id=self.coupon.id)
         basket = baskets.first()
@@ -12,6 +12,7 @@ import httpretty
 import mock
 import rules
 from django.conf import settings
+from django.db.models import Min
 from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
@@ -19,7 +20,7 @@ from django.utils.http import urlencode
 from django.utils.timezone import now
 from oscar.core.loading import get_model
 from oscar.test import factories
-from rest_framework import status
+from rest_framework import serializers, status
 from slumber.exceptions import SlumberHttpBaseException
 
 from ecommerce.core.constants import (
@@ -28,6 +29,7 @@ from ecommerce.core.constants import (
     SYSTEM_ENTERPRISE_ADMIN_ROLE,
     SYSTEM_ENTERPRISE_OPERATOR_ROLE
 )
+from ecommerce.core.jobs import JOB_SUCCEEDED, get_job
 from ecommerce.core.models import EcommerceFeatureRole, EcommerceFeatureRoleAssignment
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
@@ -42,7 +44,9 @@ from ecommerce.extensions.offer.constants import (
     DAY3,
     DAY10,
     DAY19,
+    OFFER_ASSIGNED,
     OFFER_ASSIGNMENT_EMAIL_BOUNCED,
+    OFFER_ASSIGNMENT_EMAIL_PENDING,
     OFFER_ASSIGNMENT_EMAIL_SUBJECT_LIMIT,
     OFFER_ASSIGNMENT_EMAIL_TEMPLATE_FIELD_LIMIT,
     OFFER_ASSIGNMENT_REVOKED,
@@ -1620,6 +1624,68 @@ class EnterpriseCouponViewSetRbacTests(
 
         self.assertEqual(overview_response, expected_results[0])
 
+    def test_export_codes(self):
+        """
+        Test that the codes of the enterprise's coupons are exported as CSV.
+        """
+        enterprise_id = self.data['enterprise_customer']['id']
+        for title in ('coupon-1', 'coupon-2'):
+            self.get_response('POST', ENTERPRISE_COUPONS_LINK, dict(self.data, title=title))
+        self.get_response(
+            'POST',
+            ENTERPRISE_COUPONS_LINK,
+            dict(self.data, title='coupon-3', enterprise_customer={'name': 'HPx', 'id': str(uuid4())})
+        )
+
+        url = reverse('api:v2:enterprise-coupons-export-codes', kwargs={'enterprise_id': enterprise_id})
+        response = self.get_response('GET', url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['content-type'], 'text/csv')
+
+        content = b''.join(response.streaming_content).decode('utf-8')
+        redeem_url = get_ecommerce_url(reverse('coupons:offer'))
+        self.assertIn('Enterprise Customer:,{}'.format(enterprise_id), content)
+        for title in ('coupon-1', 'coupon-2'):
+            coupon = Product.objects.get(title=title)
+            self.assertIn(title, content)
+            for voucher in coupon.attr.coupon_vouchers.vouchers.all():
+                self.assertIn('{code},{url}?code={code}'.format(code=voucher.code, url=redeem_url), content)
+        self.assertNotIn('coupon-3', content)
+
+        # Export the codes of a single coupon.
+        coupon = Product.objects.get(title='coupon-2')
+        response = self.get_response('GET', '{}?{}'.format(url, urlencode({'coupon_id': coupon.id})))
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertIn('coupon-2', content)
+        self.assertNotIn('coupon-1', content)
+
+        # Export the codes of the active coupons.
+        coupon.attr.inactive = True
+        coupon.save()
+        response = self.get_response('GET', '{}?{}'.format(url, urlencode({'filter': 'active'})))
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertIn('coupon-1', content)
+        self.assertNotIn('coupon-2', content)
+
+        response = self.get_response('GET', '{}?{}'.format(url, urlencode({'coupon_id': 'abc'})))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_codes_permission_denied(self):
+        """
+        Test that users without access to the enterprise cannot export its codes.
+        """
+        self.get_response('POST', ENTERPRISE_COUPONS_LINK, self.data)
+        EcommerceFeatureRoleAssignment.objects.all().delete()
+        self.set_jwt_cookie(system_wide_role=SYSTEM_ENTERPRISE_ADMIN_ROLE, context=str(uuid4()))
+        response = self.get_response(
+            'GET',
+            reverse(
+                'api:v2:enterprise-coupons-export-codes',
+                kwargs={'enterprise_id': self.data['enterprise_customer']['id']}
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     @ddt.data(
         {
             'voucher_type': Voucher.SINGLE_USE,
@@ -2032,6 +2098,51 @@ class EnterpriseCouponViewSetRbacTests(
         assert OfferAssignment.objects.filter(code=already_assigned_voucher.code).count() == 1
         assert OfferAssignment.objects.filter(code=already_redeemed_voucher.code).count() == 0
 
+    @override_settings(CODE_ASSIGNMENT_JOB_THRESHOLD=2, CODE_ASSIGNMENT_BATCH_SIZE=2)
+    def test_coupon_codes_assign_job(self):
+        """ Verify large assignments are made in batches by a background job, whose progress can be polled. """
+        coupon_post_data = dict(self.data, voucher_type=Voucher.MULTI_USE, quantity=2, max_uses=3)
+        coupon_id = self.get_response('POST', ENTERPRISE_COUPONS_LINK, coupon_post_data).json()['coupon_id']
+        self._create_nudge_email_templates()
+        emails = ['t{}@example.com'.format(index) for index in range(5)]
+
+        with mock.patch('ecommerce.extensions.offer.utils.send_offer_assignment_email.delay') as mock_send_email:
+            response = self.get_response(
+                'POST',
+                '/api/v2/enterprise/coupons/{}/assign/'.format(coupon_id),
+                {
+                    'template_subject': TEMPLATE_SUBJECT,
+                    'template_greeting': TEMPLATE_GREETING,
+                    'template_closing': TEMPLATE_CLOSING,
+                    'emails': emails,
+                    'enable_nudge_emails': True,
+                }
+            )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()['offer_assignments'] == []
+        assert mock_send_email.call_count == len(emails)
+
+        offer_assignments = OfferAssignment.objects.filter(user_email__in=emails).order_by('id')
+        assert [assignment.user_email for assignment in offer_assignments] == emails
+        assert [assignment.history.count() for assignment in offer_assignments] == [1] * len(emails)
+        assert CodeAssignmentNudgeEmails.objects.filter(user_email__in=emails).count() == 3 * len(emails)
+
+        status_path = '/api/v2/enterprise/coupons/{}/assign/{}/'.format(coupon_id, response.json()['job_id'])
+        response = self.get_response('GET', status_path)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'job_id': status_path.split('/')[-2],
+            'status': 'succeeded',
+            'total': len(emails),
+            'completed': len(emails),
+            'result': {'num_offer_assignments': len(emails)},
+            'error': None,
+        }
+
+        other_coupon_id = self.get_response('POST', ENTERPRISE_COUPONS_LINK, coupon_post_data).json()['coupon_id']
+        response = self.get_response('GET', status_path.replace(str(coupon_id), str(other_coupon_id)))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_coupon_codes_assign_once_per_customer_with_revoked_code(self):
         coupon_post_data = dict(self.data, voucher_type=Voucher.ONCE_PER_CUSTOMER, quantity=1)
         coupon = self.get_response('POST', ENTERPRISE_COUPONS_LINK, coupon_post_data)
@@ -2209,6 +2320,30 @@ class EnterpriseCouponViewSetRbacTests(
             self.assertEqual(OfferAssignment.objects.count(), existing_offer_assignment_count)
             self.assertEqual(mock_send_email.call_count, 0)
 
+    def test_create_refunded_voucher_async(self):
+        """ Test create refunded voucher in a background job."""
+        coupon_post_data = dict(self.data, voucher_type=Voucher.SINGLE_USE, quantity=2, max_uses=None)
+        coupon_id = self.get_response('POST', ENTERPRISE_COUPONS_LINK, coupon_post_data).json()['coupon_id']
+        vouchers = Product.objects.get(id=coupon_id).attr.coupon_vouchers.vouchers.all()
+        order = self.use_voucher(vouchers.first(), self.user)
+        existing_vouchers_count = vouchers.count()
+
+        with mock.patch('ecommerce.extensions.offer.utils.send_offer_assignment_email.delay'):
+            response = self.get_response(
+                'POST',
+                '/api/v2/enterprise/coupons/create_refunded_voucher/?async=true',
+                {
+                    "order": order.number
+                }
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = get_job(response.json()['job_id'])
+        self.assertEqual(job.name, 'refunded_order_voucher_creation')
+        self.assertEqual(job.status, JOB_SUCCEEDED)
+        self.assertDictContainsSubset({"order": str(order)}, job.result['data'])
+        self.assertEqual(vouchers.count(), existing_vouchers_count + 1)
+
     def test_create_refunded_voucher_with_coupon_could_not_assign(self):
         """ Test create refunded voucher when created successfully but failed at assign serializer."""
         coupon_post_data = dict(self.data, voucher_type=Voucher.SINGLE_USE, quantity=1, max_uses=None)
@@ -3438,6 +3573,40 @@ class OfferAssignmentSummaryViewSetTests(
             else:  # To test if response has something in it it shouldn't
                 assert False
 
+    def test_view_paginates_summaries(self):
+        """
+        View should return the requested page of summaries, in the order the codes were first assigned, with a number
+        of queries which does not depend on the number of offerAssignments.
+        """
+        summaries = OfferAssignment.objects.filter(
+            user_email=self.user.email,
+            status__in=[OFFER_ASSIGNED, OFFER_ASSIGNMENT_EMAIL_PENDING],
+        ).values('code').annotate(first_id=Min('id')).order_by('first_id')
+        codes = [summary['code'] for summary in summaries]
+        first_voucher = self.coupon1.coupon_vouchers.first().vouchers.order_by('pk').first()
+
+        with self.assertNumQueries(9):
+            response = self.client.get(OFFER_ASSIGNMENT_SUMMARY_LINK + '?page_size=2').json()
+        assert response['count'] == 3
+        assert [result['code'] for result in response['results']] == codes[:2]
+        assert response['results'][0]['coupon_start_date'] == serializers.DateTimeField().to_representation(
+            first_voucher.start_datetime
+        )
+
+        offer_assignment = OfferAssignment.objects.get(id=summaries[2]['first_id'])
+        OfferAssignment.objects.bulk_create([
+            OfferAssignment(offer=offer_assignment.offer, code=offer_assignment.code, user_email=self.user.email)
+            for __ in range(3)
+        ])
+        with self.assertNumQueries(9):
+            response = self.client.get(OFFER_ASSIGNMENT_SUMMARY_LINK + '?page_size=2&page=2').json()
+        assert [result['code'] for result in response['results']] == codes[2:]
+        assert response['results'][0]['redemptions_remaining'] == 10
+
+        response = self.client.get(OFFER_ASSIGNMENT_SUMMARY_LINK + '?format=datatables&length=-1')
+        assert response.status_code == 200
+        assert [result['code'] for result in response.json()['data']] == codes
+
 
 @ddt.ddt
 class OfferAssignmentEmailTemplatesViewSetTests(JwtMixin, TestCase):
@@ -0,0 +1,98 @@
+
+
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+
+from ecommerce.core.models import BackgroundJob
+from ecommerce.tests.testcases import TestCase
+
+
+class BackgroundJobViewSetTests(TestCase):
+    """ Tests for the background jobs API. """
+    list_path = reverse('api:v2:background-jobs-list')
+
+    def setUp(self):
+        super(BackgroundJobViewSetTests, self).setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_root_override = override_settings(MEDIA_ROOT=media_root)
+        media_root_override.enable()
+        self.addCleanup(media_root_override.disable)
+
+        self.user = self.create_user()
+        self.client.login(username=self.user.username, password=self.password)
+        self.job = BackgroundJob.objects.create(
+            name='test', total=2, completed=1, result={'partial': True}, created_by=self.user
+        )
+        self.other_job = BackgroundJob.objects.create(name='test', created_by=self.create_user())
+
+    def get_detail_path(self, job, action='detail'):
+        return reverse('api:v2:background-jobs-{}'.format(action), kwargs={'pk': job.id.hex})
+
+    def test_authentication_required(self):
+        """ Verify the endpoint requires an authenticated user. """
+        self.client.logout()
+        response = self.client.get(self.list_path)
+        self.assertEqual(response.status_code, 401)
+
+    def test_list(self):
+        """ Verify users only see their own jobs, and staff users see all of the jobs. """
+        response = self.client.get(self.list_path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job['id'] for job in response.json()['results']], [self.job.id.hex])
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(self.list_path)
+        self.assertEqual(
+            [job['id'] for job in response.json()['results']], [self.other_job.id.hex, self.job.id.hex]
+        )
+
+    @override_settings(BACKGROUND_JOB_STALE_TIMEOUT=60)
+    def test_list_stale(self):
+        """ Verify running jobs whose progress has not been updated for too long are reported as failed. """
+        BackgroundJob.objects.filter(pk=self.job.pk).update(
+            status=BackgroundJob.RUNNING, modified=now() - timedelta(seconds=61)
+        )
+        BackgroundJob.objects.filter(pk=self.other_job.pk).update(
+            status=BackgroundJob.RUNNING, modified=now() - timedelta(seconds=61)
+        )
+        response = self.client.get(self.list_path)
+        self.assertEqual([job['status'] for job in response.json()['results']], [BackgroundJob.FAILED])
+        self.assertEqual(BackgroundJob.objects.get(pk=self.other_job.pk).status, BackgroundJob.RUNNING)
+
+    def test_retrieve(self):
+        """ Verify the status, progress and partial results of a job are returned. """
+        response = self.client.get(self.get_detail_path(self.job))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['id'], self.job.id.hex)
+        self.assertEqual(data['status'], BackgroundJob.PENDING)
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['completed'], 1)
+        self.assertEqual(data['result'], {'partial': True})
+        self.assertIsNone(data['download_url'])
+
+        response = self.client.get(self.get_detail_path(self.other_job))
+        self.assertEqual(response.status_code, 404)
+
+    def test_download(self):
+        """ Verify the result file of a job can be downloaded. """
+        download_path = self.get_detail_path(self.job, 'download')
+        response = self.client.get(download_path)
+        self.assertEqual(response.status_code, 404)
+
+        self.job.result_file.save('results.csv', ContentFile('a,b\n1,2\n'))
+        response = self.client.get(self.get_detail_path(self.job))
+        self.assertEqual(response.json()['download_url'], self.get_full_url(download_path))
+
+        response = self.client.get(download_path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'a,b\n1,2\n')
+        self.assertIn('attachment', response['Content-Disposition'])
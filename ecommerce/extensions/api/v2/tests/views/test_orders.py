@@ -1,6 +1,9 @@
 
 
+import csv
 import json
+import shutil
+import tempfile
 from datetime import datetime
 from decimal import Decimal
 
@@ -8,6 +11,7 @@ import ddt
 import httpretty
 import mock
 import pytz
+from crum import set_current_request
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
 from django.test import RequestFactory, override_settings
@@ -15,13 +19,20 @@ from django.urls import reverse
 from oscar.core.loading import get_class, get_model
 from oscar.test import factories
 from rest_framework import status
+from threadlocals.threadlocals import set_thread_variable
 
+from ecommerce.core.jobs import start_job
+from ecommerce.core.models import BackgroundJob
 from ecommerce.coupons.tests.mixins import DiscoveryMockMixin
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
 from ecommerce.extensions.api.serializers import OrderSerializer
 from ecommerce.extensions.api.tests.test_authentication import AccessTokenMixin
 from ecommerce.extensions.api.v2.tests.views import OrderDetailViewTestMixin
+from ecommerce.extensions.api.v2.views.orders import (
+    ManualCourseEnrollmentOrderViewSet,
+    create_manual_enrollment_orders
+)
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.fulfillment.signals import SHIPPING_EVENT_NAME
 from ecommerce.extensions.fulfillment.status import LINE, ORDER
@@ -100,6 +111,30 @@ class OrderListViewTests(AccessTokenMixin, ThrottlingMixin, TestCase):
         self.assertEqual(content['results'][0]['number'], str(order_2.number))
         self.assertEqual(content['results'][1]['number'], str(order.number))
 
+    def test_cursor_pagination(self):
+        """ Verify clients can page through the orders with a cursor, in a stable order, without counting them. """
+        orders = [create_order(site=self.site, user=self.user) for __ in range(3)]
+        # Orders placed at the same time are ordered by ID.
+        Order.objects.filter(id__in=[order.id for order in orders[1:]]).update(date_placed=orders[1].date_placed)
+
+        response = self.client.get(self.path, {'pagination': 'cursor', 'page_size': 2}, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, 200)
+        content = response.json()
+        self.assertNotIn('count', content)
+        self.assertIsNone(content['previous'])
+        self.assertEqual(
+            [order['number'] for order in content['results']], [orders[2].number, orders[1].number]
+        )
+
+        response = self.client.get(content['next'], HTTP_AUTHORIZATION=self.token)
+        content = response.json()
+        self.assertIsNone(content['next'])
+        self.assertEqual([order['number'] for order in content['results']], [orders[0].number])
+
+        # Clients that do not request cursor pagination keep using page numbers.
+        response = self.client.get(self.path, {'page_size': 2}, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.json()['count'], 3)
+
     def test_with_other_users_orders(self):
         """ The view should only return orders for the authenticated users. """
         other_user = self.create_user()
@@ -891,6 +926,116 @@ class ManualCourseEnrollmentOrderViewSetTests(TestCase, DiscoveryMockMixin):
         self.assertEqual(order["status"], "failure")
         self.assertEqual(order["detail"], "Failed to create free order")
 
+    def test_bulk_discount_offer_and_course_fetched_once(self):
+        """
+        Test that the discount offer and course run detail are only fetched once for all of the enrollments.
+        """
+        post_data = self.generate_post_data(3)
+        get_course_run_detail = mock.patch(
+            'ecommerce.extensions.api.v2.views.orders.get_course_run_detail',
+            return_value={'course_uuid': self.course_uuid}
+        )
+        get_or_create_discount_offer = mock.patch.object(
+            ManualCourseEnrollmentOrderViewSet,
+            '_get_or_create_discount_offer',
+            autospec=True,
+            side_effect=ManualCourseEnrollmentOrderViewSet._get_or_create_discount_offer  # pylint: disable=protected-access
+        )
+        with get_course_run_detail as mock_course_run_detail, get_or_create_discount_offer as mock_discount_offer:
+            response_status, response_data = self.post_order(post_data, self.user)
+
+        self.assertEqual(response_status, status.HTTP_200_OK)
+        self.assertEqual([order["status"] for order in response_data["orders"]], ["success"] * 3)
+        self.assertEqual(mock_course_run_detail.call_count, 1)
+        self.assertEqual(mock_discount_offer.call_count, 1)
+
+    @override_settings(MANUAL_ENROLLMENT_ORDER_JOB_THRESHOLD=1)
+    def test_create_manual_order_job(self):
+        """
+        Test that orders are created by a background job when there are more enrollments than the threshold.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        post_data = self.generate_post_data(2)
+        with override_settings(MEDIA_ROOT=media_root):
+            response_status, response_data = self.post_order(post_data, self.user)
+            self.assertEqual(response_status, status.HTTP_202_ACCEPTED)
+            orders = self.read_job_orders(response_data['job_id'])
+
+        response = self.client.get(
+            reverse('api:v2:manual-course-enrollment-order-job', kwargs={'job_id': response_data['job_id']}),
+            **self.build_jwt_header(self.user)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        job = response.json()
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['completed'], 2)
+        self.assertEqual((job['succeeded'], job['failed']), (2, 0))
+        self.assertTrue(job['download_url'].endswith(
+            reverse('api:v2:background-jobs-download', kwargs={'pk': response_data['job_id']})
+        ))
+        self.assertEqual(BackgroundJob.objects.get(pk=response_data['job_id']).result, {'success': 2})
+        self.assertEqual(len(orders), 2)
+        for enrollment, order in zip(post_data["enrollments"], orders):
+            self.assertTrue(Order.objects.filter(number=order["detail"], user__username=order["username"]).exists())
+            self.assertEqual(
+                (order["username"], order["status"], order["new_order_created"]),
+                (enrollment["username"], "success", "True")
+            )
+
+        response = self.client.get(
+            reverse('api:v2:manual-course-enrollment-order-job', kwargs={'job_id': '0' * 32}),
+            **self.build_jwt_header(self.user)
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_manual_order_job_without_request(self):
+        """
+        Test that the background job fulfills the orders it creates, although Celery workers have no current request.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        enrollments = self.generate_post_data(2, discount_percentage=50.0)["enrollments"]
+        set_thread_variable('request', None)
+        set_current_request(None)
+
+        with override_settings(MEDIA_ROOT=media_root):
+            job_id = start_job(
+                ManualCourseEnrollmentOrderViewSet.JOB_NAME, create_manual_enrollment_orders, len(enrollments),
+                enrollments, self.user, self.site
+            )
+
+            job = BackgroundJob.objects.get(pk=job_id)
+            orders = self.read_job_orders(job_id)
+        self.assertEqual(job.status, BackgroundJob.SUCCEEDED)
+        self.assertEqual([order["status"] for order in orders], ["success"] * 2)
+        self.assertEqual(
+            set(Order.objects.filter(number__in=[order["detail"] for order in orders]).values_list(
+                'status', flat=True
+            )),
+            {ORDER.COMPLETE}
+        )
+
+    def test_create_manual_order_duplicated_enrollment(self):
+        """
+        Test that a learner enrolled twice in the same course by the same request gets a single order.
+        """
+        enrollments = self.generate_post_data(2)["enrollments"]
+        post_data = {"enrollments": [enrollments[0], enrollments[1], enrollments[0]]}
+        response_status, response_data = self.post_order(post_data, self.user)
+
+        self.assertEqual(response_status, status.HTTP_200_OK)
+        orders = response_data["orders"]
+        self.assertEqual([order["status"] for order in orders], ["success"] * 3)
+        self.assertEqual([order["new_order_created"] for order in orders], [True, True, False])
+        self.assertEqual(orders[2]["detail"], orders[0]["detail"])
+        self.assertEqual(Order.objects.filter(user__username=enrollments[0]["username"]).count(), 1)
+
+    def read_job_orders(self, job_id):
+        """ Returns the orders of the result file of a background job. """
+        result_file = BackgroundJob.objects.get(pk=job_id).result_file.read().decode('utf-8')
+        return list(csv.DictReader(result_file.splitlines()))
+
     def generate_post_data(self, enrollment_count, discount_percentage=0.0, mode="verified"):
         return {
             "enrollments": [
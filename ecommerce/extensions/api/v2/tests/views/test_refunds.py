@@ -5,6 +5,7 @@ import json
 import ddt
 import httpretty
 import mock
+from django.db import connection
 from django.urls import reverse
 from oscar.core.loading import get_model
 from rest_framework import status
@@ -323,6 +324,20 @@ class RefundProcessViewTests(ThrottlingMixin, TestCase):
             self.assertEqual(response.status_code, 200)
             self.assertEqual(response.data, RefundSerializer(self.refund).data)
 
+    def test_approve_outside_transaction(self):
+        """ Verify refunds are approved outside of a transaction, so that their lines can be revoked concurrently. """
+        depths = []
+
+        def approve(*args, **kwargs):  # pylint: disable=unused-argument
+            depths.append(len(connection.savepoint_ids))
+            return True
+
+        # Tests run in transactions of their own.
+        depth = len(connection.savepoint_ids)
+        with mock.patch('ecommerce.extensions.refund.models.Refund.approve', approve):
+            self.assertEqual(self.put('approve').status_code, 200)
+        self.assertEqual(depths, [depth])
+
     @mock.patch('ecommerce.extensions.refund.models.Refund._revoke_lines')
     @mock.patch('ecommerce.extensions.refund.models.Refund._issue_credit')
     def test_success_approve_payment_only(self, mock_issue_credit, mock_revoke_lines):
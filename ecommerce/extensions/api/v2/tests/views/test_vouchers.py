@@ -77,6 +77,17 @@ class VoucherViewSetTests(DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockMixi
         expected_codes = [voucher.code for voucher in vouchers]
         self.assertEqual(actual_codes, expected_codes)
 
+    def test_list_with_cursor_pagination(self):
+        """ Verify the endpoint lists the vouchers newest first when cursor pagination is requested. """
+        vouchers = self.create_vouchers(count=3)
+        response = self.client.get(self.path, {'pagination': 'cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('count', response.data)
+
+        actual_codes = [datum['code'] for datum in response.data['results']]
+        expected_codes = [voucher.code for voucher in reversed(vouchers)]
+        self.assertEqual(actual_codes, expected_codes)
+
     def test_list_with_code_filter(self):
         """ Verify the endpoint list all vouchers, filtered by the specified code. """
         voucher = self.create_vouchers()[0]
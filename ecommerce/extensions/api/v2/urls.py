@@ -12,6 +12,7 @@ from ecommerce.extensions.api.v2.views import checkout as checkout_views
 from ecommerce.extensions.api.v2.views import coupons as coupon_views
 from ecommerce.extensions.api.v2.views import courses as course_views
 from ecommerce.extensions.api.v2.views import enterprise as enterprise_views
+from ecommerce.extensions.api.v2.views import jobs as job_views
 from ecommerce.extensions.api.v2.views import orders as order_views
 from ecommerce.extensions.api.v2.views import partners as partner_views
 from ecommerce.extensions.api.v2.views import payments as payment_views
@@ -121,6 +122,7 @@ urlpatterns = [
 
 router = SimpleRouter()
 router.register(r'basket-details', basket_views.BasketViewSet, basename='basket')
+router.register(r'background-jobs', job_views.BackgroundJobViewSet, basename='background-jobs')
 router.register(r'catalogs', catalog_views.CatalogViewSet, basename='catalog') \
     .register(r'products', product_views.ProductViewSet, basename='catalog-product',
               parents_query_lookups=['stockrecords__catalogs'])
@@ -31,7 +31,11 @@ from ecommerce.extensions.basket.utils import attribute_cookie_data
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 from ecommerce.extensions.payment import exceptions as payment_exceptions
-from ecommerce.extensions.payment.helpers import get_default_processor_class, get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import (
+    get_default_processor_class,
+    get_processor,
+    get_processor_class_by_name
+)
 
 Applicator = get_class('offer.applicator', 'Applicator')
 Basket = get_model('basket', 'Basket')
@@ -217,7 +221,7 @@ class BasketCreateView(EdxOrderPlacementMixin, generics.CreateAPIView):
                 payment_processor = get_default_processor_class()
 
             try:
-                response_data = self._checkout(basket, payment_processor(request.site), request)
+                response_data = self._checkout(basket, get_processor(payment_processor, request.site), request)
             except Exception as ex:  # pylint: disable=broad-except
                 basket.delete()
                 logger.exception('Failed to initiate checkout for Basket [%d]. The basket has been deleted.', basket_id)
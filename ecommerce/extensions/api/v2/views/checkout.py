@@ -11,7 +11,7 @@ from rest_framework.views import APIView
 
 from ecommerce.extensions.api.serializers import CheckoutSerializer
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
-from ecommerce.extensions.payment.helpers import get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import get_processor, get_processor_class_by_name
 
 Applicator = get_class('offer.applicator', 'Applicator')
 logger = logging.getLogger(__name__)
@@ -48,7 +48,7 @@ class CheckoutView(APIView):
 
         # Return the payment info
         try:
-            payment_processor = get_processor_class_by_name(payment_processor_name)(request.site)
+            payment_processor = get_processor(get_processor_class_by_name(payment_processor_name), request.site)
         except ProcessorNotFoundError:
             logger.exception('Failed to get payment processor [%s]. basket id: [%s]. price: [%s]',
                              payment_processor_name, basket_id, basket.total_excl_tax)
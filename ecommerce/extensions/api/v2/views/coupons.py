@@ -14,11 +14,13 @@ from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME
+from ecommerce.core.jobs import is_async_requested
 from ecommerce.core.models import BusinessClient
 from ecommerce.coupons.utils import prepare_course_seat_types
 from ecommerce.extensions.api import data as data_api
 from ecommerce.extensions.api.filters import ProductFilter
 from ecommerce.extensions.api.serializers import CategorySerializer, CouponListSerializer, CouponSerializer
+from ecommerce.extensions.api.v2.views.jobs import start_api_action_job
 from ecommerce.extensions.basket.utils import prepare_basket
 from ecommerce.extensions.catalogue.utils import (
     attach_or_update_contract_metadata_on_coupon,
@@ -30,6 +32,8 @@ from ecommerce.extensions.payment.processors.invoice import InvoicePayment
 from ecommerce.extensions.voucher.models import CouponVouchers
 from ecommerce.extensions.voucher.utils import (
     get_or_create_enterprise_offer,
+    get_vouchers_original_and_enterprise_offers,
+    set_vouchers_offers,
     update_voucher_offer,
     update_voucher_with_enterprise_offer
 )
@@ -88,12 +92,17 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         Returns:
             200 if the order was created successfully; the basket ID is included in the response
                 body along with the order ID and payment information.
+            202 if `async=true` is passed; the ID of the background job creating the coupon is included in
+                the response body, and the job's result contains the 200 response body.
             400 if a custom code is received that already exists,
                 if a course mode is selected that is not supported.
             401 if an unauthenticated request is denied permission to access the endpoint.
             429 if the client has made requests at a rate exceeding that allowed by the configured rate limit.
             500 if an error occurs when attempting to create a coupon.
         """
+        if is_async_requested(request):
+            return start_api_action_job('coupon_creation', self, request)
+
         try:
             with transaction.atomic():
                 try:
@@ -340,7 +349,15 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         return response_data
 
     def update(self, request, *args, **kwargs):
-        """Update coupon depending on request data sent."""
+        """
+        Update coupon depending on request data sent.
+
+        The coupon is updated by a background job if `async=true` is passed, the response then only contains the
+        ID of the job.
+        """
+        if is_async_requested(request):
+            return start_api_action_job('coupon_update', self, request, context={'coupon_id': kwargs.get('pk')})
+
         try:
             super(CouponViewSet, self).update(request, *args, **kwargs)
             coupon = self.get_object()
@@ -505,43 +522,59 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         max_uses = request_data.get('max_uses')
         email_domains = request_data.get('email_domains')
 
-        for voucher in vouchers:
-            updated_original_offer = update_voucher_offer(
-                offer=voucher.original_offer,
-                benefit_value=benefit_value,
-                max_uses=max_uses,
-                program_uuid=program_uuid,
-                email_domains=email_domains,
-                site=site,
-            )
-            updated_enterprise_offer = None
-            if voucher.enterprise_offer:
-                updated_enterprise_offer = update_voucher_with_enterprise_offer(
-                    offer=voucher.enterprise_offer,
+        # The vouchers of a coupon share their offers, so each distinct offer is only updated once.
+        updated_offers = {}
+
+        def get_updated_offer(key, update, **kwargs):
+            if key not in updated_offers:
+                updated_offers[key] = update(**kwargs)
+            return updated_offers[key]
+
+        vouchers_offers = []
+        with transaction.atomic():
+            for voucher, original_offer, enterprise_offer in get_vouchers_original_and_enterprise_offers(vouchers):
+                updated_original_offer = get_updated_offer(
+                    ('original', original_offer.id),
+                    update_voucher_offer,
+                    offer=original_offer,
                     benefit_value=benefit_value,
                     max_uses=max_uses,
-                    enterprise_customer=enterprise_customer,
-                    enterprise_catalog=enterprise_catalog,
+                    program_uuid=program_uuid,
                     email_domains=email_domains,
                     site=site,
                 )
-            elif enterprise_customer:
-                # If we are performing an update on an existing enterprise coupon,
-                # we need to ensure the enterprise offer is created if it didn't already exist.
-                updated_enterprise_offer = get_or_create_enterprise_offer(
-                    benefit_value=benefit_value or voucher.original_offer.benefit.value,
-                    benefit_type=voucher.original_offer.benefit.type,
-                    enterprise_customer=enterprise_customer,
-                    enterprise_customer_catalog=enterprise_catalog,
-                    offer_name=voucher.original_offer.name + " ENT Offer",
-                    max_uses=max_uses or voucher.original_offer.max_global_applications,
-                    email_domains=email_domains or voucher.original_offer.email_domains,
-                    site=site or voucher.original_offer.site,
+                updated_enterprise_offer = None
+                if enterprise_offer:
+                    updated_enterprise_offer = get_updated_offer(
+                        ('enterprise', enterprise_offer.id),
+                        update_voucher_with_enterprise_offer,
+                        offer=enterprise_offer,
+                        benefit_value=benefit_value,
+                        max_uses=max_uses,
+                        enterprise_customer=enterprise_customer,
+                        enterprise_catalog=enterprise_catalog,
+                        email_domains=email_domains,
+                        site=site,
+                    )
+                elif enterprise_customer:
+                    # If we are performing an update on an existing enterprise coupon,
+                    # we need to ensure the enterprise offer is created if it didn't already exist.
+                    updated_enterprise_offer = get_updated_offer(
+                        ('new_enterprise', original_offer.id),
+                        get_or_create_enterprise_offer,
+                        benefit_value=benefit_value or original_offer.benefit.value,
+                        benefit_type=original_offer.benefit.type,
+                        enterprise_customer=enterprise_customer,
+                        enterprise_customer_catalog=enterprise_catalog,
+                        offer_name=original_offer.name + " ENT Offer",
+                        max_uses=max_uses or original_offer.max_global_applications,
+                        email_domains=email_domains or original_offer.email_domains,
+                        site=site or original_offer.site,
+                    )
+                vouchers_offers.append(
+                    (voucher, [offer for offer in (updated_original_offer, updated_enterprise_offer) if offer])
                 )
-            voucher.offers.clear()
-            voucher.offers.add(updated_original_offer)
-            if updated_enterprise_offer:
-                voucher.offers.add(updated_enterprise_offer)
+            set_vouchers_offers(vouchers_offers)
 
     def update_invoice_data(self, request_data, coupon):
         """
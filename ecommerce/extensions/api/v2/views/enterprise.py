@@ -6,9 +6,13 @@ from urllib.parse import urlparse
 import django_filters
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Q, prefetch_related_objects
-from django.http import Http404
+from django.db import transaction
+from django.db.models import Count, Min, OuterRef, Q, Subquery, prefetch_related_objects
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.utils.text import slugify
 from edx_rbac.decorators import permission_required
 from edx_rbac.mixins import PermissionRequiredMixin
 from oscar.core.loading import get_model
@@ -23,13 +27,16 @@ from rest_framework.viewsets import ModelViewSet, ViewSet
 from slumber.exceptions import SlumberHttpBaseException
 
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME, DEFAULT_CATALOG_PAGE_SIZE
-from ecommerce.coupons.utils import is_coupon_available
+from ecommerce.core.db_routers import read_replica_view
+from ecommerce.core.jobs import get_job, is_async_requested
+from ecommerce.core.url_utils import get_ecommerce_url
+from ecommerce.coupons.utils import generate_enrollment_code_csv, is_coupon_available
 from ecommerce.enterprise.utils import (
     get_enterprise_catalog,
     get_enterprise_customer_catalogs,
     get_enterprise_customers
 )
-from ecommerce.extensions.api.pagination import DatatablesDefaultPagination
+from ecommerce.extensions.api.pagination import DatatablesDefaultPagination, DatatablesOptionalCursorPagination
 from ecommerce.extensions.api.serializers import (
     CouponCodeAssignmentSerializer,
     CouponCodeRemindSerializer,
@@ -48,6 +55,7 @@ from ecommerce.extensions.api.serializers import (
 )
 from ecommerce.extensions.api.v2.utils import get_enterprise_from_product, send_new_codes_notification_email
 from ecommerce.extensions.api.v2.views.coupons import CouponViewSet
+from ecommerce.extensions.api.v2.views.jobs import start_api_action_job
 from ecommerce.extensions.catalogue.utils import (
     attach_or_update_contract_metadata_on_coupon,
     attach_vouchers_to_coupon_product,
@@ -72,6 +80,8 @@ from ecommerce.extensions.offer.models import OfferAssignmentEmailSentRecord
 from ecommerce.extensions.offer.utils import update_assignments_for_multi_use_per_customer
 from ecommerce.extensions.voucher.utils import (
     create_enterprise_vouchers,
+    get_vouchers_original_and_enterprise_offers,
+    set_vouchers_offers,
     update_voucher_offer,
     update_voucher_with_enterprise_offer
 )
@@ -82,6 +92,7 @@ Line = get_model('basket', 'Line')
 OfferAssignment = get_model('offer', 'OfferAssignment')
 OfferAssignmentEmailTemplates = get_model('offer', 'OfferAssignmentEmailTemplates')
 CodeAssignmentNudgeEmails = get_model('offer', 'CodeAssignmentNudgeEmails')
+CouponVouchers = get_model('voucher', 'CouponVouchers')
 Product = get_model('catalogue', 'Product')
 ProductClass = get_model('catalogue', 'ProductClass')
 Voucher = get_model('voucher', 'Voucher')
@@ -151,20 +162,17 @@ class OfferAssignmentSummaryViewSet(ModelViewSet):
 
     def get_queryset(self):
         """
-        Return a list of dictionaries to be serialized.
+        Return the summaries of the active offerAssignments of the user, one per code.
 
-        Each dictionary contains one offerAssignment object, and the count of
-        how many total offerAssignment objects the DB returned with the same
-        code, as a way of "rolling up" offerAssignments a user has.
+        Each summary contains the code, the ID of the first offerAssignment with the code, and the
+        count of how many offerAssignments have the code, as a way of "rolling up" offerAssignments
+        a user has. The offerAssignments are grouped and counted by the database, so that only the
+        requested page of summaries is loaded.
         """
         queryset = OfferAssignment.objects.filter(
             user_email=self.request.user.email,
             status__in=[OFFER_ASSIGNED, OFFER_ASSIGNMENT_EMAIL_PENDING],
-        ).select_related(
-            'offer__benefit',
-            'offer__condition',
         )
-        offer_assignments_with_counts = {}
         if self.request.query_params.get('full_discount_only'):
             queryset = queryset.filter(offer__benefit__value=100.0)
 
@@ -173,24 +181,50 @@ class OfferAssignmentSummaryViewSet(ModelViewSet):
         if enterprise_uuid:
             queryset = queryset.filter(offer__condition__enterprise_customer_uuid=enterprise_uuid)
 
-        for offer_assignment in queryset:
-            if offer_assignment.code not in offer_assignments_with_counts:
-                # Note that we can get away with just dropping in the first
-                # offerAssignment object of particular code that we see
-                # because most of the data we are returning lives on related
-                # objects that each of these offerAssignments share (e.g. the benefit)
-                offer_assignments_with_counts[offer_assignment.code] = {
-                    'count': 1,
-                    'obj': offer_assignment,
-                }
-            else:
-                offer_assignments_with_counts[offer_assignment.code]['count'] += 1
-        return list(offer_assignments_with_counts.values())
+        return queryset.values('code').annotate(count=Count('id'), first_id=Min('id')).order_by('first_id')
+
+    def list(self, request, *args, **kwargs):  # pylint: disable=unused-argument
+        """
+        Return the requested page of summaries, or all of them if the pagination is disabled, e.g. with `length=-1`.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(self.get_offer_assignment_summaries(page), many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(self.get_offer_assignment_summaries(queryset), many=True)
+        return Response(serializer.data)
+
+    def get_offer_assignment_summaries(self, summaries):
+        """
+        Return a list of dictionaries to be serialized, with the count and the first offerAssignment of each summary.
+
+        Note that we can get away with just using the first offerAssignment of each code because
+        most of the data we are returning lives on related objects that each of these
+        offerAssignments share (e.g. the benefit).
+        """
+        first_voucher = Voucher.objects.filter(offers=OuterRef('offer_id')).order_by('pk')
+        offer_assignments = OfferAssignment.objects.filter(
+            id__in=[summary['first_id'] for summary in summaries]
+        ).select_related(
+            'offer__benefit',
+            'offer__condition',
+        ).annotate(
+            coupon_start_date=Subquery(first_voucher.values('start_datetime')[:1]),
+            coupon_end_date=Subquery(first_voucher.values('end_datetime')[:1]),
+        ).in_bulk()
+        return [
+            {'count': summary['count'], 'obj': offer_assignments[summary['first_id']]}
+            for summary in summaries
+        ]
 
 
 class EnterpriseCouponViewSet(CouponViewSet):
     """ Coupon resource. """
-    pagination_class = DatatablesDefaultPagination
+    pagination_class = DatatablesOptionalCursorPagination
+    cursor_ordering = ('-date_created', '-id')
+    cursor_pagination_actions = ('list', 'overview')
 
     def get_queryset(self):
         filter_kwargs = {
@@ -313,31 +347,47 @@ class EnterpriseCouponViewSet(CouponViewSet):
             return
 
         coupon_was_migrated = False
-        for voucher in vouchers:
-            updated_enterprise_offer = update_voucher_with_enterprise_offer(
-                offer=voucher.enterprise_offer,
-                benefit_value=benefit_value,
-                max_uses=max_uses,
-                enterprise_customer=enterprise_customer,
-                enterprise_catalog=enterprise_catalog,
-                email_domains=email_domains,
-                site=site,
-            )
-            updated_orginal_offer = None
-            if voucher.original_offer != voucher.enterprise_offer:
-                coupon_was_migrated = True
-                updated_orginal_offer = update_voucher_offer(
-                    offer=voucher.original_offer,
+        # The vouchers of a coupon share their offers, so each distinct offer is only updated once.
+        updated_offers = {}
+
+        def get_updated_offer(key, update, **kwargs):
+            if key not in updated_offers:
+                updated_offers[key] = update(**kwargs)
+            return updated_offers[key]
+
+        vouchers_offers = []
+        with transaction.atomic():
+            for voucher, original_offer, enterprise_offer in get_vouchers_original_and_enterprise_offers(vouchers):
+                updated_enterprise_offer = get_updated_offer(
+                    ('enterprise', enterprise_offer.id),
+                    update_voucher_with_enterprise_offer,
+                    offer=enterprise_offer,
                     benefit_value=benefit_value,
                     max_uses=max_uses,
+                    enterprise_customer=enterprise_customer,
+                    enterprise_catalog=enterprise_catalog,
                     email_domains=email_domains,
                     site=site,
                 )
-            voucher.offers.clear()
-            voucher.offers.add(updated_enterprise_offer)
-            if updated_orginal_offer:
-                voucher.offers.add(updated_orginal_offer)
-            update_assignments_for_multi_use_per_customer(voucher)
+                updated_orginal_offer = None
+                if original_offer != enterprise_offer:
+                    coupon_was_migrated = True
+                    updated_orginal_offer = get_updated_offer(
+                        ('original', original_offer.id),
+                        update_voucher_offer,
+                        offer=original_offer,
+                        benefit_value=benefit_value,
+                        max_uses=max_uses,
+                        email_domains=email_domains,
+                        site=site,
+                    )
+                vouchers_offers.append(
+                    (voucher, [offer for offer in (updated_enterprise_offer, updated_orginal_offer) if offer])
+                )
+            set_vouchers_offers(vouchers_offers)
+
+            for voucher, offers in vouchers_offers:
+                update_assignments_for_multi_use_per_customer(voucher, offer=offers[0])
 
         if coupon_was_migrated:
             super(EnterpriseCouponViewSet, self).update_range_data(request_data, vouchers)
@@ -625,6 +675,7 @@ class EnterpriseCouponViewSet(CouponViewSet):
 
     @action(detail=False, url_path=r'(?P<enterprise_id>.+)/overview', permission_classes=[IsAuthenticated])
     @permission_required('enterprise.can_view_coupon', fn=lambda request, enterprise_id: enterprise_id)
+    @method_decorator(read_replica_view)
     def overview(self, request, enterprise_id):     # pylint: disable=unused-argument
         """
         Overview of Enterprise coupons.
@@ -648,6 +699,36 @@ class EnterpriseCouponViewSet(CouponViewSet):
         serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
+    @action(detail=False, url_path=r'(?P<enterprise_id>.+)/codes/export', permission_classes=[IsAuthenticated])
+    @permission_required('enterprise.can_view_coupon', fn=lambda request, enterprise_id: enterprise_id)
+    def export_codes(self, request, enterprise_id):
+        """
+        Export the codes of all Enterprise coupons as a CSV file.
+
+        The file has the same layout as the enrollment code CSV: one section per coupon, listing
+        the codes and their redemption URLs. It is streamed as it is read from the database so
+        that coupons with many codes can be exported. Supports the same `filter` and `coupon_id`
+        query parameters as the overview, `filter` being applied by get_queryset.
+        """
+        enterprise_coupons = self.get_queryset()
+        coupon_id = request.query_params.get('coupon_id')
+        if coupon_id is not None:
+            if not coupon_id.isdigit():
+                raise DRFValidationError({'coupon_id': 'A valid integer is required.'})
+            enterprise_coupons = enterprise_coupons.filter(id=coupon_id)
+
+        grouped_codes = CouponVouchers.objects.filter(coupon__in=enterprise_coupons).order_by(
+            'coupon_id', 'vouchers__id'
+        ).values_list('coupon_id', 'coupon__title', 'vouchers__code').iterator()
+
+        redeem_url = get_ecommerce_url(reverse('coupons:offer'))
+        rows = generate_enrollment_code_csv([('Enterprise Customer:', enterprise_id), []], grouped_codes, redeem_url)
+
+        file_name = '{filename}.csv'.format(filename=slugify('Enterprise codes {}'.format(enterprise_id)))
+        response = StreamingHttpResponse(rows, content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename={filename}'.format(filename=file_name)
+        return response
+
     def _validate_coupon_availablity(self, coupon, message):
         """
         Raise ValidationError with specified message if coupon is not available.
@@ -710,15 +791,42 @@ class EnterpriseCouponViewSet(CouponViewSet):
                 'subject': subject,
                 'greeting': greeting,
                 'closing': closing,
+                'request': request,
             }
         )
         if serializer.is_valid():
             serializer.save()
             # Create a record of the email sent
             self._create_offer_assignment_email_sent_record(enterprise_customer, ASSIGN, template)
+            if serializer.data.get('job_id'):
+                # Large assignments are made by a background job, whose progress is reported by assign_status.
+                return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(
+        detail=True, url_path=r'assign/(?P<job_id>[0-9a-f]{32})', url_name='assign-status',
+        permission_classes=[IsAuthenticated]
+    )
+    @permission_required(
+        'enterprise.can_assign_coupon', fn=lambda request, pk, job_id: get_enterprise_from_product(pk)
+    )
+    def assign_status(self, request, pk, job_id):  # pylint: disable=unused-argument
+        """
+        Return the status and progress of the background job assigning codes within the Coupon.
+        """
+        job = get_job(job_id)
+        if not job or str(job.context.get('coupon_id')) != str(pk):
+            raise Http404
+        return Response({
+            'job_id': job_id,
+            'status': job.status,
+            'total': job.total,
+            'completed': job.completed,
+            'result': job.result,
+            'error': job.error,
+        })
+
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     @permission_required('enterprise.can_assign_coupon', fn=lambda request, pk: get_enterprise_from_product(pk))
     def visibility(self, request, pk):  # pylint: disable=unused-argument
@@ -741,6 +849,9 @@ class EnterpriseCouponViewSet(CouponViewSet):
         """
         Creates new voucher in existing coupon for requested order number if possible.
 
+        The voucher is created by a background job if `async=true` is passed, the response then only contains the
+        ID of the job.
+
         example Request:
         POST "http://localhost:18130/api/v2/enterprise/coupons/create_refunded_voucher/"
         {
@@ -768,6 +879,9 @@ class EnterpriseCouponViewSet(CouponViewSet):
             ]
         }
         """
+        if is_async_requested(request):
+            return start_api_action_job('refunded_order_voucher_creation', self, request)
+
         serializer = RefundedOrderCreateVoucherSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             serializer.save()
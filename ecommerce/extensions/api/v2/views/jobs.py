@@ -0,0 +1,93 @@
+"""HTTP endpoints for the status and results of background jobs."""
+
+
+import json
+import os
+
+from django.http import FileResponse, Http404, QueryDict
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from threadlocals.threadlocals import get_current_request
+
+from ecommerce.core.jobs import JobError, fail_stale_jobs, start_job
+from ecommerce.core.models import BackgroundJob
+from ecommerce.core.utils import site_request
+from ecommerce.extensions.api import serializers
+
+
+def start_api_action_job(name, view, request, context=None):
+    """
+    Starts a job running the current action of the API view with the data of the request, see run_api_action.
+
+    The permissions of the request have been checked by the view, they are not checked again by the job.
+
+    Returns:
+        Response: 202 response with the ID of the job.
+    """
+    data = request.data.dict() if isinstance(request.data, QueryDict) else request.data
+    job_id = start_job(
+        name, run_api_action, 1, type(view), view.action, request.method, request.path, data, view.kwargs,
+        context=context, user=request.user
+    )
+    return Response({'job_id': job_id}, status=status.HTTP_202_ACCEPTED)
+
+
+def run_api_action(progress, view_class, action_name, method, path, data, kwargs):
+    """
+    Background job running an action of an API view with the data of the request which started it, under a request
+    for the same site and user.
+
+    Returns:
+        dict: Status code and data of the response of the action. Error responses fail the job.
+    """
+    current_request = get_current_request()
+    with site_request(current_request.site, path, current_request.user, method, data) as django_request:
+        view = view_class(
+            action_map={method.lower(): action_name}, args=(), kwargs=kwargs, format_kwarg=None
+        )
+        request = view.initialize_request(django_request, **kwargs)
+        request.user = django_request.user
+        request.accepted_renderer, request.accepted_media_type = view.perform_content_negotiation(request)
+        view.request = request
+        view.headers = view.default_response_headers
+        try:
+            response = getattr(view, action_name)(request, **kwargs)
+        except Exception as exc:  # pylint: disable=broad-except
+            # Errors are turned into the responses the endpoint returns, other exceptions are raised again.
+            response = view.handle_exception(exc)
+
+    response_data = json.loads(JSONRenderer().render(response.data) or 'null')
+    if response.status_code >= 400:
+        raise JobError('The request failed with status [{}]: {}'.format(response.status_code, response_data))
+
+    progress.advance(1)
+    return {'status_code': response.status_code, 'data': response_data}
+
+
+class BackgroundJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Status, progress and partial results of the background jobs started by the user, see ecommerce.core.jobs.
+
+    Staff users can see all of the jobs.
+    """
+    lookup_value_regex = '[0-9a-f]{32}'
+    permission_classes = (IsAuthenticated,)
+    serializer_class = serializers.BackgroundJobSerializer
+
+    def get_queryset(self):
+        filters = {} if self.request.user.is_staff else {'created_by': self.request.user}
+        fail_stale_jobs(**filters)
+        return BackgroundJob.objects.filter(**filters).order_by('-created')
+
+    @action(detail=True)
+    def download(self, request, pk=None):  # pylint: disable=unused-argument
+        """ Download the result file of the job. """
+        job = self.get_object()
+        if not job.result_file:
+            raise Http404
+        return FileResponse(
+            job.result_file.open('rb'), as_attachment=True, filename=os.path.basename(job.result_file.name)
+        )
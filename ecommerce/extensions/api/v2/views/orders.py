@@ -1,15 +1,21 @@
 """HTTP endpoints for interacting with orders."""
 
 
+import csv
 import logging
+from collections import Counter, defaultdict
 from decimal import Decimal
+from io import StringIO
 
 import dateutil
 import django_filters
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import F
+from django.http import Http404
+from django.urls import reverse
 from django.utils.decorators import method_decorator
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from oscar.core.loading import get_class, get_model
@@ -22,12 +28,17 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 from slumber.exceptions import HttpServerError, SlumberBaseException
 
+from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.db_routers import read_replica_view
+from ecommerce.core.jobs import get_job, start_job
+from ecommerce.core.utils import site_request
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import get_course_run_detail
 from ecommerce.enterprise.mixins import EnterpriseDiscountMixin
 from ecommerce.extensions.analytics.utils import audit_log
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.filters import OrderFilter
+from ecommerce.extensions.api.pagination import OptionalCursorPagination
 from ecommerce.extensions.api.permissions import IsStaffOrOwner
 from ecommerce.extensions.api.throttles import ServiceUserThrottle
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
@@ -42,6 +53,7 @@ logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
 OrderLine = get_model('order', 'Line')
 Product = get_model('catalogue', 'Product')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 post_checkout = get_class('checkout.signals', 'post_checkout')
 Basket = get_model('basket', 'Basket')
 Applicator = get_class('offer.applicator', 'Applicator')
@@ -49,8 +61,18 @@ ConditionalOffer = get_model('offer', 'ConditionalOffer')
 Condition = get_model('offer', 'Condition')
 Benefit = get_model('offer', 'Benefit')
 
+MANUAL_ENROLLMENT_ORDER_CSV_FIELDS = [
+    'lms_user_id', 'username', 'email', 'course_run_key', 'mode', 'status', 'detail', 'new_order_created',
+]
+
+
+def _count_manual_enrollment_orders(results):
+    """ Returns the number of manual enrollment orders which have succeeded and failed so far, by status. """
+    return dict(Counter(result['status'] for result in results if result is not None))
+
 
 @method_decorator(transaction.non_atomic_requests, name='dispatch')
+@method_decorator(read_replica_view, name='list')
 class OrderViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = 'number'
     permission_classes = (IsAuthenticated, IsStaffOrOwner, DjangoModelPermissions,)
@@ -59,6 +81,8 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
     throttle_classes = (ServiceUserThrottle,)
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = OrderFilter
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-date_placed', '-id')
 
     def filter_queryset(self, queryset):
         queryset = super(OrderViewSet, self).filter_queryset(queryset)
@@ -112,7 +136,10 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
 
         **Behavior**
 
-            Implements POST action only.
+            Implements POST action, and GET of the status of the background jobs started by POST requests with
+            more than MANUAL_ENROLLMENT_ORDER_JOB_THRESHOLD enrollments.
+
+            GET /api/v2/manual_course_enrollment_order/jobs/<job_id>/
 
             POST /api/v2/manual_course_enrollment_order/
             >>> {
@@ -177,19 +204,10 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
 
     authentication_classes = (JwtAuthentication,)
     permission_classes = (IsAuthenticated, IsAdminUser)
-    http_method_names = ['post']
+    http_method_names = ['get', 'post']
 
     SUCCESS, FAILURE = "success", "failure"
-
-    @staticmethod
-    def existing_purchased_line(seat_product, user, site):
-        """ Returns existing OrderLine object purchased by user whether in the form of course entitlement
-        or course enrollment."""
-        course_uuid = get_course_run_detail(site, seat_product.course.id)['course_uuid']
-        products = Product.objects.filter(
-            Q(pk=seat_product.pk) | Q(attributes__code='UUID', attribute_values__value_text=course_uuid)
-        )
-        return OrderLine.objects.filter(product__in=products, order__user=user, status=LINE.COMPLETE).first()
+    JOB_NAME = 'manual_enrollment_orders'
 
     def create(self, request):
         """
@@ -202,6 +220,9 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
             Learner email.
         *course_run_key*
             Course in which learner is enrolled.
+
+        Requests with more than MANUAL_ENROLLMENT_ORDER_JOB_THRESHOLD enrollments are processed by a background job.
+        The response then only contains the ID of the job, whose status is returned by the `job` action.
         """
 
         try:
@@ -215,13 +236,135 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        orders = []
-        for enrollment in enrollments:
-            orders.append(self._create_single_order(enrollment, request.user, request.site))
+        if len(enrollments) > settings.MANUAL_ENROLLMENT_ORDER_JOB_THRESHOLD:
+            job_id = start_job(
+                self.JOB_NAME, create_manual_enrollment_orders, len(enrollments), enrollments, request.user,
+                request.site, user=request.user
+            )
+            return Response({"job_id": job_id}, status=status.HTTP_202_ACCEPTED)
 
+        orders = self._create_orders(enrollments, request.user, request.site)
         return Response({"orders": orders}, status=status.HTTP_200_OK)
 
-    def _create_single_order(self, enrollment, request_user, request_site):
+    @action(detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>[0-9a-f]{32})')
+    def job(self, request, job_id):  # pylint: disable=unused-argument
+        """
+        Return the status of a background job creating orders, along with the number of enrollments which have
+        succeeded and failed so far. The orders are downloaded as a CSV file from `download_url` once the job has
+        succeeded.
+        """
+        job = get_job(job_id)
+        if not job or job.name != self.JOB_NAME:
+            raise Http404
+
+        result = job.result or {}
+        return Response({
+            "job_id": job_id,
+            "status": job.status,
+            "total": job.total,
+            "completed": job.completed,
+            "succeeded": result.get(self.SUCCESS, 0),
+            "failed": result.get(self.FAILURE, 0),
+            "download_url": request.build_absolute_uri(
+                reverse('api:v2:background-jobs-download', kwargs={'pk': job_id})
+            ) if job.result_file else None,
+            "error": job.error,
+        })
+
+    def _create_orders(self, enrollments, request_user, request_site, progress=None):
+        """
+            Creates the orders of the enrollments.
+
+            The learners, seat products, existing orders and discount offers of all of the enrollments are resolved
+            up front, and the orders are then created in batches of MANUAL_ENROLLMENT_ORDER_BATCH_SIZE.
+
+            Params:
+                `enrollments`: <list> of enrollments, see `_create_order`.
+                `request_user`: <User>
+                `request_site`: <Site>
+                `progress`: <JobProgress> of the job creating the orders, if any.
+            Returns:
+                <list> with the result of each enrollment, see `_create_order`.
+        """
+        results = [None] * len(enrollments)
+        valid_enrollments = []
+        for index, enrollment in enumerate(enrollments):
+            try:
+                enrollment_data = self._get_enrollment_data(enrollment)
+            except ValidationError as ex:
+                results[index] = dict(enrollment, status=self.FAILURE, detail=ex.message, new_order_created=None)
+                continue
+
+            learner_username, learner_email, course_run_key = enrollment_data[1:4]
+            discount_percentage, sales_force_id = enrollment_data[5:]
+            logger.info(
+                '[Manual Order Creation] Request received. User: %s, Email: %s, Course: %s, RequestUser: %s, '
+                'Discount Percentage: %s, Salesforce Opportunity Id: %s',
+                learner_username,
+                learner_email,
+                course_run_key,
+                request_user.username,
+                discount_percentage,
+                sales_force_id,
+            )
+            valid_enrollments.append((index, enrollment, enrollment_data))
+
+        if progress:
+            progress.advance(len(enrollments) - len(valid_enrollments))
+
+        learner_users = self._get_learner_users([enrollment_data for __, __, enrollment_data in valid_enrollments])
+        courses = Course.objects.in_bulk({enrollment_data[3] for __, __, enrollment_data in valid_enrollments})
+        seat_products = self._get_seat_products(
+            courses, {enrollment_data[4] for __, __, enrollment_data in valid_enrollments}
+        )
+        existing_lines = self._get_existing_purchased_lines(
+            [
+                (learner_users[enrollment_data[1]], seat_products.get((enrollment_data[3], enrollment_data[4])))
+                for __, __, enrollment_data in valid_enrollments
+                if enrollment_data[3] in courses
+            ],
+            request_site
+        )
+        discount_offers = {}
+
+        batch_size = settings.MANUAL_ENROLLMENT_ORDER_BATCH_SIZE
+        for start in range(0, len(valid_enrollments), batch_size):
+            batch = valid_enrollments[start:start + batch_size]
+            with transaction.atomic():
+                for index, enrollment, enrollment_data in batch:
+                    learner_username = enrollment_data[1]
+                    course_run_key, mode, discount_percentage, sales_force_id = enrollment_data[3:]
+                    course = courses.get(course_run_key)
+                    if course is None:
+                        results[index] = dict(
+                            enrollment, status=self.FAILURE, detail="Course not found", new_order_created=None
+                        )
+                        continue
+
+                    results[index] = self._create_order(
+                        enrollment,
+                        learner_users[learner_username],
+                        course,
+                        seat_products.get((course_run_key, mode)),
+                        existing_lines,
+                        discount_percentage,
+                        lambda enrollment=enrollment, sales_force_id=sales_force_id: self._get_discount_offer(
+                            discount_offers,
+                            enrollment.get('enterprise_customer_name'),
+                            enrollment.get('enterprise_customer_uuid'),
+                            sales_force_id
+                        ),
+                        request_site,
+                    )
+            if progress:
+                # Only the counts are stored with the job, the orders are stored in its result file at the end.
+                progress.advance(len(batch))
+                progress.update(result=_count_manual_enrollment_orders(results))
+
+        return results
+
+    def _create_order(self, enrollment, learner_user, course, seat_product, existing_lines, discount_percentage,
+                      get_discount_offer, request_site):
         """
             Creates an order from a single enrollment.
             Params:
@@ -235,63 +378,33 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
                     "mode": <string>,
                     "enterprise_customer_name": <string>,
                     "enterprise_customer_uuid": <string>,
-                `request_user`: <User>
+                `learner_user`: <User>
+                `course`: <Course>
+                `seat_product`: <Product> of the course for the mode of the enrollment, if any.
+                `existing_lines`: <dict> of the OrderLines already purchased, see `_get_existing_purchased_lines`.
+                    The line of the order created is added to it, so that the order is reused by later enrollments
+                    of the same learner in the same course.
+                `discount_percentage`: <float>
+                `get_discount_offer`: <callable> returning the discount offer of the enrollment.
                 `request_site`: <Site>
             Returns:
                 `enrollment` from above with the additional fields:
                     "status": <string> ("success" or "failure")
                     "detail": <string> (order number if success, otherwise failure reason)
         """
-        try:
-            (
-                lms_user_id,
-                learner_username,
-                learner_email,
-                course_run_key,
-                mode,
-                discount_percentage,
-                sales_force_id,
-            ) = self._get_enrollment_data(enrollment)
-        except ValidationError as ex:
-            return dict(enrollment, status=self.FAILURE, detail=ex.message, new_order_created=None)
-
-        logger.info(
-            '[Manual Order Creation] Request received. User: %s, Email: %s, Course: %s, RequestUser: %s, '
-            'Discount Percentage: %s, Salesforce Opportunity Id: %s',
-            learner_username,
-            learner_email,
-            course_run_key,
-            request_user.username,
-            discount_percentage,
-            sales_force_id,
-        )
-
-        learner_user = self._get_learner_user(lms_user_id, learner_username, learner_email)
-
-        try:
-            course = Course.objects.get(id=course_run_key)
-        except Course.DoesNotExist:
-            return dict(enrollment, status=self.FAILURE, detail="Course not found", new_order_created=None)
-
-        seat_product = course.seat_products.filter(
-            attributes__name='certificate_type',
-            attribute_values__value_text=mode
-        ).first()
-
         # check if an order already exists with the requested data
-        try:
-            order_line = self.existing_purchased_line(seat_product, learner_user, request_site)
-        except (SlumberBaseException, ConnectionError, Timeout, HttpServerError, AttributeError) as ex:
-            logger.exception(
+        existing_line = existing_lines.get((learner_user.id, seat_product.id)) if seat_product else None
+        if seat_product is None or isinstance(existing_line, Exception):
+            logger.error(
                 "Could not access existing purchased line. User: %s, Site: %s, course_run_key: %s, message: %s",
                 learner_user,
                 request_site,
-                course_run_key,
-                ex,
+                course.id,
+                existing_line if seat_product else 'Seat product not found',
             )
             return dict(enrollment, status=self.FAILURE, detail="Failed to create free order", new_order_created=None)
-        if order_line:
-            order = order_line.order
+        if existing_line:
+            order = existing_line.order
             self._update_all_orderline_with_enterprise_discount(order, discount_percentage)
             return dict(
                 enrollment,
@@ -303,14 +416,7 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
         basket = Basket.create_basket(request_site, learner_user)
         basket.add_product(seat_product)
 
-        enterprise_customer_name = enrollment.get('enterprise_customer_name')
-        enterprise_customer_uuid = enrollment.get('enterprise_customer_uuid')
-        discount_offer = self._get_or_create_discount_offer(
-            enterprise_customer_name,
-            enterprise_customer_uuid,
-            sales_force_id
-        )
-        Applicator().apply_offers(basket, [discount_offer])
+        Applicator().apply_offers(basket, [get_discount_offer()])
         try:
             order = self.place_free_order(basket)
             self._update_order_according_to_date_place(order, enrollment.get('date_placed'))
@@ -326,6 +432,7 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
             )
             return dict(enrollment, status=self.FAILURE, detail="Failed to create free order", new_order_created=None)
 
+        existing_lines[(learner_user.id, seat_product.id)] = order.lines.first()
         logger.info(
             '[Manual Order Creation] Order completed. User: %s, Course: %s, Basket: %s, Order: %s, Product: %s',
             learner_user.username,
@@ -433,19 +540,135 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
                 raise ValidationError('Discount percentage should be a float from 0 to 100.')
         return lms_user_id, learner_username, learner_email, course_run_key, mode, discount_percentage, sales_force_id
 
-    def _get_learner_user(self, lms_user_id, learner_username, learner_email):
+    def _get_learner_users(self, enrollments_data):
         """
-        Return the ecommerce user with username set to `learner_username` and email set to `learner_email`.
+        Return the ecommerce users of the enrollments, by username.
 
-        If user exists then email will be upated to matach the `learner_email`.
-        If user does not exist then a new one will be created.
+        The user with username set to `learner_username` is updated to have the `learner_email` and `lms_user_id`
+        of the enrollment, or created if it does not exist. If several enrollments are for the same username, the last
+        one wins.
         """
-        learner_user, __ = get_user_model().objects.update_or_create(username=learner_username, defaults={
-            'email': learner_email,
-            'lms_user_id': lms_user_id
-        })
+        User = get_user_model()
+        learners = {
+            learner_username: {'email': learner_email, 'lms_user_id': lms_user_id}
+            for lms_user_id, learner_username, learner_email, __, __, __, __ in enrollments_data
+        }
+        learner_users = {user.username: user for user in User.objects.filter(username__in=list(learners))}
+
+        updated_users = []
+        for username, fields in learners.items():
+            user = learner_users.get(username)
+            if user and (user.email, user.lms_user_id) != (fields['email'], fields['lms_user_id']):
+                user.email = fields['email']
+                user.lms_user_id = fields['lms_user_id']
+                updated_users.append(user)
+        User.objects.bulk_update(updated_users, ['email', 'lms_user_id'])
+
+        new_usernames = [username for username in learners if username not in learner_users]
+        if new_usernames:
+            User.objects.bulk_create([User(username=username, **learners[username]) for username in new_usernames])
+            # bulk_create does not return the IDs of the users on every database, so they are fetched again.
+            learner_users.update(
+                (user.username, user) for user in User.objects.filter(username__in=new_usernames)
+            )
 
-        return learner_user
+        return learner_users
+
+    def _get_seat_products(self, courses, modes):
+        """
+        Return the seat products of the courses for the modes, by (course run key, mode).
+        """
+        seat_products = {}
+        for product in Product.objects.filter(
+                parent__course__in=list(courses),
+                parent__product_class__name=SEAT_PRODUCT_CLASS_NAME,
+                parent__structure=Product.PARENT,
+                attribute_values__attribute__name='certificate_type',
+                attribute_values__value_text__in=list(modes),
+        ).annotate(certificate_type=F('attribute_values__value_text')).select_related('course'):
+            # Products are ordered by most recent first, like Course.seat_products.
+            seat_products.setdefault((product.course_id, product.certificate_type), product)
+        return seat_products
+
+    def _get_existing_purchased_lines(self, learner_seat_products, request_site):
+        """
+        Return the OrderLines already purchased by each learner for the course of each seat product, whether in the
+        form of course entitlement or course enrollment.
+
+        Params:
+            `learner_seat_products`: <list> of (<User>, <Product> or None) tuples.
+        Returns:
+            <dict> with the OrderLine of each (user ID, seat product ID), or the exception raised while looking up
+            the course of the seat product.
+        """
+        seat_products = {seat_product.id: seat_product for __, seat_product in learner_seat_products if seat_product}
+        course_uuids = {}
+        lines = {}
+        for seat_product in seat_products.values():
+            if seat_product.course_id not in course_uuids:
+                try:
+                    course_uuids[seat_product.course_id] = get_course_run_detail(
+                        request_site, seat_product.course_id
+                    )['course_uuid']
+                except (SlumberBaseException, ConnectionError, Timeout, HttpServerError, AttributeError) as ex:
+                    logger.exception(
+                        "Could not access existing purchased line. Site: %s, course_run_key: %s, message: %s",
+                        request_site,
+                        seat_product.course_id,
+                        ex,
+                    )
+                    course_uuids[seat_product.course_id] = ex
+
+        # Entitlement products, by course UUID.
+        entitlement_product_ids = defaultdict(set)
+        for product_id, course_uuid in ProductAttributeValue.objects.filter(
+                attribute__code='UUID',
+                value_text__in=[str(course_uuid) for course_uuid in course_uuids.values()
+                                if not isinstance(course_uuid, Exception)],
+        ).values_list('product_id', 'value_text'):
+            entitlement_product_ids[course_uuid].add(product_id)
+
+        course_product_ids = {}
+        for seat_product in seat_products.values():
+            course_uuid = course_uuids[seat_product.course_id]
+            if not isinstance(course_uuid, Exception):
+                course_product_ids[seat_product.id] = {seat_product.id} | entitlement_product_ids[str(course_uuid)]
+
+        user_lines = defaultdict(list)
+        for line in OrderLine.objects.filter(
+                product_id__in=set().union(*course_product_ids.values()),
+                order__user__in={user.id for user, __ in learner_seat_products},
+                status=LINE.COMPLETE
+        ).select_related('order').order_by('pk'):
+            user_lines[line.order.user_id].append(line)
+
+        for user, seat_product in learner_seat_products:
+            if not seat_product:
+                continue
+            course_uuid = course_uuids[seat_product.course_id]
+            if isinstance(course_uuid, Exception):
+                lines[(user.id, seat_product.id)] = course_uuid
+                continue
+            product_ids = course_product_ids[seat_product.id]
+            line = next((line for line in user_lines[user.id] if line.product_id in product_ids), None)
+            if line:
+                lines[(user.id, seat_product.id)] = line
+
+        return lines
+
+    def _get_discount_offer(self, discount_offers, enterprise_customer_name, enterprise_customer_uuid,
+                            sales_force_id):
+        """
+        Return the discount offer of the enterprise customer, only getting or creating it again when its condition
+        or offer would be updated.
+        """
+        customer_name, offer = discount_offers.get(enterprise_customer_uuid, (None, None))
+        if (offer is None or customer_name != enterprise_customer_name or
+                (sales_force_id and offer.sales_force_id != sales_force_id)):
+            offer = self._get_or_create_discount_offer(enterprise_customer_name, enterprise_customer_uuid,
+                                                       sales_force_id)
+            discount_offers[enterprise_customer_uuid] = (enterprise_customer_name, offer)
+        return offer
 
     def _get_or_create_discount_offer(self, enterprise_customer_name, enterprise_customer_uuid, sales_force_id):
         """
@@ -503,3 +726,26 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
         )
 
         return order
+
+
+def create_manual_enrollment_orders(progress, enrollments, request_user, request_site):
+    """
+    Background job creating the orders of large manual enrollment requests, see ManualCourseEnrollmentOrderViewSet.
+
+    The results of the enrollments are also stored as a CSV file, which can be downloaded through the background
+    jobs API.
+    """
+    # Jobs run outside of requests, but the discount condition and fulfillment of the orders read the current
+    # request, as they do when the orders are created by the endpoint.
+    with site_request(request_site, reverse('api:v2:manual-course-enrollment-order-list'), request_user):
+        orders = ManualCourseEnrollmentOrderViewSet()._create_orders(  # pylint: disable=protected-access
+            enrollments, request_user, request_site, progress=progress
+        )
+
+    output = StringIO()
+    writer = csv.DictWriter(output, fieldnames=MANUAL_ENROLLMENT_ORDER_CSV_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(orders)
+    progress.save_result_file('manual_enrollment_orders.csv', output.getvalue())
+
+    return _count_manual_enrollment_orders(orders)
@@ -16,6 +16,7 @@ from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.filters import ProductFilter
+from ecommerce.extensions.api.pagination import OptionalCursorPagination
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,8 @@ class ProductViewSet(NestedViewSetMixin, NonDestroyableModelViewSet):
     serializer_class = serializers.ProductSerializer
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = ProductFilter
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-date_created', '-id')
     permission_classes = (IsAuthenticated, IsAdminUser,)
 
     def get_queryset(self):
@@ -156,15 +156,19 @@ class RefundProcessView(generics.UpdateAPIView):
         if action not in (APPROVE, DENY, APPROVE_PAYMENT_ONLY):
             raise ParseError('The action [{}] is not valid.'.format(action))
 
-        with transaction.atomic():
+        if action == APPROVE:
+            # Refunds are approved outside of a transaction, so that the refund of the payment is committed
+            # before the lines are revoked, and the lines can be revoked concurrently by worker threads, see
+            # revoke_fulfillment_for_refund. The status of each step is committed as soon as it is set.
             refund = self.get_object()
-            result = False
-
-            if action in (APPROVE, APPROVE_PAYMENT_ONLY):
-                revoke_fulfillment = action == APPROVE
-                result = refund.approve(revoke_fulfillment=revoke_fulfillment)
-            elif action == DENY:
-                result = refund.deny()
+            result = refund.approve()
+        else:
+            with transaction.atomic():
+                refund = self.get_object()
+                if action == APPROVE_PAYMENT_ONLY:
+                    result = refund.approve(revoke_fulfillment=False)
+                else:
+                    result = refund.deny()
 
         http_status = status.HTTP_200_OK if result else status.HTTP_500_INTERNAL_SERVER_ERROR
         serializer = self.get_serializer(refund)
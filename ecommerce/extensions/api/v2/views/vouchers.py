@@ -9,6 +9,7 @@ import pytz
 from dateutil.parser import parse
 from dateutil.utils import default_tzinfo
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 from django.utils.timezone import now
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
@@ -20,11 +21,13 @@ from rest_framework.response import Response
 from slumber.exceptions import SlumberBaseException
 
 from ecommerce.core.constants import DEFAULT_CATALOG_PAGE_SIZE
+from ecommerce.core.db_routers import read_replica_view
 from ecommerce.coupons.utils import fetch_course_catalog, get_catalog_course_runs
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import get_course_info_from_catalog
 from ecommerce.enterprise.utils import get_enterprise_catalog
 from ecommerce.extensions.api import serializers
+from ecommerce.extensions.api.pagination import OptionalCursorPagination
 from ecommerce.extensions.api.permissions import IsOffersOrIsAuthenticatedAndStaff
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
 
@@ -53,6 +56,8 @@ class VoucherViewSet(NonDestroyableModelViewSet):
     permission_classes = (IsOffersOrIsAuthenticatedAndStaff,)
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = VoucherFilter
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-date_created', '-id')
 
     def get_queryset(self):
         return Voucher.objects.filter(
@@ -60,6 +65,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
         )
 
     @action(detail=False)
+    @method_decorator(read_replica_view)
     def offers(self, request):
         """ Preview the courses offered by the voucher.
 
@@ -2,6 +2,7 @@
 
 import datetime
 import itertools
+import json
 import urllib.error
 import urllib.parse
 from contextlib import contextmanager
@@ -26,6 +27,7 @@ from slumber.exceptions import SlumberBaseException
 from testfixtures import LogCapture
 from waffle.testutils import override_flag
 
+from ecommerce.core.cache_utils import CACHE_KEY_PREFIX
 from ecommerce.core.exceptions import SiteConfigurationError
 from ecommerce.core.tests import toggle_switch
 from ecommerce.core.url_utils import absolute_url, get_lms_url
@@ -206,7 +208,8 @@ class BasketAddItemsViewTests(CouponMixin, DiscoveryTestMixin, DiscoveryMockMixi
         stock_record = StockRecordFactory(product=product2, partner=self.partner)
         catalog.stock_records.add(stock_record)
 
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=True):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'get_already_purchased_products',
+                               side_effect=lambda user, products, site: {product.id for product in products}):
             response = self._get_response(
                 [product.stockrecords.first().partner_sku for product in [product1, product2]],
             )
@@ -218,7 +221,7 @@ class BasketAddItemsViewTests(CouponMixin, DiscoveryTestMixin, DiscoveryMockMixi
         Test user can purchase products which have not been already purchased
         """
         products = ProductFactory.create_batch(3, stockrecords__partner=self.partner)
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=False):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'get_already_purchased_products', return_value=set()):
             response = self._get_response([product.stockrecords.first().partner_sku for product in products])
             self.assertEqual(response.status_code, 303)
 
@@ -516,6 +519,30 @@ class PaymentApiViewTests(PaymentApiResponseTestMixin, BasketMixin, DiscoveryMoc
                 title=u'PaymentApiViewTests',
             )
 
+    def test_multiple_seats_course_info_fetched_in_bulk(self):
+        """ Verify the catalog information of all of the basket's seats is retrieved with a single request. """
+        courses = [self.course, CourseFactory(name='Second PaymentApiViewTests', partner=self.partner)]
+        basket = self.create_empty_basket()
+        for course in courses:
+            basket.add_product(self.create_seat(course), 1)
+        self.mock_access_token_response()
+        httpretty.register_uri(
+            httpretty.GET, '{}course_runs/'.format(self.site_configuration.discovery_api_url),
+            body=json.dumps({'results': [
+                {'key': course.id, 'title': course.name, 'image': {'src': '/path/to/image.jpg'}} for course in courses
+            ]}),
+            content_type='application/json'
+        )
+
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(product['course_key'], product['title']) for product in response.json()['products']],
+            [(course.id, course.name) for course in courses]
+        )
+        course_run_requests = [request for request in httpretty.latest_requests() if 'course_runs' in request.path]
+        self.assertEqual(len(course_run_requests), 1)
+
     def test_enrollment_code_type(self):
         course, __, enrollment_code = self.prepare_course_seat_and_enrollment_code(seat_price=100)
         basket = self.create_basket_and_add_product(enrollment_code)
@@ -860,13 +887,13 @@ class BasketSummaryViewTests(EnterpriseServiceMockMixin, DiscoveryTestMixin, Dis
             site_domain=self.site,
             resource="{}-{}".format('course_runs', self.course.id)
         )
-        course_before_cached_response = TieredCache.get_cached_response(cache_key)
+        course_before_cached_response = TieredCache.get_cached_response(CACHE_KEY_PREFIX + cache_key)
         self.assertFalse(course_before_cached_response.is_found)
 
         response = self.client.get(self.path)
         self.assertEqual(response.status_code, 200)
-        course_after_cached_response = TieredCache.get_cached_response(cache_key)
-        self.assertEqual(course_after_cached_response.value['title'], self.course.name)
+        course_after_cached_response = TieredCache.get_cached_response(CACHE_KEY_PREFIX + cache_key)
+        self.assertEqual(course_after_cached_response.value.value['title'], self.course.name)
 
     @ddt.data({
         'course': 'edX+DemoX',
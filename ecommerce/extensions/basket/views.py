@@ -11,6 +11,7 @@ from decimal import Decimal
 import dateutil.parser
 import newrelic.agent
 import waffle
+from django.db.models import Prefetch, prefetch_related_objects
 from django.http import HttpResponseBadRequest, HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
@@ -31,7 +32,11 @@ from slumber.exceptions import SlumberBaseException
 
 from ecommerce.core.exceptions import SiteConfigurationError
 from ecommerce.core.url_utils import absolute_redirect, get_lms_course_about_url, get_lms_url
-from ecommerce.courses.utils import get_certificate_type_display_value, get_course_info_from_catalog
+from ecommerce.courses.utils import (
+    get_certificate_type_display_value,
+    get_course_info_from_catalog,
+    get_course_info_from_catalog_for_products
+)
 from ecommerce.enterprise.utils import (
     CONSENT_FAILED_PARAM,
     construct_enterprise_course_consent_url,
@@ -71,6 +76,7 @@ from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 from ecommerce.extensions.payment.constants import CLIENT_SIDE_CHECKOUT_FLAG_NAME
 from ecommerce.extensions.payment.forms import PaymentForm
+from ecommerce.extensions.payment.helpers import get_processor
 
 Basket = get_model('basket', 'basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
@@ -115,18 +121,26 @@ class BasketLogicMixin:
             'is_enrollment_code_purchase': False
         }
 
+        lines = list(lines)
+        products = [line.product for line in lines]
+        prefetch_related_objects(products, Prefetch('stockrecords', queryset=StockRecord.objects.order_by('id')))
+        courses = self._get_course_info_for_products([
+            product for product in products
+            if product.is_seat_product or product.is_course_entitlement_product or product.is_enrollment_code_product
+        ])
+
         lines_data = []
         for line in lines:
             product = line.product
             if product.is_seat_product or product.is_course_entitlement_product:
-                line_data, _ = self._get_course_data(product)
+                line_data, _ = self._get_course_data(product, courses.get(product.id))
 
                 # TODO this is only used by hosted_checkout_basket template, which may no longer be
                 # used. Consider removing both.
                 if self._is_id_verification_required(product):
                     context_updates['display_verification_message'] = True
             elif product.is_enrollment_code_product:
-                line_data, course = self._get_course_data(product)
+                line_data, course = self._get_course_data(product, courses.get(product.id))
                 self._set_single_enrollment_code_warning_if_needed(product, course)
                 context_updates['is_enrollment_code_purchase'] = True
                 context_updates['show_voucher_form'] = False
@@ -138,11 +152,8 @@ class BasketLogicMixin:
                     'product_description': product.description
                 }
 
-            context_updates['order_details_msg'] = self._get_order_details_message(product)
-            context_updates['switch_link_text'], context_updates['partner_sku'] = get_basket_switch_data(product)
-
             line_data.update({
-                'sku': product.stockrecords.first().partner_sku,
+                'sku': product.stockrecords.all()[0].partner_sku,
                 'benefit_value': self._get_benefit_value(line),
                 'enrollment_code': product.is_enrollment_code_product,
                 'line': line,
@@ -150,6 +161,12 @@ class BasketLogicMixin:
             })
             lines_data.append(line_data)
 
+        if lines:
+            # Only the last line's order details message and switch link are displayed.
+            last_product = lines[-1].product
+            context_updates['order_details_msg'] = self._get_order_details_message(last_product)
+            context_updates['switch_link_text'], context_updates['partner_sku'] = get_basket_switch_data(last_product)
+
         return context_updates, lines_data
 
     def process_totals(self, context):
@@ -241,12 +258,30 @@ class BasketLogicMixin:
                 )
 
     @newrelic.agent.function_trace()
-    def _get_course_data(self, product):
+    def _get_course_info_for_products(self, products):
+        """
+        Return the catalog information of the given products, keyed by product id, fetched in bulk.
+
+        Products missing from the result (including all of them if Discovery Service could not be
+        reached) are looked up individually by _get_course_data, as are single product baskets.
+        """
+        if len(products) < 2:
+            return {}
+
+        try:
+            return get_course_info_from_catalog_for_products(self.request.site, products)
+        except (ReqConnectionError, SlumberBaseException, Timeout):
+            logger.exception('Failed to retrieve data from Discovery Service for basket products.')
+            return {}
+
+    @newrelic.agent.function_trace()
+    def _get_course_data(self, product, course=None):
         """
         Return course data.
 
         Args:
             product (Product): A product that has course_key as attribute (seat or bulk enrollment coupon)
+            course (dict): Catalog information of the product, if already retrieved.
         Returns:
             A dictionary containing product title, course key, image URL, description, and start and end dates.
             Also returns course information found from catalog.
@@ -259,13 +294,13 @@ class BasketLogicMixin:
             'course_start': None,
             'course_end': None,
         }
-        course = None
 
         if product.is_seat_product:
             course_data['course_key'] = CourseKey.from_string(product.attr.course_key)
 
         try:
-            course = get_course_info_from_catalog(self.request.site, product)
+            if course is None:
+                course = get_course_info_from_catalog(self.request.site, product)
             try:
                 course_data['image_url'] = course['image']['src']
             except (KeyError, TypeError):
@@ -593,7 +628,7 @@ class BasketSummaryView(BasketLogicMixin, BasketView):
         payment_processor_class = site_configuration.get_client_side_payment_processor_class()
 
         if payment_processor_class:
-            payment_processor = payment_processor_class(self.request.site)
+            payment_processor = get_processor(payment_processor_class, self.request.site)
             current_year = datetime.today().year
 
             return {
@@ -625,7 +660,7 @@ class CaptureContextApiLogicMixin:  # pragma: no cover
         payment_processor_class = self.request.site.siteconfiguration.get_client_side_payment_processor_class()
         if not payment_processor_class:
             return
-        payment_processor = payment_processor_class(self.request.site)
+        payment_processor = get_processor(payment_processor_class, self.request.site)
         if not hasattr(payment_processor, 'get_capture_context'):
             return
 
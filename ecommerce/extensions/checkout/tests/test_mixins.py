@@ -13,11 +13,12 @@ from testfixtures import LogCapture
 from waffle.models import Sample
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, ENROLLMENT_CODE_SWITCH
-from ecommerce.core.models import BusinessClient, SegmentClient
+from ecommerce.core.models import BusinessClient
 from ecommerce.core.tests import toggle_switch
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.analytics.utils import (
     ECOM_TRACKING_ID_FMT,
+    SegmentClient,
     parse_tracking_context,
     translate_basket_line_for_segment
 )
@@ -1,15 +1,18 @@
 
 
+from django.utils.decorators import method_decorator
 from django.views.generic import DetailView, ListView
 from oscar.core.loading import get_class, get_model
 from oscar.views import sort_queryset
 
+from ecommerce.core.db_routers import read_replica_view
 from ecommerce.extensions.dashboard.views import FilterFieldsMixin
 
 Refund = get_model('refund', 'Refund')
 RefundSearchForm = get_class('dashboard.refunds.forms', 'RefundSearchForm')
 
 
+@method_decorator(read_replica_view, name='get')
 class RefundListView(FilterFieldsMixin, ListView):
     """ Dashboard view to list refunds. """
     model = Refund
@@ -8,11 +8,16 @@ can successfully fulfill the product. Success can be reported back based on each
 
 
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from importlib import import_module
 
 from django.conf import settings
+from django.db import connection, connections
 from django.utils.timezone import now
 
+from ecommerce.core.utils import site_request
 from ecommerce.extensions.fulfillment import exceptions
 from ecommerce.extensions.fulfillment.status import LINE, ORDER
 from ecommerce.extensions.refund.status import REFUND_LINE
@@ -46,20 +51,16 @@ def fulfill_order(order, lines, email_opt_in=False):
         logger.error(error_msg)
         raise exceptions.IncorrectOrderStatusError(error_msg)
 
-    # Construct a dict of lines by their product type.
     line_items = list(lines.all())
 
     try:
-        # Iterate over the Fulfillment Modules defined in our configuration and determine if they support
-        # any of the lines in the order. Fulfill line items in the order they are designated by the configuration.
+        # Group the lines by the Fulfillment Module, defined in our configuration, that supports them.
+        # Fulfill line items in the order the modules are designated by the configuration.
         # Remaining line items should be marked with a fulfillment error since we have no configuration that
         # allows them to be fulfilled.
-        for module_class in get_fulfillment_modules():
-            module = module_class()
-            supported_lines = module.get_supported_lines(line_items)
-            if supported_lines:
-                line_items = list(set(line_items) - set(supported_lines))
-                module.fulfill_product(order, supported_lines, email_opt_in=email_opt_in)
+        module_lines, line_items = get_fulfillment_module_registry().group_lines(line_items)
+        for module, supported_lines in module_lines:
+            module.fulfill_product(order, supported_lines, email_opt_in=email_opt_in)
 
         # Check to see if any line items in the order have not been accounted for by a FulfillmentModule
         # Any product does not line up with a module, we have to mark a fulfillment error.
@@ -92,20 +93,87 @@ def fulfill_order(order, lines, email_opt_in=False):
         return order  # pylint: disable=lost-exception
 
 
-def get_fulfillment_modules():
-    """ Retrieves all fulfillment modules declared in settings. """
-    module_paths = getattr(settings, 'FULFILLMENT_MODULES', [])
-    modules = []
+class FulfillmentModuleRegistry:
+    """
+    The fulfillment modules declared in settings, loaded once.
 
-    for cls_path in module_paths:
-        try:
-            module_path, _, name = cls_path.rpartition('.')
-            module = getattr(import_module(module_path), name)
-            modules.append(module)
-        except (ImportError, ValueError, AttributeError):
-            logger.exception("Could not load module at [%s]", cls_path)
+    Modules listing the product classes they fulfill in `product_class_names` are looked up by the
+    product class of each line. The other modules are asked which lines they support.
+    """
 
-    return modules
+    def __init__(self, module_paths):
+        self.modules = []
+        self.modules_by_product_class = {}
+
+        for cls_path in module_paths:
+            try:
+                module_path, _, name = cls_path.rpartition('.')
+                module = getattr(import_module(module_path), name)
+            except (ImportError, ValueError, AttributeError):
+                logger.exception("Could not load module at [%s]", cls_path)
+                continue
+
+            self.modules.append(module)
+            for product_class_name in module.product_class_names:
+                self.modules_by_product_class.setdefault(product_class_name, []).append(module)
+
+    def get_modules_for_line(self, line):
+        """ Returns the modules that can fulfill the given Line, in the order they are declared in settings. """
+        product_class_modules = self.modules_by_product_class.get(line.product.get_product_class().name, [])
+        return [
+            module for module in self.modules
+            if module in product_class_modules or (not module.product_class_names and module().supports_line(line))
+        ]
+
+    def group_lines(self, lines):
+        """
+        Groups the lines by the module that fulfills them.
+
+        Lines of a product class listed by modules go to the first of these modules. The remaining lines
+        are offered to the other modules, in the order they are declared in settings.
+
+        Arguments:
+            lines (list): Lines to be fulfilled.
+
+        Returns:
+            tuple: A list of (module instance, lines) pairs, in the order the modules are declared in settings,
+                and the list of lines that no module supports.
+        """
+        lines_by_module = OrderedDict((module, []) for module in self.modules)
+        unmatched_lines = []
+        for line in lines:
+            modules = self.modules_by_product_class.get(line.product.get_product_class().name)
+            if modules:
+                lines_by_module[modules[0]].append(line)
+            else:
+                unmatched_lines.append(line)
+
+        module_lines = []
+        for module_class, supported_lines in lines_by_module.items():
+            module = module_class()
+            if not module_class.product_class_names and unmatched_lines:
+                supported_lines = module.get_supported_lines(unmatched_lines)
+                if supported_lines:
+                    unmatched_lines = list(set(unmatched_lines) - set(supported_lines))
+            if supported_lines:
+                module_lines.append((module, supported_lines))
+
+        return module_lines, unmatched_lines
+
+
+@lru_cache()
+def _get_fulfillment_module_registry(module_paths):
+    return FulfillmentModuleRegistry(module_paths)
+
+
+def get_fulfillment_module_registry():
+    """ Returns the registry of the fulfillment modules declared in settings. """
+    return _get_fulfillment_module_registry(tuple(getattr(settings, 'FULFILLMENT_MODULES', [])))
+
+
+def get_fulfillment_modules():
+    """ Retrieves all fulfillment modules declared in settings. """
+    return list(get_fulfillment_module_registry().modules)
 
 
 def get_fulfillment_modules_for_line(line):
@@ -115,13 +183,45 @@ def get_fulfillment_modules_for_line(line):
     Arguments
         line (Line): Line to be considered for fulfillment.
     """
-    return [module for module in get_fulfillment_modules() if module().supports_line(line)]
+    return get_fulfillment_module_registry().get_modules_for_line(line)
+
+
+def _revoke_line(modules, order_line):
+    """ Revokes the line with each of the modules, returning whether each revocation succeeded. """
+    return [module().revoke_line(order_line) for module in modules]
+
+
+def _revoke_line_in_thread(modules, order_line, site):
+    """ Revokes the line from a worker thread, which has neither the current request nor its database connections. """
+    try:
+        with site_request(site):
+            return _revoke_line(modules, order_line)
+    finally:
+        # The worker thread has its own database connections, which would otherwise be left open.
+        connections.close_all()
+
 
+def _in_transaction():
+    """ Returns whether the calling thread is in a transaction, whose writes other threads cannot read. """
+    return connection.in_atomic_block
 
-def revoke_fulfillment_for_refund(refund):
+
+def revoke_fulfillment_for_refund(refund, max_workers=None):
     """
     Revokes fulfillment for all lines in a refund.
 
+    Revoking a line usually waits on the LMS, so lines can be revoked concurrently by a pool of threads,
+    each with a request for the site of the order. The statuses of the refund lines are set once all of them
+    have been revoked, as they would be if the lines were revoked one at a time.
+
+    Lines are always revoked one at a time in transactions, since the worker threads could not read the rows
+    written by the transaction. The refund process endpoint approves refunds outside of a transaction for this reason.
+
+    Args
+        refund (Refund): Refund whose lines should be revoked.
+        max_workers (int): Maximum number of lines revoked at the same time. Defaults to
+            settings.REFUND_REVOCATION_MAX_WORKERS. Lines are revoked one at a time if it is 1.
+
     Returns
         Boolean: True, if revocation of all lines succeeded; otherwise, False.
     """
@@ -133,18 +233,37 @@ def revoke_fulfillment_for_refund(refund):
     if refund.total_credit_excl_tax == 0:
         for refund_line in refund.lines.all():
             refund_line.set_status(REFUND_LINE.COMPLETE)
+        return succeeded
+
+    refund_lines = refund.lines.select_related(
+        'order_line__order__user', 'order_line__product__product_class', 'order_line__product__parent'
+    )
+    modules_by_line = [
+        (refund_line, get_fulfillment_modules_for_line(refund_line.order_line)) for refund_line in refund_lines
+    ]
+    if max_workers is None:
+        max_workers = settings.REFUND_REVOCATION_MAX_WORKERS
+
+    if max_workers > 1 and len(modules_by_line) > 1 and not _in_transaction():
+        site = refund.order.site
+        with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(modules_by_line)), thread_name_prefix='refund-revocation'
+        ) as executor:
+            futures = [
+                executor.submit(_revoke_line_in_thread, modules, refund_line.order_line, site)
+                for refund_line, modules in modules_by_line
+            ]
+        # Any exception raised by a revocation is raised once the statuses of the lines before it are set.
+        results = (future.result() for future in futures)
     else:
-        # TODO (CCB): As our list of product types and fulfillment modules grows, this may become slow,
-        # and should be updated. Runtime is O(n^2).
-        for refund_line in refund.lines.all():
-            order_line = refund_line.order_line
-            modules = get_fulfillment_modules_for_line(order_line)
-
-            for module in modules:
-                if module().revoke_line(order_line):
-                    refund_line.set_status(REFUND_LINE.COMPLETE)
-                else:
-                    succeeded = False
-                    refund_line.set_status(REFUND_LINE.REVOCATION_ERROR)
+        results = (_revoke_line(modules, refund_line.order_line) for refund_line, modules in modules_by_line)
+
+    for (refund_line, __), revocations in zip(modules_by_line, results):
+        for revoked in revocations:
+            if revoked:
+                refund_line.set_status(REFUND_LINE.COMPLETE)
+            else:
+                succeeded = False
+                refund_line.set_status(REFUND_LINE.REVOCATION_ERROR)
 
     return succeeded
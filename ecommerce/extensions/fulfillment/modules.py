@@ -22,10 +22,13 @@ from requests.exceptions import Timeout
 from rest_framework import status
 
 from ecommerce.core.constants import (
+    COUPON_PRODUCT_CLASS_NAME,
+    COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME,
     DONATIONS_FROM_CHECKOUT_TESTS_PRODUCT_TYPE_NAME,
     ENROLLMENT_CODE_PRODUCT_CLASS_NAME,
     HUBSPOT_FORMS_INTEGRATION_ENABLE,
-    ISO_8601_FORMAT
+    ISO_8601_FORMAT,
+    SEAT_PRODUCT_CLASS_NAME
 )
 from ecommerce.core.url_utils import get_lms_enrollment_api_url, get_lms_entitlement_api_url
 from ecommerce.courses.models import Course
@@ -63,6 +66,10 @@ class BaseFulfillmentModule(metaclass=abc.ABCMeta):  # pragma: no cover
     All modules should extend the FulfillmentModule and adhere to the defined contract.
     """
 
+    # Names of the product classes whose lines are all supported by this module. Lines are dispatched to
+    # modules listing their product class without calling get_supported_lines.
+    product_class_names = ()
+
     @abc.abstractmethod
     def supports_line(self, line):
         """
@@ -131,6 +138,9 @@ class DonationsFromCheckoutTestFulfillmentModule(BaseFulfillmentModule):
     If that test, or any follow up tests around donations at checkout are not implemented, this module will be reverted.
     Don't use this code for your own purposes, thanks.
     """
+
+    product_class_names = (DONATIONS_FROM_CHECKOUT_TESTS_PRODUCT_TYPE_NAME,)
+
     def supports_line(self, line):
         """
         Returns True if the given Line has a donation product.
@@ -189,6 +199,8 @@ class EnrollmentFulfillmentModule(EnterpriseDiscountMixin, BaseFulfillmentModule
             messages if the LMS user id cannot be found.
     """
 
+    product_class_names = (SEAT_PRODUCT_CLASS_NAME,)
+
     def _post_to_enrollment_api(self, data, user, usage):
         enrollment_api_url = get_lms_enrollment_api_url()
         timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
@@ -424,6 +436,8 @@ class EnrollmentFulfillmentModule(EnterpriseDiscountMixin, BaseFulfillmentModule
 class CouponFulfillmentModule(BaseFulfillmentModule):
     """ Fulfillment Module for coupons. """
 
+    product_class_names = (COUPON_PRODUCT_CLASS_NAME,)
+
     def supports_line(self, line):
         """
         Check whether the product in line is a Coupon
@@ -481,6 +495,8 @@ class CouponFulfillmentModule(BaseFulfillmentModule):
 
 
 class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
+    product_class_names = (ENROLLMENT_CODE_PRODUCT_CLASS_NAME,)
+
     def supports_line(self, line):
         """
         Check whether the product in line is an Enrollment code.
@@ -740,6 +756,8 @@ class CourseEntitlementFulfillmentModule(EnterpriseDiscountMixin, BaseFulfillmen
     Allows the entitlement of a student via purchase of a 'Course Entitlement'.
     """
 
+    product_class_names = (COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME,)
+
     def supports_line(self, line):
         return line.product.is_course_entitlement_product
 
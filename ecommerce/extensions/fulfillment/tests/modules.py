@@ -1,5 +1,7 @@
+import threading
+import time
 
-
+from ecommerce.core.url_utils import get_lms_enrollment_api_url
 from ecommerce.extensions.fulfillment.modules import BaseFulfillmentModule
 from ecommerce.extensions.fulfillment.status import LINE
 
@@ -63,3 +65,20 @@ class RevocationFailureModule(MockFulfillmentModule):
     def revoke_line(self, line):
         """ Returns False to simulate a revocation failure."""
         return False
+
+
+class StubLmsRevocationModule(FakeFulfillmentModule):
+    """
+    Builds the LMS URL of the current request, as the LMS modules do, and waits for a stubbed LMS to revoke lines.
+    Use it to test and benchmark concurrent revocation.
+    """
+
+    latency = 0
+    failed_line_ids = ()
+    revocations = []
+
+    def revoke_line(self, line):
+        """ Records the thread and URL of the revocation, then fails to revoke the lines listed in failed_line_ids. """
+        self.revocations.append((threading.current_thread().name, get_lms_enrollment_api_url()))
+        time.sleep(self.latency)
+        return line.id not in self.failed_line_ids
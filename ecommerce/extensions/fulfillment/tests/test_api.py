@@ -1,22 +1,28 @@
 """Tests for the Fulfillment API"""
 
 
+import time
+
 import ddt
 from django.test.utils import override_settings
 from mock import patch
 from testfixtures import LogCapture
+from threadlocals.threadlocals import get_current_request
 
+from ecommerce.core.url_utils import get_lms_enrollment_api_url
 from ecommerce.extensions.fulfillment import api, exceptions
 from ecommerce.extensions.fulfillment.api import (
+    get_fulfillment_module_registry,
     get_fulfillment_modules,
     get_fulfillment_modules_for_line,
     revoke_fulfillment_for_refund
 )
+from ecommerce.extensions.fulfillment.modules import DonationsFromCheckoutTestFulfillmentModule
 from ecommerce.extensions.fulfillment.status import LINE, ORDER
 from ecommerce.extensions.fulfillment.tests.mixins import FulfillmentTestMixin
-from ecommerce.extensions.fulfillment.tests.modules import FakeFulfillmentModule
+from ecommerce.extensions.fulfillment.tests.modules import FakeFulfillmentModule, StubLmsRevocationModule
 from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
-from ecommerce.extensions.refund.tests.factories import RefundFactory
+from ecommerce.extensions.refund.tests.factories import RefundFactory, RefundLineFactory
 from ecommerce.tests.testcases import TestCase
 
 
@@ -104,6 +110,42 @@ class FulfillmentApiTests(FulfillmentTestMixin, TestCase):
         actual = get_fulfillment_modules_for_line(line)
         self.assertEqual(actual, [FakeFulfillmentModule])
 
+    @override_settings(FULFILLMENT_MODULES=[
+        'ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule',
+        'ecommerce.extensions.fulfillment.modules.DonationsFromCheckoutTestFulfillmentModule',
+    ])
+    def test_group_lines(self):
+        """
+        Verify lines are dispatched to the modules listing their product class, and the remaining lines
+        are offered to the other modules.
+        """
+        line = self.order.lines.first()
+        donation_line = self.generate_open_order(product_class='Donation').lines.first()
+
+        with patch.object(DonationsFromCheckoutTestFulfillmentModule, 'get_supported_lines') as mock_supported_lines:
+            module_lines, unsupported_lines = get_fulfillment_module_registry().group_lines([line, donation_line])
+            mock_supported_lines.assert_not_called()
+
+        self.assertEqual(
+            [(type(module), lines) for module, lines in module_lines],
+            [(FakeFulfillmentModule, [line]), (DonationsFromCheckoutTestFulfillmentModule, [donation_line])]
+        )
+        self.assertEqual(unsupported_lines, [])
+        self.assertEqual(
+            get_fulfillment_modules_for_line(donation_line),
+            [FakeFulfillmentModule, DonationsFromCheckoutTestFulfillmentModule]
+        )
+
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule'])
+    def test_fulfillment_modules_loaded_once(self):
+        """ Verify the fulfillment modules are only imported once for the modules declared in settings. """
+        get_fulfillment_modules()
+        with patch('ecommerce.extensions.fulfillment.api.import_module') as mock_import_module:
+            self.assertEqual(get_fulfillment_modules(), [FakeFulfillmentModule])
+            api.fulfill_order(self.order, self.order.lines)
+            mock_import_module.assert_not_called()
+        self.assert_order_fulfilled(self.order)
+
     @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule'])
     def test_revoke_fulfillment_for_refund(self):
         """
@@ -137,3 +179,83 @@ class FulfillmentApiTests(FulfillmentTestMixin, TestCase):
         self.assertFalse(revoke_fulfillment_for_refund(refund))
         self.assertEqual(refund.status, REFUND.PAYMENT_REFUNDED)
         self.assertEqual({line.status for line in refund.lines.all()}, {REFUND_LINE.REVOCATION_ERROR})
+
+    def create_multiline_refund(self, num_lines):
+        refund = RefundFactory(status=REFUND.PAYMENT_REFUNDED)
+        RefundLineFactory.create_batch(num_lines - 1, refund=refund)
+        return refund
+
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.StubLmsRevocationModule'])
+    @ddt.data(1, 4)
+    def test_revoke_fulfillment_for_refund_statuses(self, max_workers):
+        """
+        Verify the statuses of the refund lines are the same whether they are revoked one at a time or concurrently.
+        """
+        refund = self.create_multiline_refund(4)
+        refund_lines = list(refund.lines.order_by('id'))
+        failed_line_ids = [refund_lines[1].order_line.id]
+
+        with patch.object(StubLmsRevocationModule, 'failed_line_ids', failed_line_ids), \
+                patch.object(StubLmsRevocationModule, 'revocations', []), \
+                patch.object(api, '_in_transaction', return_value=False):
+            self.assertFalse(revoke_fulfillment_for_refund(refund, max_workers=max_workers))
+
+        self.assertEqual(
+            [line.status for line in refund.lines.order_by('id')],
+            [REFUND_LINE.COMPLETE, REFUND_LINE.REVOCATION_ERROR, REFUND_LINE.COMPLETE, REFUND_LINE.COMPLETE]
+        )
+
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.StubLmsRevocationModule'])
+    def test_revoke_fulfillment_for_refund_concurrently(self):
+        """
+        Verify the lines of a refund are revoked by worker threads, with a request for the site of the order.
+        """
+        refund = self.create_multiline_refund(4)
+        lms_url = get_lms_enrollment_api_url()
+        request = get_current_request()
+
+        with patch.object(StubLmsRevocationModule, 'revocations', []) as revocations, \
+                patch.object(api, '_in_transaction', return_value=False):
+            self.assertTrue(revoke_fulfillment_for_refund(refund, max_workers=4))
+
+        self.assertEqual(len(revocations), 4)
+        self.assertTrue(all(thread_name.startswith('refund-revocation') for thread_name, __ in revocations))
+        self.assertEqual({url for __, url in revocations}, {lms_url})
+        self.assertIs(get_current_request(), request)
+        self.assertEqual({line.status for line in refund.lines.all()}, {REFUND_LINE.COMPLETE})
+
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.StubLmsRevocationModule'])
+    def test_revoke_fulfillment_for_refund_benchmark(self):
+        """
+        Benchmark revoking the lines of a refund against a stubbed LMS, one at a time and then concurrently.
+        """
+        num_lines = 4
+        latency = 0.1
+        refunds = [self.create_multiline_refund(num_lines) for __ in range(2)]
+
+        durations = []
+        with patch.object(StubLmsRevocationModule, 'latency', latency), \
+                patch.object(StubLmsRevocationModule, 'revocations', []), \
+                patch.object(api, '_in_transaction', return_value=False):
+            for refund, max_workers in zip(refunds, (1, num_lines)):
+                start = time.time()
+                self.assertTrue(revoke_fulfillment_for_refund(refund, max_workers=max_workers))
+                durations.append(time.time() - start)
+                self.assertEqual({line.status for line in refund.lines.all()}, {REFUND_LINE.COMPLETE})
+
+        self.assertGreaterEqual(durations[0], num_lines * latency)
+        self.assertLess(durations[1], durations[0] / 2)
+
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.StubLmsRevocationModule'])
+    def test_revoke_fulfillment_for_refund_in_transaction(self):
+        """
+        Verify the lines of a refund are revoked by the calling thread in transactions, which tests run in.
+        """
+        refund = self.create_multiline_refund(4)
+
+        with patch.object(StubLmsRevocationModule, 'revocations', []) as revocations, \
+                patch.object(api, 'ThreadPoolExecutor') as mock_executor:
+            self.assertTrue(revoke_fulfillment_for_refund(refund, max_workers=4))
+
+        mock_executor.assert_not_called()
+        self.assertEqual(len(revocations), 4)
@@ -1,8 +1,11 @@
 
 
 import logging
+from collections import defaultdict
 from itertools import chain
 
+from django.conf import settings
+from edx_django_utils.cache import TieredCache
 from oscar.apps.offer.applicator import Applicator as OscarApplicator
 from oscar.core.loading import get_model
 
@@ -10,6 +13,95 @@ from ecommerce.enterprise.api import get_enterprise_id_for_user
 
 logger = logging.getLogger(__name__)
 BUNDLE = 'bundle_identifier'
+SITE_OFFER_INDEX_CACHE_KEY = 'offer.applicator.site_offer_index'
+
+
+def _is_indexable_condition(condition):
+    """
+    Returns True if the products which can satisfy the condition are exactly the products of its range,
+    as stored in the database.
+    """
+    offer_range = condition.range
+    if condition.proxy_class or offer_range is None:
+        return False
+
+    return not (
+        offer_range.proxy_class or
+        offer_range.includes_all_products or
+        offer_range.catalog_query or
+        offer_range.course_catalog or
+        offer_range.enterprise_customer or
+        offer_range.classes.all() or
+        offer_range.included_categories.all()
+    )
+
+
+def build_site_offer_index():
+    """
+    Build an index of the site offers available to baskets without bundle ids or enterprise customer UUIDs.
+
+    Offers whose condition range is made of a static list of products (or of the products of a catalog) are
+    indexed by product ID. All other offers (e.g. offers with custom conditions, or with ranges resolved by the
+    Discovery Service) can not be ruled out without evaluating their condition, and are always candidates.
+
+    Returns:
+        dict: with the keys
+            unrestricted (set): IDs of the offers which are candidates for every basket.
+            products (dict): Product ID mapped to the set of IDs of the offers whose range contains the product.
+    """
+    ConditionalOffer = get_model('offer', 'ConditionalOffer')
+    Range = get_model('offer', 'Range')
+    RangeProduct = get_model('offer', 'RangeProduct')
+
+    offers = ConditionalOffer.objects.filter(
+        offer_type=ConditionalOffer.SITE,
+        condition__program_uuid__isnull=True,
+        condition__enterprise_customer_uuid__isnull=True,
+    ).select_related('condition__range').prefetch_related(
+        'condition__range__classes', 'condition__range__included_categories'
+    )
+
+    unrestricted = set()
+    range_offers = defaultdict(set)
+    for offer in offers:
+        if _is_indexable_condition(offer.condition):
+            range_offers[offer.condition.range_id].add(offer.id)
+        else:
+            unrestricted.add(offer.id)
+
+    product_offers = defaultdict(set)
+    range_products = chain(
+        RangeProduct.objects.filter(range_id__in=range_offers).values_list('range_id', 'product_id'),
+        Range.objects.filter(
+            id__in=range_offers, catalog__isnull=False, catalog__stock_records__isnull=False
+        ).values_list('id', 'catalog__stock_records__product_id'),
+    )
+    for range_id, product_id in range_products:
+        product_offers[product_id].update(range_offers[range_id])
+
+    return {
+        'unrestricted': unrestricted,
+        'products': dict(product_offers),
+    }
+
+
+def get_site_offer_index():
+    """
+    Returns the cached site offer index, building it if necessary.
+
+    The index is invalidated whenever offers, conditions, ranges, range products or catalogs change.
+    """
+    cached_response = TieredCache.get_cached_response(SITE_OFFER_INDEX_CACHE_KEY)
+    if cached_response.is_found:
+        return cached_response.value
+
+    index = build_site_offer_index()
+    TieredCache.set_all_tiers(SITE_OFFER_INDEX_CACHE_KEY, index, settings.SITE_OFFER_INDEX_CACHE_TIMEOUT)
+    return index
+
+
+def invalidate_site_offer_index():
+    TieredCache.delete_all_tiers(SITE_OFFER_INDEX_CACHE_KEY)
 
 
 class Applicator(OscarApplicator):
@@ -55,7 +147,7 @@ class Applicator(OscarApplicator):
         """
         program_offers = self._get_program_offers(basket, bundle_id)
         enterprise_offers = self._get_enterprise_offers(basket.site, user)
-        site_offers = [] if program_offers or enterprise_offers else self.get_site_offers()
+        site_offers = [] if program_offers or enterprise_offers else self.get_site_offers(basket)
 
         basket_offers = self.get_basket_offers(basket, user)
 
@@ -72,11 +164,14 @@ class Applicator(OscarApplicator):
             )
         )
 
-    def get_site_offers(self):
+    def get_site_offers(self, basket=None):  # pylint: disable=arguments-differ
         """
         Return other site offers that are available to baskets without bundle ids or
         enterprise customer UUIDs.
 
+        If a basket is given, offers whose condition range does not contain any of the
+        basket's products are excluded, since their condition could never be satisfied.
+
         Excludes: Bundle and Enterprise offers.
         """
         ConditionalOffer = get_model('offer', 'ConditionalOffer')
@@ -85,8 +180,23 @@ class Applicator(OscarApplicator):
             condition__program_uuid__isnull=True,
             condition__enterprise_customer_uuid__isnull=True,
         )
+        if basket is not None:
+            qs = qs.filter(id__in=self._get_candidate_site_offer_ids(basket))
         return qs.select_related('condition', 'benefit')
 
+    def _get_candidate_site_offer_ids(self, basket):
+        """
+        Returns the IDs of the site offers which could apply to the basket, according to the site offer index.
+        """
+        index = get_site_offer_index()
+        offer_ids = set(index['unrestricted'])
+        product_offers = index['products']
+        for line in basket.all_lines():
+            offer_ids.update(product_offers.get(line.product_id, ()))
+            # A range which includes a parent product also includes its children.
+            offer_ids.update(product_offers.get(line.product.parent_id, ()))
+        return offer_ids
+
     def _get_enterprise_offers(self, site, user):
         """
         Return enterprise offers filtered by the user's enterprise, if it exists.
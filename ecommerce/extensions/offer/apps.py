@@ -1,7 +1,11 @@
-
-
 from oscar.apps.offer import apps
 
 
 class OfferConfig(apps.OfferConfig):
     name = 'ecommerce.extensions.offer'
+
+    def ready(self):
+        super().ready()
+        # Register signal handlers
+        # noinspection PyUnresolvedReferences
+        import ecommerce.extensions.offer.signals  # pylint: disable=unused-import, import-outside-toplevel
@@ -28,6 +28,7 @@ from slumber.exceptions import SlumberBaseException
 from threadlocals.threadlocals import get_current_request
 
 from ecommerce.core.utils import get_cache_key, log_message_and_raise_validation_error
+from ecommerce.courses.utils import get_replicated_catalog_contains
 from ecommerce.extensions.offer.constants import (
     EMAIL_TEMPLATE_TYPES,
     NUDGE_EMAIL_CYCLE,
@@ -445,8 +446,15 @@ class Range(AbstractRange):
         """
         Retrieve the results from using the catalog contains endpoint for
         catalog service for the catalog id contained in field "course_catalog".
+
+        The local copy of the catalog is used instead, if it is replicated and contains the course run of the
+        product. Course runs missing from the copy are checked with the endpoint, see get_replicated_catalog_contains.
         """
         request = get_current_request()
+        replicated_response = get_replicated_catalog_contains(request.site, self.course_catalog, [product.course_id])
+        if replicated_response is not None:
+            return replicated_response
+
         partner_code = request.site.siteconfiguration.partner.short_code
         cache_key = get_cache_key(
             site_domain=request.site.domain,
@@ -579,6 +587,7 @@ class OfferAssignment(TimeStampedModel):
         indexes = [
             models.Index(fields=['code', 'user_email']),
             models.Index(fields=['code', 'status']),
+            models.Index(fields=['user_email', 'status', 'code']),
         ]
 
     def __str__(self):
@@ -710,10 +719,14 @@ class CodeAssignmentNudgeEmailTemplates(AbstractBaseEmailTemplate):
         """
         Return the formatted email body and subject.
         """
+        return self.get_voucher_email_content(user_email, code, Voucher.objects.filter(code=code).first())
+
+    def get_voucher_email_content(self, user_email, code, voucher):
+        """
+        Return the formatted email body and subject, for the already fetched voucher of the code.
+        """
         email_body = None
-        voucher_qs = Voucher.objects.filter(code=code)
-        if voucher_qs.exists():
-            voucher = voucher_qs.first()
+        if voucher:
             offer = voucher.best_offer
             max_usage_limit = offer.max_global_applications or OFFER_MAX_USES_DEFAULT
 
@@ -773,6 +786,51 @@ class CodeAssignmentNudgeEmails(TimeStampedModel):
                     user_email, code, email_type
                 )
 
+    @classmethod
+    def bulk_subscribe_nudge_emails(cls, email_code_pairs, batch_size=None):
+        """
+        Subscribe the nudge email cycle for each of the given (user email, code) pairs.
+
+        The email templates are fetched once, and the nudge emails which do not exist yet are created
+        with a single query per batch.
+        """
+        email_code_pairs = list(email_code_pairs)
+        if not email_code_pairs:
+            return
+
+        now_datetime = datetime.datetime.now()
+        email_templates = {}
+        for days, email_type in NUDGE_EMAIL_CYCLE.items():
+            email_template = CodeAssignmentNudgeEmailTemplates.get_nudge_email_template(email_type=email_type)
+            if email_template:
+                email_templates[email_template.id] = (email_template, days)
+            else:
+                logger.warning(
+                    'Unable to create nudge emails for %d code assignments, email_type: %s',
+                    len(email_code_pairs), email_type
+                )
+
+        existing = set(
+            cls.objects.filter(
+                email_template_id__in=list(email_templates),
+                code__in={code for __, code in email_code_pairs},
+                user_email__in={user_email for user_email, __ in email_code_pairs},
+            ).values_list('email_template_id', 'user_email', 'code')
+        )
+        nudge_emails = [
+            cls(
+                email_template=email_template,
+                code=code,
+                user_email=user_email,
+                email_date=now_datetime + relativedelta(days=int(days)),
+            )
+            for email_template, days in email_templates.values()
+            for user_email, code in email_code_pairs
+            if (email_template.id, user_email, code) not in existing
+        ]
+        cls.objects.bulk_create(nudge_emails, batch_size=batch_size)
+        logger.info('Created %d nudge emails for %d code assignments.', len(nudge_emails), len(email_code_pairs))
+
     @classmethod
     def unsubscribe_from_nudging(cls, codes, user_emails):
         """
@@ -0,0 +1,63 @@
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.offer.applicator import invalidate_site_offer_index
+
+Catalog = get_model('catalogue', 'Catalog')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Range = get_model('offer', 'Range')
+RangeProduct = get_model('offer', 'RangeProduct')
+
+# Fields of offers which the site offer index, or the offers selected with it, depend on. Saves which only change
+# other fields, e.g. the usage counters updated by ConditionalOffer.record_usage for every order, keep the index.
+SITE_OFFER_INDEX_FIELDS = (
+    'offer_type', 'condition_id', 'status', 'start_datetime', 'end_datetime', 'site_id', 'priority',
+)
+
+
+def _get_site_offer_index_fields(offer):
+    # Reading deferred fields would load them from the database, they are compared as None until they are loaded.
+    return tuple(offer.__dict__.get(field) for field in SITE_OFFER_INDEX_FIELDS)
+
+
+@receiver(post_init, sender=ConditionalOffer, dispatch_uid='offer.site_offer_index.offer_loaded')
+def record_site_offer_index_fields(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Records the values of the fields of the offer which the site offer index depends on, to tell whether they
+    have changed when the offer is saved.
+    """
+    instance.original_site_offer_index_fields = _get_site_offer_index_fields(instance)
+
+
+@receiver(post_save, sender=ConditionalOffer, dispatch_uid='offer.site_offer_index.offer_saved')
+def invalidate_site_offer_index_on_offer_saved(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the site offer index used by the Applicator when offers are created, or when the fields the index
+    depends on change.
+    """
+    fields = _get_site_offer_index_fields(instance)
+    if created or fields != instance.original_site_offer_index_fields:
+        invalidate_site_offer_index()
+    instance.original_site_offer_index_fields = fields
+
+
+@receiver(post_delete, sender=ConditionalOffer, dispatch_uid='offer.site_offer_index.offer_deleted')
+@receiver(post_save, sender=Condition, dispatch_uid='offer.site_offer_index.condition_saved')
+@receiver(post_delete, sender=Condition, dispatch_uid='offer.site_offer_index.condition_deleted')
+@receiver(post_save, sender=Range, dispatch_uid='offer.site_offer_index.range_saved')
+@receiver(post_delete, sender=Range, dispatch_uid='offer.site_offer_index.range_deleted')
+@receiver(post_save, sender=RangeProduct, dispatch_uid='offer.site_offer_index.range_product_saved')
+@receiver(post_delete, sender=RangeProduct, dispatch_uid='offer.site_offer_index.range_product_deleted')
+@receiver(m2m_changed, sender=RangeProduct, dispatch_uid='offer.site_offer_index.range_products_changed')
+@receiver(m2m_changed, sender=Range.classes.through, dispatch_uid='offer.site_offer_index.range_classes_changed')
+@receiver(m2m_changed, sender=Range.included_categories.through,
+          dispatch_uid='offer.site_offer_index.range_categories_changed')
+@receiver(m2m_changed, sender=Catalog.stock_records.through,
+          dispatch_uid='offer.site_offer_index.catalog_stock_records_changed')
+def invalidate_site_offer_index_receiver(*_args, **_kwargs):
+    """
+    Invalidate the site offer index used by the Applicator when offers or the products of their ranges change.
+    """
+    invalidate_site_offer_index()
@@ -15,6 +15,7 @@ from ecommerce.tests.testcases import TestCase
 
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
+Catalog = get_model('catalogue', 'Catalog')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 
 BUNDLE = 'bundle_identifier'
@@ -63,7 +64,11 @@ class ApplicatorTests(TestCase):
     def test_get_offers_without_bundle(self):
         """ Verify that all non bundle offers are returned if no bundle id is given. """
         offers_in_db = list(ConditionalOffer.active.filter(offer_type=ConditionalOffer.SITE))
-        site_offers = ConditionalOfferFactory.create_batch(3) + offers_in_db
+        product = factories.ProductFactory()
+        self.basket.add_product(product)
+        site_offers = ConditionalOfferFactory.create_batch(
+            3, condition__range=factories.RangeFactory(products=[product])
+        ) + offers_in_db
         ProgramOfferFactory()
 
         # Verify that program offer was not returned without bundle_id
@@ -88,6 +93,55 @@ class ApplicatorTests(TestCase):
             ConditionalOfferFactory(condition=condition)
         assert self.applicator.get_site_offers().count() == 3 + len(existing_offers)
 
+    def test_get_site_offers_for_basket(self):
+        """ Verify get_site_offers excludes offers whose range does not contain any of the basket's products. """
+        parent = factories.ProductFactory(structure='parent', stockrecords__partner__short_code='parent')
+        child = factories.ProductFactory(
+            structure='child', parent=parent, product_class=None, stockrecords__partner__short_code='child'
+        )
+        other_product = factories.ProductFactory(stockrecords__partner__short_code='other')
+        self.basket.add_product(child)
+
+        existing_offers = set(self.applicator.get_site_offers(self.basket))
+        child_offer = ConditionalOfferFactory(condition__range=factories.RangeFactory(products=[child]))
+        parent_offer = ConditionalOfferFactory(condition__range=factories.RangeFactory(products=[parent]))
+        ConditionalOfferFactory(condition__range=factories.RangeFactory(products=[other_product]))
+        all_products_offer = ConditionalOfferFactory(
+            condition__range=factories.RangeFactory(includes_all_products=True)
+        )
+
+        catalog = Catalog.objects.create(partner=child.stockrecords.first().partner)
+        catalog_offer = ConditionalOfferFactory(condition__range=factories.RangeFactory(catalog=catalog))
+
+        self.assertEqual(
+            set(self.applicator.get_site_offers(self.basket)) - existing_offers,
+            {child_offer, parent_offer, all_products_offer}
+        )
+
+        # The index should be rebuilt when catalogs and ranges change.
+        catalog.stock_records.add(child.stockrecords.first())
+        other_range_offer = ConditionalOfferFactory(condition__range=factories.RangeFactory())
+        other_range_offer.condition.range.add_product(parent)
+        self.assertEqual(
+            set(self.applicator.get_site_offers(self.basket)) - existing_offers,
+            {child_offer, parent_offer, all_products_offer, catalog_offer, other_range_offer}
+        )
+
+    def test_site_offer_index_kept_on_offer_usage(self):
+        """ Verify the index is only rebuilt when offers change in ways that affect it, not when they are used. """
+        product = factories.ProductFactory()
+        offer = ConditionalOfferFactory(condition__range=factories.RangeFactory(products=[product]))
+        self.applicator.get_site_offers(self.basket)
+
+        with mock.patch('ecommerce.extensions.offer.signals.invalidate_site_offer_index') as mock_invalidate:
+            offer.record_usage({'freq': 1, 'discount': 10})
+            ConditionalOffer.objects.get(id=offer.id).record_usage({'freq': 1, 'discount': 10})
+            mock_invalidate.assert_not_called()
+
+            offer.priority += 1
+            offer.save()
+            self.assertEqual(mock_invalidate.call_count, 1)
+
     @ddt.data(
         (uuid4(), 2),
         (None, 0),
@@ -14,7 +14,10 @@ from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import Timeout
 from slumber.exceptions import SlumberBaseException
 
+from ecommerce.core.constants import DISCOVERY_REPLICA_SWITCH
+from ecommerce.core.tests import toggle_switch
 from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
+from ecommerce.courses.models import DiscoveryCatalog
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.extensions.offer.constants import ASSIGN, REMIND, REVOKE
 from ecommerce.tests.factories import UserFactory
@@ -336,6 +339,44 @@ class RangeTests(CouponMixin, DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
             _ = self.range.catalog_contains_product(self.product)
             self.assertEqual(mocked_set_all_tiers.call_count, 2)
 
+    def test_catalog_contains_product_replicated(self):
+        """ Verify that the replicated catalog is used instead of the catalog contains endpoint, if it is synced. """
+        toggle_switch(DISCOVERY_REPLICA_SWITCH, True)
+        course, seat = self.create_course_and_seat()
+        self.range.catalog_query = None
+        self.range.course_seat_types = 'verified'
+        self.range.course_catalog = 1
+        self.range.save()
+        catalog = DiscoveryCatalog.objects.create(partner=self.partner, catalog_id=1)
+        catalog.course_runs.create(key=course.id)
+
+        self.assertEqual(self.range.catalog_contains_product(seat), {'courses': {course.id: True}})
+        self.assertTrue(self.range.contains_product(seat))
+        self._assert_num_requests(0)
+
+    def test_catalog_contains_product_not_replicated(self):
+        """
+        Verify that the catalog contains endpoint is used for course runs missing from the replicated catalog,
+        e.g. archived runs, which the catalog courses endpoint the catalog is replicated from does not return.
+        """
+        toggle_switch(DISCOVERY_REPLICA_SWITCH, True)
+        self.mock_access_token_response()
+        course, seat = self.create_course_and_seat()
+        self.range.catalog_query = None
+        self.range.course_seat_types = 'verified'
+        self.range.course_catalog = 1
+        self.range.save()
+        DiscoveryCatalog.objects.create(partner=self.partner, catalog_id=1)
+        self.mock_catalog_contains_endpoint(
+            discovery_api_url=self.site_configuration.discovery_api_url, catalog_id=1, course_run_ids=[course.id]
+        )
+
+        self.assertEqual(self.range.catalog_contains_product(seat), {'courses': {course.id: True}})
+        self.assertTrue(self.range.contains_product(seat))
+        self.assertTrue(
+            any('/catalogs/1/contains/' in request.path for request in httpretty.httpretty.latest_requests)
+        )
+
 
 @ddt.ddt
 @httpretty.activate
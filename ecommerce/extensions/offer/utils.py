@@ -304,14 +304,16 @@ class SafeTuple(tuple):
         return '{}'
 
 
-def update_assignments_for_multi_use_per_customer(voucher):
+def update_assignments_for_multi_use_per_customer(voucher, offer=None):
     """
     Update `OfferAssignment` records for MULTI_USE_PER_CUSTOMER coupon type when max_uses changes for a coupon.
+
+    The enterprise offer of the voucher is looked up, unless it is passed as `offer`.
     """
     if voucher.usage == voucher.MULTI_USE_PER_CUSTOMER:
         OfferAssignment = get_model('offer', 'OfferAssignment')
 
-        offer = voucher.enterprise_offer
+        offer = offer or voucher.enterprise_offer
         existing_offer_assignments = OfferAssignment.objects.filter(code=voucher.code, offer=offer).count()
 
         if existing_offer_assignments == 0:
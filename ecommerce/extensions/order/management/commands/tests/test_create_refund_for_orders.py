@@ -1,6 +1,9 @@
 from __future__ import absolute_import
 
 import json
+import os
+import shutil
+import tempfile
 
 import httpretty
 from django.contrib.auth import get_user_model
@@ -28,6 +31,8 @@ class CreateRefundForOrdersTests(DiscoveryMockMixin, TestCase):
     def setUp(self):
         super(CreateRefundForOrdersTests, self).setUp()
         self.url = reverse('api:v2:manual-course-enrollment-order-list')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
         self.user = self.create_user(is_staff=True)
         self.client.login(username=self.user.username, password=self.password)
         self.course = CourseFactory(id='course-v1:MAX+CX+Course', partner=self.partner)
@@ -113,21 +118,22 @@ class CreateRefundForOrdersTests(DiscoveryMockMixin, TestCase):
             self.assertEqual(refund_line.quantity, order_line.quantity)
 
     def create_orders_file(self, orders, filename):
-        """Create a file with order numbers - one per line"""
+        """Create a file with order numbers - one per line, and return its path"""
+        filename = os.path.join(self.tmp_dir, filename)
         with open(filename, 'w') as f:
             for response_order in orders:
                 order = Order.objects.get(number=response_order['detail'])
                 # add to order numbers file
                 f.write("%s\n" % order.number)
         f.close()
+        return filename
 
     def test_create_refund_for_orders(self):
         """
         Test that refund is generated for manual enrollment orders.
         """
         orders = self.create_manual_order()
-        filename = 'orders_file.txt'
-        self.create_orders_file(orders, filename)
+        filename = self.create_orders_file(orders, 'orders_file.txt')
 
         self.assertFalse(Refund.objects.exists())
         call_command(
@@ -160,8 +166,7 @@ class CreateRefundForOrdersTests(DiscoveryMockMixin, TestCase):
         Test that an exception is raised when the order does not exist
         """
         orders = self.create_manual_order()
-        filename = 'missing_orders_file.txt'
-        self.create_orders_file(orders, filename)
+        filename = self.create_orders_file(orders, 'missing_orders_file.txt')
         Order.objects.all().delete()
         self.assertFalse(Refund.objects.exists())
         call_command(
@@ -174,8 +179,7 @@ class CreateRefundForOrdersTests(DiscoveryMockMixin, TestCase):
         Test that a RefundError is raised when the order line is missing.
         """
         orders = self.create_manual_order()
-        filename = 'order_without_lines_file.txt'
-        self.create_orders_file(orders, filename)
+        filename = self.create_orders_file(orders, 'order_without_lines_file.txt')
         OrderLine.objects.all().delete()
         self.assertFalse(Refund.objects.exists())
         call_command(
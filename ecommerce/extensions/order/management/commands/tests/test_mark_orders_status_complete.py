@@ -1,5 +1,10 @@
+import os
+import shutil
+import tempfile
+
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management import CommandError, call_command
+from django.test import override_settings
 from oscar.core.loading import get_model
 from testfixtures import LogCapture
 
@@ -16,7 +21,14 @@ class MarkOrdersStatusCompleteTests(TestCase):
     """
     Tests for `mark_orders_status_complete` command.
     """
-    filename = 'orders_file.txt'
+    def setUp(self):
+        super(MarkOrdersStatusCompleteTests, self).setUp()
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.filename = os.path.join(tmp_dir, 'orders_file.txt')
+        media_root_override = override_settings(MEDIA_ROOT=tmp_dir)
+        media_root_override.enable()
+        self.addCleanup(media_root_override.disable)
 
     def create_orders_file(self, order_numbers):
         """Create a file with order numbers with status `Fulfillment Error` - one per line"""
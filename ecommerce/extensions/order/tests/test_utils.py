@@ -304,6 +304,47 @@ class UserAlreadyPlacedOrderTests(RefundTestMixin, TestCase):
         product = self.get_order_product(order=refund.order)
         self.assertFalse(UserAlreadyPlacedOrder.user_already_placed_order(user=user, product=product, site=self.site))
 
+    def test_get_already_purchased_products(self):
+        """
+        Test that all products are checked at once, excluding the refunded ones.
+        """
+        refund = RefundFactory(user=self.user)
+        refund_line = RefundLine.objects.get(refund=refund)
+        refund_line.status = 'Complete'
+        refund_line.save()
+        refunded_product = self.get_order_product(order=refund.order)
+
+        purchased_product_ids = UserAlreadyPlacedOrder.get_already_purchased_products(
+            user=self.user, products=[self.product, refunded_product], site=self.site
+        )
+        self.assertEqual(purchased_product_ids, {self.product.id})
+
+    @httpretty.activate
+    def test_get_expired_entitlements(self):
+        """
+        Test that entitlements missing from the cache are retrieved with a single request and cached.
+        """
+        self.mock_access_token_response()
+        active_uuid = 'adfca7da-e593-428b-b12d-f728e2dd220d'
+        expired_uuid = 'b084097a-7596-4fe6-b6a2-d335bffeb3f1'
+        body = {
+            'results': [
+                {'uuid': active_uuid, 'expired_at': None},
+                {'uuid': expired_uuid, 'expired_at': '2017-12-16T21:36:19.279647Z'},
+            ]
+        }
+        httpretty.register_uri(httpretty.GET, get_lms_entitlement_api_url() + 'entitlements/',
+                               status=200, body=json.dumps(body), content_type='application/json')
+
+        expired = UserAlreadyPlacedOrder.get_expired_entitlements([active_uuid, expired_uuid], site=self.site)
+        self.assertEqual(expired, {expired_uuid})
+        self.assertEqual(httpretty.last_request().querystring['uuid'], [','.join(sorted([active_uuid, expired_uuid]))])
+
+        request_count = len(httpretty.latest_requests())
+        expired = UserAlreadyPlacedOrder.get_expired_entitlements([active_uuid, expired_uuid], site=self.site)
+        self.assertEqual(expired, {expired_uuid})
+        self.assertEqual(len(httpretty.latest_requests()), request_count)
+
     @ddt.data(('Open', False), ('Revocation Error', False), ('Denied', False), ('Complete', True))
     @ddt.unpack
     def test_is_order_line_refunded(self, refund_line_status, is_refunded):
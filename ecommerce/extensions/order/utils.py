@@ -14,6 +14,7 @@ from requests.exceptions import ConnectionError as ReqConnectionError  # pylint:
 from requests.exceptions import ConnectTimeout
 from threadlocals.threadlocals import get_current_request
 
+from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME
 from ecommerce.core.url_utils import get_lms_entitlement_api_url
 from ecommerce.extensions.order.constants import DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME
 from ecommerce.extensions.refund.status import REFUND_LINE
@@ -24,6 +25,7 @@ logger = logging.getLogger(__name__)
 Option = get_model('catalogue', 'Option')
 Order = get_model('order', 'Order')
 OrderLine = get_model('order', 'Line')
+OrderLineAttribute = get_model('order', 'LineAttribute')
 RefundLine = get_model('refund', 'RefundLine')
 
 
@@ -134,6 +136,11 @@ class UserAlreadyPlacedOrder:
     Provides utils methods to check if user has already placed an order
     """
 
+    @staticmethod
+    def _get_entitlement_cache_key(entitlement_uuid, site):
+        partner_short_code = site.siteconfiguration.partner.short_code
+        return 'course_entitlement_detail_{}{}'.format(entitlement_uuid, partner_short_code)
+
     @staticmethod
     def is_entitlement_expired(entitlement_uuid, site):
         """
@@ -149,8 +156,7 @@ class UserAlreadyPlacedOrder:
         """
         entitlement_api_client = EdxRestApiClient(get_lms_entitlement_api_url(),
                                                   jwt=site.siteconfiguration.access_token)
-        partner_short_code = site.siteconfiguration.partner.short_code
-        key = 'course_entitlement_detail_{}{}'.format(entitlement_uuid, partner_short_code)
+        key = UserAlreadyPlacedOrder._get_entitlement_cache_key(entitlement_uuid, site)
         entitlement_cached_response = TieredCache.get_cached_response(key)
         if entitlement_cached_response.is_found:
             entitlement = entitlement_cached_response.value
@@ -164,6 +170,125 @@ class UserAlreadyPlacedOrder:
 
         return expired
 
+    @staticmethod
+    def get_expired_entitlements(entitlement_uuids, site):
+        """
+        Checks which of the given entitlements are expired.
+
+        Entitlements which are not cached are retrieved from the LMS with a single request, and each of
+        them is cached individually so that `is_entitlement_expired` benefits from the same cache.
+
+        Args:
+            entitlement_uuids: (iterable) entitlement UUIDs
+            site: (Site)
+
+        Returns:
+            set: UUIDs of the expired entitlements
+        """
+        entitlement_uuids = set(entitlement_uuids)
+        if len(entitlement_uuids) <= 1:
+            return {uuid for uuid in entitlement_uuids if UserAlreadyPlacedOrder.is_entitlement_expired(uuid, site)}
+
+        entitlements = {}
+        missing_uuids = []
+        for entitlement_uuid in entitlement_uuids:
+            key = UserAlreadyPlacedOrder._get_entitlement_cache_key(entitlement_uuid, site)
+            entitlement_cached_response = TieredCache.get_cached_response(key)
+            if entitlement_cached_response.is_found:
+                entitlements[entitlement_uuid] = entitlement_cached_response.value
+            else:
+                missing_uuids.append(entitlement_uuid)
+
+        if missing_uuids:
+            logger.debug('Trying to get entitlements {%s}', missing_uuids)
+            entitlement_api_client = EdxRestApiClient(get_lms_entitlement_api_url(),
+                                                      jwt=site.siteconfiguration.access_token)
+            response = entitlement_api_client.entitlements.get(
+                uuid=','.join(sorted(missing_uuids)),
+                page_size=len(missing_uuids),
+            )
+            for entitlement in response.get('results', []):
+                entitlement_uuid = entitlement.get('uuid')
+                if entitlement_uuid in entitlement_uuids:
+                    entitlements[entitlement_uuid] = entitlement
+                    key = UserAlreadyPlacedOrder._get_entitlement_cache_key(entitlement_uuid, site)
+                    TieredCache.set_all_tiers(key, entitlement, settings.COURSES_API_CACHE_TIMEOUT)
+
+        # Entitlements not returned by the LMS are handled like a 404 for a single entitlement: they
+        # do not count as a purchase.
+        return {
+            entitlement_uuid for entitlement_uuid in entitlement_uuids
+            if entitlement_uuid not in entitlements or entitlements[entitlement_uuid].get('expired_at')
+        }
+
+    @staticmethod
+    def get_already_purchased_products(user, products, site):
+        """
+        Checks which of the given products the user has already purchased.
+
+        A product is considered purchased if an OrderLine exists for the product, and it has not been
+        refunded. Course entitlement products are additionally required to have an unexpired entitlement.
+        All products are checked with a single query, joined against completed refunds.
+
+        Args:
+            user: (User)
+            products: (iterable) Products to check
+            site: (Site)
+
+        Returns:
+            set: IDs of the products the user has already purchased.
+
+        Notes:
+            If the switch with the name `ecommerce.extensions.order.constants.DISABLE_REPEAT_ORDER_SWITCH_NAME`
+            is active this check will be disabled, and this method will always return an empty set.
+        """
+        if waffle.switch_is_active(DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME):
+            return set()
+
+        order_lines = OrderLine.objects.filter(
+            product__in=products,
+            order__user=user,
+        ).exclude(
+            refund_lines__status=REFUND_LINE.COMPLETE,
+        ).values_list('id', 'product_id', 'product__product_class__name', 'product__parent__product_class__name')
+
+        purchased_product_ids = set()
+        entitlement_lines = {}
+        for line_id, product_id, product_class_name, parent_product_class_name in order_lines:
+            if (product_class_name or parent_product_class_name) == COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME:
+                entitlement_lines[line_id] = product_id
+            else:
+                purchased_product_ids.add(product_id)
+
+        # Entitlement lines for products already known to be purchased do not need to be checked.
+        entitlement_lines = {
+            line_id: product_id for line_id, product_id in entitlement_lines.items()
+            if product_id not in purchased_product_ids
+        }
+        if not entitlement_lines:
+            return purchased_product_ids
+
+        entitlement_uuids = dict(
+            OrderLineAttribute.objects.filter(
+                line_id__in=entitlement_lines,
+                option__code='course_entitlement',
+            ).values_list('line_id', 'value')
+        )
+        try:
+            expired_uuids = UserAlreadyPlacedOrder.get_expired_entitlements(entitlement_uuids.values(), site)
+        except (ConnectTimeout, ReqConnectionError, HttpNotFoundError):
+            logger.exception(
+                'Unable to get entitlement info [%s] due to a network problem',
+                ', '.join(sorted(entitlement_uuids.values()))
+            )
+            return purchased_product_ids
+
+        for line_id, entitlement_uuid in entitlement_uuids.items():
+            if entitlement_uuid not in expired_uuids:
+                purchased_product_ids.add(entitlement_lines[line_id])
+
+        return purchased_product_ids
+
     @staticmethod
     def user_already_placed_order(user, product, site):
         """
@@ -183,28 +308,7 @@ class UserAlreadyPlacedOrder:
             If the switch with the name `ecommerce.extensions.order.constants.DISABLE_REPEAT_ORDER_SWITCH_NAME`
             is active this check will be disabled, and this method will already return `False`.
         """
-        if waffle.switch_is_active(DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME):
-            return False
-
-        entitlement_option = Option.objects.get(code='course_entitlement')
-
-        orders_lines = OrderLine.objects.filter(product=product, order__user=user)
-        for order_line in orders_lines:
-            if not UserAlreadyPlacedOrder.is_order_line_refunded(order_line):
-                if not order_line.product.is_course_entitlement_product:
-                    return True
-
-                entitlement_uuid = order_line.attributes.get(option=entitlement_option).value
-                try:
-                    if not UserAlreadyPlacedOrder.is_entitlement_expired(entitlement_uuid, site):
-                        return True
-                except (ConnectTimeout, ReqConnectionError, HttpNotFoundError):
-                    logger.exception(
-                        'Unable to get entitlement info [%s] due to a network problem',
-                        entitlement_uuid
-                    )
-
-        return False
+        return product.id in UserAlreadyPlacedOrder.get_already_purchased_products(user, [product], site)
 
     @staticmethod
     def is_order_line_refunded(order_line):
@@ -4,12 +4,22 @@
 import base64
 import hashlib
 import hmac
+import threading
+import uuid
 from importlib import import_module
 
 from django.conf import settings
+from django.core.cache import cache
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
 
 from ecommerce.extensions.payment import exceptions
 
+PROCESSOR_CACHE_VERSION_KEY = 'payment_processor_cache_version'
+
+# Values built from the payment processor configuration of each site, keyed by site ID and name.
+_site_processor_cache = {}
+_site_processor_cache_lock = threading.Lock()
+
 
 def get_processor_class(path):
     """Return the payment processor class at the specified path.
@@ -69,6 +79,74 @@ def get_processor_class_by_name(name):
     )
 
 
+def _get_processor_cache_version():
+    """
+    Returns the current version of the site-scoped processor cache.
+
+    The version is shared by all processes through the django cache, and read once per request.
+    """
+    cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(PROCESSOR_CACHE_VERSION_KEY)
+    if cached_response.is_found:
+        return cached_response.value
+
+    version = cache.get_or_set(PROCESSOR_CACHE_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+    DEFAULT_REQUEST_CACHE.set(PROCESSOR_CACHE_VERSION_KEY, version)
+    return version
+
+
+def get_site_processor_value(site, name, build):
+    """
+    Returns the value built from the payment processor configuration of the site, building it once per process.
+
+    Values are built again once the processor cache is invalidated.
+
+    Arguments:
+        site (Site): Site the value is built for.
+        name (object): Hashable name of the value.
+        build (callable): Takes no arguments and returns the value.
+
+    Returns:
+        object: The cached or built value.
+    """
+    version = _get_processor_cache_version()
+    key = (site.id, name)
+    cached = _site_processor_cache.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    value = build()
+    with _site_processor_cache_lock:
+        _site_processor_cache[key] = (version, value)
+    return value
+
+
+def get_processor(processor_class, site):
+    """
+    Returns an instance of the payment processor class for the site.
+
+    Processors read their configuration and build their SDK clients when they are constructed,
+    so instances are built once per process and shared by the requests of the site.
+
+    Arguments:
+        processor_class (class): Payment processor class.
+        site (Site): Site the processor is used for.
+
+    Returns:
+        BasePaymentProcessor
+    """
+    return get_site_processor_value(site, processor_class, lambda: processor_class(site))
+
+
+def clear_site_processor_cache():
+    """
+    Invalidates the site-scoped processor cache of all processes.
+    """
+    cache.set(PROCESSOR_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+    DEFAULT_REQUEST_CACHE.delete(PROCESSOR_CACHE_VERSION_KEY)
+    with _site_processor_cache_lock:
+        _site_processor_cache.clear()
+
+
 def sign(message, secret):
     """Compute a Base64-encoded HMAC-SHA256.
 
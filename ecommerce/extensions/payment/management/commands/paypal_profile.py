@@ -7,9 +7,13 @@ import paypalrestsdk
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.db.utils import IntegrityError
+from oscar.core.loading import get_model
 from paypalrestsdk import WebProfile  # pylint: disable=ungrouped-imports
 
 from ecommerce.extensions.payment.models import PaypalWebProfile
+from ecommerce.extensions.payment.processors.paypal import Paypal
+
+SiteConfiguration = get_model('core', 'SiteConfiguration')
 
 log = logging.getLogger(__name__)
 
@@ -26,6 +30,9 @@ class Command(BaseCommand):
         delete [id]         Delete an existing profile. (Use -d to automatically disable when deleting.)
         enable [id]         Enable the web profile in this Django application (send it in PayPal API calls).
         disable [id]        Disable the web profile in this Django application (don't send in PayPal API calls).
+        refresh_locale_profiles
+                            Make sure each of the partner's sites has a web profile for every supported locale,
+                            replacing the ones that no longer exist in PayPal.
 
     The 'enable' and 'disable' actions are idempotent so it is safe to run them repeatedly in the same environment.
     """
@@ -211,3 +218,20 @@ class Command(BaseCommand):
             log.info("Disabled profile %s.", profile_id)
         except PaypalWebProfile.DoesNotExist:
             log.info("Did not find an enabled web profile with id %s to disable.", profile_id)
+
+    def handle_refresh_locale_profiles(self, options):
+        """
+        Make sure the pool of per-locale web profiles of each of the partner's sites is complete.
+
+        Payments only look pooled profiles up, and create the missing ones on demand. Running this
+        ahead of time keeps profile creation out of checkout.
+        """
+        site_configurations = SiteConfiguration.objects.filter(
+            partner__short_code__iexact=options.get('partner')
+        ).select_related('site')
+        for site_configuration in site_configurations:
+            created = Paypal(site_configuration.site).refresh_locale_web_profiles()
+            log.info(
+                "Refreshed locale profiles of site %s. Created profiles for locales: %s.",
+                site_configuration.site.domain, ', '.join(created) or 'none'
+            )
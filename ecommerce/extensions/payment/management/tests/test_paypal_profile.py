@@ -9,6 +9,7 @@ from django.core.management import call_command
 from django.core.management.base import CommandError
 
 from ecommerce.extensions.payment.models import PaypalWebProfile
+from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.testcases import TestCase
 
 
@@ -159,3 +160,16 @@ class TestPaypalProfileCommand(TestCase):
         with self.assertRaises(CommandError) as context:
             call_command('paypal_profile', partner='edX', action='disable', stdout=self.stdout)  # no profile id
         self.assertEqual('Action `disable` requires a profile_id to be specified.', str(context.exception))
+
+    def test_refresh_locale_profiles(self, mock_profile):  # pylint: disable=unused-argument
+        """
+        Tests that the locale profiles of each of the partner's sites are refreshed
+        """
+        site_configuration = SiteConfigurationFactory(partner__short_code=self.PAYMENT_PROCESSOR_CONFIG_KEY)
+        SiteConfigurationFactory(partner__short_code='other')
+
+        target = 'ecommerce.extensions.payment.management.commands.paypal_profile.Paypal.refresh_locale_web_profiles'
+        with mock.patch(target, autospec=True, return_value=['US']) as mock_refresh:
+            self.call_command_action('refresh_locale_profiles')
+
+        self.assertEqual([call[0][0].site for call in mock_refresh.call_args_list], [site_configuration.site])
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.17 on 2026-10-19 09:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('payment', '0031_sdnfallbackdata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paypalwebprofile',
+            name='locale_code',
+            field=models.CharField(blank=True, default='', max_length=8),
+        ),
+        migrations.AddField(
+            model_name='paypalwebprofile',
+            name='site',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='sites.Site'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='paypalwebprofile',
+            unique_together={('site', 'locale_code')},
+        ),
+    ]
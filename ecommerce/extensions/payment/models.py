@@ -45,6 +45,13 @@ class Source(AbstractSource):
 class PaypalWebProfile(models.Model):
     id = models.CharField(max_length=255, primary_key=True)
     name = models.CharField(max_length=255, unique=True)
+    # Profiles with a site and locale code make up the per-locale pool used when the
+    # create_and_set_webprofile switch is active.
+    site = models.ForeignKey('sites.Site', null=True, blank=True, on_delete=models.CASCADE)
+    locale_code = models.CharField(max_length=8, blank=True, default='')
+
+    class Meta:
+        unique_together = ('site', 'locale_code')
 
 
 class PaypalProcessorConfiguration(SingletonModel):
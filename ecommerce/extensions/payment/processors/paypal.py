@@ -73,18 +73,17 @@ class Paypal(BasePaymentProcessor):
 
         return PAYPAL_LOCALES.get(re.split(r'[_-]', language_code)[0].lower(), default_paypal_locale)
 
-    def create_temporary_web_profile(self, locale_code):
+    def create_locale_web_profile(self, locale_code):
         """
-        Generates a temporary Paypal WebProfile that carries the locale setting for a Paypal Payment
-        and returns the id of the WebProfile
+        Generates a Paypal WebProfile that carries the locale setting for Paypal Payments, adds it to
+        this site's pool of web profiles and returns the id of the WebProfile
         """
         try:
             web_profile = paypalrestsdk.WebProfile({
-                "name": str(uuid.uuid1()),  # Generate a unique identifier
+                "name": '{}-{}'.format(locale_code, uuid.uuid4().hex),  # Generate a unique identifier
                 "presentation": {
                     "locale_code": locale_code
                 },
-                "temporary": True  # Persists for 3 hours
             }, api=self.paypal_api)
 
             if web_profile.create():
@@ -93,18 +92,68 @@ class Paypal(BasePaymentProcessor):
                     web_profile.presentation.locale_code
                 )
                 logger.info(msg)
-                return web_profile.id
-
-            msg = "Web profile creation encountered error [%s]. Will continue without one" % (
-                web_profile.error
-            )
-            logger.warning(msg)
-            return None
+            else:
+                msg = "Web profile creation encountered error [%s]. Will continue without one" % (
+                    web_profile.error
+                )
+                logger.warning(msg)
+                return None
 
         except Exception:  # pylint: disable=broad-except
             logger.warning("Creating PayPal WebProfile resulted in exception. Will continue without one.")
             return None
 
+        pooled_profile, created = PaypalWebProfile.objects.get_or_create(
+            site=self.site,
+            locale_code=locale_code,
+            defaults={'id': web_profile.id, 'name': web_profile.name},
+        )
+        if not created:
+            # Another payment added a profile for the locale in the meantime.
+            logger.info(
+                'Web Profile[%s] for locale %s is already pooled. Web Profile[%s] is left unused.',
+                pooled_profile.id, locale_code, web_profile.id
+            )
+        return pooled_profile.id
+
+    def get_locale_web_profile_id(self, locale_code):
+        """
+        Returns the id of the pooled Paypal WebProfile that carries the locale setting for a Paypal Payment,
+        creating it if this site does not have one for the locale yet.
+        """
+        if not locale_code:
+            return None
+
+        web_profile_id = PaypalWebProfile.objects.filter(
+            site=self.site, locale_code=locale_code
+        ).values_list('id', flat=True).first()
+        return web_profile_id or self.create_locale_web_profile(locale_code)
+
+    def refresh_locale_web_profiles(self):
+        """
+        Makes sure this site's pool holds a web profile, which still exists in PayPal, for every supported locale.
+
+        Returns:
+            list: Locale codes whose web profile was created.
+        """
+        created = []
+        for locale_code in sorted(set(PAYPAL_LOCALES.values())):
+            pooled_profile = PaypalWebProfile.objects.filter(site=self.site, locale_code=locale_code).first()
+            if pooled_profile:
+                try:
+                    paypalrestsdk.WebProfile.find(pooled_profile.id, api=self.paypal_api)
+                    continue
+                except paypalrestsdk.ResourceNotFound:
+                    logger.info(
+                        'Web Profile[%s] for locale %s no longer exists in PayPal. It is replaced.',
+                        pooled_profile.id, locale_code
+                    )
+                    pooled_profile.delete()
+
+            if self.create_locale_web_profile(locale_code):
+                created.append(locale_code)
+        return created
+
     def get_courseid_title(self, line):
         """
         Get CourseID & Title from basket item
@@ -182,7 +231,7 @@ class Paypal(BasePaymentProcessor):
 
         if waffle.switch_is_active('create_and_set_webprofile'):
             locale_code = self.resolve_paypal_locale(request.COOKIES.get(settings.LANGUAGE_COOKIE_NAME))
-            web_profile_id = self.create_temporary_web_profile(locale_code)
+            web_profile_id = self.get_locale_web_profile_id(locale_code)
             if web_profile_id is not None:
                 data['experience_profile_id'] = web_profile_id
         else:
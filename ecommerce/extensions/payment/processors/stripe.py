@@ -42,8 +42,6 @@ class Stripe(ApplePayMixin, BaseClientSidePaymentProcessor):
         self.secret_key = configuration['secret_key']
         self.country = configuration['country']
 
-        stripe.api_key = self.secret_key
-
     def get_transaction_parameters(self, basket, request=None, use_client_side_checkout=True, **kwargs):
         raise NotImplementedError('The Stripe payment processor does not support transaction parameters.')
 
@@ -62,7 +60,8 @@ class Stripe(ApplePayMixin, BaseClientSidePaymentProcessor):
                 currency=currency,
                 source=token,
                 description=order_number,
-                metadata={'order_number': order_number}
+                metadata={'order_number': order_number},
+                api_key=self.secret_key
             )
             transaction_id = charge.id
 
@@ -97,7 +96,7 @@ class Stripe(ApplePayMixin, BaseClientSidePaymentProcessor):
 
     def issue_credit(self, order_number, basket, reference_number, amount, currency):
         try:
-            refund = stripe.Refund.create(charge=reference_number)
+            refund = stripe.Refund.create(charge=reference_number, api_key=self.secret_key)
         except:
             msg = 'An error occurred while attempting to issue a credit (via Stripe) for order [{}].'.format(
                 order_number)
@@ -118,7 +117,7 @@ class Stripe(ApplePayMixin, BaseClientSidePaymentProcessor):
         Returns:
             BillingAddress
         """
-        data = stripe.Token.retrieve(token)['card']
+        data = stripe.Token.retrieve(token, api_key=self.secret_key)['card']
         address = BillingAddress(
             first_name=data['name'],    # Stripe only has a single name field
             last_name='',
@@ -3,17 +3,24 @@
 import logging
 
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.contrib.sites.models import Site
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from edx_django_utils.cache import TieredCache
+from oscar.core.loading import get_model
 from waffle.models import Switch
 
 from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_CACHE_KEY
+from ecommerce.extensions.payment.helpers import clear_site_processor_cache
 
 logger = logging.getLogger(__name__)
+PaypalProcessorConfiguration = get_model('payment', 'PaypalProcessorConfiguration')
+SiteConfiguration = get_model('core', 'SiteConfiguration')
 
 
 @receiver(post_save, sender=Switch)
+@receiver(post_delete, sender=Switch, dispatch_uid='payment.processor_cache.switch_deleted')
 def invalidate_processor_cache(*_args, **kwargs):
     """
     When Waffle switches for payment processors are toggled, the
@@ -25,4 +32,25 @@ def invalidate_processor_cache(*_args, **kwargs):
         processor = parts[1]
         logger.info('Switched payment processor [%s] %s.', processor, 'on' if switch.active else 'off')
         TieredCache.delete_all_tiers(PAYMENT_PROCESSOR_CACHE_KEY)
+        clear_site_processor_cache()
         logger.info('Invalidated payment processor cache after toggling [%s].', switch.name)
+
+
+@receiver(post_save, sender=Site, dispatch_uid='payment.processor_cache.site_saved')
+@receiver(post_save, sender=SiteConfiguration, dispatch_uid='payment.processor_cache.site_configuration_saved')
+@receiver(post_save, sender=PaypalProcessorConfiguration,
+          dispatch_uid='payment.processor_cache.paypal_configuration_saved')
+def invalidate_site_processor_cache(*_args, **_kwargs):
+    """
+    Invalidate the payment processors built for each site when their configuration changes.
+    """
+    clear_site_processor_cache()
+
+
+@receiver(setting_changed, dispatch_uid='payment.processor_cache.setting_changed')
+def invalidate_site_processor_cache_on_setting_changed(*_args, **kwargs):
+    """
+    Invalidate the payment processors built for each site when their settings are overridden.
+    """
+    if kwargs['setting'].startswith('PAYMENT_PROCESSOR'):
+        clear_site_processor_cache()
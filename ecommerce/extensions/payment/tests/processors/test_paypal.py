@@ -22,10 +22,12 @@ from testfixtures import LogCapture
 
 from ecommerce.core.tests import toggle_switch
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.payment.constants import PAYPAL_LOCALES
 from ecommerce.extensions.payment.models import PaypalWebProfile
 from ecommerce.extensions.payment.processors.paypal import Paypal
 from ecommerce.extensions.payment.tests.mixins import PaypalMixin
 from ecommerce.extensions.payment.tests.processors.mixins import PaymentProcessorTestCaseMixin
+from ecommerce.tests.factories import SiteFactory
 from ecommerce.tests.testcases import TestCase
 
 log = logging.getLogger(__name__)
@@ -212,7 +214,8 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
     @mock.patch('ecommerce.extensions.payment.processors.paypal.paypalrestsdk.WebProfile')
     def test_web_profile_with_valid_locale(self, mock_web_profile, mock_payment, mock_logger):
         """
-        Verify that the payment creation payload references a web profile when a valid locale is chosen
+        Verify that the payment creation payload references a web profile when a valid locale is chosen,
+        and that the web profile is only created for the first payment in that locale.
         This should occur when the create_and_set_webprofile waffle is enabled.
         """
         toggle_switch('create_and_set_webprofile', True)
@@ -226,13 +229,21 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         Paypal.resolve_paypal_locale = mock.Mock(return_value='valid_locale')
         mock_web_profile_instance = mock.Mock()
         mock_web_profile_instance.id = 'test-profile-id'
+        mock_web_profile_instance.name = 'test-profile-name'
         mock_web_profile_instance.presentation.locale_code = 'valid_locale'
         mock_web_profile.create = mock.Mock(return_value=True)
         mock_web_profile.return_value = mock_web_profile_instance
 
-        self.processor.get_transaction_parameters(self.basket, request=self.request)
-        payment_creation_payload = mock_payment.call_args[0][0]
-        self.assertEqual(payment_creation_payload['experience_profile_id'], 'test-profile-id')
+        for __ in range(2):
+            self.processor.get_transaction_parameters(self.basket, request=self.request)
+            payment_creation_payload = mock_payment.call_args[0][0]
+            self.assertEqual(payment_creation_payload['experience_profile_id'], 'test-profile-id')
+
+        self.assertEqual(mock_web_profile.call_count, 1)
+        self.assertFalse(mock_web_profile.call_args[0][0].get('temporary'))
+        self.assertTrue(
+            PaypalWebProfile.objects.filter(id='test-profile-id', site=self.site, locale_code='valid_locale').exists()
+        )
 
         msg = 'Web Profile[%s] for locale %s created successfully' % (
             mock_web_profile_instance.id,
@@ -240,6 +251,57 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         )
         mock_logger.info.assert_any_call(msg)
 
+    @mock.patch('ecommerce.extensions.payment.processors.paypal.paypalrestsdk.Payment')
+    @mock.patch('ecommerce.extensions.payment.processors.paypal.paypalrestsdk.WebProfile')
+    def test_pooled_web_profile(self, mock_web_profile, mock_payment):
+        """
+        Verify that the payment creation payload references the site's pooled web profile for the locale,
+        without creating a new web profile.
+        """
+        toggle_switch('create_and_set_webprofile', True)
+        mock_payment_instance = mock.Mock()
+        mock_payment_instance.id = FuzzyInteger(low=1).fuzz()
+        mock_payment_instance.to_dict.return_value = {}
+        mock_payment_instance.links = [mock.Mock(rel='approval_url', href='dummy')]
+        mock_payment.return_value = mock_payment_instance
+
+        PaypalWebProfile.objects.create(id='other-site-profile-id', name='other', site=SiteFactory(), locale_code='US')
+        PaypalWebProfile.objects.create(id='pooled-profile-id', name='pooled', site=self.site, locale_code='US')
+
+        with mock.patch.object(Paypal, 'resolve_paypal_locale', return_value='US'):
+            self.processor.get_transaction_parameters(self.basket, request=self.request)
+        payment_creation_payload = mock_payment.call_args[0][0]
+        self.assertEqual(payment_creation_payload['experience_profile_id'], 'pooled-profile-id')
+        mock_web_profile.assert_not_called()
+
+    @mock.patch('ecommerce.extensions.payment.processors.paypal.paypalrestsdk.WebProfile')
+    def test_refresh_locale_web_profiles(self, mock_web_profile):
+        """
+        Verify that a web profile is created for every supported locale that has no pooled web profile,
+        or whose pooled web profile no longer exists in PayPal.
+        """
+        locale_codes = sorted(set(PAYPAL_LOCALES.values()))
+        PaypalWebProfile.objects.create(id='existing-id', name='existing', site=self.site, locale_code=locale_codes[0])
+        PaypalWebProfile.objects.create(id='deleted-id', name='deleted', site=self.site, locale_code=locale_codes[1])
+        # The existing web profile is found, but not the deleted one.
+        mock_web_profile.find.side_effect = [mock.Mock(), paypalrestsdk.ResourceNotFound(mock.Mock())]
+
+        def create_web_profile(data, api):  # pylint: disable=unused-argument
+            web_profile = mock.Mock(id='{}-id'.format(data['presentation']['locale_code']))
+            web_profile.name = data['name']
+            return web_profile
+
+        mock_web_profile.side_effect = create_web_profile
+
+        self.assertEqual(self.processor.refresh_locale_web_profiles(), locale_codes[1:])
+        self.assertEqual(
+            dict(PaypalWebProfile.objects.filter(site=self.site).values_list('locale_code', 'id')),
+            dict(
+                [(locale_codes[0], 'existing-id')] +
+                [(locale_code, '{}-id'.format(locale_code)) for locale_code in locale_codes[1:]]
+            )
+        )
+
     @mock.patch('ecommerce.extensions.payment.processors.paypal.logger')
     @mock.patch('ecommerce.extensions.payment.processors.paypal.paypalrestsdk.Payment')
     @mock.patch('ecommerce.extensions.payment.processors.paypal.paypalrestsdk.WebProfile')
@@ -308,7 +370,7 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         ['zh-zh', '', 'CN'],
         ['invalid default', 'invalid cookie', None]
     )
-    @mock.patch('ecommerce.extensions.payment.processors.paypal.Paypal.create_temporary_web_profile')
+    @mock.patch('ecommerce.extensions.payment.processors.paypal.Paypal.get_locale_web_profile_id')
     def test_resolve_paypal_locale(self, default_locale, cookie_locale, expected_paypal_locale, mock_method):
         """
         Verify that the correct locale for payment processing is fetched from the language cookie
@@ -45,7 +45,8 @@ class StripeTests(PaymentProcessorTestCaseMixin, TestCase):
                 currency=self.basket.currency,
                 source=token,
                 description=self.basket.order_number,
-                metadata={'order_number': self.basket.order_number}
+                metadata={'order_number': self.basket.order_number},
+                api_key=self.processor.secret_key
             )
 
         assert actual.transaction_id == charge.id
@@ -74,7 +75,9 @@ class StripeTests(PaymentProcessorTestCaseMixin, TestCase):
             refund_mock.return_value = refund
             self.processor.issue_credit(order.number, order.basket, charge_reference_number, order.total_incl_tax,
                                         order.currency)
-            refund_mock.assert_called_once_with(charge=charge_reference_number)
+            refund_mock.assert_called_once_with(
+                charge=charge_reference_number, api_key=self.processor.secret_key
+            )
 
         self.assert_processor_response_recorded(self.processor_name, refund.id, refund, basket=self.basket)
 
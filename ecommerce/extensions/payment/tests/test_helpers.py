@@ -1,11 +1,16 @@
 
 
 import ddt
+from django.conf import settings
+from django.core.cache import cache
 from django.test import override_settings
+from edx_django_utils.cache import RequestCache
+from waffle.models import Switch
 
 from ecommerce.extensions.payment import helpers
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
 from ecommerce.extensions.payment.tests.processors import AnotherDummyProcessor, DummyProcessor
+from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.testcases import TestCase
 
 
@@ -36,6 +41,31 @@ class HelperTests(TestCase):
         """
         self.assertRaises(ProcessorNotFoundError, helpers.get_processor_class_by_name, 'foo')
 
+    def test_get_processor(self):
+        """ Verify processors are built once per site, until the processor cache is invalidated. """
+        processor = helpers.get_processor(DummyProcessor, self.site)
+        self.assertIsInstance(processor, DummyProcessor)
+        self.assertIs(helpers.get_processor(DummyProcessor, self.site), processor)
+
+        other_site = SiteConfigurationFactory().site
+        self.assertIsNot(helpers.get_processor(DummyProcessor, other_site), processor)
+        self.assertIs(helpers.get_processor(DummyProcessor, other_site).site, other_site)
+
+        Switch.objects.update_or_create(
+            name=settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + DummyProcessor.NAME, defaults={'active': False}
+        )
+        self.assertIsNot(helpers.get_processor(DummyProcessor, self.site), processor)
+
+    def test_get_processor_invalidated_by_other_process(self):
+        """ Verify processors are built again once another process invalidates the processor cache. """
+        processor = helpers.get_processor(DummyProcessor, self.site)
+
+        cache.set(helpers.PROCESSOR_CACHE_VERSION_KEY, 'other-version', None)
+        self.assertIs(helpers.get_processor(DummyProcessor, self.site), processor)
+
+        RequestCache.clear_all_namespaces()
+        self.assertIsNot(helpers.get_processor(DummyProcessor, self.site), processor)
+
     def test_sign(self):
         """ Verify the function returns a valid HMAC SHA-256 signature. """
         message = "This is a super-secret message!"
@@ -30,6 +30,7 @@ from ecommerce.extensions.payment.exceptions import (
     InvalidSignatureError,
     RedundantPaymentNotificationError
 )
+from ecommerce.extensions.payment.helpers import get_processor
 from ecommerce.extensions.payment.processors.cybersource import Cybersource, CybersourceREST
 from ecommerce.extensions.payment.views import BasePaymentSubmitView
 
@@ -52,7 +53,7 @@ PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 class CyberSourceProcessorMixin:
     @cached_property
     def payment_processor(self):
-        return Cybersource(self.request.site)
+        return get_processor(Cybersource, self.request.site)
 
 
 class CybersourceOrderInitiationView:
@@ -398,7 +399,7 @@ class CybersourceOrderCompletionView(EdxOrderPlacementMixin):
 class CyberSourceRESTProcessorMixin:
     @cached_property
     def payment_processor(self):
-        return CybersourceREST(self.request.site)
+        return get_processor(CybersourceREST, self.request.site)
 
 
 class CybersourceAuthorizeAPIView(
@@ -19,6 +19,7 @@ from oscar.core.loading import get_class, get_model
 from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
+from ecommerce.extensions.payment.helpers import get_processor
 from ecommerce.extensions.payment.processors.paypal import Paypal
 
 logger = logging.getLogger(__name__)
@@ -38,7 +39,7 @@ class PaypalPaymentExecutionView(EdxOrderPlacementMixin, View):
 
     @property
     def payment_processor(self):
-        return Paypal(self.request.site)
+        return get_processor(Paypal, self.request.site)
 
     # Disable atomicity for the view. Otherwise, we'd be unable to commit to the database
     # until the request had concluded; Django will refuse to commit when an atomic() block
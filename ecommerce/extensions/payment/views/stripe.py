@@ -9,6 +9,7 @@ from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
 from ecommerce.extensions.payment.forms import StripeSubmitForm
+from ecommerce.extensions.payment.helpers import get_processor
 from ecommerce.extensions.payment.processors.stripe import Stripe
 from ecommerce.extensions.payment.views import BasePaymentSubmitView
 
@@ -31,7 +32,7 @@ class StripeSubmitView(EdxOrderPlacementMixin, BasePaymentSubmitView):
 
     @property
     def payment_processor(self):
-        return Stripe(self.request.site)
+        return get_processor(Stripe, self.request.site)
 
     def form_valid(self, form):
         form_data = form.cleaned_data
@@ -1,9 +1,21 @@
 
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+
+from django.db import connections
+from django.db.models import Exists, OuterRef, Q
 from oscar.core.loading import get_model
 
+from ecommerce.core.utils import site_request
 from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.refund.status import REFUND_LINE
+
+logger = logging.getLogger(__name__)
 
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Line = get_model('order', 'Line')
 Option = get_model('catalogue', 'Option')
 Refund = get_model('refund', 'Refund')
 RefundLine = get_model('refund', 'RefundLine')
@@ -89,3 +101,149 @@ def create_refunds(orders, course_id):
             refunds.append(refund)
 
     return refunds
+
+
+def find_unrefunded_course_lines(course_id, usernames=None, enterprise_customer_uuid=None):
+    """
+    Returns the unrefunded lines of all complete orders associated with the given course, with a single query.
+
+    Arguments:
+        course_id (str): Identifier of the course associated with the order line(s)
+        usernames (list): If given, only the orders of these users are considered
+        enterprise_customer_uuid (str): If given, only the orders discounted by an offer or coupon of
+            this enterprise customer are considered
+
+    Raises:
+        ValueError if course_id is invalid.
+
+    Returns:
+        QuerySet: order lines, ordered by order, with their order and its user selected
+    """
+    if not course_id or not course_id.strip():
+        raise ValueError('"{}" is not a valid course ID.'.format(course_id))
+
+    refunded_lines = RefundLine.objects.filter(order_line=OuterRef('pk')).exclude(status=REFUND_LINE.DENIED)
+    lines = Line.objects.annotate(is_refunded=Exists(refunded_lines)).filter(
+        is_refunded=False,
+        order__status=ORDER.COMPLETE,
+        product__attribute_values__attribute__code='course_key',
+        product__attribute_values__value_text=course_id,
+    )
+
+    if usernames is not None:
+        lines = lines.filter(order__user__username__in=usernames)
+
+    if enterprise_customer_uuid:
+        enterprise_offers = ConditionalOffer.objects.filter(
+            Q(condition__enterprise_customer_uuid=enterprise_customer_uuid) |
+            Q(benefit__range__enterprise_customer=enterprise_customer_uuid)
+        )
+        lines = lines.filter(order__discounts__offer_id__in=enterprise_offers.values('id'))
+
+    return lines.select_related('order', 'order__user').order_by('order_id', 'id').distinct()
+
+
+def create_refunds_for_course(course_id, usernames=None, enterprise_customer_uuid=None, dry_run=False,
+                              batch_size=100):
+    """
+    Creates refunds for all of the unrefunded lines associated with the given course, e.g. when a course
+    run is cancelled.
+
+    The eligible lines are found with a single query, and the refunds are created `batch_size` orders at a
+    time. Refunds are not approved; see approve_refunds.
+
+    Arguments:
+        course_id (str): Identifier of the course associated with the order line(s)
+        usernames (list): If given, only the orders of these users are refunded
+        enterprise_customer_uuid (str): If given, only the orders of this enterprise customer are refunded
+        dry_run (bool): If True, nothing is created, and the report lists the refunds that would be created
+        batch_size (int): Number of orders whose refunds are created in each transaction
+
+    Returns:
+        list: A dict for each refunded order, with its `order_number`, `username`, `num_lines`,
+            `total_credit_excl_tax`, `currency` and `refund_id` (None for a dry run).
+    """
+    lines = find_unrefunded_course_lines(course_id, usernames, enterprise_customer_uuid)
+    report = []
+
+    def create_batch(lines_by_order):
+        if dry_run:
+            refunds = [None] * len(lines_by_order)
+        else:
+            refunds = Refund.create_with_lines_in_bulk(lines_by_order)
+
+        for (order, order_lines), refund in zip(lines_by_order, refunds):
+            report.append({
+                'order_number': order.number,
+                'username': order.user.username,
+                'num_lines': len(order_lines),
+                'total_credit_excl_tax': sum([line.line_price_excl_tax for line in order_lines]),
+                'currency': order.currency,
+                'refund_id': refund.id if refund else None,
+            })
+
+    batch = []
+    for order, order_lines in groupby(lines.iterator(), key=lambda line: line.order):
+        batch.append((order, list(order_lines)))
+        if len(batch) == batch_size:
+            create_batch(batch)
+            batch = []
+    if batch:
+        create_batch(batch)
+
+    logger.info(
+        '%s %d refunds for course [%s].', 'Found' if dry_run else 'Created', len(report), course_id
+    )
+    return report
+
+
+def _approve_refund_batch(refund_ids, notify_purchaser, in_thread):
+    results = {}
+    try:
+        for refund in Refund.objects.filter(id__in=refund_ids).select_related('order__site', 'user'):
+            try:
+                # Refunds are approved outside of requests, but revoking fulfillment builds the LMS URLs of the
+                # site of the current request.
+                with site_request(refund.order.site):
+                    # Refunds corresponding to a total credit of $0 are approved without notifying the purchaser,
+                    # as they are by Refund.create_with_lines.
+                    results[refund.id] = refund.approve(
+                        notify_purchaser=notify_purchaser and refund.total_credit_excl_tax != 0
+                    )
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to approve refund [%d].', refund.id)
+                results[refund.id] = False
+    finally:
+        if in_thread:
+            # The worker thread has its own database connections, which would otherwise be left open.
+            connections.close_all()
+    return results
+
+
+def approve_refunds(refund_ids, notify_purchaser=True, batch_size=100, max_workers=1):
+    """
+    Approves the given refunds, which issues credits and revokes fulfillment, in parallel batches.
+
+    Arguments:
+        refund_ids (list): IDs of the refunds to approve
+        notify_purchaser (bool): Whether purchasers are notified of their non-zero refunds
+        batch_size (int): Number of refunds approved by each worker task
+        max_workers (int): Number of batches approved at the same time. Batches are approved in
+            the calling thread if this is 1.
+
+    Returns:
+        dict: Whether each refund was approved, keyed by refund ID.
+    """
+    batches = [refund_ids[index:index + batch_size] for index in range(0, len(refund_ids), batch_size)]
+    results = {}
+
+    if max_workers <= 1:
+        for batch in batches:
+            results.update(_approve_refund_batch(batch, notify_purchaser, False))
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='refund-approval') as executor:
+        for batch_results in executor.map(lambda batch: _approve_refund_batch(batch, notify_purchaser, True),
+                                          batches):
+            results.update(batch_results)
+    return results
@@ -0,0 +1,124 @@
+"""
+This command refunds all of the learners who purchased a course, e.g. when a course run is cancelled.
+"""
+
+
+import logging
+
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.extensions.refund.api import approve_refunds, create_refunds_for_course
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Creates, and optionally approves, refunds for all of the unrefunded order lines of a course.
+    """
+
+    help = 'Create refunds for all of the unrefunded order lines of a course.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course-id',
+            action='store',
+            dest='course_id',
+            required=True,
+            help='ID of the course whose order lines should be refunded.',
+            type=str,
+        )
+        parser.add_argument(
+            '--username',
+            action='append',
+            dest='usernames',
+            default=None,
+            help='Only refund the orders of this user. May be repeated.',
+            type=str,
+        )
+        parser.add_argument(
+            '--enterprise-customer',
+            action='store',
+            dest='enterprise_customer_uuid',
+            default=None,
+            help='Only refund the orders discounted by an offer or coupon of this enterprise customer.',
+            type=str,
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help='Report the refunds that would be created, without creating them.',
+        )
+        parser.add_argument(
+            '--approve',
+            action='store_true',
+            dest='approve',
+            default=False,
+            help='Approve the refunds, which issues credits and revokes fulfillment.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            dest='batch_size',
+            default=100,
+            help='Number of orders refunded, and refunds approved, in each batch.',
+            type=int,
+        )
+        parser.add_argument(
+            '--max-workers',
+            action='store',
+            dest='max_workers',
+            default=4,
+            help='Number of batches of refunds approved at the same time.',
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        course_id = options['course_id']
+        dry_run = options['dry_run']
+
+        try:
+            report = create_refunds_for_course(
+                course_id,
+                usernames=options['usernames'],
+                enterprise_customer_uuid=options['enterprise_customer_uuid'],
+                dry_run=dry_run,
+                batch_size=options['batch_size'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for entry in report:
+            logger.info(
+                '%s of %s %s for %d line(s) of order [%s] of user [%s].',
+                'Would create a refund' if dry_run else 'Created refund [{}]'.format(entry['refund_id']),
+                entry['total_credit_excl_tax'],
+                entry['currency'],
+                entry['num_lines'],
+                entry['order_number'],
+                entry['username'],
+            )
+
+        if dry_run:
+            return
+
+        # Refunds corresponding to a total credit of $0 are always approved upon creation.
+        refund_ids = [
+            entry['refund_id'] for entry in report if options['approve'] or entry['total_credit_excl_tax'] == 0
+        ]
+        results = approve_refunds(
+            refund_ids, batch_size=options['batch_size'], max_workers=options['max_workers']
+        )
+        failed_refund_ids = sorted(refund_id for refund_id, approved in results.items() if not approved)
+        if failed_refund_ids:
+            logger.error(
+                'Failed to approve %d of %d refunds for course [%s]: %s',
+                len(failed_refund_ids),
+                len(results),
+                course_id,
+                ', '.join(str(refund_id) for refund_id in failed_refund_ids)
+            )
+        else:
+            logger.info('Approved %d refunds for course [%s].', len(results), course_id)
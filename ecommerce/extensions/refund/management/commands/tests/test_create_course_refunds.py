@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+import httpretty
+import mock
+from crum import set_current_request
+from django.core.management import CommandError, call_command
+from oscar.core.loading import get_model
+from testfixtures import LogCapture
+from threadlocals.threadlocals import set_thread_variable
+
+from ecommerce.core.url_utils import get_lms_enrollment_api_url
+from ecommerce.extensions.refund.status import REFUND
+from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.tests.factories import UserFactory
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.extensions.refund.management.commands.create_course_refunds'
+APPROVE_REFUNDS_PATH = LOGGER_NAME + '.approve_refunds'
+Refund = get_model('refund', 'Refund')
+
+
+class CreateCourseRefundsTests(RefundTestMixin, TestCase):
+    """
+    Test the `create_course_refunds` command.
+    """
+
+    def setUp(self):
+        super(CreateCourseRefundsTests, self).setUp()
+        self.user = UserFactory()
+        self.order = self.create_order()
+        self.free_order = self.create_order(user=UserFactory(), free=True)
+
+    def test_dry_run(self):
+        """ Verify the refunds that would be created are logged, and none are created. """
+        with LogCapture(LOGGER_NAME) as logger:
+            call_command('create_course_refunds', course_id=self.course.id, dry_run=True)
+            logger.check(
+                (
+                    LOGGER_NAME,
+                    'INFO',
+                    'Would create a refund of {} {} for 1 line(s) of order [{}] of user [{}].'.format(
+                        self.order.total_excl_tax, self.order.currency, self.order.number, self.user.username
+                    )
+                ),
+                (
+                    LOGGER_NAME,
+                    'INFO',
+                    'Would create a refund of 0.00 {} for 1 line(s) of order [{}] of user [{}].'.format(
+                        self.free_order.currency, self.free_order.number, self.free_order.user.username
+                    )
+                ),
+            )
+
+        self.assertFalse(Refund.objects.exists())
+
+    def test_create_refunds(self):
+        """ Verify refunds are created, and that only the free ones are approved unless asked to. """
+        with mock.patch(APPROVE_REFUNDS_PATH) as mock_approve_refunds:
+            mock_approve_refunds.side_effect = lambda refund_ids, **kwargs: dict.fromkeys(refund_ids, True)
+            call_command('create_course_refunds', course_id=self.course.id, username=[self.free_order.user.username])
+            call_command('create_course_refunds', course_id=self.course.id, approve=True, max_workers=2)
+
+        free_refund = Refund.objects.get(order=self.free_order)
+        refund = Refund.objects.get(order=self.order)
+        self.assertEqual(free_refund.total_credit_excl_tax, Decimal(0))
+        self.assertEqual(mock_approve_refunds.call_args_list, [
+            mock.call([free_refund.id], batch_size=100, max_workers=4),
+            mock.call([refund.id], batch_size=100, max_workers=2),
+        ])
+
+    @httpretty.activate
+    def test_approve_refunds_without_request(self):
+        """ Verify refunds are approved, and their lines revoked, although commands run outside of requests. """
+        httpretty.register_uri(
+            httpretty.POST, get_lms_enrollment_api_url(), status=200, body='{}', content_type='application/json'
+        )
+        set_thread_variable('request', None)
+        set_current_request(None)
+
+        with mock.patch.object(Refund, '_notify_purchaser'):
+            call_command('create_course_refunds', course_id=self.course.id, approve=True, max_workers=1)
+
+        self.assertEqual(set(Refund.objects.values_list('status', flat=True)), {REFUND.COMPLETE})
+
+    def test_approval_failure(self):
+        """ Verify refunds which could not be approved are logged. """
+        with mock.patch(APPROVE_REFUNDS_PATH) as mock_approve_refunds, LogCapture(LOGGER_NAME) as logger:
+            mock_approve_refunds.side_effect = lambda refund_ids, **kwargs: dict.fromkeys(refund_ids, False)
+            call_command('create_course_refunds', course_id=self.course.id, approve=True)
+
+            refund_ids = sorted(Refund.objects.values_list('id', flat=True))
+            logger.check_present((
+                LOGGER_NAME,
+                'ERROR',
+                'Failed to approve 2 of 2 refunds for course [{}]: {}'.format(
+                    self.course.id, ', '.join(str(refund_id) for refund_id in refund_ids)
+                )
+            ))
+
+    def test_invalid_course_id(self):
+        """ Verify an error is raised for an invalid course ID. """
+        with self.assertRaises(CommandError):
+            call_command('create_course_refunds', course_id=' ')
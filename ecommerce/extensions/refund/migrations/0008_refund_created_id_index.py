@@ -0,0 +1,17 @@
+# Generated by Django 2.2.17 on 2026-10-19 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('refund', '0007_auto_20191115_2151'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='refund',
+            index=models.Index(fields=['created', 'id'], name='refund_refu_created_38f10c_idx'),
+        ),
+    ]
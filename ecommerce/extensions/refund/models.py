@@ -3,7 +3,7 @@
 import logging
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from ecommerce_worker.sailthru.v1.tasks import send_course_refund_email
@@ -85,6 +85,11 @@ class Refund(StatusMixin, TimeStampedModel):
     history = HistoricalRecords()
     pipeline_setting = 'OSCAR_REFUND_STATUS_PIPELINE'
 
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            models.Index(fields=['created', 'id']),
+        ]
+
     @classmethod
     def all_statuses(cls):
         """Returns all possible statuses for a refund."""
@@ -143,6 +148,65 @@ class Refund(StatusMixin, TimeStampedModel):
 
         return refund
 
+    @classmethod
+    def create_with_lines_in_bulk(cls, lines_by_order):
+        """Given several orders and their unrefunded order lines, creates a Refund for each order.
+
+        Unlike create_with_lines, the lines are expected to have been checked for existing refunds
+        (e.g. with a single query), and the RefundLines of all of the orders are inserted at once.
+        Refunds corresponding to a total credit of $0 are NOT approved; see refund.api.approve_refunds.
+
+        Arguments:
+            lines_by_order (list of tuple): (order.Order, list of order.Line) pairs.
+
+        Returns:
+            list of Refund: The refunds created, in the order of the given orders.
+        """
+        refund_status = getattr(settings, 'OSCAR_INITIAL_REFUND_STATUS', REFUND.OPEN)
+        line_status = getattr(settings, 'OSCAR_INITIAL_REFUND_LINE_STATUS', REFUND_LINE.OPEN)
+        refunds = []
+        refund_lines = []
+
+        with transaction.atomic():
+            for order, lines in lines_by_order:
+                if not lines:
+                    continue
+
+                total_credit_excl_tax = sum([line.line_price_excl_tax for line in lines])
+                refund = cls.objects.create(
+                    order=order,
+                    user=order.user,
+                    status=refund_status,
+                    total_credit_excl_tax=total_credit_excl_tax
+                )
+                refunds.append(refund)
+                refund_lines += [
+                    RefundLine(
+                        refund=refund,
+                        order_line=line,
+                        line_credit_excl_tax=line.line_price_excl_tax,
+                        quantity=line.quantity,
+                        status=line_status
+                    )
+                    for line in lines
+                ]
+
+            RefundLine.objects.bulk_create(refund_lines)
+            # bulk_create does not send the signals that create historical records.
+            RefundLine.history.bulk_history_create(RefundLine.objects.filter(refund__in=refunds))
+
+        for refund in refunds:
+            audit_log(
+                'refund_created',
+                amount=refund.total_credit_excl_tax,
+                currency=refund.currency,
+                order_number=refund.order.number,
+                refund_id=refund.id,
+                user_id=refund.user.id
+            )
+
+        return refunds
+
     @property
     def num_items(self):
         """Returns the number of items in this refund."""
@@ -247,8 +311,10 @@ class Refund(StatusMixin, TimeStampedModel):
             return False
         if self.status in (REFUND.OPEN, REFUND.PAYMENT_REFUND_ERROR):
             try:
-                self._issue_credit()
-                self.set_status(REFUND.PAYMENT_REFUNDED)
+                # Outside of transactions, the refund of the payment is committed before the lines are revoked.
+                with transaction.atomic():
+                    self._issue_credit()
+                    self.set_status(REFUND.PAYMENT_REFUNDED)
                 if notify_purchaser:
                     self._notify_purchaser()
             except PaymentError:
@@ -1,19 +1,31 @@
 
 
+from decimal import Decimal
+
 import ddt
+import mock
 from django.test import override_settings
 from oscar.core.loading import get_model
 
 from ecommerce.extensions.fulfillment.status import ORDER
-from ecommerce.extensions.refund.api import create_refunds, find_orders_associated_with_course
-from ecommerce.extensions.refund.tests.factories import RefundLineFactory
+from ecommerce.extensions.refund.api import (
+    approve_refunds,
+    create_refunds,
+    create_refunds_for_course,
+    find_orders_associated_with_course,
+    find_unrefunded_course_lines
+)
+from ecommerce.extensions.refund.status import REFUND_LINE
+from ecommerce.extensions.refund.tests.factories import RefundFactory, RefundLineFactory
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.extensions.test.factories import EnterpriseOfferFactory
 from ecommerce.tests.factories import UserFactory
 from ecommerce.tests.testcases import TestCase
 
 ProductAttribute = get_model("catalogue", "ProductAttribute")
 ProductClass = get_model("catalogue", "ProductClass")
 Refund = get_model('refund', 'Refund')
+RefundLine = get_model('refund', 'RefundLine')
 
 OSCAR_INITIAL_REFUND_STATUS = 'REFUND_OPEN'
 OSCAR_INITIAL_REFUND_LINE_STATUS = 'REFUND_LINE_OPEN'
@@ -79,3 +91,101 @@ class ApiTests(RefundTestMixin, TestCase):
 
         actual = create_refunds([order], self.course.id)
         self.assertEqual(actual, [])
+
+    def test_find_unrefunded_course_lines(self):
+        """ The method should return the lines of complete orders of the course that have not been refunded. """
+        order = self.create_order(multiple_lines=True)
+        denied_order = self.create_order(user=UserFactory())
+        RefundLineFactory(order_line=denied_order.lines.first(), status=REFUND_LINE.DENIED)
+        refunded_order = self.create_order(user=UserFactory())
+        RefundLineFactory(order_line=refunded_order.lines.first())
+        self.create_order(user=UserFactory(), status=ORDER.OPEN)
+
+        with self.assertNumQueries(1):
+            lines = list(find_unrefunded_course_lines(self.course.id))
+        self.assertEqual(lines, list(order.lines.order_by('id')) + list(denied_order.lines.all()))
+
+        self.assertEqual(
+            list(find_unrefunded_course_lines(self.course.id, usernames=[denied_order.user.username])),
+            list(denied_order.lines.all())
+        )
+
+    def test_find_unrefunded_course_lines_for_enterprise(self):
+        """ The method should only return the lines of orders discounted by an offer of the enterprise customer. """
+        offer = EnterpriseOfferFactory()
+        order = self.create_order()
+        order.discounts.create(offer_id=offer.id, amount=1)
+        self.create_order(user=UserFactory())
+
+        lines = find_unrefunded_course_lines(
+            self.course.id, enterprise_customer_uuid=offer.condition.enterprise_customer_uuid
+        )
+        self.assertEqual(list(lines), list(order.lines.all()))
+
+    @override_settings(OSCAR_INITIAL_REFUND_STATUS=OSCAR_INITIAL_REFUND_STATUS,
+                       OSCAR_INITIAL_REFUND_LINE_STATUS=OSCAR_INITIAL_REFUND_LINE_STATUS)
+    def test_create_refunds_for_course(self):
+        """ The method should create a refund for each order with unrefunded lines, in batches. """
+        orders = [self.create_order(multiple_lines=True)] + [self.create_order(user=UserFactory()) for _ in range(2)]
+
+        report = create_refunds_for_course(self.course.id, batch_size=2)
+
+        refunds = Refund.objects.order_by('order_id')
+        self.assertEqual(len(refunds), 3)
+        for order, refund in zip(orders, refunds):
+            self.assert_refund_matches_order(refund, order)
+            self.assertEqual(refund.lines.first().history.count(), 1)
+        self.assertEqual(report, [
+            {
+                'order_number': order.number,
+                'username': order.user.username,
+                'num_lines': order.lines.count(),
+                'total_credit_excl_tax': order.total_excl_tax,
+                'currency': order.currency,
+                'refund_id': refund.id,
+            }
+            for order, refund in zip(orders, refunds)
+        ])
+
+        # The lines have been refunded.
+        self.assertEqual(create_refunds_for_course(self.course.id), [])
+
+    def test_create_refunds_for_course_dry_run(self):
+        """ The method should report the refunds that would be created, without creating them. """
+        order = self.create_order()
+
+        report = create_refunds_for_course(self.course.id, dry_run=True)
+
+        self.assertFalse(Refund.objects.exists())
+        self.assertEqual([(entry['order_number'], entry['refund_id']) for entry in report], [(order.number, None)])
+
+    def test_approve_refunds(self):
+        """ The method should approve each refund, only notifying the purchasers of non-zero refunds. """
+        refunds = [RefundFactory(), RefundFactory()]
+        refunds[1].total_credit_excl_tax = Decimal(0)
+        refunds[1].save()
+        failing_refund = RefundFactory()
+
+        def approve(refund, notify_purchaser):
+            # Approvals succeed if the purchaser is notified, so that the results reflect notify_purchaser.
+            if refund.id == failing_refund.id:
+                raise Exception
+            return notify_purchaser
+
+        with mock.patch.object(Refund, 'approve', autospec=True, side_effect=approve):
+            results = approve_refunds([refund.id for refund in refunds + [failing_refund]], batch_size=2)
+
+        self.assertEqual(results, {refunds[0].id: True, refunds[1].id: False, failing_refund.id: False})
+
+    def test_approve_refunds_in_parallel(self):
+        """ The method should approve the batches of refunds in worker threads. """
+        with mock.patch('ecommerce.extensions.refund.api._approve_refund_batch') as mock_approve_batch:
+            mock_approve_batch.side_effect = lambda refund_ids, notify_purchaser, in_thread: {
+                refund_id: in_thread for refund_id in refund_ids
+            }
+            results = approve_refunds([1, 2, 3], batch_size=2, max_workers=2)
+
+        self.assertEqual(results, {1: True, 2: True, 3: True})
+        self.assertEqual(
+            sorted(call[0][0] for call in mock_approve_batch.call_args_list), [[1, 2], [3]]
+        )
@@ -2,8 +2,7 @@
 
 from mock import patch
 
-from ecommerce.core.models import SegmentClient
-from ecommerce.extensions.analytics.utils import ECOM_TRACKING_ID_FMT
+from ecommerce.extensions.analytics.utils import ECOM_TRACKING_ID_FMT, SegmentClient
 from ecommerce.extensions.refund.api import create_refunds
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
 from ecommerce.tests.factories import UserFactory
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.17 on 2026-10-19 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voucher', '0012_voucher_is_public'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='voucher',
+            index=models.Index(fields=['date_created', 'id'], name='voucher_vou_date_cr_3d00ed_idx'),
+        ),
+    ]
@@ -51,6 +51,11 @@ class Voucher(AbstractVoucher):
         default=False
     )
 
+    class Meta(AbstractVoucher.Meta):
+        indexes = [
+            models.Index(fields=['date_created', 'id']),
+        ]
+
     def is_available_to_user(self, user=None):
         is_available, message = super(Voucher, self).is_available_to_user(user)  # pylint: disable=bad-super-call
 
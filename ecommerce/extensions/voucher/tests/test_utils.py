@@ -37,6 +37,8 @@ from ecommerce.extensions.voucher.utils import (
     generate_coupon_report,
     get_voucher_and_products_from_code,
     get_voucher_discount_info,
+    get_vouchers_original_and_enterprise_offers,
+    set_vouchers_offers,
     update_voucher_offer
 )
 from ecommerce.tests.factories import UserFactory
@@ -717,6 +719,35 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
         self.assertEqual(new_offer.benefit.range.catalog, self.catalog)
         self.assertEqual(new_offer.email_domains, new_email_domains)
 
+    def test_get_vouchers_original_and_enterprise_offers(self):
+        """ Verify the offers returned for each voucher match its original_offer and enterprise_offer properties. """
+        vouchers = create_vouchers(**self.data)
+        enterprise_offer = ConditionalOfferFactory(
+            condition__enterprise_customer_uuid=uuid.uuid4(), condition__range=None
+        )
+        vouchers[0].offers.add(enterprise_offer)
+
+        with self.assertNumQueries(4):
+            voucher_offers = get_vouchers_original_and_enterprise_offers(
+                Voucher.objects.filter(id__in=[voucher.id for voucher in vouchers])
+            )
+        self.assertEqual(
+            [(voucher.id, original_offer, offer) for voucher, original_offer, offer in voucher_offers],
+            [(voucher.id, voucher.original_offer, voucher.enterprise_offer) for voucher in vouchers]
+        )
+        self.assertEqual(voucher_offers[0][2], enterprise_offer)
+
+    def test_set_vouchers_offers(self):
+        """ Verify only the offers of the vouchers whose offers changed are replaced. """
+        vouchers = create_vouchers(**self.data)
+        offer = vouchers[0].offers.first()
+        new_offer = ConditionalOfferFactory()
+
+        set_vouchers_offers([(vouchers[0], [offer]), (vouchers[1], [new_offer, offer])])
+
+        self.assertEqual(list(vouchers[0].offers.all()), [offer])
+        self.assertEqual(set(vouchers[1].offers.all()), {new_offer, offer})
+
     def test_get_voucher_and_products_from_code(self):
         """ Verify that get_voucher_and_products_from_code() returns products and voucher. """
         original_voucher, original_product = prepare_voucher(code=VOUCHER_CODE)
@@ -1,11 +1,15 @@
 
 
+import json
+import shutil
+import tempfile
 from uuid import uuid4
 
 import httpretty
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
 from oscar.core.loading import get_model
 
+from ecommerce.core.jobs import JOB_FAILED, JOB_SUCCEEDED, get_job
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
@@ -55,7 +59,7 @@ class CouponReportCSVViewTest(CouponMixin, DiscoveryTestMixin, LmsApiMockMixin,
         basket = Basket.get_basket(client, self.site)
         basket.add_product(coupon)
 
-        request = RequestFactory()
+        request = RequestFactory().get('/')
         response = CouponReportCSVView().get(request, coupon_id=coupon.id)
 
         self.assertEqual(response.status_code, 200)
@@ -80,3 +84,35 @@ class CouponReportCSVViewTest(CouponMixin, DiscoveryTestMixin, LmsApiMockMixin,
         self.assertEqual(response.content.decode('utf-8'),
                          'Failed to find a matching stock record for coupon, report download canceled.')
         self.assertEqual(response.status_code, 404)
+
+    def get_async_report(self, coupon):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        with override_settings(MEDIA_ROOT=media_root):
+            request = RequestFactory().get('/', {'async': 'true'})
+            request.user = self.user
+            response = CouponReportCSVView().get(request, coupon_id=coupon.id)
+            self.assertEqual(response.status_code, 202)
+            job = get_job(json.loads(response.content.decode('utf-8'))['job_id'])
+            self.assertEqual(job.name, 'coupon_report')
+            self.assertEqual(job.context, {'coupon_id': coupon.id})
+            self.assertEqual(job.created_by, self.user)
+            return job, job.result_file.read() if job.result_file else None
+
+    @httpretty.activate
+    def test_get_csv_report_async(self):
+        """ Verify the report is generated by a background job when async=true is passed. """
+        self.mock_course_api_response(course=self.course)
+        job, content = self.get_async_report(self.coupon1)
+        self.assertEqual(job.status, JOB_SUCCEEDED)
+        self.assertEqual(job.completed, 1)
+        self.assertTrue(job.result_file.name.endswith('.csv'))
+        self.assertEqual(len(content.splitlines()), 7)
+
+    def test_get_csv_report_async_missing_stockrecord(self):
+        """ Verify the background job fails when the coupon has no StockRecord. """
+        StockRecord.objects.get(product=self.coupon1).delete()
+        job, content = self.get_async_report(self.coupon1)
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertEqual(job.error, 'Failed to find a matching stock record for coupon, report download canceled.')
+        self.assertIsNone(content)
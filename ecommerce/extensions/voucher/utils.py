@@ -957,6 +957,60 @@ def update_voucher_offer(offer, benefit_value, benefit_type=None, max_uses=None,
     )
 
 
+def get_vouchers_original_and_enterprise_offers(vouchers):
+    """
+    Return the original and enterprise offer of each of the vouchers.
+
+    The offers are selected like the original_offer and enterprise_offer properties of Voucher do, but the offers
+    of all of the vouchers are loaded with a fixed number of queries.
+
+    Args:
+        vouchers (QuerySet): Vouchers whose offers are returned.
+
+    Returns:
+        list: (voucher, original offer, enterprise offer or None) tuple for each voucher.
+    """
+    voucher_offers = []
+    for voucher in vouchers.prefetch_related('offers__condition', 'offers__benefit'):
+        offers = list(voucher.offers.all())
+        ranged_offers = [offer for offer in offers if offer.condition.range_id is not None]
+        original_offer = ranged_offers[0] if ranged_offers else min(offers, key=lambda offer: offer.date_created)
+        enterprise_offer = next((offer for offer in offers if offer.condition.enterprise_customer_uuid), None)
+        voucher_offers.append((voucher, original_offer, enterprise_offer))
+    return voucher_offers
+
+
+def set_vouchers_offers(vouchers_offers):
+    """
+    Replace the offers of the vouchers, with a fixed number of queries.
+
+    Args:
+        vouchers_offers (list): (voucher, offers) tuple for each voucher, where offers is the list of offers the
+            voucher should be linked to.
+    """
+    current_offer_ids = {}
+    for voucher_offer in VoucherOffer.objects.filter(
+            voucher_id__in=[voucher.id for voucher, __ in vouchers_offers]
+    ).order_by('id'):
+        current_offer_ids.setdefault(voucher_offer.voucher_id, []).append(voucher_offer.conditionaloffer_id)
+
+    # Only the links of the vouchers whose offers changed are rewritten.
+    changed_vouchers_offers = [
+        (voucher, offers) for voucher, offers in vouchers_offers
+        if current_offer_ids.get(voucher.id, []) != [offer.id for offer in offers]
+    ]
+    if not changed_vouchers_offers:
+        return
+
+    VoucherOffer.objects.filter(voucher_id__in=[voucher.id for voucher, __ in changed_vouchers_offers]).delete()
+    VoucherOffer.objects.bulk_create([
+        VoucherOffer(voucher_id=voucher.id, conditionaloffer_id=offer.id)
+        for voucher, offers in changed_vouchers_offers
+        for offer in offers
+    ])
+    logger.info('Replaced the offers of %d of %d vouchers.', len(changed_vouchers_offers), len(vouchers_offers))
+
+
 def get_cached_voucher(code):
     """
     Returns a voucher from cache if one is stored to cache, if not the voucher
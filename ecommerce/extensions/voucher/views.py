@@ -2,13 +2,17 @@
 
 import csv
 import logging
+from io import StringIO
 
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
 from django.utils.text import slugify
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import View
 from oscar.core.loading import get_model
 
+from ecommerce.core.db_routers import read_replica_view
+from ecommerce.core.jobs import JobError, is_async_requested, start_job
 from ecommerce.core.views import StaffOnlyMixin
 from ecommerce.extensions.voucher.utils import generate_coupon_report
 
@@ -20,32 +24,67 @@ Product = get_model('catalogue', 'Product')
 StockRecord = get_model('partner', 'StockRecord')
 
 
+def write_coupon_report(coupon, output):
+    """
+    Writes the CSV report of the vouchers associated with the coupon to the output file.
+
+    Raises:
+        StockRecord.DoesNotExist: If the coupon has no stock record.
+    """
+    field_names, rows = generate_coupon_report(CouponVouchers.objects.filter(coupon=coupon))
+    writer = csv.DictWriter(output, fieldnames=field_names)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+
+
+def get_coupon_report_filename(coupon):
+    filename = _("Coupon Report for {coupon_name}").format(coupon_name=str(coupon))
+    return "{}.csv".format(slugify(filename))
+
+
+def generate_coupon_report_file(progress, coupon_id):
+    """
+    Background job generating the coupon report, which can be downloaded through the background jobs API.
+    """
+    coupon = Product.objects.get(id=coupon_id)
+    output = StringIO()
+    try:
+        write_coupon_report(coupon, output)
+    except StockRecord.DoesNotExist:
+        raise JobError(_('Failed to find a matching stock record for coupon, report download canceled.'))
+    progress.save_result_file(get_coupon_report_filename(coupon), output.getvalue())
+    progress.advance(1)
+
+
 class CouponReportCSVView(StaffOnlyMixin, View):
     """Generates coupon report and returns it in CSV format."""
 
+    @method_decorator(read_replica_view)
     def get(self, request, coupon_id):  # pylint: disable=unused-argument
         """
         Generate coupon report for vouchers associated with the coupon.
+
+        The report is generated by a background job if `async=true` is passed, the response then only contains the
+        ID of the job.
         """
         coupon = Product.objects.get(id=coupon_id)
-        filename = _("Coupon Report for {coupon_name}").format(coupon_name=str(coupon))
-        coupons_vouchers = CouponVouchers.objects.filter(coupon=coupon)
 
-        filename = "{}.csv".format(slugify(filename))
+        if is_async_requested(request):
+            job_id = start_job(
+                'coupon_report', generate_coupon_report_file, 1, coupon.id, context={'coupon_id': coupon.id},
+                user=getattr(request, 'user', None)
+            )
+            return JsonResponse({'job_id': job_id}, status=202)
+
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename={}'.format(get_coupon_report_filename(coupon))
 
         try:
-            field_names, rows = generate_coupon_report(coupons_vouchers)
+            write_coupon_report(coupon, response)
         except StockRecord.DoesNotExist:
             logger.exception(u'Failed to find StockRecord for Coupon [%d].', coupon.id)
             return HttpResponse(_('Failed to find a matching stock record for coupon, report download canceled.'),
                                 status=404)
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename={}'.format(filename)
-
-        writer = csv.DictWriter(response, fieldnames=field_names)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
-
         return response
@@ -3,7 +3,8 @@
 import logging
 
 from django.conf import settings
-from edx_django_utils.cache import TieredCache
+
+from ecommerce.core.cache_utils import get_or_fetch
 
 logger = logging.getLogger(__name__)
 
@@ -33,15 +34,10 @@ class ProgramsApiClient:
         program_uuid = str(uuid)
         cache_key = '{site_domain}-program-{uuid}'.format(site_domain=self.site_domain, uuid=program_uuid)
 
-        program_cached_response = TieredCache.get_cached_response(cache_key)
-
-        if program_cached_response.is_found:  # pragma: no cover
-            logger.debug('Program [%s] was found in the cache.', program_uuid)
-            return program_cached_response.value
-
-        logging.info('Retrieving details of of program [%s]...', program_uuid)
-        program = self.client.programs(program_uuid).get()
+        def fetch():
+            logging.info('Retrieving details of of program [%s]...', program_uuid)
+            program = self.client.programs(program_uuid).get()
+            logging.info('Program [%s] was successfully retrieved and cached.', program_uuid)
+            return program
 
-        TieredCache.set_all_tiers(cache_key, program, self.cache_ttl)
-        logging.info('Program [%s] was successfully retrieved and cached.', program_uuid)
-        return program
+        return get_or_fetch('program', cache_key, fetch, self.cache_ttl)
@@ -68,6 +68,17 @@ DATABASES = {
         'CONN_MAX_AGE': 60,
     }
 }
+
+# Reads of the views and commands decorated with ecommerce.core.db_routers.use_read_replica are sent
+# to the 'read_replica' database, if one is configured.
+DATABASE_ROUTERS = ['ecommerce.core.db_routers.ReadReplicaRouter']
+# Reads fall back to the default database when the replica is behind by more than this number of seconds.
+# Set to None to skip the check.
+READ_REPLICA_MAX_LAG = 30
+# Number of seconds the replication lag check is cached for.
+READ_REPLICA_LAG_CHECK_INTERVAL = 10
+# Number of seconds the reads of a client are sent to the default database after it made a write request.
+READ_REPLICA_STICKY_SECONDS = 10
 # END DATABASE CONFIGURATION
 
 
@@ -239,6 +250,7 @@ MIDDLEWARE = (
     'edx_rest_framework_extensions.middleware.RequestMetricsMiddleware',
     'edx_rest_framework_extensions.auth.jwt.middleware.EnsureJWTAuthSettingsMiddleware',
     'crum.CurrentRequestUserMiddleware',
+    'ecommerce.core.db_routers.ReadReplicaStickinessMiddleware',
 )
 # END MIDDLEWARE CONFIGURATION
 
@@ -260,6 +272,31 @@ CATALOG_RESULTS_CACHE_TIMEOUT = 86400
 # Cache timeout for enterprise customer results from the enterprise service.
 ENTERPRISE_CUSTOMER_RESULTS_CACHE_TIMEOUT = 3600  # Value is in seconds
 
+# Responses from other services cached with ecommerce.core.cache_utils are served for this long after their
+# cache timeout has passed, while they are refreshed in the background.
+CACHE_STALE_WHILE_REVALIDATE_PERIOD = 3600  # Value is in seconds.
+# Not found responses are cached for this long.
+CACHE_NOT_FOUND_TIMEOUT = 300  # Value is in seconds.
+# Maximum time a single refresh of a stale cache entry is expected to take.
+CACHE_REFRESH_LOCK_TIMEOUT = 60  # Value is in seconds.
+CACHE_REFRESH_IN_BACKGROUND = True
+CACHE_REFRESH_MAX_WORKERS = 4
+
+# Running background jobs whose progress has not been updated for this long are failed, see ecommerce.core.jobs.
+BACKGROUND_JOB_STALE_TIMEOUT = 60 * 60  # Value is in seconds.
+# Background jobs, and their result files, are deleted once they are older than this.
+BACKGROUND_JOB_RETENTION_DAYS = 30
+
+# Code assignments to more learners than this run as background jobs, see ecommerce.core.jobs.
+CODE_ASSIGNMENT_JOB_THRESHOLD = 1000
+# Number of code assignments created, revoked or reminded, and of their emails sent, at a time.
+CODE_ASSIGNMENT_BATCH_SIZE = 500
+
+# Manual enrollment order requests with more enrollments than this run as background jobs.
+MANUAL_ENROLLMENT_ORDER_JOB_THRESHOLD = 1000
+# Number of manual enrollment orders created in each transaction.
+MANUAL_ENROLLMENT_ORDER_BATCH_SIZE = 100
+
 # PROVIDER DATA PROCESSING
 PROVIDER_DATA_PROCESSING_TIMEOUT = 15  # Value is in seconds.
 CREDIT_PROVIDER_CACHE_TIMEOUT = 600
@@ -267,6 +304,9 @@ CREDIT_PROVIDER_CACHE_TIMEOUT = 600
 # Anonymous User Calculate Cache timeout
 ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT = 3600  # Value is in seconds.
 
+# Cache timeout for the index of site offers by product, used to skip offers which can not apply to a basket.
+SITE_OFFER_INDEX_CACHE_TIMEOUT = 3600  # Value is in seconds.
+
 # LMS API settings used for fetching information from LMS
 LMS_API_CACHE_TIMEOUT = 30  # Value is in seconds.
 # END URL CONFIGURATION
@@ -556,6 +596,7 @@ BROKER_HEARTBEAT_CHECKRATE = 2
 # See http://celery.readthedocs.io/en/latest/userguide/configuration.html#imports.
 CELERY_IMPORTS = (
     'ecommerce_worker.fulfillment.v1.tasks',
+    'ecommerce.core.jobs',
 )
 
 DEFAULT_PRIORITY_QUEUE = 'ecommerce.default'
@@ -570,6 +611,8 @@ CELERY_ROUTES = {
     'ecommerce_worker.sailthru.v1.tasks.send_offer_update_email': {'queue': 'ecommerce.email_marketing'},
     'ecommerce_worker.sailthru.v1.tasks.send_offer_usage_email': {'queue': 'ecommerce.email_marketing'},
     'ecommerce_worker.sailthru.v1.tasks.send_code_assignment_nudge_email': {'queue': 'ecommerce.email_marketing'},
+    # Run by workers of the ecommerce app itself, see ecommerce.core.jobs.
+    'ecommerce.core.jobs.run_background_job': {'queue': 'ecommerce.background_jobs'},
 }
 
 # Prevent Celery from removing handlers on the root logger. Allows setting custom logging handlers.
@@ -642,6 +685,8 @@ EDX_DRF_EXTENSIONS = {
 # created for the Enrollment code products.
 ENROLLMENT_CODE_EXIPRATION_DATE = datetime.datetime.now() + datetime.timedelta(weeks=520)
 ENROLLMENT_FULFILLMENT_TIMEOUT = 7
+# Maximum number of lines of a refund whose fulfillment is revoked at the same time, outside of transactions.
+REFUND_REVOCATION_MAX_WORKERS = 4
 
 # Affiliate cookie key
 AFFILIATE_COOKIE_KEY = 'affiliate_id'
@@ -687,6 +732,12 @@ if os.environ.get('ENABLE_DJANGO_TOOLBAR', False):
 # Determines if events are actually sent to Segment. This should only be set to False for testing purposes.
 SEND_SEGMENT_EVENTS = True
 
+# Maximum number of events buffered per Segment write key before new events are dropped.
+SEGMENT_MAX_QUEUE_SIZE = 10000
+
+# Fraction of SEGMENT_MAX_QUEUE_SIZE above which the Segment queue is reported as being under backpressure.
+SEGMENT_QUEUE_BACKPRESSURE_THRESHOLD = 0.8
+
 NEW_CODES_EMAIL_CONFIG = {
     'email_subject': 'New edX codes available',
     'from_email': 'customersuccess@edx.org',
@@ -159,6 +159,9 @@ ENTERPRISE_CATALOG_API_URL = urljoin(ENTERPRISE_CATALOG_SERVICE_URL, 'api/v1/')
 # Don't bother sending fake events to Segment. Doing so creates unnecessary threads.
 SEND_SEGMENT_EVENTS = False
 
+# Refresh stale cache entries in-process, so that the refreshed values can be asserted on.
+CACHE_REFRESH_IN_BACKGROUND = False
+
 # SPEED
 DEBUG = False
 TEMPLATE_DEBUG = False
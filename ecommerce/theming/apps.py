@@ -21,6 +21,10 @@ class ThemeAppConfig(AppConfig):
         startup run method, this method is called after the application has successfully initialized.
         Anything that needs to executed once (and only once) the theming app starts can be placed here.
         """
+        # Register signal handlers
+        # noinspection PyUnresolvedReferences
+        import ecommerce.theming.signals  # pylint: disable=unused-import, import-outside-toplevel
+
         if is_comprehensive_theming_enabled():
             # proceed only if comprehensive theming in enabled
 
@@ -5,14 +5,20 @@
 
 import logging
 import os
+import threading
 
 import waffle
 from django.conf import ImproperlyConfigured, settings
+from django.utils.functional import cached_property
 from path import Path
 from threadlocals.threadlocals import get_current_request
 
 logger = logging.getLogger(__name__)
 
+# Themes resolved by this process, keyed by theme directory name.
+_resolved_themes = {}
+_resolved_themes_lock = threading.Lock()
+
 
 def get_current_site_theme():
     """
@@ -46,17 +52,65 @@ def get_current_theme():
     if not site_theme:
         return None
     try:
-        return Theme(
-            name=site_theme.theme_dir_name,
-            theme_dir_name=site_theme.theme_dir_name,
-            themes_base_dir=get_theme_base_dir(site_theme.theme_dir_name),
-        )
+        return get_resolved_theme(site_theme.theme_dir_name)
     except ValueError as e:
         # Log exception message and return None, so that open source theme is used instead
         logger.exception('Theme not found in any of the themes dirs. [%s]', e)
         return None
 
 
+def _get_theme_base_dirs_state():
+    """
+    Returns the modification times of the theme base directories, which change when themes are added or removed.
+    Returns None if the directories can not be read, so that they are validated by get_theme_base_dirs.
+    """
+    try:
+        return tuple(
+            (theme_dir, os.stat(theme_dir).st_mtime_ns) for theme_dir in settings.COMPREHENSIVE_THEME_DIRS
+        )
+    except (OSError, TypeError):
+        return None
+
+
+def get_resolved_theme(theme_dir_name):
+    """
+    Returns the Theme with the given directory name.
+
+    Looking up the directory that contains the theme scans every theme base directory, so themes are only
+    resolved once per process. They are resolved again once the theme base directories are modified, or the
+    SiteThemes are changed.
+
+    Args:
+        theme_dir_name (str): directory name of the theme
+    Returns:
+        (Theme): the theme
+    Raises:
+        ValueError: if the theme is not found in any of the theme base directories
+    """
+    state = _get_theme_base_dirs_state()
+    resolved_theme = _resolved_themes.get(theme_dir_name)
+    if state is not None and resolved_theme and resolved_theme[0] == state:
+        return resolved_theme[1]
+
+    theme = Theme(
+        name=theme_dir_name,
+        theme_dir_name=theme_dir_name,
+        themes_base_dir=get_theme_base_dir(theme_dir_name),
+    )
+    if state is not None:
+        with _resolved_themes_lock:
+            _resolved_themes[theme_dir_name] = (state, theme)
+    return theme
+
+
+def clear_resolved_themes():
+    """
+    Clears the themes resolved by this process.
+    """
+    with _resolved_themes_lock:
+        _resolved_themes.clear()
+
+
 def get_theme_base_dir(theme_dir_name, suppress_error=False):
     """
     Returns absolute path to the directory that contains the given theme.
@@ -246,11 +300,11 @@ class Theme:
     def __repr__(self):
         return self.__str__()
 
-    @property
+    @cached_property
     def path(self):
         return Path(self.themes_base_dir) / self.theme_dir_name
 
-    @property
+    @cached_property
     def template_dirs(self):
         return [
             self.path / 'templates',
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ecommerce.theming.helpers import clear_resolved_themes
+from ecommerce.theming.models import SiteTheme
+
+
+@receiver(post_save, sender=SiteTheme, dispatch_uid='theming.resolved_themes.site_theme_saved')
+@receiver(post_delete, sender=SiteTheme, dispatch_uid='theming.resolved_themes.site_theme_deleted')
+def clear_resolved_themes_receiver(*_args, **_kwargs):
+    """
+    Clear the themes resolved by this process when a SiteTheme changes.
+    """
+    clear_resolved_themes()
@@ -3,6 +3,8 @@ Tests of comprehensive theming.
 """
 
 
+import os
+
 from django.conf import ImproperlyConfigured, settings
 from django.test import override_settings
 from mock import patch
@@ -10,13 +12,16 @@ from mock import patch
 from ecommerce.tests.testcases import TestCase
 from ecommerce.theming.helpers import (
     Theme,
+    clear_resolved_themes,
     get_all_theme_template_dirs,
     get_current_site_theme,
     get_current_theme,
+    get_resolved_theme,
     get_theme_base_dir,
     get_theme_base_dirs,
     get_themes
 )
+from ecommerce.theming.models import SiteTheme
 from ecommerce.theming.test_utils import with_comprehensive_theme
 
 
@@ -38,6 +43,29 @@ class TestHelpers(TestCase):
         actual_themes = get_themes()
         self.assertCountEqual(expected_themes, actual_themes)
 
+    def test_get_resolved_theme(self):
+        """
+        Tests themes are resolved once, until the theme base dirs are modified or a SiteTheme is changed.
+        """
+        clear_resolved_themes()
+        with patch('ecommerce.theming.helpers.get_theme_base_dir', wraps=get_theme_base_dir) as mock_base_dir:
+            theme = get_resolved_theme('test-theme')
+            self.assertIs(get_resolved_theme('test-theme'), theme)
+            self.assertEqual(mock_base_dir.call_count, 1)
+
+            theme_dir = get_theme_base_dirs()[0]
+            stat = os.stat(theme_dir)
+            os.utime(theme_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            self.addCleanup(os.utime, theme_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(get_resolved_theme('test-theme'), theme)
+            self.assertEqual(mock_base_dir.call_count, 2)
+
+            SiteTheme.objects.create(site=self.site, theme_dir_name='test-theme-2')
+            get_resolved_theme('test-theme')
+            self.assertEqual(mock_base_dir.call_count, 3)
+
+        self.assertEqual(theme.path, settings.DJANGO_ROOT + "/tests/themes/test-theme")
+
     def test_get_themes_with_theming_disabled(self):
         """
         Tests get_themes returns empty list when theming is disabled.